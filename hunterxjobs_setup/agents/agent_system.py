@@ -4,17 +4,23 @@
 import logging
 import os
 import json
+import uuid
 from typing import Dict, List, Any, Optional
 from datetime import datetime
 
 # Import all agent classes
 from agents.base.agent_factory import AgentFactory
+from agents.base.knowledge_base import create_knowledge_backend
+from agents.base.snapshot import SnapshotWriter, SnapshotReader, LazyAgentMap, LazyRecordList, resolve_class
 from agents.project_manager import ProjectManagerAgent
 from agents.programmer import ProgrammerAgent
 from agents.debugger import DebuggerAgent
 from agents.linkedin_optimizer import LinkedInProfileOptimizerAgent
 from agents.security import SecurityAgent
 
+# Lists at least this long are stored as separate snapshot records and decoded on first use
+LAZY_LIST_THRESHOLD = 1024
+
 class AgentSystem:
     """
     Main agent system that integrates all agents and manages their interactions.
@@ -28,15 +34,7 @@ class AgentSystem:
             config_path: Optional path to configuration file
         """
         # Set up logging
-        self.logger = logging.getLogger("AgentSystem")
-        self.logger.setLevel(logging.INFO)
-        
-        # Create console handler if not already exists
-        if not self.logger.handlers:
-            handler = logging.StreamHandler()
-            formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
-            handler.setFormatter(formatter)
-            self.logger.addHandler(handler)
+        self._setup_logging()
         
         self.logger.info("Initializing HunterXJobs Agent System")
         
@@ -46,6 +44,9 @@ class AgentSystem:
         # Initialize agent factory
         self.agent_factory = AgentFactory()
         
+        # Shared knowledge backend (from the "cache" section, if configured)
+        self.knowledge_backend = create_knowledge_backend(self.config.get("cache"))
+        
         # Initialize agents
         self.agents = {}
         self._initialize_agents()
@@ -55,6 +56,20 @@ class AgentSystem:
         
         self.logger.info("HunterXJobs Agent System initialized successfully")
     
+    def _setup_logging(self) -> None:
+        """
+        Set up the system logger.
+        """
+        self.logger = logging.getLogger("AgentSystem")
+        self.logger.setLevel(logging.INFO)
+        
+        # Create console handler if not already exists
+        if not self.logger.handlers:
+            handler = logging.StreamHandler()
+            formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+            handler.setFormatter(formatter)
+            self.logger.addHandler(handler)
+    
     def _load_config(self, config_path: Optional[str]) -> Dict[str, Any]:
         """
         Load configuration from file or use default.
@@ -168,6 +183,138 @@ class AgentSystem:
             if self.agents["security"]:
                 self.agents["security"].start_security_monitoring()
                 self.logger.info("Security monitoring started")
+        
+        # Share knowledge between agents through the configured backend
+        if self.knowledge_backend is not None:
+            for agent in self.agents.values():
+                agent.set_knowledge_backend(self.knowledge_backend)
+            self.logger.info(f"Shared knowledge backend attached: {type(self.knowledge_backend).__name__}")
+    
+    def snapshot(self, path: str) -> Dict[str, Any]:
+        """
+        Save the state of the whole system (agents, tasks, knowledge, messages)
+        to a binary snapshot file.
+        
+        Args:
+            path: Path of the snapshot file
+            
+        Returns:
+            Dictionary containing snapshot details
+        """
+        self.logger.info(f"Writing system snapshot to {path}")
+        
+        writer = SnapshotWriter(path)
+        agent_records = {}
+        skipped_attributes = {}
+        
+        try:
+            for agent_id, agent in self.agents.items():
+                record_name = f"agent:{agent_id}"
+                agent_class = type(agent)
+                state = dict(vars(agent))
+                
+                # Large lists (messages, history) get their own records so they can be loaded lazily
+                lazy_attributes = {}
+                for name, value in list(state.items()):
+                    if isinstance(value, LazyRecordList) or (
+                        isinstance(value, list) and len(value) >= LAZY_LIST_THRESHOLD
+                    ):
+                        lazy_attributes[name] = f"{record_name}:{name}"
+                        writer.write_record(lazy_attributes[name], list(value))
+                        del state[name]
+                
+                skipped = writer.write_state_record(record_name, state)
+                agent_records[agent_id] = [
+                    f"{agent_class.__module__}.{agent_class.__qualname__}", record_name, lazy_attributes
+                ]
+                
+                # Loggers are always recreated; anything else skipped is worth knowing about
+                skipped = [name for name in skipped if name != "logger"]
+                if skipped:
+                    skipped_attributes[agent_id] = skipped
+                    self.logger.warning(f"Agent {agent_id} attributes not included in snapshot: {skipped}")
+            
+            writer.write_record("config", self.config)
+            writer.write_record("message_queue", list(self.message_queue))
+            writer.close(metadata={
+                "agents": agent_records,
+                "created_at": datetime.now().isoformat()
+            })
+        except Exception:
+            writer.abort()
+            raise
+        
+        self.logger.info(f"System snapshot written to {path}")
+        return {
+            "path": path,
+            "agents": list(agent_records),
+            "skipped_attributes": skipped_attributes,
+            "size": os.path.getsize(path)
+        }
+    
+    @classmethod
+    def restore(cls, path: str) -> "AgentSystem":
+        """
+        Restore a system from a snapshot written by snapshot().
+        
+        The snapshot is memory-mapped and agents are only rebuilt the first time
+        they are accessed, so the system is ready without decoding every record.
+        
+        Args:
+            path: Path of the snapshot file
+            
+        Returns:
+            Restored AgentSystem
+        """
+        system = cls.__new__(cls)
+        system._setup_logging()
+        system.logger.info(f"Restoring HunterXJobs Agent System from {path}")
+        
+        reader = SnapshotReader(path)
+        system._snapshot_reader = reader
+        system.config = reader.read_record("config")
+        system.agent_factory = AgentFactory()
+        system.knowledge_backend = create_knowledge_backend(system.config.get("cache"))
+        system.agents = LazyAgentMap(reader, reader.metadata["agents"], system._load_snapshot_agent)
+        system.message_queue = LazyRecordList(reader, "message_queue")
+        
+        # Security monitoring threads are not part of the snapshot
+        if "security" in system.agents:
+            system.agents["security"].start_security_monitoring()
+            system.logger.info("Security monitoring started")
+        
+        system.logger.info("HunterXJobs Agent System restored successfully")
+        return system
+    
+    def _load_snapshot_agent(self, reader: SnapshotReader, class_path: str, record_name: str,
+                             lazy_attributes: Dict[str, str]) -> Any:
+        """
+        Rebuild an agent from its snapshot record.
+        
+        Args:
+            reader: Snapshot reader
+            class_path: Dotted path of the agent class
+            record_name: Name of the agent record
+            lazy_attributes: Attribute name -> record name for lists decoded on first use
+            
+        Returns:
+            Restored agent
+        """
+        agent_class = resolve_class(class_path)
+        state = reader.read_record(record_name)
+        
+        # Construct normally so attributes missing from the snapshot get fresh defaults
+        agent = agent_class(name=state["name"])
+        agent.__dict__.update(state)
+        for name, lazy_record in lazy_attributes.items():
+            setattr(agent, name, LazyRecordList(reader, lazy_record))
+        
+        if self.knowledge_backend is not None:
+            agent.set_knowledge_backend(self.knowledge_backend)
+        agent.after_restore()
+        
+        self.logger.debug(f"Agent {agent.name} restored from snapshot")
+        return agent
     
     def start(self) -> None:
         """
@@ -231,8 +378,30 @@ class AgentSystem:
             self.send_message(shutdown_message)
         
         self.logger.info("Shutdown messages sent to all agents")
+        
+        self._release_snapshot()
         self.logger.info("HunterXJobs Agent System stopped successfully")
     
+    def _release_snapshot(self) -> None:
+        """
+        Close the snapshot a restored system was loaded from.
+        Anything still backed by the snapshot is decoded first, so the system stays usable.
+        """
+        reader = getattr(self, "_snapshot_reader", None)
+        if reader is None:
+            return
+        
+        lists = [self.message_queue] + [
+            value for agent in self.agents.values() for value in vars(agent).values()
+        ]
+        for value in lists:
+            if isinstance(value, LazyRecordList):
+                value.items
+        
+        reader.close()
+        self._snapshot_reader = None
+        self.logger.info("Snapshot file released")
+    
     def _setup_agent_communication(self) -> None:
         """
         Set up communication channels between agents.
@@ -440,4 +609,66 @@ class AgentSystem:
                 
                 # Handle response if needed
                 if response:
-               <response clipped><NOTE>To save on context only part of this file has been shown to you. You should retry this tool after you have searched inside the file with `grep -n` in order to find the line numbers of what you are looking for.</NOTE>
\ No newline at end of file
+                    self.logger.debug(f"Response from {receiver}: {response.get('message_type')}")
+                    
+                    # Route responses addressed to the system
+                    if response.get("receiver") == "system":
+                        self._handle_system_message(response)
+            except Exception as e:
+                self.logger.error(f"Error delivering message to {receiver}: {str(e)}")
+    
+    def _handle_system_message(self, message: Dict[str, Any]) -> None:
+        """
+        Handle a message addressed to the system.
+        
+        Args:
+            message: Message to handle
+        """
+        action = message.get("content", {}).get("action", "")
+        self.logger.info(f"System message received from {message.get('sender')}: {action}")
+    
+    def _generate_message_id(self) -> str:
+        """
+        Generate a unique message ID.
+        
+        Returns:
+            Message ID
+        """
+        return f"msg_{uuid.uuid4().hex}"
+    
+    def get_agent(self, agent_id: str) -> Optional[Any]:
+        """
+        Get an agent by ID.
+        
+        Args:
+            agent_id: ID of the agent
+            
+        Returns:
+            Agent instance or None if not found
+        """
+        return self.agents.get(agent_id)
+    
+    def get_all_agents(self) -> Dict[str, Any]:
+        """
+        Get all agents in the system.
+        
+        Returns:
+            Dictionary of agent IDs and agent instances
+        """
+        return self.agents
+    
+    def get_system_status(self) -> Dict[str, Any]:
+        """
+        Get the current status of the agent system.
+        
+        Returns:
+            Dictionary containing system status information
+        """
+        return {
+            "system_status": "running" if self.agents else "stopped",
+            "agent_statuses": {
+                agent_id: agent.get_state() for agent_id, agent in self.agents.items()
+            },
+            "message_queue_size": len(self.message_queue),
+            "generated_at": datetime.now().isoformat()
+        }
@@ -4,5 +4,10 @@
 from .base_agent import BaseAgent
 from .communication import AgentCommunication
 from .agent_factory import AgentFactory
+from .decision_scorer import DecisionScorer
+from .knowledge_base import KnowledgeBase, SQLiteKnowledgeBackend, RedisKnowledgeBackend, create_knowledge_backend
 
-__all__ = ['BaseAgent', 'AgentCommunication', 'AgentFactory']
+__all__ = [
+    'BaseAgent', 'AgentCommunication', 'AgentFactory', 'DecisionScorer',
+    'KnowledgeBase', 'SQLiteKnowledgeBackend', 'RedisKnowledgeBackend', 'create_knowledge_backend'
+]
@@ -5,7 +5,10 @@ import json
 import logging
 import uuid
 from datetime import datetime
-from typing import Dict, List, Optional, Any
+from typing import Dict, List, Optional, Any, Union
+
+from .decision_scorer import DecisionScorer
+from .knowledge_base import KnowledgeBase
 
 # Configure logging
 logging.basicConfig(
@@ -32,7 +35,7 @@ class BaseAgent:
         self.agent_type = agent_type
         self.created_at = datetime.now()
         self.state = "initialized"
-        self.knowledge_base = {}
+        self.knowledge_base = KnowledgeBase(namespace=name)
         self.tasks = []
         self.messages = []
         self.logger = logging.getLogger(f"agent.{agent_type}.{name}")
@@ -162,37 +165,59 @@ class BaseAgent:
             "state": self.state,
             "tasks": len(self.tasks),
             "pending_tasks": sum(1 for task in self.tasks if task["status"] == "pending"),
-            "messages": len(self.messages)
+            "messages": len(self.messages),
+            "knowledge_base": self.knowledge_base.get_stats()
         }
     
-    def update_knowledge(self, key: str, value: Any) -> None:
+    def update_knowledge(self, key: str, value: Any, ttl: Optional[float] = None,
+                         namespace: Optional[str] = None) -> None:
         """
         Update the agent's knowledge base.
         
         Args:
             key: Knowledge item key
             value: Knowledge item value
+            ttl: Optional time to live in seconds
+            namespace: Optional namespace (defaults to the agent's own namespace)
         """
-        self.knowledge_base[key] = value
-        self.logger.info(f"Knowledge base updated: {key}")
+        self.knowledge_base.set(key, value, ttl=ttl, namespace=namespace)
+        self.logger.debug(f"Knowledge base updated: {key}")
     
-    def get_knowledge(self, key: str) -> Any:
+    def get_knowledge(self, key: str, namespace: Optional[str] = None) -> Any:
         """
         Retrieve an item from the agent's knowledge base.
         
         Args:
             key: Knowledge item key
+            namespace: Optional namespace (defaults to the agent's own namespace)
             
         Returns:
             Knowledge item value or None if not found
         """
-        if key in self.knowledge_base:
-            return self.knowledge_base[key]
+        value = self.knowledge_base.get(key, namespace=namespace)
+        if value is None:
+            self.logger.debug(f"Knowledge item {key} not found")
+        return value
+    
+    def set_knowledge_backend(self, backend: Any) -> None:
+        """
+        Attach a shared backend so facts can be read by other agents or processes.
         
-        self.logger.warning(f"Knowledge item {key} not found")
-        return None
+        Args:
+            backend: Shared knowledge backend (see create_knowledge_backend)
+        """
+        self.knowledge_base.backend = backend
+        self.logger.info(f"Knowledge base backend set: {type(backend).__name__}")
+    
+    def after_restore(self) -> None:
+        """
+        Rebuild state that is not saved in snapshots, once the agent's attributes were restored.
+        Agents holding such state (compiled rules, shared references, ...) override this.
+        """
+        pass
     
-    def make_decision(self, options: List[Dict], criteria: Dict) -> Dict:
+    def make_decision(self, options: List[Dict], criteria: Dict,
+                      normalization: Union[None, str, Dict[str, Optional[str]]] = None) -> Dict:
         """
         Make a decision based on given options and criteria.
         This is a basic implementation that should be overridden by specialized agents.
@@ -200,6 +225,7 @@ class BaseAgent:
         Args:
             options: List of option dictionaries
             criteria: Dictionary of criteria and their weights
+            normalization: Optional per-criterion normalization ("minmax", "zscore", "max")
             
         Returns:
             The selected option
@@ -212,17 +238,46 @@ class BaseAgent:
         if not criteria:
             return options[0]
         
-        # Basic weighted scoring
-        scores = []
-        for option in options:
-            score = 0
-            for criterion, weight in criteria.items():
-                if criterion in option:
-                    score += option[criterion] * weight
-            scores.append(score)
-        
-        best_option_index = scores.index(max(scores))
-        return options[best_option_index]
+        # Weighted scoring (vectorized for large inputs)
+        return DecisionScorer(criteria, normalization).best(options)
+    
+    def rank_options(self, options: List[Dict], criteria: Dict, k: Optional[int] = None,
+                     normalization: Union[None, str, Dict[str, Optional[str]]] = None) -> List[Dict]:
+        """
+        Rank options by weighted score and return the best k of them.
+        
+        Args:
+            options: List of option dictionaries
+            criteria: Dictionary of criteria and their weights
+            k: Number of options to return (all options if not provided)
+            normalization: Optional per-criterion normalization ("minmax", "zscore", "max")
+            
+        Returns:
+            List of options, best first
+        """
+        k = len(options) if k is None else k
+        if not criteria:
+            return options[:k]
+        
+        return DecisionScorer(criteria, normalization).top_k(options, k)
+    
+    def make_decisions(self, option_sets: List[List[Dict]], criteria: Dict,
+                       normalization: Union[None, str, Dict[str, Optional[str]]] = None) -> List[Dict]:
+        """
+        Make one decision per option set, scoring all sets in a single batch.
+        
+        Args:
+            option_sets: List of option lists
+            criteria: Dictionary of criteria and their weights
+            normalization: Optional per-criterion normalization ("minmax", "zscore", "max")
+            
+        Returns:
+            List of selected options, one per option set
+        """
+        if not criteria:
+            return [options[0] if options else {} for options in option_sets]
+        
+        return DecisionScorer(criteria, normalization).best_batch(option_sets)
     
     def __str__(self) -> str:
         """String representation of the agent."""
@@ -0,0 +1,282 @@
+# Decision Scorer Module
+# This file defines the multi-criteria scorer used by agents to rank options
+
+import heapq
+import math
+from typing import Dict, List, Optional, Union
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - numpy is optional
+    np = None
+
+# Below this many option x criterion cells the plain Python scorer is faster
+VECTORIZE_THRESHOLD = 256
+
+NORMALIZATIONS = (None, "minmax", "zscore", "max")
+
+
+class DecisionScorer:
+    """
+    Weighted multi-criteria scorer.
+    Builds an options x criteria matrix once and scores it with NumPy when
+    available, falling back to plain Python for small inputs.
+    """
+    
+    def __init__(self, criteria: Dict[str, float],
+                 normalization: Union[None, str, Dict[str, Optional[str]]] = None,
+                 vectorize_threshold: int = VECTORIZE_THRESHOLD):
+        """
+        Initialize the scorer.
+        
+        Args:
+            criteria: Dictionary of criteria and their weights
+            normalization: Normalization applied to each criterion before weighting
+                (None, "minmax", "zscore" or "max"), either one method for all
+                criteria or a dictionary of criterion -> method
+            vectorize_threshold: Minimum number of matrix cells for the NumPy path
+        """
+        self.criteria = list(criteria)
+        self.weights = [criteria[criterion] for criterion in self.criteria]
+        self.vectorize_threshold = vectorize_threshold
+        
+        if isinstance(normalization, dict):
+            self.normalization = [normalization.get(criterion) for criterion in self.criteria]
+        else:
+            self.normalization = [normalization] * len(self.criteria)
+        
+        for method in self.normalization:
+            if method not in NORMALIZATIONS:
+                raise ValueError(f"Unknown normalization method: {method}")
+        
+        self._needs_normalization = any(self.normalization)
+    
+    def _use_numpy(self, cells: int) -> bool:
+        """Check whether the vectorized path should be used."""
+        return np is not None and cells >= self.vectorize_threshold
+    
+    def _build_matrix(self, options: List[Dict]) -> "np.ndarray":
+        """
+        Build the options x criteria matrix (NaN where an option lacks a criterion).
+        
+        Args:
+            options: List of option dictionaries
+        
+        Returns:
+            Float matrix of criterion values
+        """
+        nan = math.nan
+        criteria = self.criteria
+        return np.array(
+            [[option.get(criterion, nan) for criterion in criteria] for option in options],
+            dtype=float
+        ).reshape(len(options), len(criteria))
+    
+    def _normalize_matrix(self, matrix: "np.ndarray") -> "np.ndarray":
+        """
+        Normalize each criterion column in place, ignoring missing values.
+        
+        Args:
+            matrix: Float matrix of criterion values
+        
+        Returns:
+            The normalized matrix
+        """
+        for column, method in enumerate(self.normalization):
+            if not method:
+                continue
+            
+            values = matrix[:, column]
+            present = ~np.isnan(values)
+            if not present.any():
+                continue
+            
+            observed = values[present]
+            if method == "minmax":
+                low, high = observed.min(), observed.max()
+                span = high - low
+                values[present] = (observed - low) / span if span else 0.0
+            elif method == "zscore":
+                std = observed.std()
+                values[present] = (observed - observed.mean()) / std if std else 0.0
+            elif method == "max":
+                peak = np.abs(observed).max()
+                values[present] = observed / peak if peak else 0.0
+        
+        return matrix
+    
+    def _normalize_columns(self, options: List[Dict]) -> List[Dict[str, float]]:
+        """
+        Plain Python counterpart of _normalize_matrix.
+        
+        Args:
+            options: List of option dictionaries
+        
+        Returns:
+            List of dictionaries with normalized criterion values
+        """
+        normalized = [
+            {criterion: option[criterion] for criterion in self.criteria if criterion in option}
+            for option in options
+        ]
+        
+        for criterion, method in zip(self.criteria, self.normalization):
+            if not method:
+                continue
+            
+            observed = [row[criterion] for row in normalized if criterion in row]
+            if not observed:
+                continue
+            
+            if method == "minmax":
+                low = min(observed)
+                span = max(observed) - low
+                transform = (lambda v: (v - low) / span) if span else (lambda v: 0.0)
+            elif method == "zscore":
+                mean = sum(observed) / len(observed)
+                std = math.sqrt(sum((v - mean) ** 2 for v in observed) / len(observed))
+                transform = (lambda v: (v - mean) / std) if std else (lambda v: 0.0)
+            else:
+                peak = max(abs(v) for v in observed)
+                transform = (lambda v: v / peak) if peak else (lambda v: 0.0)
+            
+            for row in normalized:
+                if criterion in row:
+                    row[criterion] = transform(row[criterion])
+        
+        return normalized
+    
+    def score(self, options: List[Dict]) -> List[float]:
+        """
+        Compute the weighted score of every option.
+        Criteria missing from an option contribute nothing to its score.
+        
+        Args:
+            options: List of option dictionaries
+        
+        Returns:
+            List of scores, one per option
+        """
+        if not options:
+            return []
+        
+        if self._use_numpy(len(options) * len(self.criteria)):
+            return self._score_matrix(self._build_matrix(options)).tolist()
+        
+        rows = self._normalize_columns(options) if self._needs_normalization else options
+        scores = []
+        for row in rows:
+            score = 0
+            for criterion, weight in zip(self.criteria, self.weights):
+                if criterion in row:
+                    score += row[criterion] * weight
+            scores.append(score)
+        
+        return scores
+    
+    def _score_matrix(self, matrix: "np.ndarray") -> "np.ndarray":
+        """
+        Score an options x criteria matrix.
+        
+        Args:
+            matrix: Float matrix of criterion values
+        
+        Returns:
+            Vector of scores
+        """
+        if self._needs_normalization:
+            matrix = self._normalize_matrix(matrix)
+        
+        return np.nan_to_num(matrix, nan=0.0) @ np.asarray(self.weights, dtype=float)
+    
+    def best(self, options: List[Dict]) -> Dict:
+        """
+        Select the highest scoring option (the first one on ties).
+        
+        Args:
+            options: List of option dictionaries
+        
+        Returns:
+            The selected option, or an empty dictionary if there are no options
+        """
+        if not options:
+            return {}
+        
+        if self._use_numpy(len(options) * len(self.criteria)):
+            return options[int(np.argmax(self._score_matrix(self._build_matrix(options))))]
+        
+        scores = self.score(options)
+        return options[scores.index(max(scores))]
+    
+    def top_k(self, options: List[Dict], k: int) -> List[Dict]:
+        """
+        Select the k highest scoring options, best first (earlier options win ties).
+        
+        Args:
+            options: List of option dictionaries
+            k: Number of options to return
+        
+        Returns:
+            List of selected options
+        """
+        if not options or k <= 0:
+            return []
+        
+        k = min(k, len(options))
+        
+        if self._use_numpy(len(options) * len(self.criteria)):
+            scores = self._score_matrix(self._build_matrix(options))
+            if k < len(options):
+                # Take everything scoring at least the k-th best so ties can be ordered by index
+                threshold = scores[np.argpartition(-scores, k - 1)[k - 1]]
+                candidates = np.flatnonzero(scores >= threshold)
+            else:
+                candidates = np.arange(len(options))
+            order = candidates[np.lexsort((candidates, -scores[candidates]))][:k]
+            return [options[i] for i in order]
+        
+        scores = self.score(options)
+        return [options[i] for i in heapq.nlargest(k, range(len(options)), key=scores.__getitem__)]
+    
+    def score_batch(self, option_sets: List[List[Dict]]) -> List[List[float]]:
+        """
+        Score many option sets at once.
+        Normalization is applied within each option set.
+        
+        Args:
+            option_sets: List of option lists
+        
+        Returns:
+            List of score lists, one per option set
+        """
+        total = sum(len(options) for options in option_sets)
+        
+        if not self._use_numpy(total * len(self.criteria)):
+            return [self.score(options) for options in option_sets]
+        
+        if self._needs_normalization:
+            return [
+                self._score_matrix(self._build_matrix(options)).tolist() if options else []
+                for options in option_sets
+            ]
+        
+        # Without normalization a single matrix covers every set
+        flat = [option for options in option_sets for option in options]
+        scores = self._score_matrix(self._build_matrix(flat))
+        offsets = np.cumsum([len(options) for options in option_sets])[:-1]
+        return [chunk.tolist() for chunk in np.split(scores, offsets)]
+    
+    def best_batch(self, option_sets: List[List[Dict]]) -> List[Dict]:
+        """
+        Select the highest scoring option of every option set.
+        
+        Args:
+            option_sets: List of option lists
+        
+        Returns:
+            List of selected options (an empty dictionary for empty sets)
+        """
+        results = []
+        for options, scores in zip(option_sets, self.score_batch(option_sets)):
+            results.append(options[scores.index(max(scores))] if options else {})
+        return results
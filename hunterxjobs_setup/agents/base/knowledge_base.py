@@ -0,0 +1,665 @@
+# Knowledge Base Module
+# This file defines the bounded knowledge base used by agents and its optional shared backends
+
+import json
+import logging
+import sqlite3
+import sys
+import threading
+import time
+from collections import OrderedDict
+from datetime import date, datetime
+from typing import Dict, List, Any, Optional, Tuple
+
+try:
+    import redis
+except ImportError:  # pragma: no cover - redis is optional
+    redis = None
+
+logger = logging.getLogger("knowledge_base")
+
+_MISSING = object()
+
+# Key marking a JSON object that encodes a value JSON has no type for (tuple, set, datetime, ...)
+_TYPE_KEY = "__type__"
+
+
+def _to_json(value: Any) -> Any:
+    """
+    Convert a value to plain JSON data that decodes back to the same types.
+    
+    Args:
+        value: Value built from None, bool, int, float, str, list, tuple, set, frozenset, dict,
+            datetime and date
+    
+    Returns:
+        JSON-compatible value
+    
+    Raises:
+        TypeError: If the value contains any other type
+    """
+    value_type = type(value)
+    if value is None or value_type in (bool, int, float, str):
+        return value
+    if value_type is list:
+        return [_to_json(item) for item in value]
+    if value_type is dict:
+        if _TYPE_KEY not in value and all(type(key) is str for key in value):
+            return {key: _to_json(item) for key, item in value.items()}
+        return {_TYPE_KEY: "dict", "items": [[_to_json(key), _to_json(item)] for key, item in value.items()]}
+    if value_type in (tuple, set, frozenset):
+        return {_TYPE_KEY: value_type.__name__, "items": [_to_json(item) for item in value]}
+    if value_type in (datetime, date):
+        return {_TYPE_KEY: value_type.__name__, "value": value.isoformat()}
+    raise TypeError(f"Cannot store a value of type {value_type.__name__} in a shared backend")
+
+
+def _from_json(data: Any) -> Any:
+    """
+    Rebuild a value converted by _to_json.
+    
+    Args:
+        data: Decoded JSON data
+    
+    Returns:
+        The original value
+    
+    Raises:
+        ValueError: If the data holds an unknown type marker
+    """
+    if type(data) is list:
+        return [_from_json(item) for item in data]
+    if type(data) is not dict:
+        return data
+    
+    value_type = data.get(_TYPE_KEY)
+    if value_type is None:
+        return {key: _from_json(item) for key, item in data.items()}
+    if value_type == "dict":
+        return {_from_json(key): _from_json(item) for key, item in data["items"]}
+    if value_type in ("tuple", "set", "frozenset"):
+        return {"tuple": tuple, "set": set, "frozenset": frozenset}[value_type](
+            _from_json(item) for item in data["items"]
+        )
+    if value_type == "datetime":
+        return datetime.fromisoformat(data["value"])
+    if value_type == "date":
+        return date.fromisoformat(data["value"])
+    raise ValueError(f"Unknown value type in knowledge data: {value_type}")
+
+
+class SQLiteKnowledgeBackend:
+    """
+    Shared knowledge backend stored in a local SQLite database.
+    Several agents or processes can point at the same file to share facts.
+    """
+    
+    def __init__(self, path: str = "knowledge_base.db"):
+        """
+        Initialize the SQLite backend.
+        
+        Args:
+            path: Path to the SQLite database file
+        """
+        self.path = path
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(path, check_same_thread=False)
+        self._connection.execute(
+            "CREATE TABLE IF NOT EXISTS knowledge ("
+            "namespace TEXT NOT NULL, "
+            "key TEXT NOT NULL, "
+            "value TEXT NOT NULL, "
+            "expires_at REAL, "
+            "PRIMARY KEY (namespace, key))"
+        )
+        self._connection.commit()
+    
+    def get(self, namespace: str, key: str) -> Optional[str]:
+        """
+        Get a serialized value from the backend.
+        
+        Args:
+            namespace: Knowledge namespace
+            key: Knowledge item key
+        
+        Returns:
+            Serialized value or None if not found or expired
+        """
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT value, expires_at FROM knowledge WHERE namespace = ? AND key = ?",
+                (namespace, key)
+            ).fetchone()
+            
+            if row is None:
+                return None
+            
+            value, expires_at = row
+            if expires_at is not None and expires_at <= time.time():
+                self._connection.execute(
+                    "DELETE FROM knowledge WHERE namespace = ? AND key = ?", (namespace, key)
+                )
+                self._connection.commit()
+                return None
+            
+            return value
+    
+    def set(self, namespace: str, key: str, value: str, ttl: Optional[float] = None) -> None:
+        """
+        Store a serialized value in the backend.
+        
+        Args:
+            namespace: Knowledge namespace
+            key: Knowledge item key
+            value: Serialized value
+            ttl: Optional time to live in seconds
+        """
+        expires_at = time.time() + ttl if ttl else None
+        with self._lock:
+            self._connection.execute(
+                "INSERT OR REPLACE INTO knowledge (namespace, key, value, expires_at) VALUES (?, ?, ?, ?)",
+                (namespace, key, value, expires_at)
+            )
+            self._connection.commit()
+    
+    def delete(self, namespace: str, key: str) -> None:
+        """
+        Delete a value from the backend.
+        
+        Args:
+            namespace: Knowledge namespace
+            key: Knowledge item key
+        """
+        with self._lock:
+            self._connection.execute(
+                "DELETE FROM knowledge WHERE namespace = ? AND key = ?", (namespace, key)
+            )
+            self._connection.commit()
+    
+    def clear(self, namespace: str) -> None:
+        """
+        Delete all values in a namespace.
+        
+        Args:
+            namespace: Knowledge namespace
+        """
+        with self._lock:
+            self._connection.execute("DELETE FROM knowledge WHERE namespace = ?", (namespace,))
+            self._connection.commit()
+    
+    def close(self) -> None:
+        """Close the database connection."""
+        with self._lock:
+            self._connection.close()
+
+
+class RedisKnowledgeBackend:
+    """
+    Shared knowledge backend stored in Redis.
+    Any client implementing get/set/delete/scan_iter with the redis-py
+    signatures can be passed in, which allows a local stand-in for testing.
+    """
+    
+    def __init__(self, host: str = "localhost", port: int = 6379, db: int = 0,
+                 prefix: str = "hunterxjobs:knowledge", client: Any = None):
+        """
+        Initialize the Redis backend.
+        
+        Args:
+            host: Redis host
+            port: Redis port
+            db: Redis database number
+            prefix: Prefix for all knowledge keys
+            client: Optional pre-configured Redis client
+        """
+        if client is None:
+            if redis is None:
+                raise ImportError("The redis package is required for the Redis knowledge backend")
+            client = redis.Redis(host=host, port=port, db=db, decode_responses=True)
+        
+        self.client = client
+        self.prefix = prefix
+    
+    def _redis_key(self, namespace: str, key: str) -> str:
+        """Build the Redis key for a namespaced knowledge item."""
+        return f"{self.prefix}:{namespace}:{key}"
+    
+    def get(self, namespace: str, key: str) -> Optional[str]:
+        """
+        Get a serialized value from the backend.
+        
+        Args:
+            namespace: Knowledge namespace
+            key: Knowledge item key
+        
+        Returns:
+            Serialized value or None if not found or expired
+        """
+        value = self.client.get(self._redis_key(namespace, key))
+        if isinstance(value, bytes):
+            value = value.decode("utf-8")
+        return value
+    
+    def set(self, namespace: str, key: str, value: str, ttl: Optional[float] = None) -> None:
+        """
+        Store a serialized value in the backend.
+        
+        Args:
+            namespace: Knowledge namespace
+            key: Knowledge item key
+            value: Serialized value
+            ttl: Optional time to live in seconds
+        """
+        if ttl:
+            self.client.set(self._redis_key(namespace, key), value, px=int(ttl * 1000))
+        else:
+            self.client.set(self._redis_key(namespace, key), value)
+    
+    def delete(self, namespace: str, key: str) -> None:
+        """
+        Delete a value from the backend.
+        
+        Args:
+            namespace: Knowledge namespace
+            key: Knowledge item key
+        """
+        self.client.delete(self._redis_key(namespace, key))
+    
+    def clear(self, namespace: str) -> None:
+        """
+        Delete all values in a namespace.
+        
+        Args:
+            namespace: Knowledge namespace
+        """
+        for redis_key in self.client.scan_iter(match=f"{self.prefix}:{namespace}:*"):
+            self.client.delete(redis_key)
+    
+    def close(self) -> None:
+        """Close the Redis connection."""
+        close = getattr(self.client, "close", None)
+        if close:
+            close()
+
+
+def create_knowledge_backend(cache_config: Optional[Dict[str, Any]]) -> Any:
+    """
+    Create a shared knowledge backend from the ``cache`` section of the configuration.
+    
+    Args:
+        cache_config: Cache configuration (type, host, port, path, ...)
+    
+    Returns:
+        Backend instance, or None if no shared backend is configured or available
+    """
+    if not cache_config:
+        return None
+    
+    backend_type = cache_config.get("type")
+    
+    try:
+        if backend_type == "sqlite":
+            return SQLiteKnowledgeBackend(cache_config.get("path", "knowledge_base.db"))
+        
+        if backend_type == "redis":
+            backend = RedisKnowledgeBackend(
+                host=cache_config.get("host", "localhost"),
+                port=cache_config.get("port", 6379),
+                db=cache_config.get("db", 0),
+                prefix=cache_config.get("prefix", "hunterxjobs:knowledge")
+            )
+            backend.client.ping()
+            return backend
+    except Exception as e:
+        logger.warning(f"Shared knowledge backend '{backend_type}' unavailable: {str(e)}")
+        return None
+    
+    if backend_type:
+        logger.warning(f"Unknown knowledge backend type: {backend_type}")
+    return None
+
+
+class KnowledgeBase:
+    """
+    Bounded knowledge store with LRU and TTL eviction, namespaces and hit/miss counters.
+    An optional shared backend is used as a write-through, read-through second level.
+    While a backend is attached, local copies are only trusted for backend_ttl seconds,
+    so updates made by other agents or processes are seen once that time has passed.
+    Values are stored in the backend as JSON that keeps tuples, sets, non-string dict
+    keys and datetimes, so they come back with the same types either way.
+    """
+    
+    def __init__(self, max_bytes: int = 16 * 1024 * 1024, max_items: Optional[int] = None,
+                 default_ttl: Optional[float] = None, namespace: str = "default",
+                 backend: Any = None, backend_ttl: float = 1.0):
+        """
+        Initialize the knowledge base.
+        
+        Args:
+            max_bytes: Memory budget for locally cached values (estimated)
+            max_items: Optional maximum number of locally cached items
+            default_ttl: Optional default time to live in seconds
+            namespace: Default namespace for keys
+            backend: Optional shared backend (see create_knowledge_backend)
+            backend_ttl: Seconds a local copy of a shared item is used before the backend is read again
+        """
+        self.max_bytes = max_bytes
+        self.max_items = max_items
+        self.default_ttl = default_ttl
+        self.namespace = namespace
+        self.backend = backend
+        self.backend_ttl = backend_ttl
+        
+        # (namespace, key) -> (value, size, expires_at)
+        self._entries = OrderedDict()
+        self._lock = threading.RLock()
+        self.current_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+    
+    @staticmethod
+    def _serialize(value: Any) -> str:
+        """Serialize a value for size estimation and backend storage."""
+        return json.dumps(_to_json(value))
+    
+    @staticmethod
+    def _deserialize(serialized: str) -> Any:
+        """Rebuild a value serialized by _serialize."""
+        return _from_json(json.loads(serialized))
+    
+    def _estimate_size(self, value: Any) -> Tuple[int, Optional[str]]:
+        """
+        Estimate the memory footprint of a value.
+        
+        Returns:
+            Tuple of (estimated size in bytes, serialized value or None)
+        """
+        try:
+            serialized = self._serialize(value)
+            return len(serialized), serialized
+        except (TypeError, ValueError, RecursionError):
+            return sys.getsizeof(value), None
+    
+    def _local_expiry(self, ttl: Optional[float]) -> Optional[float]:
+        """
+        Get the local expiry time of an entry.
+        
+        Args:
+            ttl: Time to live of the item, or None if it does not expire
+        
+        Returns:
+            Monotonic expiry time, capped at backend_ttl while a backend is attached, or None
+        """
+        ttl = ttl or None
+        if self.backend is not None:
+            ttl = self.backend_ttl if ttl is None else min(ttl, self.backend_ttl)
+        return time.monotonic() + ttl if ttl is not None else None
+    
+    def _remove(self, entry_key: Tuple[str, str]) -> None:
+        """Remove an entry from the local cache."""
+        _, size, _ = self._entries.pop(entry_key)
+        self.current_bytes -= size
+    
+    def _evict(self) -> None:
+        """Evict least recently used entries until the cache is within budget."""
+        while self._entries and (
+            self.current_bytes > self.max_bytes or
+            (self.max_items is not None and len(self._entries) > self.max_items)
+        ):
+            entry_key = next(iter(self._entries))
+            self._remove(entry_key)
+            self.evictions += 1
+    
+    def set(self, key: str, value: Any, ttl: Optional[float] = None,
+            namespace: Optional[str] = None) -> None:
+        """
+        Store a knowledge item.
+        
+        Args:
+            key: Knowledge item key
+            value: Knowledge item value
+            ttl: Optional time to live in seconds (defaults to default_ttl)
+            namespace: Optional namespace (defaults to the knowledge base namespace)
+        
+        Raises:
+            ValueError: If a backend is attached and the value cannot be serialized
+        """
+        namespace = namespace or self.namespace
+        ttl = ttl if ttl is not None else self.default_ttl
+        expires_at = self._local_expiry(ttl)
+        size, serialized = self._estimate_size(value)
+        entry_key = (namespace, key)
+        
+        if self.backend is not None and serialized is None:
+            raise ValueError(f"Knowledge item {namespace}:{key} cannot be stored in the shared backend: "
+                             f"unsupported value of type {type(value).__name__}")
+        
+        with self._lock:
+            if entry_key in self._entries:
+                self._remove(entry_key)
+            
+            if size <= self.max_bytes:
+                self._entries[entry_key] = (value, size, expires_at)
+                self.current_bytes += size
+                self._evict()
+        
+        if self.backend is not None and serialized is not None:
+            try:
+                self.backend.set(namespace, key, serialized, ttl)
+            except Exception as e:
+                logger.warning(f"Error writing knowledge item {namespace}:{key} to backend: {str(e)}")
+    
+    def get(self, key: str, default: Any = None, namespace: Optional[str] = None) -> Any:
+        """
+        Retrieve a knowledge item.
+        
+        Args:
+            key: Knowledge item key
+            default: Value returned if the item is not found
+            namespace: Optional namespace (defaults to the knowledge base namespace)
+        
+        Returns:
+            Knowledge item value or default if not found
+        """
+        namespace = namespace or self.namespace
+        entry_key = (namespace, key)
+        
+        with self._lock:
+            entry = self._entries.get(entry_key)
+            if entry is not None:
+                value, _, expires_at = entry
+                if expires_at is None or expires_at > time.monotonic():
+                    self._entries.move_to_end(entry_key)
+                    self.hits += 1
+                    return value
+                
+                self._remove(entry_key)
+                self.expirations += 1
+        
+        if self.backend is not None:
+            try:
+                serialized = self.backend.get(namespace, key)
+            except Exception as e:
+                logger.warning(f"Error reading knowledge item {namespace}:{key} from backend: {str(e)}")
+                serialized = None
+            
+            if serialized is not None:
+                try:
+                    value = self._deserialize(serialized)
+                except (TypeError, ValueError, KeyError) as e:
+                    logger.warning(f"Ignoring unreadable knowledge item {namespace}:{key} in backend: {str(e)}")
+                    serialized = None
+            
+            if serialized is not None:
+                with self._lock:
+                    if entry_key not in self._entries and len(serialized) <= self.max_bytes:
+                        self._entries[entry_key] = (value, len(serialized), self._local_expiry(None))
+                        self.current_bytes += len(serialized)
+                        self._evict()
+                    self.hits += 1
+                return value
+        
+        with self._lock:
+            self.misses += 1
+        return default
+    
+    def delete(self, key: str, namespace: Optional[str] = None) -> bool:
+        """
+        Delete a knowledge item.
+        
+        Args:
+            key: Knowledge item key
+            namespace: Optional namespace (defaults to the knowledge base namespace)
+        
+        Returns:
+            Boolean indicating if the item was cached locally
+        """
+        namespace = namespace or self.namespace
+        entry_key = (namespace, key)
+        
+        with self._lock:
+            found = entry_key in self._entries
+            if found:
+                self._remove(entry_key)
+        
+        if self.backend is not None:
+            self.backend.delete(namespace, key)
+        
+        return found
+    
+    def clear(self, namespace: Optional[str] = None) -> None:
+        """
+        Remove all knowledge items in a namespace.
+        
+        Args:
+            namespace: Optional namespace (defaults to the knowledge base namespace)
+        """
+        namespace = namespace or self.namespace
+        
+        with self._lock:
+            for entry_key in [k for k in self._entries if k[0] == namespace]:
+                self._remove(entry_key)
+        
+        if self.backend is not None:
+            self.backend.clear(namespace)
+    
+    def keys(self, namespace: Optional[str] = None) -> List[str]:
+        """
+        Get the locally cached keys in a namespace.
+        
+        Args:
+            namespace: Optional namespace (defaults to the knowledge base namespace)
+        
+        Returns:
+            List of keys
+        """
+        namespace = namespace or self.namespace
+        with self._lock:
+            return [key for ns, key in self._entries if ns == namespace]
+    
+    def items(self, namespace: Optional[str] = None) -> List[Tuple[str, Any]]:
+        """
+        Get the locally cached items in a namespace without updating recency.
+        
+        Args:
+            namespace: Optional namespace (defaults to the knowledge base namespace)
+        
+        Returns:
+            List of (key, value) tuples
+        """
+        namespace = namespace or self.namespace
+        now = time.monotonic()
+        with self._lock:
+            return [
+                (key, value) for (ns, key), (value, _, expires_at) in self._entries.items()
+                if ns == namespace and (expires_at is None or expires_at > now)
+            ]
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get cache statistics.
+        
+        Returns:
+            Dictionary containing hit, miss and eviction counters and memory usage
+        """
+        lookups = self.hits + self.misses
+        return {
+            "items": len(self._entries),
+            "bytes": self.current_bytes,
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+            "shared_backend": type(self.backend).__name__ if self.backend is not None else None
+        }
+    
+    def __getstate__(self) -> Dict[str, Any]:
+        """
+        Get a serializable state (used by snapshots and pickling).
+        The shared backend is not included and must be attached again after restore.
+        """
+        now = time.monotonic()
+        with self._lock:
+            entries = [
+                [namespace, key, value, size, expires_at - now if expires_at is not None else None]
+                for (namespace, key), (value, size, expires_at) in self._entries.items()
+            ]
+        
+        return {
+            "max_bytes": self.max_bytes,
+            "max_items": self.max_items,
+            "default_ttl": self.default_ttl,
+            "namespace": self.namespace,
+            "backend_ttl": self.backend_ttl,
+            "entries": entries,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "expirations": self.expirations
+        }
+    
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        """Restore the state produced by __getstate__."""
+        self.__init__(
+            max_bytes=state["max_bytes"],
+            max_items=state["max_items"],
+            default_ttl=state["default_ttl"],
+            namespace=state["namespace"],
+            backend_ttl=state.get("backend_ttl", 1.0)
+        )
+        now = time.monotonic()
+        for namespace, key, value, size, remaining in state["entries"]:
+            if remaining is not None and remaining <= 0:
+                continue
+            self._entries[(namespace, key)] = (value, size, now + remaining if remaining is not None else None)
+            self.current_bytes += size
+        
+        self.hits = state["hits"]
+        self.misses = state["misses"]
+        self.evictions = state["evictions"]
+        self.expirations = state["expirations"]
+    
+    def __contains__(self, key: str) -> bool:
+        """Check if a key is cached locally in the default namespace and not expired."""
+        with self._lock:
+            entry = self._entries.get((self.namespace, key))
+            return entry is not None and (entry[2] is None or entry[2] > time.monotonic())
+    
+    def __getitem__(self, key: str) -> Any:
+        """Dictionary-style access to the default namespace."""
+        value = self.get(key, _MISSING)
+        if value is _MISSING:
+            raise KeyError(key)
+        return value
+    
+    def __setitem__(self, key: str, value: Any) -> None:
+        """Dictionary-style assignment in the default namespace."""
+        self.set(key, value)
+    
+    def __len__(self) -> int:
+        """Number of locally cached items."""
+        return len(self._entries)
@@ -0,0 +1,514 @@
+# Snapshot Module
+# This file defines the compact binary snapshot format used to save and restore agent state
+
+import importlib
+import mmap
+import os
+import struct
+import tempfile
+from collections.abc import MutableMapping, MutableSequence
+from datetime import datetime
+from typing import Dict, List, Any, Optional, Callable, Tuple
+
+# File layout:
+#   header   MAGIC | u64 index offset | u64 string table offset
+#   records  u64 length | encoded value            (one per agent, system state, ...)
+#   strings  u64 count | u64 offsets[count + 1] | utf-8 data
+#   index    u64 length | encoded value            (record offsets by name)
+MAGIC = b"HXJSNAP\x01"
+HEADER = struct.Struct("<8sQQ")
+
+_U32 = struct.Struct("<I")
+_U64 = struct.Struct("<Q")
+_I64 = struct.Struct("<q")
+_F64 = struct.Struct("<d")
+
+_NONE = 0
+_TRUE = 1
+_FALSE = 2
+_INT = 3
+_BIGINT = 4
+_FLOAT = 5
+_STR = 6
+_BYTES = 7
+_LIST = 8
+_TUPLE = 9
+_DICT = 10
+_SET = 11
+_DATETIME = 12
+_OBJECT = 13
+
+# Only classes from this package can be rebuilt from a snapshot
+ALLOWED_MODULE_PREFIX = "agents."
+
+
+class SnapshotError(Exception):
+    """Raised when a snapshot cannot be written or read."""
+
+
+class _Unencodable(Exception):
+    """Raised for values that have no snapshot encoding (loggers, locks, threads, ...)."""
+
+
+class SnapshotWriter:
+    """
+    Writes length-prefixed records to a snapshot file, interning every string
+    into a single string table written at the end.
+    """
+    
+    def __init__(self, path: str):
+        """
+        Initialize the writer.
+        
+        The snapshot is written to a temporary file next to path and renamed
+        into place by close(), so an existing snapshot is never left half written.
+        
+        Args:
+            path: Path of the snapshot file
+        """
+        self.path = path
+        directory = os.path.dirname(os.path.abspath(path))
+        fd, self._temp_path = tempfile.mkstemp(prefix=".snapshot-", dir=directory)
+        self._file = os.fdopen(fd, "wb")
+        self._file.write(HEADER.pack(MAGIC, 0, 0))
+        self._strings = {}
+        self._index = {}
+    
+    def _intern(self, value: str) -> int:
+        """Get the string table ID of a string, adding it if needed."""
+        string_id = self._strings.get(value)
+        if string_id is None:
+            string_id = len(self._strings)
+            self._strings[value] = string_id
+        return string_id
+    
+    def _encode(self, value: Any, out: bytearray) -> None:
+        """
+        Append the encoding of a value to a buffer.
+        
+        Args:
+            value: Value to encode
+            out: Output buffer
+        """
+        if value is None:
+            out += b"\x00"
+        elif value is True:
+            out += b"\x01"
+        elif value is False:
+            out += b"\x02"
+        elif isinstance(value, str):
+            out += b"\x06"
+            out += _U32.pack(self._intern(value))
+        elif isinstance(value, int):
+            if -(1 << 63) <= value < (1 << 63):
+                out += b"\x03"
+                out += _I64.pack(value)
+            else:
+                out += b"\x04"
+                out += _U32.pack(self._intern(str(value)))
+        elif isinstance(value, float):
+            out += b"\x05"
+            out += _F64.pack(value)
+        elif isinstance(value, dict):
+            out += b"\x0a"
+            out += _U32.pack(len(value))
+            for key, item in value.items():
+                self._encode(key, out)
+                self._encode(item, out)
+        elif isinstance(value, (list, tuple, set, frozenset)):
+            tag = b"\x08" if isinstance(value, list) else b"\x09" if isinstance(value, tuple) else b"\x0b"
+            out += tag
+            out += _U32.pack(len(value))
+            for item in value:
+                self._encode(item, out)
+        elif isinstance(value, datetime):
+            out += b"\x0c"
+            out += _U32.pack(self._intern(value.isoformat()))
+        elif isinstance(value, (bytes, bytearray)):
+            out += b"\x07"
+            out += _U32.pack(len(value))
+            out += value
+        else:
+            cls = type(value)
+            if not cls.__module__.startswith(ALLOWED_MODULE_PREFIX):
+                raise _Unencodable(cls.__name__)
+            state = value.__getstate__() if hasattr(cls, "__getstate__") else vars(value)
+            if not isinstance(state, dict):
+                raise _Unencodable(cls.__name__)
+            out += b"\x0d"
+            out += _U32.pack(self._intern(f"{cls.__module__}.{cls.__qualname__}"))
+            self._encode(state, out)
+    
+    def write_state_record(self, name: str, state: Dict[str, Any]) -> List[str]:
+        """
+        Write an attribute dictionary as a named record, skipping attributes
+        that cannot be encoded (loggers, locks, threads, ...).
+        
+        Args:
+            name: Record name used in the index
+            state: Attribute dictionary (e.g. vars(agent))
+        
+        Returns:
+            Names of the skipped attributes
+        """
+        payload = bytearray(b"\x0a")
+        payload += _U32.pack(0)
+        count = 0
+        skipped = []
+        
+        for key, value in state.items():
+            encoded = bytearray()
+            try:
+                self._encode(key, encoded)
+                self._encode(value, encoded)
+            except _Unencodable:
+                skipped.append(key)
+                continue
+            payload += encoded
+            count += 1
+        
+        _U32.pack_into(payload, 1, count)
+        self._write_payload(name, payload)
+        return skipped
+    
+    def write_record(self, name: str, value: Any) -> int:
+        """
+        Write a named, length-prefixed record.
+        
+        Args:
+            name: Record name used in the index
+            value: Value to encode
+        
+        Returns:
+            Offset of the record in the file
+        """
+        payload = bytearray()
+        try:
+            self._encode(value, payload)
+        except _Unencodable as e:
+            raise SnapshotError(f"Cannot encode record {name}: unsupported type {e}")
+        
+        return self._write_payload(name, payload)
+    
+    def _write_payload(self, name: str, payload: bytearray) -> int:
+        """Write an encoded record and add it to the index."""
+        offset = self._file.tell()
+        self._file.write(_U64.pack(len(payload)))
+        self._file.write(payload)
+        self._index[name] = offset
+        return offset
+    
+    def close(self, metadata: Optional[Dict[str, Any]] = None) -> None:
+        """
+        Write the string table and index and move the snapshot into place.
+        
+        Args:
+            metadata: Optional extra values stored in the index
+        """
+        index = bytearray()
+        self._encode({"records": self._index, "metadata": metadata or {}}, index)
+        
+        strings_offset = self._file.tell()
+        encoded = [value.encode("utf-8", "surrogatepass") for value in self._strings]
+        offsets = [0]
+        for data in encoded:
+            offsets.append(offsets[-1] + len(data))
+        self._file.write(_U64.pack(len(encoded)))
+        self._file.write(struct.pack(f"<{len(offsets)}Q", *offsets))
+        self._file.write(b"".join(encoded))
+        
+        index_offset = self._file.tell()
+        self._file.write(_U64.pack(len(index)))
+        self._file.write(index)
+        
+        self._file.seek(0)
+        self._file.write(HEADER.pack(MAGIC, index_offset, strings_offset))
+        # Flush to disk before the rename, so a crash cannot leave a renamed but incomplete snapshot
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        self._file.close()
+        os.replace(self._temp_path, self.path)
+    
+    def abort(self) -> None:
+        """Discard a partially written snapshot."""
+        self._file.close()
+        if os.path.exists(self._temp_path):
+            os.remove(self._temp_path)
+
+
+class SnapshotReader:
+    """
+    Reads a snapshot through a memory map.
+    Records and strings are only decoded when they are accessed.
+    """
+    
+    def __init__(self, path: str):
+        """
+        Open a snapshot file.
+        
+        Args:
+            path: Path of the snapshot file
+        """
+        self.path = path
+        self._file = open(path, "rb")
+        try:
+            self._mmap = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            self._file.close()
+            raise SnapshotError(f"Snapshot is empty: {path}")
+        self._view = memoryview(self._mmap)
+        
+        magic, index_offset, strings_offset = HEADER.unpack_from(self._view, 0)
+        if magic != MAGIC or not index_offset:
+            self.close()
+            raise SnapshotError(f"Not a valid snapshot: {path}")
+        
+        count = _U64.unpack_from(self._view, strings_offset)[0]
+        offsets_start = strings_offset + 8
+        self._string_offsets = self._view[offsets_start:offsets_start + 8 * (count + 1)].cast("Q")
+        self._string_data = offsets_start + 8 * (count + 1)
+        self._strings = [None] * count
+        
+        index = self._read_at(index_offset)
+        self.records = index["records"]
+        self.metadata = index["metadata"]
+    
+    def _string(self, string_id: int) -> str:
+        """Decode a string from the string table (cached)."""
+        value = self._strings[string_id]
+        if value is None:
+            start = self._string_data + self._string_offsets[string_id]
+            end = self._string_data + self._string_offsets[string_id + 1]
+            value = str(self._view[start:end], "utf-8", "surrogatepass")
+            self._strings[string_id] = value
+        return value
+    
+    def _decode(self, position: int) -> Tuple[Any, int]:
+        """
+        Decode the value starting at a position.
+        
+        Args:
+            position: Offset into the snapshot
+        
+        Returns:
+            Tuple of (decoded value, offset after the value)
+        """
+        view = self._view
+        tag = view[position]
+        position += 1
+        
+        if tag == _STR:
+            return self._string(_U32.unpack_from(view, position)[0]), position + 4
+        if tag == _INT:
+            return _I64.unpack_from(view, position)[0], position + 8
+        if tag == _DICT:
+            count = _U32.unpack_from(view, position)[0]
+            position += 4
+            result = {}
+            for _ in range(count):
+                key, position = self._decode(position)
+                result[key], position = self._decode(position)
+            return result, position
+        if tag in (_LIST, _TUPLE, _SET):
+            count = _U32.unpack_from(view, position)[0]
+            position += 4
+            items = []
+            for _ in range(count):
+                item, position = self._decode(position)
+                items.append(item)
+            if tag == _TUPLE:
+                return tuple(items), position
+            if tag == _SET:
+                return set(items), position
+            return items, position
+        if tag == _NONE:
+            return None, position
+        if tag == _TRUE:
+            return True, position
+        if tag == _FALSE:
+            return False, position
+        if tag == _FLOAT:
+            return _F64.unpack_from(view, position)[0], position + 8
+        if tag == _BIGINT:
+            return int(self._string(_U32.unpack_from(view, position)[0])), position + 4
+        if tag == _BYTES:
+            length = _U32.unpack_from(view, position)[0]
+            position += 4
+            return bytes(view[position:position + length]), position + length
+        if tag == _DATETIME:
+            return datetime.fromisoformat(self._string(_U32.unpack_from(view, position)[0])), position + 4
+        if tag == _OBJECT:
+            class_path = self._string(_U32.unpack_from(view, position)[0])
+            state, position = self._decode(position + 4)
+            return rebuild_object(class_path, state), position
+        
+        raise SnapshotError(f"Unknown value tag {tag} at offset {position - 1}")
+    
+    def _read_at(self, offset: int) -> Any:
+        """Decode the length-prefixed record at an offset."""
+        return self._decode(offset + 8)[0]
+    
+    def read_record(self, name: str) -> Any:
+        """
+        Decode a named record.
+        
+        Args:
+            name: Record name
+        
+        Returns:
+            Decoded value
+        """
+        if name not in self.records:
+            raise KeyError(name)
+        return self._read_at(self.records[name])
+    
+    def close(self) -> None:
+        """Release the memory map and file handle."""
+        for view in (getattr(self, "_string_offsets", None), self._view):
+            if view is not None:
+                view.release()
+        self._mmap.close()
+        self._file.close()
+
+
+def resolve_class(class_path: str) -> type:
+    """
+    Import a class recorded in a snapshot.
+    
+    Args:
+        class_path: Dotted path of the class
+    
+    Returns:
+        The class
+    """
+    if not class_path.startswith(ALLOWED_MODULE_PREFIX):
+        raise SnapshotError(f"Refusing to load class outside the agents package: {class_path}")
+    
+    module_path, class_name = class_path.rsplit(".", 1)
+    return getattr(importlib.import_module(module_path), class_name)
+
+
+def rebuild_object(class_path: str, state: Dict[str, Any]) -> Any:
+    """
+    Rebuild an object from its snapshot state without calling __init__.
+    
+    Args:
+        class_path: Dotted path of the class
+        state: Object state
+    
+    Returns:
+        The rebuilt object
+    """
+    cls = resolve_class(class_path)
+    obj = cls.__new__(cls)
+    if hasattr(obj, "__setstate__"):
+        obj.__setstate__(state)
+    else:
+        obj.__dict__.update(state)
+    return obj
+
+
+class LazyAgentMap(MutableMapping):
+    """
+    Mapping of agent IDs to agents that rebuilds each agent from its snapshot
+    record the first time it is accessed.
+    """
+    
+    def __init__(self, reader: SnapshotReader, pending: Dict[str, List[Any]],
+                 loader: Callable[..., Any]):
+        """
+        Initialize the map.
+        
+        Args:
+            reader: Snapshot reader holding the agent records
+            pending: Agent ID -> record entry for agents not yet rebuilt
+            loader: Function rebuilding an agent, called as loader(reader, *entry)
+        """
+        self._reader = reader
+        self._pending = dict(pending)
+        self._loader = loader
+        self._loaded = {}
+        self._order = list(pending)
+    
+    def __getitem__(self, agent_id: str) -> Any:
+        if agent_id in self._loaded:
+            return self._loaded[agent_id]
+        if agent_id not in self._pending:
+            raise KeyError(agent_id)
+        
+        agent = self._loader(self._reader, *self._pending.pop(agent_id))
+        self._loaded[agent_id] = agent
+        return agent
+    
+    def __setitem__(self, agent_id: str, agent: Any) -> None:
+        self._pending.pop(agent_id, None)
+        if agent_id not in self._order:
+            self._order.append(agent_id)
+        self._loaded[agent_id] = agent
+    
+    def __delitem__(self, agent_id: str) -> None:
+        if agent_id not in self._loaded and agent_id not in self._pending:
+            raise KeyError(agent_id)
+        self._loaded.pop(agent_id, None)
+        self._pending.pop(agent_id, None)
+        self._order.remove(agent_id)
+    
+    def __contains__(self, agent_id: object) -> bool:
+        return agent_id in self._loaded or agent_id in self._pending
+    
+    def __iter__(self):
+        return iter(list(self._order))
+    
+    def __len__(self) -> int:
+        return len(self._order)
+    
+    def loaded_agents(self) -> List[str]:
+        """Get the IDs of agents that have already been rebuilt."""
+        return [agent_id for agent_id in self._order if agent_id in self._loaded]
+
+
+class LazyRecordList(MutableSequence):
+    """
+    List backed by a snapshot record, decoded on first access.
+    """
+    
+    def __init__(self, reader: SnapshotReader, record_name: str):
+        """
+        Initialize the list.
+        
+        Args:
+            reader: Snapshot reader holding the record
+            record_name: Name of the record holding the list
+        """
+        self._reader = reader
+        self._record_name = record_name
+        self._items = None
+    
+    @property
+    def items(self) -> list:
+        """The decoded list."""
+        if self._items is None:
+            self._items = list(self._reader.read_record(self._record_name))
+            self._reader = None
+        return self._items
+    
+    def __getitem__(self, index):
+        return self.items[index]
+    
+    def __setitem__(self, index, value) -> None:
+        self.items[index] = value
+    
+    def __delitem__(self, index) -> None:
+        del self.items[index]
+    
+    def __len__(self) -> int:
+        return len(self.items)
+    
+    def insert(self, index: int, value: Any) -> None:
+        self.items.insert(index, value)
+    
+    def __eq__(self, other: object) -> bool:
+        return self.items == (other.items if isinstance(other, LazyRecordList) else other)
+    
+    def __repr__(self) -> str:
+        return repr(self.items)
@@ -0,0 +1,460 @@
+# Debugger Benchmark Module
+# This file defines the synthetic source corpus and the throughput benchmark for the Debugger agent
+#
+# Usage:
+#   python -m agents.debugger.benchmark --sizes 1KB,100KB,1MB --save-baseline main
+#   python -m agents.debugger.benchmark --sizes 1KB,100KB,1MB --compare main
+
+import argparse
+import json
+import logging
+import os
+import platform
+import random
+import sys
+import tempfile
+from collections import namedtuple
+from datetime import datetime
+from time import perf_counter
+from typing import Dict, List, Any, Optional, Iterable, Tuple
+
+from .debugger_agent import DebuggerAgent
+from .profiling import RuleProfile
+
+LANGUAGE_EXTENSIONS = {"python": ".py", "javascript": ".js", "typescript": ".ts"}
+
+KB = 1024
+MB = 1024 * KB
+DEFAULT_SIZES = (1 * KB, 10 * KB, 100 * KB, 1 * MB, 10 * MB)
+
+# Fraction of body lines that carry each injected issue
+DEFAULT_DENSITIES = {
+    "bracket_errors": 0.0,
+    "long_lines": 0.02,
+    "credentials": 0.005,
+    "unused_imports": 0.01
+}
+
+DEFAULT_BASELINE_FILE = "debugger_benchmark_baselines.json"
+
+# A generated file and the number of issues injected into it, per kind
+CorpusFile = namedtuple("CorpusFile", ["path", "language", "size", "injected"])
+
+
+def _python_block(index: int, rng: random.Random, injections: List[str]) -> List[str]:
+    """Build a Python function with the injected statements before its return."""
+    lines = [
+        f"def function_{index}(value, items):",
+        f'    """Return the weighted total of items for case {index}."""',
+        f"    total = value * {rng.randint(1, 99)}",
+        "    for item in items:",
+        f"        total += len(item) + {rng.randint(1, 99)}"
+    ]
+    lines.extend("    " + statement for statement in injections)
+    lines.append('    return json.dumps({"total": total, "separator": os.sep})')
+    return lines
+
+
+def _javascript_block(index: int, rng: random.Random, injections: List[str], typed: bool) -> List[str]:
+    """Build a JavaScript or TypeScript function with the injected statements before its return."""
+    if typed:
+        signature = f"function function{index}(value: number, items: string[]): string {{"
+        declaration = f"  let total: number = value * {rng.randint(1, 99)};"
+    else:
+        signature = f"function function{index}(value, items) {{"
+        declaration = f"  let total = value * {rng.randint(1, 99)};"
+    lines = [
+        signature,
+        declaration,
+        "  for (const item of items) {",
+        f"    total += item.length + {rng.randint(1, 99)};",
+        "  }"
+    ]
+    lines.extend("  " + statement for statement in injections)
+    lines.extend(["  return JSON.stringify({ total: total });", "}"])
+    return lines
+
+
+def _injection(kind: str, language: str, index: int, rng: random.Random) -> str:
+    """Build one statement carrying an injected issue."""
+    python = language == "python"
+    terminator = "" if python else ";"
+    declaration = "" if python else "const "
+    if kind == "long_lines":
+        text = "".join(rng.choice("abcdefghijklmnopqrstuvwxyz ") for _ in range(rng.randint(110, 160)))
+        return f'{declaration}message{index} = "{text}"{terminator}'
+    if kind == "credentials":
+        return f'{declaration}password = "pw-{index}-{rng.randint(1000, 9999)}"{terminator}'
+    if kind == "bracket_errors":
+        # One unmatched closing bracket (in Python this makes the file a syntax error)
+        return f"{declaration}check{index}_{rng.randint(1000, 9999)} = (value + {index})){terminator}"
+    raise ValueError(f"Unknown injection: {kind}")
+
+
+def generate_source(language: str, size: int, seed: int = 0,
+                    densities: Optional[Dict[str, float]] = None) -> Tuple[str, Dict[str, int]]:
+    """
+    Generate a synthetic source file.
+    
+    The same language, size, seed and densities always give the same file.
+    
+    Args:
+        language: "python", "javascript" or "typescript"
+        size: Approximate size in bytes (the file ends after the block that reaches it)
+        seed: Random seed
+        densities: Fraction of body lines carrying each injected issue
+            (bracket_errors, long_lines, credentials, unused_imports)
+    
+    Returns:
+        Tuple of (code, number of injected issues per kind)
+    """
+    if language not in LANGUAGE_EXTENSIONS:
+        raise ValueError(f"Unsupported language: {language}")
+    densities = dict(DEFAULT_DENSITIES, **(densities or {}))
+    injected = {kind: 0 for kind in densities}
+    rng = random.Random(f"{seed}:{language}:{size}")
+    python = language == "python"
+    
+    if python:
+        lines = ['"""Synthetic module generated for the debugger benchmark."""', "", "import json", "import os", ""]
+    else:
+        lines = ["// Synthetic module generated for the debugger benchmark", ""]
+    length = sum(len(line) + 1 for line in lines)
+    
+    index = 0
+    while length < size:
+        block = []
+        # Blocks are about eight lines long, so each gets eight draws per injected kind
+        if rng.random() < densities["unused_imports"] * 8:
+            injected["unused_imports"] += 1
+            block.append(f"import synthetic_helper_{index}" if python
+                         else f"import {{ helper{index} }} from './helper{index}';")
+        
+        injections = []
+        for kind in ("long_lines", "credentials", "bracket_errors"):
+            for _ in range(8):
+                if rng.random() < densities[kind]:
+                    injected[kind] += 1
+                    if kind == "bracket_errors":
+                        # Module level, so the stray bracket does not unbalance the function around it
+                        block.append(_injection(kind, language, index, rng))
+                    else:
+                        injections.append(_injection(kind, language, index, rng))
+        
+        if python:
+            block.extend(_python_block(index, rng, injections))
+        else:
+            block.extend(_javascript_block(index, rng, injections, typed=language == "typescript"))
+        block.append("")
+        
+        lines.extend(block)
+        length += sum(len(line) + 1 for line in block)
+        index += 1
+    
+    return "\n".join(lines), injected
+
+
+def generate_corpus(directory: str, sizes: Iterable[int] = DEFAULT_SIZES,
+                    languages: Iterable[str] = tuple(LANGUAGE_EXTENSIONS), seed: int = 0,
+                    densities: Optional[Dict[str, float]] = None) -> List[CorpusFile]:
+    """
+    Write a synthetic corpus with one file per language and size.
+    Files that already exist with the expected content are not rewritten.
+    
+    Args:
+        directory: Output directory (created if missing)
+        sizes: File sizes in bytes
+        languages: Languages to generate
+        seed: Random seed
+        densities: Fraction of body lines carrying each injected issue
+    
+    Returns:
+        List of generated files
+    """
+    os.makedirs(directory, exist_ok=True)
+    corpus = []
+    for language in languages:
+        for size in sizes:
+            code, injected = generate_source(language, size, seed, densities)
+            path = os.path.join(directory, f"{language}_{size}{LANGUAGE_EXTENSIONS[language]}")
+            data = code.encode("utf-8")
+            if os.path.exists(path) and os.path.getsize(path) == len(data):
+                with open(path, "rb") as f:
+                    unchanged = f.read() == data
+            else:
+                unchanged = False
+            if not unchanged:
+                with open(path, "wb") as f:
+                    f.write(data)
+            corpus.append(CorpusFile(path, language, len(data), injected))
+    return corpus
+
+
+def _throughput(size: int, seconds: float) -> float:
+    """Megabytes per second."""
+    return size / MB / seconds if seconds > 0 else 0.0
+
+
+def run_benchmark(corpus: List[CorpusFile], agent: Optional[DebuggerAgent] = None,
+                  repeat: int = 3) -> Dict[str, Any]:
+    """
+    Measure DebuggerAgent.review_code throughput over a corpus.
+    
+    Each file is reviewed repeat times and the fastest run is kept. Per-check
+    throughput comes from one extra profiled review of each file: the bytes
+    of the files a check ran on divided by the time spent in it.
+    
+    Args:
+        corpus: Files to review (see generate_corpus)
+        agent: Agent to benchmark (defaults to a new agent without a review cache)
+        repeat: Timed reviews per file
+    
+    Returns:
+        Dictionary with per-file, per-language, per-check and total throughput
+    """
+    agent = agent or DebuggerAgent("DebuggerBenchmark")
+    previous_profile = agent.rule_profile
+    files = []
+    languages: Dict[str, Dict[str, float]] = {}
+    checks: Dict[str, Dict[str, Dict[str, float]]] = {}
+    
+    try:
+        for corpus_file in corpus:
+            agent.rule_profile = None
+            best = None
+            review = None
+            for _ in range(max(1, repeat)):
+                start = perf_counter()
+                review = agent.review_code(corpus_file.path)
+                elapsed = perf_counter() - start
+                best = elapsed if best is None else min(best, elapsed)
+            if review.get("status") != "completed":
+                raise ValueError(f"Review failed for {corpus_file.path}: {review.get('error')}")
+            
+            files.append({
+                "path": corpus_file.path,
+                "language": corpus_file.language,
+                "size": corpus_file.size,
+                "seconds": best,
+                "mb_per_s": _throughput(corpus_file.size, best),
+                "issues": review["issues_count"],
+                "streaming": review.get("streaming", False)
+            })
+            totals = languages.setdefault(corpus_file.language, {"files": 0, "bytes": 0, "seconds": 0.0})
+            totals["files"] += 1
+            totals["bytes"] += corpus_file.size
+            totals["seconds"] += best
+            
+            agent.rule_profile = RuleProfile()
+            agent.review_code(corpus_file.path)
+            language_checks = checks.setdefault(corpus_file.language, {})
+            for rule_id, _, _, seconds, _, _ in agent.rule_profile.records():
+                check = language_checks.setdefault(rule_id, {"bytes": 0, "seconds": 0.0})
+                check["bytes"] += corpus_file.size
+                check["seconds"] += seconds
+    finally:
+        agent.rule_profile = previous_profile
+    
+    for totals in languages.values():
+        totals["mb_per_s"] = _throughput(totals["bytes"], totals["seconds"])
+    for language_checks in checks.values():
+        for check in language_checks.values():
+            check["mb_per_s"] = _throughput(check["bytes"], check["seconds"])
+    
+    total_bytes = sum(totals["bytes"] for totals in languages.values())
+    total_seconds = sum(totals["seconds"] for totals in languages.values())
+    return {
+        "created_at": datetime.now().isoformat(),
+        "python_version": platform.python_version(),
+        "platform": platform.platform(),
+        "repeat": repeat,
+        "files": files,
+        "languages": languages,
+        "checks": checks,
+        "total": {"bytes": total_bytes, "seconds": total_seconds,
+                  "mb_per_s": _throughput(total_bytes, total_seconds)}
+    }
+
+
+def save_baseline(results: Dict[str, Any], path: str = DEFAULT_BASELINE_FILE, name: str = "default") -> None:
+    """
+    Store benchmark results as a named baseline.
+    Other baselines in the file are kept.
+    
+    Args:
+        results: Results from run_benchmark
+        path: Baseline file
+        name: Baseline name
+    """
+    baselines = {}
+    if os.path.exists(path):
+        with open(path, "r") as f:
+            baselines = json.load(f)
+    baselines[name] = results
+    
+    # Write to a temporary file first so an interrupted save keeps the old baselines
+    directory = os.path.dirname(os.path.abspath(path))
+    with tempfile.NamedTemporaryFile("w", dir=directory, delete=False, suffix=".tmp") as f:
+        json.dump(baselines, f, indent=2)
+    os.replace(f.name, path)
+
+
+def load_baseline(path: str = DEFAULT_BASELINE_FILE, name: str = "default") -> Optional[Dict[str, Any]]:
+    """
+    Load a named baseline.
+    
+    Args:
+        path: Baseline file
+        name: Baseline name
+    
+    Returns:
+        Stored results, or None if there is no such baseline
+    """
+    if not os.path.exists(path):
+        return None
+    with open(path, "r") as f:
+        return json.load(f).get(name)
+
+
+def compare_to_baseline(results: Dict[str, Any], baseline: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Compare throughput with a baseline.
+    
+    Args:
+        results: Current results from run_benchmark
+        baseline: Baseline results
+    
+    Returns:
+        Dictionary with baseline and current MB/s and the relative change, per language,
+        per check and in total (entries missing on either side are skipped)
+    """
+    def change(current: float, previous: float) -> Dict[str, float]:
+        return {"baseline": previous, "current": current,
+                "change": current / previous - 1 if previous else 0.0}
+    
+    comparison = {
+        "total": change(results["total"]["mb_per_s"], baseline["total"]["mb_per_s"]),
+        "languages": {},
+        "checks": {}
+    }
+    for language, totals in results["languages"].items():
+        if language in baseline["languages"]:
+            comparison["languages"][language] = change(totals["mb_per_s"],
+                                                       baseline["languages"][language]["mb_per_s"])
+    for language, language_checks in results["checks"].items():
+        baseline_checks = baseline["checks"].get(language, {})
+        for rule_id, check in language_checks.items():
+            if rule_id in baseline_checks:
+                comparison["checks"].setdefault(language, {})[rule_id] = change(
+                    check["mb_per_s"], baseline_checks[rule_id]["mb_per_s"]
+                )
+    return comparison
+
+
+def format_benchmark(results: Dict[str, Any], comparison: Optional[Dict[str, Any]] = None) -> str:
+    """
+    Format benchmark results as text tables.
+    
+    Args:
+        results: Results from run_benchmark
+        comparison: Optional result of compare_to_baseline
+    
+    Returns:
+        Report text
+    """
+    def changed(section: Optional[Dict[str, Any]]) -> str:
+        return f"{section['change']:+.1%}" if section else ""
+    
+    comparison = comparison or {"languages": {}, "checks": {}}
+    report = [f"{'language':<12}{'files':>7}{'MB':>10}{'MB/s':>10}{'vs base':>10}"]
+    for language, totals in sorted(results["languages"].items()):
+        report.append(f"{language:<12}{totals['files']:>7}{totals['bytes'] / MB:>10.2f}{totals['mb_per_s']:>10.2f}"
+                      f"{changed(comparison['languages'].get(language)):>10}")
+    total = results["total"]
+    report.append(f"{'total':<12}{len(results['files']):>7}{total['bytes'] / MB:>10.2f}{total['mb_per_s']:>10.2f}"
+                  f"{changed(comparison.get('total')):>10}")
+    
+    report.append("")
+    report.append(f"{'language':<12}{'check':<24}{'MB/s':>10}{'vs base':>10}")
+    for language, language_checks in sorted(results["checks"].items()):
+        for rule_id, check in sorted(language_checks.items(), key=lambda item: item[1]["mb_per_s"]):
+            report.append(f"{language:<12}{rule_id:<24}{check['mb_per_s']:>10.2f}"
+                          f"{changed(comparison['checks'].get(language, {}).get(rule_id)):>10}")
+    return "\n".join(report)
+
+
+def parse_size(text: str) -> int:
+    """
+    Parse a size such as 512, 10KB or 1MB.
+    
+    Args:
+        text: Size text
+    
+    Returns:
+        Size in bytes
+    """
+    text = text.strip().upper()
+    for suffix, factor in (("MB", MB), ("KB", KB), ("M", MB), ("K", KB), ("B", 1)):
+        if text.endswith(suffix):
+            return int(float(text[:-len(suffix)]) * factor)
+    return int(text)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """
+    Generate the corpus, run the benchmark and report or store the results.
+    
+    Args:
+        argv: Command-line arguments
+    
+    Returns:
+        Exit status
+    """
+    parser = argparse.ArgumentParser(description="Benchmark Debugger agent review throughput")
+    parser.add_argument("--corpus-dir", help="Directory for the synthetic corpus (defaults to a temporary directory)")
+    parser.add_argument("--sizes", default="1KB,10KB,100KB,1MB,10MB", help="Comma-separated file sizes")
+    parser.add_argument("--languages", default=",".join(LANGUAGE_EXTENSIONS), help="Comma-separated languages")
+    parser.add_argument("--seed", type=int, default=0, help="Corpus random seed")
+    parser.add_argument("--repeat", type=int, default=3, help="Timed reviews per file")
+    for kind, density in DEFAULT_DENSITIES.items():
+        parser.add_argument(f"--{kind.replace('_', '-')}", type=float, default=density,
+                            help=f"Fraction of lines with {kind.replace('_', ' ')} (default {density})")
+    parser.add_argument("--baseline-file", default=DEFAULT_BASELINE_FILE, help="Baseline file")
+    parser.add_argument("--save-baseline", metavar="NAME", help="Store the results under this baseline name")
+    parser.add_argument("--compare", metavar="NAME", help="Compare with this stored baseline")
+    parser.add_argument("--json", action="store_true", help="Print the results as JSON")
+    args = parser.parse_args(argv)
+    
+    sizes = [parse_size(size) for size in args.sizes.split(",") if size]
+    languages = [language for language in args.languages.split(",") if language]
+    densities = {kind: getattr(args, kind) for kind in DEFAULT_DENSITIES}
+    
+    with tempfile.TemporaryDirectory() as temporary_directory:
+        corpus = generate_corpus(args.corpus_dir or temporary_directory, sizes, languages, args.seed, densities)
+        agent = DebuggerAgent("DebuggerBenchmark")
+        agent.logger.setLevel(logging.WARNING)
+        results = run_benchmark(corpus, agent, repeat=args.repeat)
+    results["corpus"] = {"sizes": sizes, "languages": languages, "seed": args.seed, "densities": densities}
+    
+    comparison = None
+    if args.compare:
+        baseline = load_baseline(args.baseline_file, args.compare)
+        if baseline is None:
+            print(f"No baseline named {args.compare} in {args.baseline_file}", file=sys.stderr)
+            return 1
+        if baseline.get("corpus") != results["corpus"]:
+            print(f"Baseline {args.compare} was measured on a different corpus", file=sys.stderr)
+        comparison = compare_to_baseline(results, baseline)
+    
+    if args.json:
+        print(json.dumps({"results": results, "comparison": comparison}, indent=2))
+    else:
+        print(format_benchmark(results, comparison))
+    
+    if args.save_baseline:
+        save_baseline(results, args.baseline_file, args.save_baseline)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,571 @@
+# Clone Detection Module
+# This file defines the token fingerprinting and the fingerprint index used to find duplicated code
+
+import keyword
+import os
+import re
+import sqlite3
+import threading
+import zlib
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from itertools import groupby
+from typing import Dict, List, Any, Optional, Iterable, Tuple
+
+from .lexer import LineIndex
+from .rules import detect_language
+from .tree_review import iter_source_stats
+
+# Tokens per k-gram and k-grams per winnowing window: every shared run of at least
+# K_GRAM + WINDOW - 1 tokens is guaranteed to share a fingerprint
+K_GRAM = 15
+WINDOW = 10
+
+# Clone regions shorter than this many lines are not reported
+MIN_CLONE_LINES = 5
+
+# Fingerprints found in more places than this are not compared pair by pair; they are grouped by
+# the set of files sharing them instead (a component copied into many files, or boilerplate)
+MAX_POSTINGS = 64
+
+# Rolling hash modulus (a Mersenne prime, so hashes fit an SQLite INTEGER) and base
+HASH_MODULUS = (1 << 61) - 1
+HASH_BASE = 1000003
+
+JAVASCRIPT_KEYWORDS = frozenset((
+    "async", "await", "break", "case", "catch", "class", "const", "continue", "debugger", "default",
+    "delete", "do", "else", "export", "extends", "false", "finally", "for", "function", "if", "import",
+    "in", "instanceof", "let", "new", "null", "return", "super", "switch", "this", "throw", "true", "try",
+    "typeof", "undefined", "var", "void", "while", "with", "yield", "interface", "type", "enum"
+))
+
+_TOKEN_PATTERNS = {
+    "python": re.compile(
+        r"""(?P<comment>\#[^\n]*)"""
+        r"""|(?P<string>[rRbBuUfF]{0,2}(?:'''[\s\S]*?(?:'''|\Z)|\"\"\"[\s\S]*?(?:\"\"\"|\Z)"""
+        r"""|'(?:[^'\\\n]|\\.)*'?|"(?:[^"\\\n]|\\.)*"?))"""
+        r"""|(?P<number>\.?\d[\w.]*)"""
+        r"""|(?P<name>[A-Za-z_]\w*)"""
+        r"""|(?P<op>\S)"""
+    ),
+    "javascript": re.compile(
+        r"""(?P<comment>//[^\n]*|/\*[\s\S]*?(?:\*/|\Z))"""
+        r"""|(?P<string>`(?:[^`\\]|\\.)*`?|'(?:[^'\\\n]|\\.)*'?|"(?:[^"\\\n]|\\.)*"?)"""
+        r"""|(?P<number>\.?\d[\w.]*)"""
+        r"""|(?P<name>[A-Za-z_$][\w$]*)"""
+        r"""|(?P<op>\S)"""
+    )
+}
+
+_KEYWORDS = {"python": frozenset(keyword.kwlist), "javascript": JAVASCRIPT_KEYWORDS}
+
+# Stable integer code of each normalized token
+_token_codes: Dict[str, int] = {}
+
+
+def _token_code(token: str) -> int:
+    """Get the stable integer code of a normalized token."""
+    code = _token_codes.get(token)
+    if code is None:
+        code = _token_codes[token] = zlib.crc32(token.encode("utf-8", "surrogatepass")) + 1
+    return code
+
+
+def tokenize(code_content: str, language: str = "python",
+             normalize_identifiers: bool = True) -> Tuple[List[int], List[int]]:
+    """
+    Split code into normalized tokens.
+    Comments are dropped and literals are replaced by their kind; identifiers are
+    too unless disabled, so renamed copies still match.
+    
+    Args:
+        code_content: Code content
+        language: "python" or "javascript"
+        normalize_identifiers: Replace identifiers (but not keywords) by a placeholder
+    
+    Returns:
+        Tuple of the token codes and the character offset of each token
+    """
+    keywords = _KEYWORDS[language]
+    string_code = _token_code("$str")
+    number_code = _token_code("$num")
+    identifier_code = _token_code("$id")
+    codes = []
+    offsets = []
+    for match in _TOKEN_PATTERNS[language].finditer(code_content):
+        kind = match.lastgroup
+        if kind == "comment":
+            continue
+        if kind == "string":
+            code = string_code
+        elif kind == "number":
+            code = number_code
+        else:
+            text = match.group()
+            if kind == "name" and normalize_identifiers and text not in keywords:
+                code = identifier_code
+            else:
+                code = _token_codes.get(text) or _token_code(text)
+        codes.append(code)
+        offsets.append(match.start())
+    return codes, offsets
+
+
+def winnow(hashes: List[int], window: int = WINDOW) -> List[int]:
+    """
+    Select fingerprints with the winnowing algorithm.
+    In every window of consecutive hashes the rightmost minimum is selected,
+    each position once. Runs in linear time with a monotonic queue.
+    
+    Args:
+        hashes: k-gram hashes
+        window: Window size
+    
+    Returns:
+        Positions of the selected hashes
+    """
+    if len(hashes) < window:
+        if not hashes:
+            return []
+        smallest = min(hashes)
+        return [len(hashes) - 1 - hashes[::-1].index(smallest)]
+    
+    selected = []
+    candidates = deque()
+    for position, value in enumerate(hashes):
+        while candidates and hashes[candidates[-1]] >= value:
+            candidates.pop()
+        candidates.append(position)
+        if candidates[0] <= position - window:
+            candidates.popleft()
+        if position >= window - 1 and (not selected or selected[-1] != candidates[0]):
+            selected.append(candidates[0])
+    return selected
+
+
+def fingerprint(code_content: str, language: str = "python", k: int = K_GRAM,
+                window: int = WINDOW) -> List[Tuple[int, int, int]]:
+    """
+    Fingerprint code with Rabin-Karp hashes of its k-token windows.
+    
+    Args:
+        code_content: Code content
+        language: "python" or "javascript"
+        k: Tokens per k-gram
+        window: Winnowing window
+    
+    Returns:
+        List of (hash, first line, last line) tuples
+    """
+    codes, offsets = tokenize(code_content, language)
+    if len(codes) < k:
+        return []
+    
+    # Rolling hash: drop the leading token, shift, add the next one
+    high = pow(HASH_BASE, k - 1, HASH_MODULUS)
+    value = 0
+    for code in codes[:k]:
+        value = (value * HASH_BASE + code) % HASH_MODULUS
+    hashes = [value]
+    for position in range(k, len(codes)):
+        value = ((value - codes[position - k] * high) * HASH_BASE + codes[position]) % HASH_MODULUS
+        hashes.append(value)
+    
+    # Only the selected k-grams need line numbers
+    line_index = LineIndex(code_content)
+    return [
+        (hashes[position], line_index.position(offsets[position])[0], line_index.position(offsets[position + k - 1])[0])
+        for position in winnow(hashes, window)
+    ]
+
+
+def fingerprint_file(file_path: str, k: int = K_GRAM,
+                     window: int = WINDOW) -> Optional[Tuple[str, int, int, List[Tuple[int, int, int]]]]:
+    """
+    Fingerprint a file (usable as a worker function).
+    
+    Args:
+        file_path: Path to the file
+        k: Tokens per k-gram
+        window: Winnowing window
+    
+    Returns:
+        Tuple of the path, mtime, size and fingerprints, or None if the file cannot be read
+    """
+    try:
+        stat = os.stat(file_path)
+        with open(file_path, 'r', encoding='utf-8', errors='replace') as f:
+            code_content = f.read()
+    except OSError:
+        return None
+    language = detect_language(file_path) or "javascript"
+    return file_path, stat.st_mtime_ns, stat.st_size, fingerprint(code_content, language, k, window)
+
+
+def _covered_lines(ranges: List[Tuple[int, int]]) -> int:
+    """Count the lines covered by (first line, last line) ranges."""
+    covered = 0
+    last = 0
+    for start, end in sorted(ranges):
+        if end > last:
+            covered += end - max(start, last + 1) + 1
+            last = end
+    return covered
+
+
+def _merge_regions(matches: List[Tuple[int, int, int, int]], min_lines: int,
+                   same_file: bool = False) -> List[Tuple[int, int, int, int]]:
+    """
+    Merge the matched line ranges of two files into clone regions.
+    Matches are chained along their line offset, then the longest regions
+    are kept so that each line belongs to at most one region per file.
+    
+    Args:
+        matches: (first line, last line) in the first file and in the second file of each match
+        min_lines: Minimum region length
+        same_file: Whether both files are the same file, so a region may not overlap its copy
+    
+    Returns:
+        Regions as (first line, last line, first line, last line) tuples, in line order
+    """
+    regions = []
+    for a_start, a_end, b_start, b_end in sorted(set(matches), key=lambda match: (match[2] - match[0], match[0])):
+        if regions:
+            region = regions[-1]
+            if b_start - a_start == region[2] - region[0] and a_start <= region[1] + 1:
+                region[1] = max(region[1], a_end)
+                region[3] = max(region[3], b_end)
+                continue
+        regions.append([a_start, a_end, b_start, b_end])
+    
+    kept = []
+    for region in sorted(regions, key=lambda region: region[0] - region[1]):
+        if region[1] - region[0] + 1 < min_lines:
+            break
+        if same_file and region[0] <= region[3] and region[2] <= region[1]:
+            continue
+        if not any(region[0] <= other[1] and other[0] <= region[1] or region[2] <= other[3] and other[2] <= region[3]
+                   for other in kept):
+            kept.append(region)
+    return sorted(tuple(region) for region in kept)
+
+
+class CloneIndex:
+    """
+    Fingerprint index of a code base, stored in SQLite.
+    
+    Pass ":memory:" to keep the index in memory. Files are indexed by their
+    winnowed fingerprints with their mtime and size, so updating the index
+    only fingerprints files that changed. Clone search reads the shared
+    fingerprints in hash order and only compares the places of a
+    fingerprint pair by pair when there are at most max_postings of them;
+    more widely shared fingerprints are grouped by the set of files sharing
+    them, so the search stays close to linear in the size of the index.
+    """
+    
+    def __init__(self, path: str = ":memory:", k: int = K_GRAM, window: int = WINDOW):
+        """
+        Initialize the index.
+        An existing index built with other settings is emptied.
+        
+        Args:
+            path: Path to the SQLite database file, or ":memory:"
+            k: Tokens per k-gram
+            window: Winnowing window
+        """
+        self.path = path
+        self.k = k
+        self.window = window
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(path, check_same_thread=False)
+        if path != ":memory:":
+            self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.execute("CREATE TABLE IF NOT EXISTS settings (name TEXT PRIMARY KEY, value INTEGER NOT NULL)")
+        self._connection.execute(
+            "CREATE TABLE IF NOT EXISTS files ("
+            "file_id INTEGER PRIMARY KEY, "
+            "file_path TEXT NOT NULL UNIQUE, "
+            "mtime_ns INTEGER, "
+            "size INTEGER, "
+            "distinct_fingerprints INTEGER NOT NULL)"
+        )
+        self._connection.execute(
+            "CREATE TABLE IF NOT EXISTS fingerprints ("
+            "hash INTEGER NOT NULL, "
+            "file_id INTEGER NOT NULL, "
+            "start_line INTEGER NOT NULL, "
+            "end_line INTEGER NOT NULL)"
+        )
+        self._connection.execute("CREATE INDEX IF NOT EXISTS fingerprints_hash ON fingerprints (hash)")
+        self._connection.execute("CREATE INDEX IF NOT EXISTS fingerprints_file ON fingerprints (file_id)")
+        
+        settings = dict(self._connection.execute("SELECT name, value FROM settings"))
+        if settings != {"k": k, "window": window}:
+            self._connection.execute("DELETE FROM fingerprints")
+            self._connection.execute("DELETE FROM files")
+            self._connection.execute("DELETE FROM settings")
+            self._connection.executemany("INSERT INTO settings (name, value) VALUES (?, ?)",
+                                         [("k", k), ("window", window)])
+        self._connection.commit()
+    
+    def _store(self, file_path: str, fingerprints: List[Tuple[int, int, int]],
+               mtime_ns: Optional[int], size: Optional[int]) -> None:
+        """Replace the fingerprints of a file (the caller holds the lock and commits)."""
+        self._delete(file_path)
+        cursor = self._connection.execute(
+            "INSERT INTO files (file_path, mtime_ns, size, distinct_fingerprints) VALUES (?, ?, ?, ?)",
+            (file_path, mtime_ns, size, len({value for value, _, _ in fingerprints}))
+        )
+        file_id = cursor.lastrowid
+        self._connection.executemany(
+            "INSERT INTO fingerprints (hash, file_id, start_line, end_line) VALUES (?, ?, ?, ?)",
+            [(value, file_id, start_line, end_line) for value, start_line, end_line in fingerprints]
+        )
+    
+    def _delete(self, file_path: str) -> bool:
+        """Remove a file from the index (the caller holds the lock and commits)."""
+        row = self._connection.execute("SELECT file_id FROM files WHERE file_path = ?", (file_path,)).fetchone()
+        if row is None:
+            return False
+        self._connection.execute("DELETE FROM fingerprints WHERE file_id = ?", row)
+        self._connection.execute("DELETE FROM files WHERE file_id = ?", row)
+        return True
+    
+    def add_file(self, file_path: str, code_content: Optional[str] = None) -> int:
+        """
+        Index a file, replacing its previous fingerprints.
+        
+        Args:
+            file_path: Path to the file
+            code_content: Optional code content (read from the file if not provided)
+        
+        Returns:
+            Number of fingerprints stored
+        """
+        mtime_ns = size = None
+        if code_content is None:
+            stat = os.stat(file_path)
+            mtime_ns, size = stat.st_mtime_ns, stat.st_size
+            with open(file_path, 'r', encoding='utf-8', errors='replace') as f:
+                code_content = f.read()
+        
+        fingerprints = fingerprint(code_content, detect_language(file_path) or "javascript", self.k, self.window)
+        with self._lock:
+            self._store(file_path, fingerprints, mtime_ns, size)
+            self._connection.commit()
+        return len(fingerprints)
+    
+    def remove_file(self, file_path: str) -> bool:
+        """
+        Remove a file from the index.
+        
+        Args:
+            file_path: Path to the file
+        
+        Returns:
+            True if the file was indexed
+        """
+        with self._lock:
+            removed = self._delete(file_path)
+            self._connection.commit()
+        return removed
+    
+    def update(self, root: str, include: Optional[Iterable[str]] = None, exclude: Optional[Iterable[str]] = None,
+               max_workers: int = 1) -> Dict[str, int]:
+        """
+        Bring the index up to date with a directory tree.
+        Only files whose mtime or size changed are fingerprinted, and indexed
+        files under the root that no longer exist are removed.
+        
+        Args:
+            root: Root directory
+            include: Glob patterns of files to index (defaults to the supported languages)
+            exclude: Glob patterns of files and directories to skip
+            max_workers: Number of worker processes fingerprinting changed files
+        
+        Returns:
+            Dictionary with the number of added, updated, removed and unchanged files
+        """
+        with self._lock:
+            known = {
+                file_path: (mtime_ns, size)
+                for file_path, mtime_ns, size in self._connection.execute("SELECT file_path, mtime_ns, size FROM files")
+            }
+        
+        counts = {"added": 0, "updated": 0, "removed": 0, "unchanged": 0}
+        changed = []
+        seen = set()
+        for file_path, file_stat in iter_source_stats(root, include, exclude):
+            seen.add(file_path)
+            previous = known.get(file_path)
+            if previous is not None and previous == (file_stat.st_mtime_ns, file_stat.st_size):
+                counts["unchanged"] += 1
+            else:
+                changed.append(file_path)
+        
+        worker = partial(fingerprint_file, k=self.k, window=self.window)
+        if max_workers > 1 and len(changed) > 1:
+            with ProcessPoolExecutor(max_workers=max_workers) as executor:
+                results = list(executor.map(worker, changed, chunksize=max(1, len(changed) // (max_workers * 4))))
+        else:
+            results = [worker(file_path) for file_path in changed]
+        
+        prefix = os.path.join(root, "")
+        with self._lock:
+            for result in results:
+                if result is None:
+                    continue
+                file_path, mtime_ns, size, fingerprints = result
+                counts["updated" if file_path in known else "added"] += 1
+                self._store(file_path, fingerprints, mtime_ns, size)
+            for file_path in known:
+                if file_path.startswith(prefix) and file_path not in seen:
+                    self._delete(file_path)
+                    counts["removed"] += 1
+            self._connection.commit()
+        return counts
+    
+    def find_clones(self, file_path: Optional[str] = None, min_lines: int = MIN_CLONE_LINES,
+                    max_postings: int = MAX_POSTINGS) -> Dict[str, Any]:
+        """
+        Find duplicated code across indexed files and within each file.
+        A file containing copies of its own code is reported as a pair with
+        itself, but only files sharing code with other files form clusters.
+        
+        Code found in more than max_postings places (e.g. a component copied
+        into hundreds of files) is not reported pair by pair. The files
+        sharing the same widely found fingerprints are reported together as a
+        widespread group, if those fingerprints cover at least min_lines lines
+        in each of them, and join the same cluster.
+        
+        Args:
+            file_path: Optional file whose clones to find (defaults to every file)
+            min_lines: Minimum length of a reported clone region
+            max_postings: Fingerprints found in more places are grouped instead of compared pair by pair
+        
+        Returns:
+            Dictionary with the clone pairs, most shared code first, the widespread groups, most files
+            first, and the clusters of files connected by clones, largest first
+        """
+        query = (
+            "SELECT f.hash, f.file_id, f.start_line, f.end_line FROM fingerprints f JOIN ("
+            "SELECT hash FROM fingerprints {where} GROUP BY hash HAVING COUNT(*) >= 2"
+            ") shared ON f.hash = shared.hash ORDER BY f.hash"
+        )
+        with self._lock:
+            files = {
+                file_id: (path, count)
+                for file_id, path, count in self._connection.execute(
+                    "SELECT file_id, file_path, distinct_fingerprints FROM files"
+                )
+            }
+            target = None
+            if file_path is not None:
+                target = next((file_id for file_id, (path, _) in files.items() if path == file_path), None)
+                if target is None:
+                    return {"pairs": [], "widespread": [], "clusters": []}
+                rows = self._connection.execute(
+                    query.format(where="WHERE hash IN (SELECT hash FROM fingerprints WHERE file_id = ?)"),
+                    (target,)
+                )
+            else:
+                rows = self._connection.execute(query.format(where=""))
+            
+            # (file ID, file ID) -> matched line ranges, and the fingerprints each pair shares
+            matches: Dict[Tuple[int, int], List[Tuple[int, int, int, int]]] = {}
+            shared: Dict[Tuple[int, int], set] = {}
+            # Set of file IDs -> the widely found fingerprints they share, and their line ranges by file ID
+            widespread: Dict[frozenset, tuple] = {}
+            for value, postings in groupby(rows, key=lambda row: row[0]):
+                postings = list(postings)
+                if len(postings) > max_postings:
+                    group = widespread.setdefault(frozenset(row[1] for row in postings), (set(), {}))
+                    group[0].add(value)
+                    for _, file_id, start_line, end_line in postings:
+                        group[1].setdefault(file_id, []).append((start_line, end_line))
+                    continue
+                for index, (_, a_id, a_start, a_end) in enumerate(postings):
+                    for _, b_id, b_start, b_end in postings[index + 1:]:
+                        if target is not None and target not in (a_id, b_id):
+                            continue
+                        if (a_id, a_start) > (b_id, b_start):
+                            a_id, a_start, a_end, b_id, b_start, b_end = b_id, b_start, b_end, a_id, a_start, a_end
+                        matches.setdefault((a_id, b_id), []).append((a_start, a_end, b_start, b_end))
+                        shared.setdefault((a_id, b_id), set()).add(value)
+        
+        pairs = []
+        parents: Dict[int, int] = {}
+        
+        def find(file_id: int) -> int:
+            while parents.setdefault(file_id, file_id) != file_id:
+                parents[file_id] = parents[parents[file_id]]
+                file_id = parents[file_id]
+            return file_id
+        
+        for (a_id, b_id), pair_matches in matches.items():
+            regions = [
+                {"a_lines": (a_start, a_end), "b_lines": (b_start, b_end)}
+                for a_start, a_end, b_start, b_end in _merge_regions(pair_matches, min_lines, a_id == b_id)
+            ]
+            if not regions:
+                continue
+            count = len(shared[(a_id, b_id)])
+            pairs.append({
+                "file_a": files[a_id][0],
+                "file_b": files[b_id][0],
+                "shared_fingerprints": count,
+                "similarity": count / max(1, min(files[a_id][1], files[b_id][1])),
+                "duplicated_lines": sum(region["a_lines"][1] - region["a_lines"][0] + 1 for region in regions),
+                "regions": regions
+            })
+            if a_id != b_id:
+                parents[find(a_id)] = find(b_id)
+        
+        groups_found = []
+        for file_ids, (values, ranges) in widespread.items():
+            if len(file_ids) < 2:
+                continue
+            duplicated_lines = min(_covered_lines(file_ranges) for file_ranges in ranges.values())
+            if duplicated_lines < min_lines:
+                continue
+            groups_found.append({
+                "files": sorted(files[file_id][0] for file_id in file_ids),
+                "shared_fingerprints": len(values),
+                "duplicated_lines": duplicated_lines
+            })
+            first, *others = file_ids
+            for file_id in others:
+                parents[find(file_id)] = find(first)
+        
+        pairs.sort(key=lambda pair: (-pair["duplicated_lines"], pair["file_a"], pair["file_b"]))
+        groups_found.sort(key=lambda group: (-len(group["files"]), -group["duplicated_lines"], group["files"]))
+        groups: Dict[int, List[str]] = {}
+        for file_id in list(parents):
+            groups.setdefault(find(file_id), []).append(files[file_id][0])
+        clusters = sorted((sorted(group) for group in groups.values()), key=lambda group: (-len(group), group))
+        return {"pairs": pairs, "widespread": groups_found, "clusters": clusters}
+    
+    def clear(self) -> None:
+        """Remove every indexed file."""
+        with self._lock:
+            self._connection.execute("DELETE FROM fingerprints")
+            self._connection.execute("DELETE FROM files")
+            self._connection.commit()
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get index statistics.
+        
+        Returns:
+            Dictionary with the path, settings and the number of files and fingerprints
+        """
+        with self._lock:
+            files = self._connection.execute("SELECT COUNT(*) FROM files").fetchone()[0]
+            fingerprints = self._connection.execute("SELECT COUNT(*) FROM fingerprints").fetchone()[0]
+        return {"path": self.path, "k": self.k, "window": self.window, "files": files, "fingerprints": fingerprints}
+    
+    def close(self) -> None:
+        """Close the database connection."""
+        with self._lock:
+            self._connection.close()
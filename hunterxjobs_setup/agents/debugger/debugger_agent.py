@@ -2,13 +2,32 @@
 # This file implements the Debugger agent that reviews code and identifies issues
 
 import logging
-from typing import Dict, List, Any, Optional
+import uuid
+from typing import Dict, List, Any, Optional, Iterable, Iterator, TextIO, Union
 from datetime import datetime
 import os
-import re
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
 
 # Import base agent class
 from ..base.base_agent import BaseAgent
+from .clones import CloneIndex, MIN_CLONE_LINES
+from .dependency_graph import DependencyGraph
+from .exporters import create_writer
+from .fixes import fix_batch, fix_file, init_fix_worker
+from .issue_store import IssueTable, IssueView
+from .metrics import MetricsStore
+from .profiling import RuleProfile
+from .review_cache import ReviewCache, content_hash
+from .rules import RuleRegistry, SourceFile, compile_rule_set
+from .watcher import create_monitor, IncrementalReviewer, SourceWatch, INCREMENTAL_THRESHOLD
+from .tree_review import (
+    iter_source_files, balance_batches, calculate_quality_metrics, cached_review_result, git_changed_files,
+    init_worker, review_batch, review_file, review_file_streaming, TreeReviewSummary,
+    STREAMING_THRESHOLD, MAX_STREAMING_ISSUES
+)
+
+# Completed reviews kept in full; older reviews survive only in the metrics store
+MAX_COMPLETED_REVIEWS = 100
 
 class DebuggerAgent(BaseAgent):
     """
@@ -29,10 +48,21 @@ class DebuggerAgent(BaseAgent):
         # Initialize debugger-specific attributes
         self.current_review = None
         self.completed_reviews = []
+        self.issue_store = IssueTable()
         self.fixed_issues = []
-        self.code_quality_metrics = {}
+        self.metrics_store = MetricsStore()
+        self.max_completed_reviews = MAX_COMPLETED_REVIEWS
         self.linting_rules = {}
         self.security_checks = {}
+        self.rule_registry = RuleRegistry.default()
+        self.review_cache = None
+        self.clone_index = None
+        self.dependency_graphs = {}
+        self.streaming_threshold = STREAMING_THRESHOLD
+        self.max_streaming_issues = MAX_STREAMING_ISSUES
+        self.rule_profile = None
+        self.subscribers = []
+        self.watches = []
         
         # Load configuration if provided
         if config:
@@ -52,6 +82,120 @@ class DebuggerAgent(BaseAgent):
         
         if "security_checks" in config:
             self.security_checks = config["security_checks"]
+        
+        if "linting_rules" in config or "security_checks" in config:
+            self.configure_rules(self.linting_rules, self.security_checks)
+        
+        if "streaming_threshold" in config:
+            self.streaming_threshold = config["streaming_threshold"]
+        
+        if "max_streaming_issues" in config:
+            self.max_streaming_issues = config["max_streaming_issues"]
+        
+        if "max_completed_reviews" in config:
+            self.max_completed_reviews = config["max_completed_reviews"]
+        
+        if "max_tracked_files" in config:
+            self.metrics_store.max_files = config["max_tracked_files"]
+        
+        if config.get("profile_rules"):
+            self.enable_rule_profiling()
+        
+        if config.get("review_cache"):
+            self.enable_review_cache(config["review_cache"])
+        
+        if config.get("clone_index"):
+            self.clone_index = CloneIndex(config["clone_index"])
+    
+    def after_restore(self) -> None:
+        """
+        Recompile the configured rule set and attach the restored issue store to the
+        restored reviews, after the agent was restored from a snapshot.
+        """
+        if self.linting_rules or self.security_checks:
+            self.configure_rules(self.linting_rules, self.security_checks)
+        for review in self.completed_reviews:
+            if isinstance(review.get("issues"), IssueView):
+                review["issues"].table = self.issue_store
+    
+    def configure_rules(self, linting_rules: Optional[Dict[str, Any]] = None,
+                        security_checks: Optional[Dict[str, Any]] = None) -> RuleRegistry:
+        """
+        Select and configure the review rules.
+        The configuration is compiled once into an immutable rule set that is
+        shared with every other agent using the same configuration; disabled
+        rules are left out of it entirely.
+        
+        Args:
+            linting_rules: Settings of the syntax, style and performance rules by rule ID
+                (False disables a rule, a dictionary sets its options, e.g. {"long-line": {"max_line_length": 120}})
+            security_checks: Settings of the security rules by rule ID
+            
+        Returns:
+            The compiled rule set
+        """
+        self.linting_rules = linting_rules or {}
+        self.security_checks = security_checks or {}
+        self.rule_registry = compile_rule_set(self.linting_rules, self.security_checks)
+        self.logger.info(f"Rule set {self.rule_registry.version} compiled with "
+                         f"{len(self.rule_registry.rules)} rules")
+        return self.rule_registry
+    
+    def enable_review_cache(self, path: str) -> ReviewCache:
+        """
+        Store review results on disk and reuse them for unchanged files.
+        
+        Args:
+            path: Path to the review cache database
+            
+        Returns:
+            The review cache
+        """
+        if self.review_cache is not None:
+            self.review_cache.close()
+        self.review_cache = ReviewCache(path)
+        self.logger.info(f"Review cache enabled: {path}")
+        return self.review_cache
+    
+    def enable_rule_profiling(self) -> RuleProfile:
+        """
+        Record wall time, lines scanned and issues emitted per rule and file extension.
+        Timings accumulate over every review until profiling is disabled or reset.
+        
+        Returns:
+            The rule profile
+        """
+        if self.rule_profile is None:
+            self.rule_profile = RuleProfile()
+            self.logger.info("Rule profiling enabled")
+        return self.rule_profile
+    
+    def disable_rule_profiling(self) -> None:
+        """Stop recording rule timings and discard the profile."""
+        self.rule_profile = None
+    
+    def get_rule_profile(self, format: str = "table", by_extension: bool = False,
+                         sort_by: str = "seconds") -> Any:
+        """
+        Report the rule timings recorded so far, slowest rules first.
+        
+        Args:
+            format: "table" for a text table, "json" for a JSON string or "dict"
+            by_extension: One table row per rule and file extension
+            sort_by: Column to sort by (files, seconds, lines or issues)
+            
+        Returns:
+            The report, or None if profiling is not enabled
+        """
+        if self.rule_profile is None:
+            return None
+        if format == "table":
+            return self.rule_profile.format_table(by_extension, sort_by)
+        if format == "json":
+            return self.rule_profile.to_json(sort_by)
+        if format == "dict":
+            return self.rule_profile.as_dict(sort_by)
+        raise ValueError(f"Unsupported profile format: {format}")
     
     def review_code(self, file_path: str, code_content: str = None) -> Dict[str, Any]:
         """
@@ -75,35 +219,51 @@ class DebuggerAgent(BaseAgent):
         }
         
         try:
+            cache = self.review_cache
+            version = self.rule_registry.version
+            stat = None
+            entry = None
+            lines = None
+            
             # Get code content if not provided
             if code_content is None:
                 if os.path.exists(file_path):
-                    with open(file_path, 'r') as f:
-                        code_content = f.read()
+                    stat = os.stat(file_path)
+                    if self.streaming_threshold is not None and stat.st_size >= self.streaming_threshold:
+                        return self.review_code_streaming(file_path)
+                    # Fast path: same mtime and size as the last review of this file
+                    if cache is not None:
+                        entry = cache.get_for_file(file_path, version, stat.st_mtime_ns, stat.st_size)
+                    if entry is None:
+                        with open(file_path, 'r') as f:
+                            code_content = f.read()
                 else:
                     self.logger.error(f"File not found: {file_path}")
                     self.current_review["status"] = "failed"
                     self.current_review["error"] = "File not found"
                     return self.current_review
             
-            # Perform code review
-            issues = []
-            
-            # Check for syntax errors
-            syntax_issues = self._check_syntax(file_path, code_content)
-            issues.extend(syntax_issues)
-            
-            # Check for code style issues
-            style_issues = self._check_code_style(file_path, code_content)
-            issues.extend(style_issues)
-            
-            # Check for security vulnerabilities
-            security_issues = self._check_security(file_path, code_content)
-            issues.extend(security_issues)
+            if entry is None and cache is not None:
+                digest = content_hash(code_content)
+                entry = cache.get(digest, version)
             
-            # Check for performance issues
-            performance_issues = self._check_performance(file_path, code_content)
-            issues.extend(performance_issues)
+            if entry is not None:
+                issues = entry["issues"]
+                lines_of_code = entry["lines_of_code"]
+                self.current_review["cached"] = True
+                if stat is not None and code_content is not None:
+                    # Same content under a new mtime: remember the new stat for the fast path
+                    cache.put(entry["content_hash"], version, issues, lines_of_code,
+                              file_path, stat.st_mtime_ns, stat.st_size)
+            else:
+                # Perform code review: every rule runs in a single pass over the file's lines
+                source = SourceFile(file_path, code_content)
+                issues = self.rule_registry.run(source, profile=self.rule_profile)
+                lines_of_code = len(source.lines)
+                lines = source.lines
+                if cache is not None:
+                    cache.put(digest, version, issues, lines_of_code, file_path if stat else None,
+                              stat.st_mtime_ns if stat else None, stat.st_size if stat else None)
             
             # Update current review
             self.current_review["issues"] = issues
@@ -111,11 +271,11 @@ class DebuggerAgent(BaseAgent):
             self.current_review["status"] = "completed"
             self.current_review["completed_at"] = datetime.now().isoformat()
             
-            # Add to completed reviews
-            self.completed_reviews.append(self.current_review)
+            # Add to completed reviews, keeping the issues in the columnar store
+            self._store_completed_review(lines)
             
             # Calculate code quality metrics
-            self._calculate_code_quality_metrics(file_path, code_content, issues)
+            self._calculate_code_quality_metrics(file_path, code_content, issues, lines_of_code)
             
             return self.current_review
             
@@ -125,6 +285,135 @@ class DebuggerAgent(BaseAgent):
             self.current_review["error"] = str(e)
             return self.current_review
     
+    def review_code_streaming(self, file_path: str, max_issues: Optional[int] = None) -> Dict[str, Any]:
+        """
+        Review a large file without reading it into memory.
+        The file is memory-mapped and its lines are decoded one at a time;
+        rules that need the whole file (syntax, imports, docstrings, brackets)
+        are skipped and the review stops at the issue cap.
+        
+        Args:
+            file_path: Path to the file to review
+            max_issues: Issue cap (defaults to max_streaming_issues)
+            
+        Returns:
+            Dictionary containing review results
+        """
+        self.logger.info(f"Reviewing code (streaming): {file_path}")
+        
+        self.current_review = {
+            "file_path": file_path,
+            "started_at": datetime.now().isoformat(),
+            "issues": [],
+            "status": "in_progress"
+        }
+        
+        try:
+            result = review_file_streaming(self.rule_registry, file_path,
+                                           max_issues if max_issues is not None else self.max_streaming_issues,
+                                           profile=self.rule_profile)
+            
+            self.current_review.update({
+                "issues": result["issues"],
+                "issues_count": result["issues_count"],
+                "streaming": True,
+                "truncated": result["truncated"],
+                "skipped_rules": result["skipped_rules"],
+                "status": "completed",
+                "completed_at": datetime.now().isoformat()
+            })
+            self._store_completed_review()
+            self._update_quality_metrics(file_path, result["metrics"])
+            
+            return self.current_review
+            
+        except Exception as e:
+            self.logger.error(f"Error reviewing code: {str(e)}")
+            self.current_review["status"] = "failed"
+            self.current_review["error"] = str(e)
+            return self.current_review
+    
+    def _store_completed_review(self, lines: Optional[List[str]] = None) -> None:
+        """
+        Record the current review as completed.
+        The stored copy refers to its issues in the issue store instead of holding the issue list.
+        
+        Args:
+            lines: Optional lines of the reviewed file
+        """
+        review = dict(self.current_review)
+        review["issues"] = self.issue_store.add(review["file_path"], review["issues"], lines)
+        self.completed_reviews.append(review)
+        
+        if len(self.completed_reviews) > self.max_completed_reviews:
+            del self.completed_reviews[:-self.max_completed_reviews]
+            # Reclaim the issues of dropped reviews once they make up most of the store
+            views = [review["issues"] for review in self.completed_reviews]
+            if len(self.issue_store) > 2 * sum(len(view) for view in views) + 1024:
+                self.issue_store.compact(views)
+    
+    def _update_quality_metrics(self, file_path: str, metrics: Dict[str, Any]) -> None:
+        """
+        Add the metrics of a review to the rolling metrics.
+        
+        Args:
+            file_path: Path to the file
+            metrics: Code quality metrics of the review
+        """
+        self.metrics_store.record(file_path, metrics)
+    
+    @property
+    def code_quality_metrics(self) -> Dict[str, Dict[str, Any]]:
+        """Latest metrics of each tracked file (the metrics store bounds how many files are kept)."""
+        return {file_path: entry["metrics"] for file_path, entry in self.metrics_store.files.items()}
+    
+    def get_quality_trends(self, window_seconds: Optional[float] = 24 * 3600,
+                           file_path: Optional[str] = None, top: int = 10) -> Dict[str, Any]:
+        """
+        Get rolling code-quality metrics.
+        Answered from running totals, without replaying past reviews.
+        
+        Args:
+            window_seconds: Length of the recent window (None for every review since the agent started)
+            file_path: Optional file whose trend to include
+            top: Number of worst offenders to include
+            
+        Returns:
+            Dictionary with the window totals (issues per KLOC by type and severity),
+            the worst offenders and, if requested, the file's trend
+        """
+        trends = {
+            "window": self.metrics_store.window(window_seconds),
+            "worst_offenders": self.metrics_store.worst_offenders(top)
+        }
+        if file_path is not None:
+            trends["file_trend"] = self.metrics_store.file_trend(file_path)
+        return trends
+    
+    def export_issues(self, destination: Union[str, TextIO], format: str = "sarif") -> Dict[str, Any]:
+        """
+        Export the issues of all completed reviews.
+        Issues are written one at a time from the issue store.
+        
+        Args:
+            destination: Output file path or text stream
+            format: "sarif" or "jsonl"
+            
+        Returns:
+            Dictionary with the number of issues written
+        """
+        stream = open(destination, 'w') if isinstance(destination, str) else destination
+        try:
+            with create_writer(stream, format, self.rule_registry.rules) as writer:
+                for issue in self.issue_store.iter_issues():
+                    writer.write(issue.pop("file_path"), issue)
+        finally:
+            if stream is not destination:
+                stream.close()
+        
+        self.logger.info(f"Exported {writer.count} issues as {format}")
+        return {"format": format, "issues": writer.count}
+    
     def _check_syntax(self, file_path: str, code_content: str) -> List[Dict[str, Any]]:
         """
         Check for syntax errors in the code.
@@ -136,76 +425,7 @@ class DebuggerAgent(BaseAgent):
         Returns:
             List of syntax issues
         """
-        issues = []
-        
-        # Determine file type
-        file_extension = os.path.splitext(file_path)[1].lower()
-        
-        if file_extension in ['.py', '.pyw']:
-            # Python syntax check
-            try:
-                compile(code_content, file_path, 'exec')
-            except SyntaxError as e:
-                issues.append({
-                    "type": "syntax",
-                    "severity": "critical",
-                    "message": f"Syntax error: {str(e)}",
-                    "line": e.lineno,
-                    "column": e.offset,
-                    "code": e.text.strip() if e.text else ""
-                })
-        
-        elif file_extension in ['.js', '.jsx', '.ts', '.tsx']:
-            # JavaScript/TypeScript syntax check (simplified)
-            # In a real implementation, we would use a proper parser
-            
-            # Check for mismatched brackets
-            brackets = {'(': ')', '[': ']', '{': '}'}
-            stack = []
-            
-            for i, char in enumerate(code_content):
-                if char in brackets.keys():
-                    stack.append((char, i))
-                elif char in brackets.values():
-                    if not stack:
-                        line_number = code_content[:i].count('\n') + 1
-                        column = i - code_content[:i].rfind('\n')
-                        issues.append({
-                            "type": "syntax",
-                            "severity": "critical",
-                            "message": f"Unmatched closing bracket: {char}",
-                            "line": line_number,
-                            "column": column,
-                            "code": code_content.splitlines()[line_number-1] if line_number <= len(code_content.splitlines()) else ""
-                        })
-                    else:
-                        open_bracket, _ = stack.pop()
-                        if char != brackets[open_bracket]:
-                            line_number = code_content[:i].count('\n') + 1
-                            column = i - code_content[:i].rfind('\n')
-                            issues.append({
-                                "type": "syntax",
-                                "severity": "critical",
-                                "message": f"Mismatched brackets: {open_bracket} and {char}",
-                                "line": line_number,
-                                "column": column,
-                                "code": code_content.splitlines()[line_number-1] if line_number <= len(code_content.splitlines()) else ""
-                            })
-            
-            # Check for unclosed brackets
-            for bracket, pos in stack:
-                line_number = code_content[:pos].count('\n') + 1
-                column = pos - code_content[:pos].rfind('\n')
-                issues.append({
-                    "type": "syntax",
-                    "severity": "critical",
-                    "message": f"Unclosed bracket: {bracket}",
-                    "line": line_number,
-                    "column": column,
-                    "code": code_content.splitlines()[line_number-1] if line_number <= len(code_content.splitlines()) else ""
-                })
-        
-        return issues
+        return self.rule_registry.run(SourceFile(file_path, code_content), issue_types=("syntax",))
     
     def _check_code_style(self, file_path: str, code_content: str) -> List[Dict[str, Any]]:
         """
@@ -218,107 +438,7 @@ class DebuggerAgent(BaseAgent):
         Returns:
             List of code style issues
         """
-        issues = []
-        
-        # Determine file type
-        file_extension = os.path.splitext(file_path)[1].lower()
-        
-        # Common style checks for all languages
-        
-        # Check for long lines
-        max_line_length = 100
-        for i, line in enumerate(code_content.splitlines()):
-            if len(line) > max_line_length:
-                issues.append({
-                    "type": "style",
-                    "severity": "low",
-                    "message": f"Line too long ({len(line)} > {max_line_length} characters)",
-                    "line": i + 1,
-                    "column": 1,
-                    "code": line
-                })
-        
-        # Check for trailing whitespace
-        for i, line in enumerate(code_content.splitlines()):
-            if line.rstrip() != line:
-                issues.append({
-                    "type": "style",
-                    "severity": "low",
-                    "message": "Trailing whitespace",
-                    "line": i + 1,
-                    "column": len(line.rstrip()) + 1,
-                    "code": line
-                })
-        
-        # Language-specific style checks
-        if file_extension in ['.py', '.pyw']:
-            # Python style checks
-            
-            # Check for missing docstrings
-            if not re.search(r'""".*?"""', code_content, re.DOTALL):
-                issues.append({
-                    "type": "style",
-                    "severity": "medium",
-                    "message": "Missing module docstring",
-                    "line": 1,
-                    "column": 1,
-                    "code": ""
-                })
-            
-            # Check for unused imports
-            import_pattern = r'^import\s+(\w+)|^from\s+(\w+)\s+import\s+(.+)$'
-            imports = []
-            
-            for i, line in enumerate(code_content.splitlines()):
-                match = re.match(import_pattern, line)
-                if match:
-                    if match.group(1):  # import module
-                        imports.append(match.group(1))
-                    elif match.group(3):  # from module import ...
-                        for name in re.split(r',\s*', match.group(3)):
-                            if name != '*':
-                                imports.append(name.strip())
-            
-            for imp in imports:
-                if imp not in code_content.replace(f"import {imp}", "").replace(f"from {imp} import", ""):
-                    issues.append({
-                        "type": "style",
-                        "severity": "low",
-                        "message": f"Unused import: {imp}",
-                        "line": next((i + 1 for i, line in enumerate(code_content.splitlines()) if imp in line and ('import' in line or 'from' in line)), 1),
-                        "column": 1,
-                        "code": next((line for line in code_content.splitlines() if imp in line and ('import' in line or 'from' in line)), "")
-                    })
-        
-        elif file_extension in ['.js', '.jsx', '.ts', '.tsx']:
-            # JavaScript/TypeScript style checks
-            
-            # Check for missing semicolons
-            for i, line in enumerate(code_content.splitlines()):
-                line = line.strip()
-                if line and not line.endswith(';') and not line.endswith('{') and not line.endswith('}') and not line.endswith(',') and not line.startswith('//'):
-                    issues.append({
-                        "type": "style",
-                        "severity": "low",
-                        "message": "Missing semicolon",
-                        "line": i + 1,
-                        "column": len(line) + 1,
-                        "code": line
-                    })
-            
-            # Check for console.log statements
-            for i, line in enumerate(code_content.splitlines()):
-                if 'console.log' in line and not line.strip().startswith('//'):
-                    issues.append({
-                        "type": "style",
-                        "severity": "medium",
-                        "message": "Console statement should be removed in production code",
-                        "line": i + 1,
-                        "column": line.find('console.log') + 1,
-                        "code": line
-                    })
-        
-        return issues
+        return self.rule_registry.run(SourceFile(file_path, code_content), issue_types=("style",))
     
     def _check_security(self, file_path: str, code_content: str) -> List[Dict[str, Any]]:
         """
@@ -331,66 +451,476 @@ class DebuggerAgent(BaseAgent):
         Returns:
             List of security issues
         """
-        issues = []
-        
-        # Determine file type
-        file_extension = os.path.splitext(file_path)[1].lower()
-        
-        # Common security checks for all languages
-        
-        # Check for hardcoded credentials
-        credential_patterns = [
-            (r'password\s*=\s*["\']([^"\']+)["\']', "Hardcoded password"),
-            (r'api[_\s]*key\s*=\s*["\']([^"\']+)["\']', "Hardcoded API key"),
-            (r'secret\s*=\s*["\']([^"\']+)["\']', "Hardcoded secret"),
-            (r'token\s*=\s*["\']([^"\']+)["\']', "Hardcoded token")
-        ]
-        
-        for i, line in enumerate(code_content.splitlines()):
-            for pattern, message in credential_patterns:
-                match = re.search(pattern, line, re.IGNORECASE)
-                if match and not line.strip().startswith(('#', '//', '/*')):
-                    issues.append({
-                        "type": "security",
-                        "severity": "critical",
-                        "message": message,
-                        "line": i + 1,
-                        "column": match.start() + 1,
-                        "code": line
-                    })
-        
-        # Language-specific security checks
-        if file_extension in ['.py', '.pyw']:
-            # Python security checks
-            
-            # Check for SQL injection vulnerabilities
-            sql_patterns = [
-                r'execute\s*\(\s*[f"\'](.*?)["\']',
-                r'executemany\s*\(\s*[f"\'](.*?)["\']',
-                r'cursor\.execute\s*\(\s*[f"\'](.*?)["\']'
-            ]
-            
-            for i, line in enumerate(code_content.splitlines()):
-                for pattern in sql_patterns:
-                    match = re.search(pattern, line)
-                    if match and '{' in match.group(1) and not line.strip().startswith('#'):
-                        issues.append({
-                            "type": "security",
-                            "severity": "critical",
-                            "message": "Potential SQL injection vulnerability",
-                            "line": i + 1,
-                            "column": match.start() + 1,
-                            "code": line
-                        })
-            
-            # Check for unsafe deserialization
-            if 'pickle.loads' in code_content or 'yaml.load(' in code_content:
-                for i, line in enumerate(code_content.splitlines()):
-                    if 'pickle.loads' in line and not line.strip().startswith('#'):
-                        issues.append({
-                            "type": "security",
-                            "severity": "high",
-                            "message": "Unsafe deserialization with pickle.loads",
-                            "line": i + 1,
-                            "column": line.find('pickle.loads') + 1,
-                     <response clipped><NOTE>To save on context only part of this file has been shown to you. You should retry this tool after you have searched inside the file with `grep -n` in order to find the line numbers of what you are looking for.</NOTE>
\ No newline at end of file
+        return self.rule_registry.run(SourceFile(file_path, code_content), issue_types=("security",))
+    
+    def _check_performance(self, file_path: str, code_content: str) -> List[Dict[str, Any]]:
+        """
+        Check for performance issues.
+        
+        Args:
+            file_path: Path to the file
+            code_content: Code content
+            
+        Returns:
+            List of performance issues
+        """
+        return self.rule_registry.run(SourceFile(file_path, code_content), issue_types=("performance",))
+    
+    def _calculate_code_quality_metrics(self, file_path: str, code_content: str, issues: List[Dict[str, Any]],
+                                        lines_of_code: Optional[int] = None) -> Dict[str, Any]:
+        """
+        Calculate code quality metrics for a reviewed file.
+        
+        Args:
+            file_path: Path to the file
+            code_content: Code content
+            issues: Issues found in the file
+            lines_of_code: Optional line count (computed from code_content if not provided)
+            
+        Returns:
+            Dictionary containing code quality metrics
+        """
+        if lines_of_code is None:
+            lines_of_code = len(code_content.splitlines())
+        
+        metrics = calculate_quality_metrics(issues, lines_of_code)
+        self._update_quality_metrics(file_path, metrics)
+        return metrics
+    
+    def review_tree(self, root: str, include: Optional[Iterable[str]] = None,
+                    exclude: Optional[Iterable[str]] = None, max_workers: Optional[int] = None,
+                    batches_per_worker: int = 4, changed_files: Optional[Iterable[str]] = None,
+                    only_files: Optional[Iterable[str]] = None) -> Iterator[Dict[str, Any]]:
+        """
+        Review every matching file under a directory.
+        
+        Files are split into size-balanced batches that run on a process pool.
+        Results are yielded per file as their batch finishes, followed by one
+        aggregate result. Per-file results are not kept by the agent, only
+        their quality metrics.
+        
+        With a review cache, files whose mtime and size match their last review
+        are answered from the cache without being read, and workers look up
+        the remaining files by content hash before running the rules.
+        
+        Args:
+            root: Root directory
+            include: Glob patterns of files to review (defaults to the supported languages)
+            exclude: Glob patterns of files and directories to skip
+            max_workers: Number of worker processes (defaults to the CPU count; 1 reviews in-process)
+            batches_per_worker: Batches per worker, more batches stream results sooner
+            changed_files: Optional paths of the files known to have changed; every other
+                file reuses its last cached review without being checked
+            only_files: Optional paths of the only files to review (the tree is not walked)
+            
+        Returns:
+            Iterator of per-file results ("result_type": "file") ending with the
+            aggregate ("result_type": "summary")
+        """
+        self.logger.info(f"Reviewing tree: {root}")
+        
+        summary = TreeReviewSummary(root)
+        cache = self.review_cache
+        version = self.rule_registry.version
+        changed = {os.path.abspath(path) for path in changed_files} if changed_files is not None else None
+        
+        if only_files is not None:
+            sources = ((file_path, os.path.getsize(file_path)) for file_path in sorted(set(only_files))
+                       if os.path.isfile(file_path))
+        else:
+            sources = iter_source_files(root, include, exclude)
+        
+        files = []
+        for file_path, size in sources:
+            entry = None
+            if cache is not None:
+                if changed is not None:
+                    if os.path.abspath(file_path) not in changed:
+                        entry = cache.get_for_file(file_path, version)
+                else:
+                    stat = os.stat(file_path)
+                    entry = cache.get_for_file(file_path, version, stat.st_mtime_ns, stat.st_size)
+            
+            if entry is None:
+                files.append((file_path, size))
+                continue
+            
+            result = cached_review_result(file_path, entry, size)
+            summary.add(result)
+            self._update_quality_metrics(file_path, result["metrics"])
+            result["result_type"] = "file"
+            yield result
+        
+        max_workers = max_workers or os.cpu_count() or 1
+        batches = balance_batches(files, max_workers * batches_per_worker)
+        
+        try:
+            for result in self._run_review_batches(batches, max_workers):
+                profile_records = result.pop("rule_profile", None)
+                if profile_records and self.rule_profile is not None:
+                    self.rule_profile.merge(profile_records)
+                summary.add(result)
+                if result["status"] == "completed":
+                    self._update_quality_metrics(result["file_path"], result["metrics"])
+                    if cache is not None and "content_hash" in result:
+                        cache.put(result["content_hash"], version, result["issues"],
+                                  result["metrics"]["lines_of_code"], result["file_path"],
+                                  result["mtime_ns"], result["file_size"], commit=False)
+                result["result_type"] = "file"
+                yield result
+        finally:
+            if cache is not None:
+                cache.commit()
+        
+        aggregate = summary.as_dict()
+        aggregate["result_type"] = "summary"
+        self.logger.info(f"Reviewed {aggregate['files_reviewed']} files under {root}: "
+                         f"{aggregate['issues_count']} issues ({aggregate['files_cached']} from cache)")
+        yield aggregate
+    
+    def review_changes(self, root: str, changed_files: Optional[Iterable[str]] = None,
+                       base_revision: Optional[str] = None, **options) -> Iterator[Dict[str, Any]]:
+        """
+        Review a directory incrementally.
+        Only changed files are analysed again; every other file reuses its
+        cached review (files never reviewed before are analysed as well).
+        
+        Args:
+            root: Root directory
+            changed_files: Paths of the changed files (e.g. from git diff --name-only),
+                relative to root or absolute
+            base_revision: Git revision to diff against when changed_files is not given
+            **options: Other review_tree options (include, exclude, max_workers, ...)
+            
+        Returns:
+            Iterator of per-file results ending with the aggregate
+        """
+        if changed_files is None:
+            changed_files = git_changed_files(root, base_revision or "HEAD")
+        else:
+            changed_files = [os.path.join(root, path) for path in changed_files]
+        
+        if self.review_cache is None:
+            self.logger.warning("Incremental review without a review cache reviews every file")
+        
+        return self.review_tree(root, changed_files=changed_files, **options)
+    
+    def review_impacted(self, root: str, changed_files: Optional[Iterable[str]] = None,
+                        base_revision: Optional[str] = None, include: Optional[Iterable[str]] = None,
+                        exclude: Optional[Iterable[str]] = None, max_depth: Optional[int] = None,
+                        **options) -> Iterator[Dict[str, Any]]:
+        """
+        Review the files a change impacts: the changed files and every file
+        importing them, directly or transitively.
+        
+        The import graph of the directory is kept between calls and updated
+        incrementally; with a review cache, parsed imports are also cached by
+        content hash. Without changed_files or base_revision, the change set is
+        what changed on disk since the previous call (everything on the first).
+        
+        Args:
+            root: Root directory
+            changed_files: Paths of the changed files, relative to root or absolute
+            base_revision: Git revision to diff against when changed_files is not given
+            include: Glob patterns of files to consider (defaults to the supported languages)
+            exclude: Glob patterns of files and directories to skip
+            max_depth: Optional limit on the number of import hops followed
+            **options: Other review_tree options (max_workers, batches_per_worker)
+            
+        Returns:
+            Iterator of per-file results for the impacted files ending with the aggregate,
+            which also holds the number of changed and impacted files
+        """
+        graph = self.get_dependency_graph(root, include, exclude, options.get("max_workers") or 1)
+        update = graph.last_update
+        
+        if changed_files is not None:
+            changed_files = [os.path.join(root, path) for path in changed_files]
+        elif base_revision is not None:
+            changed_files = git_changed_files(root, base_revision)
+        
+        if changed_files is None:
+            changed_files, impacted = update["changed"], update["impacted"]
+        else:
+            impacted = graph.impacted(changed_files, max_depth)
+        self.logger.info(f"{len(changed_files)} changed files impact {len(impacted)} files under {root}")
+        
+        for result in self.review_tree(root, include, exclude, changed_files=impacted, only_files=impacted, **options):
+            if result["result_type"] == "summary":
+                result["changed_files"] = len(changed_files)
+                result["impacted_files"] = len(impacted)
+            yield result
+    
+    def get_dependency_graph(self, root: str, include: Optional[Iterable[str]] = None,
+                             exclude: Optional[Iterable[str]] = None, max_workers: int = 1) -> DependencyGraph:
+        """
+        Get the up-to-date import graph of a directory.
+        The graph is kept per directory and updated incrementally on each call.
+        
+        Args:
+            root: Root directory
+            include: Glob patterns of files to include (defaults to the supported languages)
+            exclude: Glob patterns of files and directories to skip
+            max_workers: Number of worker processes scanning changed files
+            
+        Returns:
+            The dependency graph (its last_update holds the changes this call found)
+        """
+        key = (os.path.abspath(root), tuple(include) if include is not None else None,
+               tuple(exclude) if exclude is not None else None)
+        graph = self.dependency_graphs.get(key)
+        if graph is None:
+            graph = self.dependency_graphs[key] = DependencyGraph(root, include, exclude, self.review_cache)
+        graph.update(max_workers)
+        return graph
+    
+    def find_duplicate_code(self, root: str, include: Optional[Iterable[str]] = None,
+                            exclude: Optional[Iterable[str]] = None, min_lines: int = MIN_CLONE_LINES,
+                            max_workers: int = 1) -> Dict[str, Any]:
+        """
+        Find copy-pasted code under a directory.
+        
+        Files are fingerprinted from their normalized tokens, so copies with
+        renamed identifiers or changed literals still match. The fingerprint
+        index is updated incrementally: only files changed since the last call
+        are fingerprinted again. It is kept in memory unless a "clone_index"
+        database path is configured.
+        
+        Args:
+            root: Root directory
+            include: Glob patterns of files to check (defaults to the supported languages)
+            exclude: Glob patterns of files and directories to skip
+            min_lines: Minimum length of a reported clone
+            max_workers: Number of worker processes fingerprinting changed files
+            
+        Returns:
+            Dictionary with the clone pairs, the groups of files sharing widely copied code,
+            clone clusters and the index update counts
+        """
+        if self.clone_index is None:
+            self.clone_index = CloneIndex()
+        
+        update = self.clone_index.update(root, include, exclude, max_workers)
+        clones = self.clone_index.find_clones(min_lines=min_lines)
+        clones["index"] = update
+        self.logger.info(f"Found {len(clones['pairs'])} clone pairs in {len(clones['clusters'])} clusters under {root}")
+        return clones
+    
+    def apply_fixes(self, path: str, rules: Optional[Iterable[str]] = None, dry_run: bool = False,
+                    include: Optional[Iterable[str]] = None, exclude: Optional[Iterable[str]] = None,
+                    max_workers: Optional[int] = None) -> Dict[str, Any]:
+        """
+        Fix mechanical issues (trailing whitespace, missing semicolons, unused
+        Python imports and console.log statements) in a file or directory.
+        
+        Each file is reviewed, the edits for its fixable issues are planned so
+        they do not overlap, applied in one pass and written back once through
+        a temporary file that is renamed over the original. Edits that would
+        change the meaning of the code (e.g. whitespace inside a multi-line
+        string) are not made, and a file that would no longer parse, or that
+        changed on disk during the run, is left alone. Directories are
+        processed in size-balanced batches on a process pool.
+        
+        Args:
+            path: File or root directory
+            rules: Optional IDs of the rules to fix (defaults to every fixable rule)
+            dry_run: Return a unified diff of the fixes instead of writing them
+            include: Glob patterns of files to fix (defaults to the supported languages)
+            exclude: Glob patterns of files and directories to skip
+            max_workers: Number of worker processes (defaults to the CPU count; 1 fixes in-process)
+        
+        Returns:
+            Dictionary with the results of the files with fixable issues, the number of
+            fixes applied and left unfixed per rule and, in a dry run, the combined diff
+        """
+        rules = list(rules) if rules is not None else None
+        if os.path.isfile(path):
+            results = [fix_file(self.rule_registry, path, rules, dry_run)]
+            files_checked = 1
+        else:
+            files = list(iter_source_files(path, include, exclude))
+            files_checked = len(files)
+            max_workers = max_workers or os.cpu_count() or 1
+            batches = balance_batches(files, max_workers * 4)
+            if max_workers <= 1 or len(batches) <= 1:
+                results = [fix_file(self.rule_registry, file_path, rules, dry_run, path)
+                           for batch in batches for file_path in batch]
+            else:
+                with ProcessPoolExecutor(max_workers=max_workers, initializer=init_fix_worker,
+                                         initargs=(self.rule_registry, rules, dry_run, path)) as executor:
+                    results = [result for batch_results in executor.map(fix_batch, batches)
+                               for result in batch_results]
+        
+        results = [result for result in results if result["status"] != "unchanged" or result["unfixed"]]
+        results.sort(key=lambda result: result["file_path"])
+        applied = {}
+        unfixed = {}
+        for result in results:
+            for rule_id, count in result["applied"].items():
+                applied[rule_id] = applied.get(rule_id, 0) + count
+            for rule_id, count in result["unfixed"].items():
+                unfixed[rule_id] = unfixed.get(rule_id, 0) + count
+        
+        summary = {
+            "path": path,
+            "dry_run": dry_run,
+            "files_checked": files_checked,
+            "files_changed": sum(1 for result in results if result["status"] in ("fixed", "previewed")),
+            "fixes_applied": sum(applied.values()),
+            "fixes_unfixed": sum(unfixed.values()),
+            "applied": applied,
+            "unfixed": unfixed,
+            "files": results
+        }
+        if dry_run:
+            summary["diff"] = "".join(result.get("diff", "") for result in results)
+        else:
+            self.fixed_issues.append({
+                "path": path,
+                "files_changed": summary["files_changed"],
+                "applied": applied,
+                "timestamp": datetime.now().isoformat()
+            })
+        
+        self.logger.info(f"{'Previewed' if dry_run else 'Applied'} {summary['fixes_applied']} fixes in "
+                         f"{summary['files_changed']} of {files_checked} files under {path}")
+        return summary
+    
+    def subscribe(self, subscriber: Any) -> None:
+        """
+        Subscribe to review notifications pushed by watch.
+        
+        Args:
+            subscriber: An agent (messages are passed to its receive_message) or a callable taking the message
+        """
+        if subscriber not in self.subscribers:
+            self.subscribers.append(subscriber)
+    
+    def unsubscribe(self, subscriber: Any) -> None:
+        """
+        Stop sending notifications to a subscriber.
+        
+        Args:
+            subscriber: A subscribed agent or callable
+        """
+        if subscriber in self.subscribers:
+            self.subscribers.remove(subscriber)
+    
+    def _notify_subscribers(self, action: str, data: Dict[str, Any]) -> None:
+        """
+        Push a notification message to every subscriber.
+        
+        Args:
+            action: Message action
+            data: Message data
+        """
+        for subscriber in list(self.subscribers):
+            receiver = getattr(subscriber, "name", "subscriber")
+            message = {
+                "id": str(uuid.uuid4()),
+                "sender": self.name,
+                "receiver": receiver,
+                "message_type": "notification",
+                "content": {
+                    "action": action,
+                    "data": data,
+                    "priority": "medium",
+                    "timestamp": datetime.now().isoformat()
+                }
+            }
+            try:
+                if hasattr(subscriber, "receive_message"):
+                    subscriber.receive_message(message)
+                else:
+                    subscriber(message)
+            except Exception as e:
+                self.logger.error(f"Error notifying subscriber {receiver}: {str(e)}")
+    
+    def watch(self, root: str, include: Optional[Iterable[str]] = None, exclude: Optional[Iterable[str]] = None,
+              debounce: float = 0.05, max_delay: float = 1.0, poll_interval: float = 0.25,
+              use_inotify: Optional[bool] = None, incremental_threshold: int = INCREMENTAL_THRESHOLD,
+              start: bool = True) -> SourceWatch:
+        """
+        Watch a directory and re-review files as they change.
+        
+        Changes are detected with inotify where available, otherwise by polling
+        a directory-level mtime index. Bursts of saves are debounced, only the
+        changed files are reviewed, and large files whose rules are all
+        line-local are re-checked only in their edited region. Each batch is
+        pushed to subscribers as a "review_updated" notification.
+        
+        Args:
+            root: Root directory
+            include: Glob patterns of files to watch (defaults to the supported languages)
+            exclude: Glob patterns of files and directories to skip
+            debounce: Seconds without changes that end a burst
+            max_delay: Maximum seconds to keep collecting a burst
+            poll_interval: Seconds between polls when polling
+            use_inotify: True to require inotify, False to poll, None to use inotify where available
+            incremental_threshold: Size from which files are re-checked region by region
+            start: Start watching in a background thread (otherwise call run_once)
+            
+        Returns:
+            The running watch (call stop to end it)
+        """
+        monitor = create_monitor(root, include, exclude, use_inotify, poll_interval)
+        reviewer = IncrementalReviewer(self.rule_registry, incremental_threshold, self.streaming_threshold,
+                                       self.max_streaming_issues)
+        
+        def publish(results: List[Dict[str, Any]], elapsed_ms: float) -> None:
+            for result in results:
+                if result["status"] == "completed":
+                    self._update_quality_metrics(result["file_path"], result["metrics"])
+                elif result["status"] == "deleted":
+                    self.metrics_store.forget(result["file_path"])
+            self.logger.info(f"Re-reviewed {len(results)} changed files under {root} in {elapsed_ms:.1f} ms")
+            self._notify_subscribers("review_updated", {
+                "root": root,
+                "results": results,
+                "issues_count": sum(result["issues_count"] for result in results),
+                "elapsed_ms": elapsed_ms
+            })
+        
+        source_watch = SourceWatch(monitor, reviewer, publish, debounce, max_delay)
+        self.watches.append(source_watch)
+        self.logger.info(f"Watching {root} with {type(monitor).__name__}")
+        return source_watch.start() if start else source_watch
+    
+    def _run_review_batches(self, batches: List[List[str]], max_workers: int) -> Iterator[Dict[str, Any]]:
+        """
+        Review batches of files and yield per-file results as batches finish.
+        At most two batches per worker are in flight so results do not pile up.
+        
+        Args:
+            batches: Batches of file paths
+            max_workers: Number of worker processes
+            
+        Returns:
+            Iterator of per-file results
+        """
+        profile_rules = self.rule_profile is not None
+        if max_workers <= 1 or len(batches) <= 1:
+            for batch in batches:
+                for file_path in batch:
+                    yield review_file(self.rule_registry, file_path, self.review_cache, self.streaming_threshold,
+                                      self.max_streaming_issues, profile_rules)
+            return
+        
+        cache_path = self.review_cache.path if self.review_cache is not None else None
+        remaining = iter(batches)
+        with ProcessPoolExecutor(max_workers=max_workers, initializer=init_worker,
+                                 initargs=(self.rule_registry, cache_path, self.streaming_threshold,
+                                           self.max_streaming_issues, profile_rules)) as executor:
+            pending = set()
+            for batch in remaining:
+                pending.add(executor.submit(review_batch, batch))
+                if len(pending) >= max_workers * 2:
+                    break
+            
+            while pending:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    next_batch = next(remaining, None)
+                    if next_batch is not None:
+                        pending.add(executor.submit(review_batch, next_batch))
+                    yield from future.result()
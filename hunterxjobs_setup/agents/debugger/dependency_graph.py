@@ -0,0 +1,443 @@
+# Dependency Graph Module
+# This file defines the module import graph used by the Debugger agent to find the files a change impacts
+
+import ast
+import os
+import re
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Any, Optional, Iterable, Set
+
+from .review_cache import ReviewCache, content_hash
+from .rules import detect_language, JAVASCRIPT_EXTENSIONS
+from .tree_review import iter_source_files
+
+# Fallback for Python files that do not parse
+_PYTHON_IMPORT_LINE = re.compile(
+    r"^[ \t]*(?:from[ \t]+(\.*[\w.]*)[ \t]+import[ \t]+\(?([\w., \t]+)|import[ \t]+([\w., \t]+))", re.MULTILINE
+)
+
+# ES module imports and re-exports, dynamic import() and require()
+_JS_IMPORT = re.compile(
+    r"""(?:\bimport\s*(?:[\w*${}\s,]+?\s*from\s*)?|\bexport\s*[\w*${}\s,]+?\s*from\s*|\b(?:require|import)\s*\(\s*)"""
+    r"""(['"])([^'"\n]+)\1"""
+)
+
+# Scan result fields kept for each file in the graph
+NODE_FIELDS = ("mtime_ns", "size", "content_hash", "imports")
+
+# Review cache used by scan_file in worker processes (opened on first use)
+_worker_cache = None
+_worker_cache_path = None
+
+
+def extract_python_imports(code_content: str) -> List[str]:
+    """
+    List the modules a Python file imports.
+    "import a.b" also imports its parent packages, and "from a import b" may
+    import the submodule a.b, so both are listed. Relative imports keep their
+    leading dots and are resolved against the importing module later.
+    
+    Args:
+        code_content: Code content
+    
+    Returns:
+        Sorted list of dotted module names
+    """
+    modules = set()
+    
+    def add_import(name: str) -> None:
+        parts = name.split(".")
+        for index in range(1, len(parts) + 1):
+            modules.add(".".join(parts[:index]))
+    
+    def add_from(module: str, names: Iterable[str]) -> None:
+        dots = module[:len(module) - len(module.lstrip("."))]
+        if module != dots:
+            parts = module[len(dots):].split(".")
+            for index in range(1, len(parts) + 1):
+                modules.add(dots + ".".join(parts[:index]))
+        else:
+            modules.add(module)
+        separator = "" if not module or module.endswith(".") else "."
+        for name in names:
+            if name != "*":
+                modules.add(module + separator + name)
+    
+    try:
+        tree = ast.parse(code_content)
+    except (SyntaxError, ValueError):
+        for match in _PYTHON_IMPORT_LINE.finditer(code_content):
+            if match.group(3):
+                for name in match.group(3).split(","):
+                    if name.split():
+                        add_import(name.split()[0])
+            else:
+                add_from(match.group(1), (name.split()[0] for name in match.group(2).split(",") if name.split()))
+        return sorted(modules)
+    
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Import):
+            for alias in node.names:
+                add_import(alias.name)
+        elif isinstance(node, ast.ImportFrom):
+            add_from("." * node.level + (node.module or ""), (alias.name for alias in node.names))
+    return sorted(modules)
+
+
+def extract_javascript_imports(code_content: str) -> List[str]:
+    """
+    List the module specifiers a JavaScript/TypeScript file imports, re-exports or requires.
+    
+    Args:
+        code_content: Code content
+    
+    Returns:
+        Sorted list of specifiers
+    """
+    return sorted({match.group(2) for match in _JS_IMPORT.finditer(code_content)})
+
+
+def scan_file(file_path: str, cache: Optional[ReviewCache] = None) -> Optional[Dict[str, Any]]:
+    """
+    Read a file and extract its imports.
+    
+    Args:
+        file_path: Path to the file
+        cache: Optional review cache holding imports by content hash
+    
+    Returns:
+        Dictionary with the file's mtime, size, content hash and imports and whether they
+        were parsed (not cached), or None if the file cannot be read
+    """
+    try:
+        stat = os.stat(file_path)
+        with open(file_path, 'r', encoding='utf-8', errors='replace') as f:
+            code_content = f.read()
+    except OSError:
+        return None
+    
+    digest = content_hash(code_content)
+    imports = cache.get_imports(digest) if cache is not None else None
+    parsed = imports is None
+    if parsed:
+        if detect_language(file_path) == "python":
+            imports = extract_python_imports(code_content)
+        else:
+            imports = extract_javascript_imports(code_content)
+    return {"file_path": file_path, "mtime_ns": stat.st_mtime_ns, "size": stat.st_size, "content_hash": digest,
+            "imports": imports, "parsed": parsed}
+
+
+def scan_batch(file_paths: List[str], cache_path: Optional[str] = None) -> List[Optional[Dict[str, Any]]]:
+    """
+    Scan a batch of files in a worker process.
+    
+    Args:
+        file_paths: Paths of the files
+        cache_path: Optional path of the review cache database
+    
+    Returns:
+        List of scan results
+    """
+    global _worker_cache, _worker_cache_path
+    if cache_path != _worker_cache_path:
+        _worker_cache = ReviewCache(cache_path) if cache_path else None
+        _worker_cache_path = cache_path
+    return [scan_file(file_path, _worker_cache) for file_path in file_paths]
+
+
+class DependencyGraph:
+    """
+    Import graph of the Python and JavaScript/TypeScript files under a directory.
+    
+    Each file's imports are kept unresolved (module names and specifiers) so
+    they can be cached by content hash, and resolved against the files in the
+    graph. The graph also remembers which files asked for each module, so
+    adding or removing a file only re-resolves the files that import it.
+    Imports of modules outside the directory (packages, the standard
+    library) are ignored.
+    """
+    
+    def __init__(self, root: str, include: Optional[Iterable[str]] = None, exclude: Optional[Iterable[str]] = None,
+                 cache: Optional[ReviewCache] = None):
+        """
+        Initialize an empty graph.
+        
+        Args:
+            root: Root directory
+            include: Glob patterns of files to include (defaults to the supported languages)
+            exclude: Glob patterns of files and directories to skip
+            cache: Optional review cache holding parsed imports by content hash
+        """
+        self.root = os.path.abspath(root)
+        self.include = tuple(include) if include is not None else None
+        self.exclude = tuple(exclude) if exclude is not None else None
+        self.cache = cache
+        # File path -> NODE_FIELDS
+        self.files: Dict[str, Dict[str, Any]] = {}
+        self.dependencies: Dict[str, Set[str]] = {}
+        self.dependents: Dict[str, Set[str]] = {}
+        # Module key (dotted Python name or JavaScript path without extension) -> files providing it
+        self._modules: Dict[str, Set[str]] = {}
+        # Module key -> files importing it, including imports nothing resolves to yet
+        self._wanted: Dict[str, Set[str]] = {}
+        self._wanted_keys: Dict[str, Set[str]] = {}
+        # Result of the latest update
+        self.last_update: Optional[Dict[str, Any]] = None
+    
+    # Module keys
+    
+    def _python_module(self, file_path: str) -> str:
+        """Get the dotted module name of a Python file from the packages (__init__.py files) in the graph."""
+        directory, file_name = os.path.split(file_path)
+        parts = [] if file_name.startswith("__init__.") else [os.path.splitext(file_name)[0]]
+        while os.path.join(directory, "__init__.py") in self.files:
+            directory, package = os.path.split(directory)
+            parts.append(package)
+        return ".".join(reversed(parts))
+    
+    def _provided_keys(self, file_path: str) -> List[str]:
+        """Get the module keys a file can be imported by."""
+        if detect_language(file_path) == "python":
+            return [self._python_module(file_path)]
+        base, extension = os.path.splitext(file_path)
+        keys = [base]
+        if os.path.basename(base) == "index":
+            keys.append(os.path.dirname(base))
+        return keys
+    
+    def _wanted_keys_of(self, file_path: str) -> Set[str]:
+        """Get the module keys a file's imports refer to."""
+        imports = self.files[file_path]["imports"]
+        keys = set()
+        if detect_language(file_path) == "python":
+            module = self._python_module(file_path)
+            package = module.split(".")
+            if not os.path.basename(file_path).startswith("__init__."):
+                package = package[:-1]
+            for name in imports:
+                level = len(name) - len(name.lstrip("."))
+                if level:
+                    if level - 1 > len(package):
+                        continue
+                    base = package[:len(package) - (level - 1)]
+                    name = ".".join(base + ([name[level:]] if name[level:] else []))
+                if name:
+                    keys.add(name)
+        else:
+            directory = os.path.dirname(file_path)
+            for specifier in imports:
+                if specifier.startswith("."):
+                    base, extension = os.path.splitext(os.path.normpath(os.path.join(directory, specifier)))
+                    keys.add(base if extension in JAVASCRIPT_EXTENSIONS else base + extension)
+        return keys
+    
+    # Updates
+    
+    def _resolve(self, file_path: str) -> None:
+        """Recompute the dependencies of a file."""
+        self._unresolve(file_path)
+        keys = self._wanted_keys_of(file_path)
+        self._wanted_keys[file_path] = keys
+        dependencies = set()
+        for key in keys:
+            self._wanted.setdefault(key, set()).add(file_path)
+            dependencies.update(self._modules.get(key, ()))
+        dependencies.discard(file_path)
+        self.dependencies[file_path] = dependencies
+        for dependency in dependencies:
+            self.dependents.setdefault(dependency, set()).add(file_path)
+    
+    def _unresolve(self, file_path: str) -> None:
+        """Drop the dependency edges of a file."""
+        for key in self._wanted_keys.pop(file_path, ()):
+            importers = self._wanted.get(key)
+            if importers is not None:
+                importers.discard(file_path)
+                if not importers:
+                    del self._wanted[key]
+        for dependency in self.dependencies.pop(file_path, ()):
+            self.dependents.get(dependency, set()).discard(file_path)
+    
+    def _register(self, file_path: str) -> Set[str]:
+        """Make a file importable. Returns the files whose imports may now resolve to it."""
+        importers = set()
+        for key in self._provided_keys(file_path):
+            self._modules.setdefault(key, set()).add(file_path)
+            importers.update(self._wanted.get(key, ()))
+        return importers
+    
+    def _unregister(self, file_path: str) -> Set[str]:
+        """Make a file no longer importable. Returns the files that imported it."""
+        importers = set()
+        for key in self._provided_keys(file_path):
+            providers = self._modules.get(key)
+            if providers is not None:
+                providers.discard(file_path)
+                if not providers:
+                    del self._modules[key]
+            importers.update(self._wanted.get(key, ()))
+        return importers
+    
+    def _scan(self, file_paths: List[str], max_workers: int) -> List[Dict[str, Any]]:
+        """Scan files, in worker processes when there are several workers."""
+        if max_workers <= 1 or len(file_paths) < 2:
+            results = [scan_file(file_path, self.cache) for file_path in file_paths]
+        else:
+            batch_size = max(1, len(file_paths) // (max_workers * 4))
+            batches = [file_paths[start:start + batch_size] for start in range(0, len(file_paths), batch_size)]
+            cache_path = self.cache.path if self.cache is not None else None
+            with ProcessPoolExecutor(max_workers=max_workers) as executor:
+                results = [result for batch in executor.map(scan_batch, batches, [cache_path] * len(batches))
+                           for result in batch]
+        
+        results = [result for result in results if result is not None]
+        if self.cache is not None:
+            for result in results:
+                if result["parsed"]:
+                    self.cache.put_imports(result["content_hash"], result["imports"], commit=False)
+            self.cache.commit()
+        return results
+    
+    def update(self, max_workers: int = 1) -> Dict[str, Any]:
+        """
+        Bring the graph up to date with the directory.
+        Only files whose mtime or size changed are read; files whose content
+        hash is unchanged keep their edges.
+        
+        Args:
+            max_workers: Number of worker processes scanning changed files
+        
+        Returns:
+            Dictionary with the number of added, updated, removed and unchanged files,
+            the paths whose content changed ("changed") and the files they impact ("impacted")
+        """
+        seen = set()
+        to_scan = []
+        for file_path, size in iter_source_files(self.root, self.include, self.exclude):
+            file_path = os.path.abspath(file_path)
+            seen.add(file_path)
+            node = self.files.get(file_path)
+            if node is None or (node["mtime_ns"], node["size"]) != (os.stat(file_path).st_mtime_ns, size):
+                to_scan.append(file_path)
+        
+        removed = [file_path for file_path in self.files if file_path not in seen]
+        results = self._scan(to_scan, max_workers)
+        added = [result["file_path"] for result in results if result["file_path"] not in self.files]
+        
+        # A package appearing or disappearing renames every module below it
+        if any(os.path.basename(file_path) == "__init__.py" for file_path in added + removed):
+            return self._rebuild(results, removed, len(seen) - len(to_scan))
+        
+        impacted_seeds = set()
+        to_resolve = set()
+        for file_path in removed:
+            impacted_seeds.update(self.dependents.get(file_path, ()))
+            to_resolve.update(self._unregister(file_path))
+            self._unresolve(file_path)
+            self.dependents.pop(file_path, None)
+            del self.files[file_path]
+        
+        changed = []
+        for result in results:
+            file_path = result["file_path"]
+            node = self.files.get(file_path)
+            if node is not None and node["content_hash"] == result["content_hash"]:
+                node["mtime_ns"], node["size"] = result["mtime_ns"], result["size"]
+                continue
+            self.files[file_path] = {key: result[key] for key in NODE_FIELDS}
+            changed.append(file_path)
+            to_resolve.add(file_path)
+        
+        for file_path in added:
+            to_resolve.update(self._register(file_path))
+        to_resolve.difference_update(removed)
+        for file_path in to_resolve:
+            self._resolve(file_path)
+        
+        impacted = set(self.impacted(changed)) | set(self.impacted(impacted_seeds - set(removed)))
+        self.last_update = {
+            "added": len(added),
+            "updated": len(changed) - len(added),
+            "removed": len(removed),
+            "unchanged": len(seen) - len(changed),
+            "changed": sorted(changed + removed),
+            "impacted": sorted(impacted)
+        }
+        return self.last_update
+    
+    def _rebuild(self, results: List[Dict[str, Any]], removed: List[str], unchanged: int) -> Dict[str, Any]:
+        """Rebuild every edge after the package layout changed."""
+        for file_path in removed:
+            del self.files[file_path]
+        changed = []
+        added = 0
+        for result in results:
+            node = self.files.get(result["file_path"])
+            added += node is None
+            if node is None or node["content_hash"] != result["content_hash"]:
+                changed.append(result["file_path"])
+            self.files[result["file_path"]] = {key: result[key] for key in NODE_FIELDS}
+        
+        self.dependencies, self.dependents, self._modules, self._wanted, self._wanted_keys = {}, {}, {}, {}, {}
+        for file_path in self.files:
+            self._register(file_path)
+        for file_path in self.files:
+            self._resolve(file_path)
+        self.last_update = {
+            "added": added,
+            "updated": len(changed) - added,
+            "removed": len(removed),
+            "unchanged": unchanged,
+            "changed": sorted(changed + removed),
+            # Module names changed, so any file may now resolve differently
+            "impacted": sorted(self.files)
+        }
+        return self.last_update
+    
+    # Queries
+    
+    def impacted(self, file_paths: Iterable[str], max_depth: Optional[int] = None) -> List[str]:
+        """
+        Expand a change set to every file that depends on it, directly or transitively.
+        
+        Args:
+            file_paths: Paths of the changed files
+            max_depth: Optional limit on the number of import hops followed
+        
+        Returns:
+            Sorted paths of the changed files still in the graph and the files importing them
+        """
+        queue = deque((os.path.abspath(file_path), 0) for file_path in file_paths)
+        impacted = set()
+        while queue:
+            file_path, depth = queue.popleft()
+            if file_path in impacted or file_path not in self.files:
+                continue
+            impacted.add(file_path)
+            if max_depth is None or depth < max_depth:
+                queue.extend((dependent, depth + 1) for dependent in self.dependents.get(file_path, ()))
+        return sorted(impacted)
+    
+    def get_dependencies(self, file_path: str) -> List[str]:
+        """Get the files a file imports directly."""
+        return sorted(self.dependencies.get(os.path.abspath(file_path), ()))
+    
+    def get_dependents(self, file_path: str) -> List[str]:
+        """Get the files that import a file directly."""
+        return sorted(self.dependents.get(os.path.abspath(file_path), ()))
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get graph statistics.
+        
+        Returns:
+            Dictionary with the number of files, import edges and unresolved module keys
+        """
+        return {
+            "root": self.root,
+            "files": len(self.files),
+            "edges": sum(len(dependencies) for dependencies in self.dependencies.values()),
+            "unresolved_imports": sum(1 for key in self._wanted if key not in self._modules)
+        }
@@ -0,0 +1,194 @@
+# Issue Exporters Module
+# This file defines the streaming SARIF and JSON Lines writers for review issues
+
+import json
+from typing import Dict, List, Any, Optional, Iterable, TextIO
+
+SARIF_VERSION = "2.1.0"
+SARIF_SCHEMA = "https://json.schemastore.org/sarif-2.1.0.json"
+
+# Review severities mapped to SARIF result levels
+SARIF_LEVELS = {
+    "critical": "error",
+    "high": "error",
+    "medium": "warning",
+    "low": "note"
+}
+
+
+class JsonLinesWriter:
+    """
+    Writes issues as JSON Lines, one issue object per line, as they are produced.
+    """
+    
+    def __init__(self, stream: TextIO):
+        """
+        Initialize the writer.
+        
+        Args:
+            stream: Text stream to write to
+        """
+        self.stream = stream
+        self.count = 0
+    
+    def __enter__(self) -> "JsonLinesWriter":
+        return self
+    
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.close()
+    
+    def write(self, file_path: str, issue: Dict[str, Any]) -> None:
+        """
+        Write one issue.
+        
+        Args:
+            file_path: Path of the file the issue was found in
+            issue: Issue dictionary
+        """
+        record = {"file_path": file_path}
+        record.update(issue)
+        self.stream.write(json.dumps(record))
+        self.stream.write("\n")
+        self.count += 1
+    
+    def close(self) -> None:
+        """Flush the stream."""
+        self.stream.flush()
+
+
+class SarifWriter:
+    """
+    Writes issues as a SARIF 2.1.0 log without holding the log in memory.
+    
+    The document header and rule metadata are written up front, each result
+    is written as it arrives, and close writes the closing brackets.
+    """
+    
+    def __init__(self, stream: TextIO, rules: Iterable[Any] = (), tool_name: str = "HunterxJobs Debugger"):
+        """
+        Initialize the writer and write the document header.
+        
+        Args:
+            stream: Text stream to write to
+            rules: Review rules described in the tool section (objects with rule_id, issue_type and a docstring)
+            tool_name: Tool name reported in the log
+        """
+        self.stream = stream
+        self.count = 0
+        self.closed = False
+        self.rule_indexes: Dict[str, int] = {}
+        
+        descriptors = []
+        for rule in rules:
+            self.rule_indexes[rule.rule_id] = len(descriptors)
+            descriptor = {"id": rule.rule_id, "properties": {"category": rule.issue_type}}
+            description = (type(rule).__doc__ or "").strip()
+            if description:
+                descriptor["shortDescription"] = {"text": description.splitlines()[0]}
+            descriptors.append(descriptor)
+        
+        driver = json.dumps({"name": tool_name, "rules": descriptors})
+        stream.write(f'{{"version": "{SARIF_VERSION}", "$schema": "{SARIF_SCHEMA}", '
+                     f'"runs": [{{"tool": {{"driver": {driver}}}, "results": [')
+    
+    def __enter__(self) -> "SarifWriter":
+        return self
+    
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.close()
+    
+    def write(self, file_path: str, issue: Dict[str, Any]) -> None:
+        """
+        Write one issue as a SARIF result.
+        
+        Args:
+            file_path: Path of the file the issue was found in
+            issue: Issue dictionary
+        """
+        region = {}
+        if issue.get("line"):
+            region["startLine"] = issue["line"]
+        if issue.get("column"):
+            region["startColumn"] = issue["column"]
+        if issue.get("code"):
+            region["snippet"] = {"text": issue["code"]}
+        
+        location = {"artifactLocation": {"uri": file_path.replace("\\", "/")}}
+        if region:
+            location["region"] = region
+        
+        result = {
+            "ruleId": issue.get("rule") or issue.get("type", "issue"),
+            "level": SARIF_LEVELS.get(issue.get("severity"), "warning"),
+            "message": {"text": issue.get("message", "")},
+            "locations": [{"physicalLocation": location}],
+            "properties": {"type": issue.get("type"), "severity": issue.get("severity")}
+        }
+        for field in ("complexity", "suggestion"):
+            if field in issue:
+                result["properties"][field] = issue[field]
+        rule_index = self.rule_indexes.get(result["ruleId"])
+        if rule_index is not None:
+            result["ruleIndex"] = rule_index
+        
+        if self.count:
+            self.stream.write(", ")
+        self.stream.write(json.dumps(result))
+        self.count += 1
+    
+    def close(self) -> None:
+        """Finish the document and flush the stream."""
+        if self.closed:
+            return
+        self.stream.write("]}]}\n")
+        self.stream.flush()
+        self.closed = True
+
+
+def create_writer(stream: TextIO, format: str = "sarif", rules: Iterable[Any] = ()):
+    """
+    Create an issue writer.
+    
+    Args:
+        stream: Text stream to write to
+        format: "sarif" or "jsonl"
+        rules: Review rules described in SARIF output
+    
+    Returns:
+        SarifWriter or JsonLinesWriter
+    """
+    if format == "sarif":
+        return SarifWriter(stream, rules)
+    if format == "jsonl":
+        return JsonLinesWriter(stream)
+    raise ValueError(f"Unsupported export format: {format}")
+
+
+def export_results(results: Iterable[Dict[str, Any]], stream: TextIO, format: str = "sarif",
+                   rules: Iterable[Any] = ()) -> Dict[str, Any]:
+    """
+    Write the issues of review results as they arrive.
+    Takes per-file results such as those yielded by DebuggerAgent.review_tree;
+    results without issues (e.g. the aggregate summary) are skipped.
+    
+    Args:
+        results: Iterable of per-file review results
+        stream: Text stream to write to
+        format: "sarif" or "jsonl"
+        rules: Review rules described in SARIF output
+    
+    Returns:
+        Dictionary with the number of files and issues written and the last summary result, if any
+    """
+    files_count = 0
+    summary: Optional[Dict[str, Any]] = None
+    with create_writer(stream, format, rules) as writer:
+        for result in results:
+            if result.get("result_type") == "summary":
+                summary = result
+                continue
+            issues: List[Dict[str, Any]] = result.get("issues") or []
+            files_count += 1
+            for issue in issues:
+                writer.write(result["file_path"], issue)
+    return {"files": files_count, "issues": writer.count, "summary": summary}
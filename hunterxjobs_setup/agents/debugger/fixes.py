@@ -0,0 +1,469 @@
+# Debugger Fixes Module
+# This file defines the auto-fixes for mechanical review findings and the atomic writer that applies them
+
+import ast
+import difflib
+import os
+import re
+import stat
+import tempfile
+from collections import namedtuple
+from typing import Dict, List, Any, Optional, Iterable, Tuple
+
+from .lexer import scan_js_brackets, scan_js_line_contexts, STATEMENT, TEMPLATE
+from .rules import RuleRegistry, SourceFile
+
+# A replacement of the characters in [start, end) by text; fixes is the number of issues it resolves
+Edit = namedtuple("Edit", ["start", "end", "text", "rule", "fixes"])
+
+# Issue types of the fixable rules; the rule pass of a fix run is restricted to them
+FIX_ISSUE_TYPES = ("style",)
+
+# Lines opening a block or declaration, which must not get a semicolon
+_JS_BLOCK_HEADER = re.compile(
+    r"^(?:}\s*)?(?:if|else|for|while|do|switch|try|catch|finally|function|class|interface|type|enum|namespace"
+    r"|async\s+function|export\s+(?:default\s+)?(?:async\s+)?(?:function|class|interface|enum))\b"
+)
+
+# Line endings that continue the expression on the next line
+_JS_CONTINUED_ENDINGS = tuple("([{,;=+-*/%&|^!?:<>.`\\")
+
+# Line starts that continue the expression of the previous line
+_JS_CONTINUING_STARTS = tuple(".?:)],([`+-*/%&|^=>")
+
+# Braceless control statements whose body is the next statement
+_JS_BRACELESS_HEADER = re.compile(r"^(?:}\s*)?(?:(?:if|for|while)\s*\(.*\)|else|do)$")
+
+# Rules for the worker processes of a fix run (set by init_fix_worker)
+_worker_registry = None
+_worker_options = {}
+
+
+def _line_start(source: SourceFile, line_number: int) -> int:
+    """Get the offset of the first character of a line."""
+    return source.line_index.line_starts[line_number - 1]
+
+
+def _line_end(source: SourceFile, line_number: int) -> int:
+    """Get the offset just after the last character of a line, before its line ending."""
+    return _line_start(source, line_number) + len(source.line_index.line_text(line_number))
+
+
+def _char_offset(source: SourceFile, line_number: int, byte_column: int) -> int:
+    """Convert an AST position (line and UTF-8 byte column) to a character offset."""
+    text = source.line_index.line_text(line_number)
+    return _line_start(source, line_number) + len(text.encode("utf-8")[:byte_column].decode("utf-8", "ignore"))
+
+
+def _python_string_lines(tree: ast.Module) -> set:
+    """Get the lines that end inside a multi-line string literal."""
+    lines = set()
+    for node in ast.walk(tree):
+        if isinstance(node, (ast.Constant, ast.JoinedStr)) and node.end_lineno > node.lineno:
+            if isinstance(node, ast.JoinedStr) or isinstance(node.value, (str, bytes)):
+                lines.update(range(node.lineno, node.end_lineno))
+    return lines
+
+
+def _js_contexts(source: SourceFile) -> List[str]:
+    """Get the line-end contexts of a JavaScript/TypeScript file, scanned once per fix run."""
+    contexts = source.state.get("line_contexts")
+    if contexts is None:
+        contexts = source.state["line_contexts"] = scan_js_line_contexts(source.code_content)
+    return contexts
+
+
+def _neighbour_line(source: SourceFile, line_number: int, step: int) -> str:
+    """Get the nearest non-blank line before (step -1) or after (step 1) a line, stripped."""
+    line_number += step
+    while 1 <= line_number <= len(source.line_index):
+        stripped = source.line_index.line_text(line_number).strip()
+        if stripped:
+            return stripped
+        line_number += step
+    return ""
+
+
+def fix_trailing_whitespace(source: SourceFile, issues: List[Dict[str, Any]]) -> Iterable[Edit]:
+    """
+    Strip trailing whitespace, except where it is part of a multi-line string.
+    
+    Args:
+        source: File being fixed
+        issues: The file's trailing-whitespace issues
+    
+    Returns:
+        Edits removing the whitespace
+    """
+    if source.language == "python":
+        if source.python_tree is None:
+            return []
+        protected = _python_string_lines(source.python_tree)
+    elif source.language == "javascript":
+        contexts = _js_contexts(source)
+        protected = {number for number, context in enumerate(contexts, 1) if context == TEMPLATE}
+    else:
+        protected = set()
+    
+    edits = []
+    for issue in issues:
+        line_number = issue["line"]
+        if line_number in protected:
+            continue
+        text = source.line_index.line_text(line_number)
+        start = _line_start(source, line_number)
+        edits.append(Edit(start + len(text.rstrip()), start + len(text), "", "trailing-whitespace", 1))
+    return edits
+
+
+def fix_missing_semicolons(source: SourceFile, issues: List[Dict[str, Any]]) -> Iterable[Edit]:
+    """
+    Add semicolons to JavaScript/TypeScript lines that end a statement.
+    
+    Only lines ending outside any expression, whose last token cannot continue
+    onto the next line and whose next line cannot continue them, are fixed;
+    lines with comments are left alone.
+    
+    Args:
+        source: File being fixed
+        issues: The file's missing-semicolon issues
+    
+    Returns:
+        Edits inserting the semicolons
+    """
+    contexts = _js_contexts(source)
+    edits = []
+    for issue in issues:
+        line_number = issue["line"]
+        text = source.line_index.line_text(line_number)
+        stripped = text.strip()
+        if contexts[line_number - 1] != STATEMENT or "//" in text or "/*" in text or "*/" in text:
+            continue
+        if stripped.startswith(("*", "@", "<")) or _JS_BLOCK_HEADER.match(stripped):
+            continue
+        if stripped.endswith(_JS_CONTINUED_ENDINGS) and not stripped.endswith(("++", "--")):
+            continue
+        if _neighbour_line(source, line_number, 1).startswith(_JS_CONTINUING_STARTS):
+            continue
+        end = _line_start(source, line_number) + len(text.rstrip())
+        edits.append(Edit(end, end, ";", "missing-semicolon", 1))
+    return edits
+
+
+def fix_console_logs(source: SourceFile, issues: List[Dict[str, Any]]) -> Iterable[Edit]:
+    """
+    Remove console.log statements that take up whole lines.
+    
+    A statement is removed only if it starts and ends at statement level and is
+    not the body of a braceless if, loop or else.
+    
+    Args:
+        source: File being fixed
+        issues: The file's console-log issues
+    
+    Returns:
+        Edits deleting the lines
+    """
+    contexts = _js_contexts(source)
+    edits = []
+    for issue in issues:
+        line_number = issue["line"]
+        stripped = source.line_index.line_text(line_number).strip()
+        if not stripped.startswith("console.log(") or not stripped.rstrip(";").endswith(")"):
+            continue
+        if contexts[line_number - 1] != STATEMENT or (line_number > 1 and contexts[line_number - 2] != STATEMENT):
+            continue
+        if _JS_BRACELESS_HEADER.match(_neighbour_line(source, line_number, -1)):
+            continue
+        # The call must close on its own line, so the statement is the whole line
+        if scan_js_brackets(stripped):
+            continue
+        end = _line_start(source, line_number + 1) if line_number < len(source.line_index) else len(source.code_content)
+        edits.append(Edit(_line_start(source, line_number), end, "", "console-log", 1))
+    return edits
+
+
+def _statement_bodies(tree: ast.Module) -> Iterable[List[ast.stmt]]:
+    """Iterate over every list of statements in a module."""
+    for node in ast.walk(tree):
+        for field in ("body", "orelse", "finalbody"):
+            body = getattr(node, field, None)
+            if isinstance(body, list) and body and isinstance(body[0], ast.stmt):
+                yield body
+
+
+def _render_import(statement: ast.stmt, aliases: List[ast.alias]) -> str:
+    """Render an import statement with a subset of its names."""
+    names = ", ".join(alias.name + (f" as {alias.asname}" if alias.asname else "") for alias in aliases)
+    if isinstance(statement, ast.Import):
+        return f"import {names}"
+    return f"from {'.' * statement.level}{statement.module or ''} import {names}"
+
+
+def fix_unused_imports(source: SourceFile, issues: List[Dict[str, Any]]) -> Iterable[Edit]:
+    """
+    Remove unused Python imports.
+    
+    A statement whose names are all unused is deleted with its line (or replaced
+    by pass if it is the only statement of its block); otherwise it is rewritten
+    without the unused names. Statements sharing their line with other code are
+    left alone.
+    
+    Args:
+        source: File being fixed
+        issues: The file's unused-import issues
+    
+    Returns:
+        Edits removing the imports
+    """
+    symbols = source.python_symbols
+    if symbols is None:
+        return []
+    issue_lines = {issue["line"] for issue in issues}
+    unused = {(imported.line, imported.name) for imported in symbols.unused_imports() if imported.line in issue_lines}
+    
+    edits = []
+    for body in _statement_bodies(source.python_tree):
+        for statement in body:
+            if not isinstance(statement, (ast.Import, ast.ImportFrom)) or statement.lineno not in issue_lines:
+                continue
+            if isinstance(statement, ast.Import):
+                bound = [alias.asname or alias.name.split(".")[0] for alias in statement.names]
+            else:
+                bound = [alias.asname or alias.name for alias in statement.names]
+            kept = [alias for alias, name in zip(statement.names, bound) if (statement.lineno, name) not in unused]
+            removed = len(statement.names) - len(kept)
+            if not removed:
+                continue
+            
+            start = _char_offset(source, statement.lineno, statement.col_offset)
+            end = _char_offset(source, statement.end_lineno, statement.end_col_offset)
+            before = source.code_content[_line_start(source, statement.lineno):start]
+            after = source.code_content[end:_line_end(source, statement.end_lineno)].strip()
+            if before.strip() or (after and not after.startswith("#")):
+                continue
+            
+            if kept:
+                edits.append(Edit(start, end, _render_import(statement, kept), "unused-import", removed))
+            elif len(body) == 1:
+                edits.append(Edit(start, end, "pass", "unused-import", removed))
+            else:
+                line_start = _line_start(source, statement.lineno)
+                if statement.end_lineno < len(source.line_index):
+                    line_end = _line_start(source, statement.end_lineno + 1)
+                else:
+                    line_end = len(source.code_content)
+                edits.append(Edit(line_start, line_end, "", "unused-import", removed))
+    return edits
+
+
+# Fix functions by rule ID, in the order their edits win when they overlap at the same offset
+FIXERS = {
+    "unused-import": fix_unused_imports,
+    "console-log": fix_console_logs,
+    "missing-semicolon": fix_missing_semicolons,
+    "trailing-whitespace": fix_trailing_whitespace
+}
+
+
+def plan_fixes(source: SourceFile, issues: List[Dict[str, Any]],
+               rules: Optional[Iterable[str]] = None) -> Tuple[List[Edit], Dict[str, int], Dict[str, int]]:
+    """
+    Compute the edits fixing a file's issues.
+    Edits are sorted by offset; an edit overlapping one before it is dropped,
+    so the result can be applied in a single pass (dropped issues are found
+    again by the next review). An edit inside text another edit deletes is
+    counted as applied, since its issue goes away with the text.
+    
+    Args:
+        source: File being fixed
+        issues: The file's issues
+        rules: Optional IDs of the rules to fix (defaults to every fixable rule)
+    
+    Returns:
+        Tuple of the non-overlapping edits, the number of issues they fix per rule and
+        the number of fixable issues left unfixed per rule
+    """
+    rules = set(FIXERS) if rules is None else set(rules) & set(FIXERS)
+    by_rule = {}
+    for issue in issues:
+        if issue.get("rule") in rules and issue.get("line"):
+            by_rule.setdefault(issue["rule"], []).append(issue)
+    
+    order = {rule_id: position for position, rule_id in enumerate(FIXERS)}
+    candidates = []
+    for rule_id, rule_issues in by_rule.items():
+        candidates.extend(FIXERS[rule_id](source, rule_issues))
+    candidates.sort(key=lambda edit: (edit.start, edit.end, order[edit.rule]))
+    
+    edits = []
+    applied = {}
+    position = 0
+    for edit in candidates:
+        if edit.start < position:
+            last = edits[-1]
+            if last.text or edit.end > last.end:
+                continue
+        else:
+            edits.append(edit)
+            position = edit.end
+        applied[edit.rule] = applied.get(edit.rule, 0) + edit.fixes
+    
+    unfixed = {rule_id: len(rule_issues) - applied.get(rule_id, 0) for rule_id, rule_issues in by_rule.items()}
+    return edits, applied, {rule_id: count for rule_id, count in unfixed.items() if count}
+
+
+def apply_edits(code_content: str, edits: List[Edit]) -> str:
+    """
+    Apply sorted, non-overlapping edits in one pass over the code.
+    
+    Args:
+        code_content: Code content
+        edits: Edits from plan_fixes
+    
+    Returns:
+        The edited code
+    """
+    pieces = []
+    position = 0
+    for edit in edits:
+        pieces.append(code_content[position:edit.start])
+        pieces.append(edit.text)
+        position = edit.end
+    pieces.append(code_content[position:])
+    return "".join(pieces)
+
+
+def _still_valid(source: SourceFile, fixed_content: str) -> bool:
+    """Check that fixing did not break code that was well-formed before."""
+    if source.language == "python":
+        if source.python_tree is None:
+            return True
+        try:
+            ast.parse(fixed_content)
+            return True
+        except SyntaxError:
+            return False
+    if source.language == "javascript":
+        return len(scan_js_brackets(fixed_content)) <= len(scan_js_brackets(source.code_content))
+    return True
+
+
+def write_atomic(file_path: str, content: str, expected: Optional[os.stat_result] = None) -> bool:
+    """
+    Replace a file's content atomically.
+    The content is written to a temporary file in the same directory, flushed
+    to disk and renamed over the file, so readers see either the old or the
+    new content and never a partial write. The file's permissions are kept.
+    
+    Args:
+        file_path: Path to the file
+        content: New content
+        expected: Optional stat of the file when it was read; if its mtime or size
+            changed since, the file is left alone
+    
+    Returns:
+        True if the file was replaced, False if it changed since it was read
+    """
+    directory = os.path.dirname(os.path.abspath(file_path))
+    descriptor, temp_path = tempfile.mkstemp(prefix=f".{os.path.basename(file_path)}.", suffix=".tmp",
+                                             dir=directory)
+    try:
+        with os.fdopen(descriptor, "w", encoding="utf-8", newline="") as f:
+            f.write(content)
+            f.flush()
+            os.fsync(f.fileno())
+        
+        current = os.stat(file_path)
+        os.chmod(temp_path, stat.S_IMODE(current.st_mode))
+        if expected is not None and (current.st_mtime_ns, current.st_size) != (expected.st_mtime_ns, expected.st_size):
+            os.unlink(temp_path)
+            return False
+        os.replace(temp_path, file_path)
+        return True
+    except BaseException:
+        if os.path.exists(temp_path):
+            os.unlink(temp_path)
+        raise
+
+
+def fix_file(registry: RuleRegistry, file_path: str, rules: Optional[Iterable[str]] = None,
+             dry_run: bool = False, root: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Review a file and fix its mechanical issues.
+    
+    Args:
+        registry: Rule registry finding the issues
+        file_path: Path to the file
+        rules: Optional IDs of the rules to fix (defaults to every fixable rule)
+        dry_run: Compute a unified diff of the fixes instead of writing them
+        root: Optional directory the paths in the diff are relative to
+    
+    Returns:
+        Dictionary with the file's status ("fixed", "unchanged", "previewed", "conflict",
+        "rejected" or "failed"), the applied and unfixed counts per rule and, in a dry run, the diff
+    """
+    result = {"file_path": file_path, "status": "unchanged", "applied": {}, "unfixed": {}}
+    try:
+        original = os.stat(file_path)
+        with open(file_path, "r", encoding="utf-8", newline="") as f:
+            code_content = f.read()
+        
+        source = SourceFile(file_path, code_content)
+        edits, applied, unfixed = plan_fixes(source, registry.run(source, issue_types=FIX_ISSUE_TYPES), rules)
+        result["unfixed"] = unfixed
+        if not edits:
+            return result
+        
+        fixed_content = apply_edits(code_content, edits)
+        if not _still_valid(source, fixed_content):
+            result["status"] = "rejected"
+            return result
+        
+        result["applied"] = applied
+        if dry_run:
+            label = os.path.relpath(file_path, root) if root else os.path.basename(file_path)
+            label = label.replace(os.sep, "/")
+            result["status"] = "previewed"
+            result["diff"] = "".join(difflib.unified_diff(
+                code_content.splitlines(True), fixed_content.splitlines(True), f"a/{label}", f"b/{label}"
+            ))
+        elif write_atomic(file_path, fixed_content, original):
+            result["status"] = "fixed"
+        else:
+            result["status"] = "conflict"
+        return result
+    except Exception as e:
+        result["status"] = "failed"
+        result["error"] = str(e)
+        return result
+
+
+def init_fix_worker(registry: RuleRegistry, rules: Optional[List[str]] = None, dry_run: bool = False,
+                    root: Optional[str] = None) -> None:
+    """
+    Initialize a worker process of a fix run.
+    
+    Args:
+        registry: Rule registry finding the issues
+        rules: Optional IDs of the rules to fix
+        dry_run: Compute diffs instead of writing files
+        root: Optional directory the paths in the diffs are relative to
+    """
+    global _worker_registry, _worker_options
+    _worker_registry = registry
+    _worker_options = {"rules": rules, "dry_run": dry_run, "root": root}
+
+
+def fix_batch(file_paths: List[str]) -> List[Dict[str, Any]]:
+    """
+    Fix a batch of files in a worker process.
+    
+    Args:
+        file_paths: Paths of the files to fix
+    
+    Returns:
+        List of per-file fix results
+    """
+    registry = _worker_registry if _worker_registry is not None else RuleRegistry.default()
+    return [fix_file(registry, file_path, **_worker_options) for file_path in file_paths]
@@ -0,0 +1,318 @@
+# Issue Store Module
+# This file defines the columnar storage used to keep review issues compactly
+
+from array import array
+from collections.abc import Sequence
+from typing import Dict, List, Any, Optional, Iterator
+
+SEVERITIES = ("critical", "high", "medium", "low")
+
+# Marks an issue whose code is the text of its line in the file's line table
+LINE_TEXT = -1
+
+# Marks an issue without a code field
+NO_CODE = -2
+
+# Issue fields kept in columns; any other field (e.g. complexity) is kept in a sparse side table
+ISSUE_FIELDS = frozenset(("type", "severity", "message", "line", "column", "code", "rule"))
+
+# Array type codes of the columns
+COLUMN_TYPECODES = {
+    "file_ids": "I", "lines": "I", "columns": "I", "severity_ids": "B",
+    "type_ids": "I", "rule_ids": "I", "message_ids": "I", "code_ids": "i"
+}
+
+
+class IssueTable:
+    """
+    Columnar store of review issues.
+    
+    Line, column and severity are kept in integer arrays; types, rule IDs,
+    messages and file paths are interned once. Each file has a sparse line
+    table holding the text of the lines that have issues, and an issue
+    whose code is its line's text refers to that table instead of keeping
+    its own copy.
+    """
+    
+    def __init__(self):
+        """Initialize an empty store."""
+        self.files: List[str] = []
+        self.strings: List[str] = []
+        self.severities: List[str] = list(SEVERITIES)
+        self.line_tables: List[Dict[int, str]] = []
+        self.extras: Dict[int, Dict[str, Any]] = {}
+        self._file_ids: Dict[str, int] = {}
+        self._string_ids: Dict[str, int] = {}
+        self._severity_ids = {severity: index for index, severity in enumerate(self.severities)}
+        
+        self.file_ids = array('I')
+        self.lines = array('I')
+        self.columns = array('I')
+        self.severity_ids = array('B')
+        self.type_ids = array('I')
+        self.rule_ids = array('I')
+        self.message_ids = array('I')
+        self.code_ids = array('i')
+    
+    def __len__(self) -> int:
+        """Number of stored issues."""
+        return len(self.lines)
+    
+    def __getstate__(self) -> Dict[str, Any]:
+        """Get a serializable state (used by snapshots); columns are stored as lists."""
+        state = {name: value for name, value in vars(self).items() if not name.startswith("_")}
+        for name in COLUMN_TYPECODES:
+            state[name] = state[name].tolist()
+        return state
+    
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        """Restore the state produced by __getstate__, rebuilding the columns and lookups."""
+        self.__dict__.update(state)
+        for name, typecode in COLUMN_TYPECODES.items():
+            setattr(self, name, array(typecode, state[name]))
+        self._file_ids = {file_path: file_id for file_id, file_path in enumerate(self.files)}
+        self._string_ids = {value: string_id for string_id, value in enumerate(self.strings)}
+        self._severity_ids = {severity: index for index, severity in enumerate(self.severities)}
+    
+    def _intern(self, value: Optional[str]) -> int:
+        """Get the ID of an interned string."""
+        value = value or ""
+        string_id = self._string_ids.get(value)
+        if string_id is None:
+            string_id = self._string_ids[value] = len(self.strings)
+            self.strings.append(value)
+        return string_id
+    
+    def _file_id(self, file_path: str) -> int:
+        """Get the ID of a file, registering it on first use."""
+        file_id = self._file_ids.get(file_path)
+        if file_id is None:
+            file_id = self._file_ids[file_path] = len(self.files)
+            self.files.append(file_path)
+            self.line_tables.append({})
+        return file_id
+    
+    def add(self, file_path: str, issues: List[Dict[str, Any]],
+            lines: Optional[List[str]] = None) -> "IssueView":
+        """
+        Store the issues of a file.
+        
+        Args:
+            file_path: Path to the file
+            issues: Issue dictionaries
+            lines: Optional lines of the file, used to recognize issues whose code is a full line
+        
+        Returns:
+            View of the stored issues
+        """
+        file_id = self._file_id(file_path)
+        line_table = self.line_tables[file_id]
+        start = len(self)
+        
+        for issue in issues:
+            line = issue.get("line") or 0
+            code = issue.get("code") or ""
+            severity = issue.get("severity")
+            severity_id = self._severity_ids.get(severity)
+            if severity_id is None:
+                severity_id = self._severity_ids[severity] = len(self.severities)
+                self.severities.append(severity)
+            
+            if "code" not in issue:
+                code_id = NO_CODE
+            else:
+                known = line_table.get(line)
+                if known is None and line and (lines is None or (line <= len(lines) and lines[line - 1] == code)):
+                    line_table[line] = known = code
+                code_id = LINE_TEXT if known is not None and known == code else self._intern(code)
+            
+            self.file_ids.append(file_id)
+            self.lines.append(line)
+            self.columns.append(issue.get("column") or 0)
+            self.severity_ids.append(severity_id)
+            self.type_ids.append(self._intern(issue.get("type")))
+            self.rule_ids.append(self._intern(issue.get("rule")))
+            self.message_ids.append(self._intern(issue.get("message")))
+            self.code_ids.append(code_id)
+            
+            if not ISSUE_FIELDS.issuperset(issue):
+                self.extras[len(self.lines) - 1] = {
+                    field: value for field, value in issue.items() if field not in ISSUE_FIELDS
+                }
+        
+        return IssueView(self, start, len(self))
+    
+    def get(self, index: int) -> Dict[str, Any]:
+        """
+        Materialize a stored issue.
+        
+        Args:
+            index: Issue index
+        
+        Returns:
+            Issue dictionary
+        """
+        file_id = self.file_ids[index]
+        line = self.lines[index]
+        code_id = self.code_ids[index]
+        issue = {
+            "type": self.strings[self.type_ids[index]],
+            "severity": self.severities[self.severity_ids[index]],
+            "message": self.strings[self.message_ids[index]],
+            "line": line or None,
+            "column": self.columns[index] or None
+        }
+        if code_id != NO_CODE:
+            issue["code"] = self.line_tables[file_id][line] if code_id == LINE_TEXT else self.strings[code_id]
+        rule = self.strings[self.rule_ids[index]]
+        if rule:
+            issue["rule"] = rule
+        extra = self.extras.get(index)
+        if extra:
+            issue.update(extra)
+        return issue
+    
+    def file_path(self, index: int) -> str:
+        """Get the path of the file an issue belongs to."""
+        return self.files[self.file_ids[index]]
+    
+    def iter_issues(self, start: int = 0, stop: Optional[int] = None) -> Iterator[Dict[str, Any]]:
+        """
+        Iterate over stored issues, materializing one at a time.
+        
+        Args:
+            start: First issue index
+            stop: Index after the last issue (defaults to the end)
+        
+        Returns:
+            Iterator of issue dictionaries with a "file_path" key
+        """
+        stop = len(self) if stop is None else stop
+        for index in range(start, stop):
+            issue = self.get(index)
+            issue["file_path"] = self.file_path(index)
+            yield issue
+    
+    def count_by_severity(self) -> Dict[str, int]:
+        """Count stored issues per severity."""
+        counts = [0] * len(self.severities)
+        for severity_id in self.severity_ids:
+            counts[severity_id] += 1
+        return {severity: count for severity, count in zip(self.severities, counts) if count}
+    
+    def compact(self, views: List["IssueView"]) -> None:
+        """
+        Drop every issue not covered by the given views.
+        The views are moved to their new positions in place.
+        
+        Args:
+            views: Views of the issues to keep
+        """
+        kept = IssueTable()
+        for view in views:
+            start = len(kept)
+            for index in range(view.start, view.stop):
+                file_id = self.file_ids[index]
+                kept_file_id = kept._file_id(self.files[file_id])
+                line = self.lines[index]
+                code_id = self.code_ids[index]
+                if code_id == LINE_TEXT:
+                    kept.line_tables[kept_file_id][line] = self.line_tables[file_id][line]
+                elif code_id != NO_CODE:
+                    code_id = kept._intern(self.strings[code_id])
+                severity = self.severities[self.severity_ids[index]]
+                if severity not in kept._severity_ids:
+                    kept._severity_ids[severity] = len(kept.severities)
+                    kept.severities.append(severity)
+                
+                kept.file_ids.append(kept_file_id)
+                kept.lines.append(line)
+                kept.columns.append(self.columns[index])
+                kept.severity_ids.append(kept._severity_ids[severity])
+                kept.type_ids.append(kept._intern(self.strings[self.type_ids[index]]))
+                kept.rule_ids.append(kept._intern(self.strings[self.rule_ids[index]]))
+                kept.message_ids.append(kept._intern(self.strings[self.message_ids[index]]))
+                kept.code_ids.append(code_id)
+                if index in self.extras:
+                    kept.extras[len(kept) - 1] = self.extras[index]
+            view.start, view.stop = start, len(kept)
+        self.__dict__.update(kept.__dict__)
+    
+    def clear(self) -> None:
+        """Remove every stored issue."""
+        self.__init__()
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get storage statistics.
+        
+        Returns:
+            Dictionary with issue, file and string counts and the approximate size of the columns
+        """
+        columns = (self.file_ids, self.lines, self.columns, self.severity_ids, self.type_ids,
+                   self.rule_ids, self.message_ids, self.code_ids)
+        return {
+            "issues": len(self),
+            "files": len(self.files),
+            "interned_strings": len(self.strings),
+            "line_table_entries": sum(len(line_table) for line_table in self.line_tables),
+            "extra_fields": len(self.extras),
+            "column_bytes": sum(column.itemsize * len(column) for column in columns)
+        }
+
+
+class IssueView(Sequence):
+    """
+    Read-only list of a range of issues in an IssueTable.
+    Issues are materialized as dictionaries on access.
+    
+    Snapshots save only the range, since many views share one table; the
+    owner of the table attaches it again after restore.
+    """
+    
+    def __init__(self, table: IssueTable, start: int, stop: int):
+        """
+        Initialize the view.
+        
+        Args:
+            table: Issue table
+            start: First issue index
+            stop: Index after the last issue
+        """
+        self.table = table
+        self.start = start
+        self.stop = stop
+    
+    def __len__(self) -> int:
+        return self.stop - self.start
+    
+    def __getstate__(self) -> Dict[str, Any]:
+        """Get a serializable state (used by snapshots), without the table."""
+        return {"start": self.start, "stop": self.stop}
+    
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        """Restore the range saved by __getstate__; the table must be attached again."""
+        self.table = None
+        self.start = state["start"]
+        self.stop = state["stop"]
+    
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self.table.get(self.start + position) for position in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("issue index out of range")
+        return self.table.get(self.start + index)
+    
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        for index in range(self.start, self.stop):
+            yield self.table.get(index)
+    
+    def __eq__(self, other: Any) -> bool:
+        if isinstance(other, (IssueView, list)):
+            return list(self) == list(other)
+        return NotImplemented
+    
+    def __repr__(self) -> str:
+        return f"IssueView({len(self)} issues)"
@@ -0,0 +1,290 @@
+# Debugger Lexer Module
+# This file defines the line index and the lexer-aware bracket and line-context scanners used by the Debugger agent
+
+import re
+from bisect import bisect_right
+from typing import List, Optional, Tuple
+
+BRACKETS = {'(': ')', '[': ']', '{': '}'}
+CLOSING_BRACKETS = {')': '(', ']': '[', '}': '{'}
+
+# Next token of interest in JavaScript/TypeScript code; everything else is skipped by the regex engine
+_JS_CODE_TOKEN = re.compile(
+    r"""//[^\n]*"""                        # line comment
+    r"""|/\*.*?(?:\*/|\Z)"""               # block comment
+    r"""|"(?:[^"\\\n]|\\.)*"?"""           # double-quoted string
+    r"""|'(?:[^'\\\n]|\\.)*'?"""           # single-quoted string
+    r"""|[`()\[\]{}/]""",                  # template start, brackets, possible regex literal
+    re.DOTALL
+)
+
+# Body of a template literal up to its end or the next ${ expression
+_JS_TEMPLATE_CHUNK = re.compile(r"""(?:[^`\\$]|\\.|\$(?!\{))*(`|\$\{)?""", re.DOTALL)
+
+# Regular expression literal starting at a '/'
+_JS_REGEX_LITERAL = re.compile(r"""/(?![*/])(?:[^/\\\[\n]|\\.|\[(?:[^\]\\\n]|\\.)*\])+/[A-Za-z]*""")
+
+# Characters and keywords after which a '/' starts a regular expression rather than a division
+_REGEX_PRECEDING_CHARS = set("(,=:[!&|?{};+-*%<>~^")
+_REGEX_PRECEDING_WORDS = re.compile(r"""(?:^|[^\w$])(?:return|typeof|instanceof|in|of|new|delete|void|throw|case|do|else|yield|await)$""")
+
+# Characters and keywords after which a '{' starts an object literal rather than a block
+_OBJECT_PRECEDING_CHARS = set("(,=:[!&|?+-*%<>~^")
+_OBJECT_PRECEDING_WORDS = re.compile(r"""(?:^|[^\w$])(?:return|typeof|case|yield|await|throw|in|of)$""")
+
+# Contexts a line of JavaScript/TypeScript code can end in
+STATEMENT = "statement"
+EXPRESSION = "expression"
+TEMPLATE = "template"
+COMMENT = "comment"
+
+
+class LineIndex:
+    """
+    Table of line start offsets for a piece of source code.
+    Maps character offsets to line/column positions with a binary search.
+    """
+    
+    def __init__(self, code_content: str):
+        """
+        Build the line index.
+        
+        Args:
+            code_content: Code content
+        """
+        self.code_content = code_content
+        self.line_starts = [0]
+        position = code_content.find('\n')
+        while position != -1:
+            self.line_starts.append(position + 1)
+            position = code_content.find('\n', position + 1)
+    
+    def __len__(self) -> int:
+        """Number of lines."""
+        return len(self.line_starts)
+    
+    def position(self, offset: int) -> Tuple[int, int]:
+        """
+        Convert a character offset to a position.
+        
+        Args:
+            offset: Character offset
+        
+        Returns:
+            Tuple of (1-based line number, 1-based column)
+        """
+        line_index = bisect_right(self.line_starts, offset) - 1
+        return line_index + 1, offset - self.line_starts[line_index] + 1
+    
+    def line_text(self, line_number: int) -> str:
+        """
+        Get the text of a line without its line ending.
+        
+        Args:
+            line_number: 1-based line number
+        
+        Returns:
+            Line text, or an empty string if out of range
+        """
+        if line_number < 1 or line_number > len(self.line_starts):
+            return ""
+        start = self.line_starts[line_number - 1]
+        if line_number < len(self.line_starts):
+            end = self.line_starts[line_number] - 1
+        else:
+            end = len(self.code_content)
+        return self.code_content[start:end].rstrip('\r')
+
+
+def _starts_regex_literal(code_content: str, position: int) -> bool:
+    """
+    Decide whether the '/' at a position starts a regular expression literal.
+    
+    Args:
+        code_content: Code content
+        position: Offset of the '/'
+    
+    Returns:
+        True if the slash starts a regular expression literal
+    """
+    previous = position - 1
+    while previous >= 0 and code_content[previous] in ' \t\r\n':
+        previous -= 1
+    
+    if previous < 0 or code_content[previous] in _REGEX_PRECEDING_CHARS:
+        return True
+    
+    return bool(_REGEX_PRECEDING_WORDS.search(code_content, max(0, previous - 11), previous + 1))
+
+
+def _starts_object_literal(code_content: str, position: int) -> bool:
+    """
+    Decide whether the '{' at a position starts an object literal rather than a block.
+    
+    Args:
+        code_content: Code content
+        position: Offset of the '{'
+    
+    Returns:
+        True if the brace starts an object literal (or a destructuring pattern)
+    """
+    previous = position - 1
+    while previous >= 0 and code_content[previous] in ' \t\r\n':
+        previous -= 1
+    
+    if previous < 0:
+        return False
+    if code_content[previous] == '>' and code_content[previous - 1:previous + 1] == '=>':
+        return False
+    if code_content[previous] in _OBJECT_PRECEDING_CHARS or code_content[previous - 1:previous + 1] == '${':
+        return True
+    
+    return bool(_OBJECT_PRECEDING_WORDS.search(code_content, max(0, previous - 6), previous + 1))
+
+
+def scan_js_line_contexts(code_content: str) -> List[str]:
+    """
+    Find the context each line of JavaScript/TypeScript code ends in.
+    
+    A line ends in STATEMENT context when its end is outside any parenthesis,
+    bracket or object literal (directly in a block or at the top level), so a
+    statement may end there; in EXPRESSION context inside one; in TEMPLATE
+    context inside template literal text; and in COMMENT context inside a
+    block comment.
+    
+    Args:
+        code_content: Code content
+    
+    Returns:
+        List with the context of each line, indexed by line number - 1
+    """
+    contexts = []
+    # Stack entries: (bracket, is a block)
+    stack = []
+    position = 0
+    length = len(code_content)
+    in_template = False
+    
+    def mark_lines(end: int, context: Optional[str] = None) -> None:
+        """Record the context of every line ending before an offset."""
+        if context is None:
+            context = STATEMENT if not stack or stack[-1][1] else EXPRESSION
+        newline = code_content.find('\n', position, end)
+        while newline != -1:
+            contexts.append(context)
+            newline = code_content.find('\n', newline + 1, end)
+    
+    while position < length:
+        if in_template:
+            match = _JS_TEMPLATE_CHUNK.match(code_content, position)
+            mark_lines(match.end(), TEMPLATE)
+            position = match.end()
+            terminator = match.group(1)
+            if terminator == '${':
+                stack.append(('${', False))
+            in_template = False
+            if terminator is None:
+                break
+            continue
+        
+        match = _JS_CODE_TOKEN.search(code_content, position)
+        if match is None:
+            break
+        
+        token = match.group()
+        start = match.start()
+        mark_lines(start)
+        position = start
+        if token.startswith('/*'):
+            mark_lines(match.end(), COMMENT)
+        position = match.end()
+        
+        if token == '{':
+            stack.append(('{', not _starts_object_literal(code_content, start)))
+        elif token in ('(', '['):
+            stack.append((token, False))
+        elif token in CLOSING_BRACKETS:
+            if stack:
+                bracket, _ = stack.pop()
+                in_template = bracket == '${'
+        elif token == '`':
+            in_template = True
+        elif token == '/' and _starts_regex_literal(code_content, start):
+            regex_match = _JS_REGEX_LITERAL.match(code_content, start)
+            if regex_match:
+                position = regex_match.end()
+    
+    mark_lines(length, TEMPLATE if in_template else None)
+    contexts.append(TEMPLATE if in_template else STATEMENT if not stack or stack[-1][1] else EXPRESSION)
+    return contexts
+
+
+def scan_js_brackets(code_content: str) -> List[Tuple[str, int]]:
+    """
+    Find bracket errors in JavaScript/TypeScript code in a single pass.
+    Brackets inside strings, template literal text, comments and regular
+    expression literals are ignored; brackets inside template ${...}
+    expressions are checked.
+    
+    Args:
+        code_content: Code content
+    
+    Returns:
+        List of (message, offset) tuples in source order
+    """
+    problems = []
+    # Stack entries: (bracket, offset, opens a template ${...} expression)
+    stack = []
+    position = 0
+    length = len(code_content)
+    in_template = False
+    
+    while position < length:
+        if in_template:
+            match = _JS_TEMPLATE_CHUNK.match(code_content, position)
+            position = match.end()
+            terminator = match.group(1)
+            if terminator == '${':
+                stack.append(('{', position - 1, True))
+                in_template = False
+            elif terminator is None:
+                # Unterminated template literal
+                break
+            else:
+                in_template = False
+            continue
+        
+        match = _JS_CODE_TOKEN.search(code_content, position)
+        if match is None:
+            break
+        
+        token = match.group()
+        start = match.start()
+        position = match.end()
+        
+        if token in BRACKETS:
+            stack.append((token, start, False))
+        elif token in CLOSING_BRACKETS:
+            if not stack:
+                problems.append((f"Unmatched closing bracket: {token}", start))
+                continue
+            
+            open_bracket, open_offset, template_expression = stack.pop()
+            if token != BRACKETS[open_bracket]:
+                problems.append((f"Mismatched brackets: {open_bracket} and {token}", start))
+                if template_expression:
+                    # Keep waiting for the '}' that returns to the template text
+                    stack.append((open_bracket, open_offset, True))
+            elif template_expression:
+                in_template = True
+        elif token == '`':
+            in_template = True
+        elif token == '/' and _starts_regex_literal(code_content, start):
+            regex_match = _JS_REGEX_LITERAL.match(code_content, start)
+            if regex_match:
+                position = regex_match.end()
+    
+    for bracket, offset, _ in stack:
+        problems.append((f"Unclosed bracket: {bracket}", offset))
+    
+    return problems
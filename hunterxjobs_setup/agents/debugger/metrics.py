@@ -0,0 +1,336 @@
+# Debugger Metrics Module
+# This file defines the rolling code-quality metrics store used by the Debugger agent
+
+import heapq
+import time
+from collections import OrderedDict, deque
+from typing import Dict, List, Any, Optional
+
+# Default bucket width and retention: hourly buckets for a week
+BUCKET_SECONDS = 3600
+RETENTION_BUCKETS = 24 * 7
+HISTORY_PER_FILE = 32
+MAX_FILES = 10000
+TOP_K = 10
+
+
+class MetricsBucket:
+    """Review totals for one time bucket."""
+    
+    __slots__ = ("index", "reviews", "lines_of_code", "issues_count", "issues_by_type", "issues_by_severity")
+    
+    def __init__(self, index: int = 0):
+        self.index = index
+        self.reviews = 0
+        self.lines_of_code = 0
+        self.issues_count = 0
+        self.issues_by_type: Dict[str, int] = {}
+        self.issues_by_severity: Dict[str, int] = {}
+    
+    def __getstate__(self) -> Dict[str, Any]:
+        """Get a serializable state (used by snapshots)."""
+        return {name: getattr(self, name) for name in self.__slots__}
+    
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        """Restore the state produced by __getstate__."""
+        for name in self.__slots__:
+            setattr(self, name, state[name])
+    
+    def add(self, metrics: Dict[str, Any]) -> None:
+        """Add one review's metrics."""
+        self.reviews += 1
+        self.lines_of_code += metrics["lines_of_code"]
+        self.issues_count += metrics["issues_count"]
+        for issue_type, count in metrics["issues_by_type"].items():
+            self.issues_by_type[issue_type] = self.issues_by_type.get(issue_type, 0) + count
+        for severity, count in metrics["issues_by_severity"].items():
+            self.issues_by_severity[severity] = self.issues_by_severity.get(severity, 0) + count
+    
+    def merge(self, other: "MetricsBucket") -> None:
+        """Add another bucket's totals."""
+        self.reviews += other.reviews
+        self.lines_of_code += other.lines_of_code
+        self.issues_count += other.issues_count
+        for issue_type, count in other.issues_by_type.items():
+            self.issues_by_type[issue_type] = self.issues_by_type.get(issue_type, 0) + count
+        for severity, count in other.issues_by_severity.items():
+            self.issues_by_severity[severity] = self.issues_by_severity.get(severity, 0) + count
+    
+    def as_dict(self) -> Dict[str, Any]:
+        """Get the totals with issues per KLOC by type and severity."""
+        kloc = self.lines_of_code / 1000
+        
+        def per_kloc(counts: Dict[str, int]) -> Dict[str, Dict[str, float]]:
+            return {key: {"count": count, "per_kloc": count / kloc if kloc else 0} for key, count in counts.items()}
+        
+        return {
+            "reviews": self.reviews,
+            "lines_of_code": self.lines_of_code,
+            "issues_count": self.issues_count,
+            "issues_per_kloc": self.issues_count / kloc if kloc else 0,
+            "by_type": per_kloc(self.issues_by_type),
+            "by_severity": per_kloc(self.issues_by_severity)
+        }
+
+
+class MetricsStore:
+    """
+    Rolling code-quality metrics.
+    
+    Each review updates a fixed-width time bucket, the lifetime totals, a
+    short history of the reviewed file and the worst-offender heap, so the
+    cost of recording a review does not depend on how many came before.
+    Buckets past the retention are dropped (the lifetime totals still count
+    them), and per-file history keeps only the latest samples plus a
+    running summary. At most max_files files are tracked; the least
+    recently reviewed file is forgotten first.
+    """
+    
+    def __init__(self, bucket_seconds: int = BUCKET_SECONDS, retention_buckets: int = RETENTION_BUCKETS,
+                 history_per_file: int = HISTORY_PER_FILE, top_k: int = TOP_K, max_files: int = MAX_FILES):
+        """
+        Initialize the store.
+        
+        Args:
+            bucket_seconds: Width of a time bucket; windows are answered at this resolution
+            retention_buckets: Number of buckets kept for window queries
+            history_per_file: Number of samples kept per file
+            top_k: Number of worst offenders tracked
+            max_files: Number of files tracked
+        """
+        self.bucket_seconds = bucket_seconds
+        self.retention_buckets = retention_buckets
+        self.history_per_file = history_per_file
+        self.top_k = top_k
+        self.max_files = max_files
+        self.buckets = deque()
+        self.lifetime = MetricsBucket()
+        # Least recently reviewed file first
+        self.files: Dict[str, Dict[str, Any]] = OrderedDict()
+        # Min-heap of (issues per KLOC, file path) holding the top_k worst files
+        self._offenders: List[tuple] = []
+        self._offender_scores: Dict[str, float] = {}
+        self._offenders_stale = False
+    
+    def __getstate__(self) -> Dict[str, Any]:
+        """Get a serializable state (used by snapshots); buckets and file histories are stored as lists."""
+        state = dict(vars(self))
+        state["buckets"] = list(self.buckets)
+        state["files"] = {
+            file_path: dict(entry, history=list(entry["history"])) for file_path, entry in self.files.items()
+        }
+        return state
+    
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        """Restore the state produced by __getstate__."""
+        self.__dict__.update(state)
+        self.max_files = state.get("max_files", MAX_FILES)
+        self.buckets = deque(state["buckets"])
+        self.files = OrderedDict(state["files"])
+        for entry in self.files.values():
+            entry["history"] = deque(entry["history"], maxlen=self.history_per_file)
+    
+    def _bucket(self, timestamp: float) -> MetricsBucket:
+        """Get the bucket for a timestamp, expiring buckets past the retention."""
+        index = int(timestamp // self.bucket_seconds)
+        if self.buckets and index <= self.buckets[-1].index:
+            # Late samples land in the newest bucket they can still belong to
+            for bucket in reversed(self.buckets):
+                if bucket.index <= index:
+                    return bucket
+            return self.buckets[0]
+        
+        bucket = MetricsBucket(index)
+        self.buckets.append(bucket)
+        while self.buckets[0].index <= index - self.retention_buckets:
+            self.buckets.popleft()
+        return bucket
+    
+    def record(self, file_path: str, metrics: Dict[str, Any], timestamp: Optional[float] = None) -> None:
+        """
+        Record the metrics of a review.
+        
+        Args:
+            file_path: Path of the reviewed file
+            metrics: Metrics from calculate_quality_metrics
+            timestamp: Review time in seconds since the epoch (defaults to now)
+        """
+        timestamp = time.time() if timestamp is None else timestamp
+        self._bucket(timestamp).add(metrics)
+        self.lifetime.add(metrics)
+        
+        density = metrics["issues_per_kloc"]
+        sample = (timestamp, metrics["issues_count"], metrics["lines_of_code"], density, metrics["quality_score"])
+        entry = self.files.get(file_path)
+        if entry is not None:
+            self.files.move_to_end(file_path)
+        else:
+            entry = self.files[file_path] = {
+                "reviews": 0,
+                "first_reviewed": timestamp,
+                "best_quality_score": sample[4],
+                "worst_quality_score": sample[4],
+                "history": deque(maxlen=self.history_per_file)
+            }
+        entry["reviews"] += 1
+        entry["last_reviewed"] = timestamp
+        entry["best_quality_score"] = max(entry["best_quality_score"], sample[4])
+        entry["worst_quality_score"] = min(entry["worst_quality_score"], sample[4])
+        entry["history"].append(sample)
+        entry["metrics"] = metrics
+        
+        while len(self.files) > self.max_files:
+            self.forget(next(iter(self.files)))
+        
+        self._update_offenders(file_path, density)
+    
+    def _update_offenders(self, file_path: str, density: float) -> None:
+        """Keep the worst-offender heap current for a file's new issue density."""
+        previous = self._offender_scores.get(file_path)
+        if previous is not None:
+            if density >= previous:
+                # Got worse: update in place (the heap holds at most top_k entries)
+                self._offender_scores[file_path] = density
+                self._offenders = [(self._offender_scores[path], path) for _, path in self._offenders]
+                heapq.heapify(self._offenders)
+            else:
+                # Improved: another file may now belong in the top k, so rebuild on the next query
+                self._offenders_stale = True
+            return
+        
+        if len(self._offenders) < self.top_k:
+            heapq.heappush(self._offenders, (density, file_path))
+            self._offender_scores[file_path] = density
+        elif (density, file_path) > self._offenders[0]:
+            _, evicted = heapq.heapreplace(self._offenders, (density, file_path))
+            del self._offender_scores[evicted]
+            self._offender_scores[file_path] = density
+    
+    def forget(self, file_path: str) -> None:
+        """
+        Stop tracking a file (e.g. after it was deleted). Window totals are kept.
+        
+        Args:
+            file_path: Path of the file
+        """
+        if self.files.pop(file_path, None) is not None and file_path in self._offender_scores:
+            self._offenders_stale = True
+    
+    def window(self, seconds: Optional[float] = None, now: Optional[float] = None) -> Dict[str, Any]:
+        """
+        Get the totals of the reviews in a recent time window.
+        
+        Args:
+            seconds: Window length (rounded up to whole buckets); None for all reviews ever recorded
+            now: End of the window in seconds since the epoch (defaults to now)
+        
+        Returns:
+            Dictionary with review, line and issue counts and issues per KLOC by type and severity
+        """
+        if seconds is None:
+            totals = self.lifetime.as_dict()
+            totals["window_seconds"] = None
+            return totals
+        
+        now = time.time() if now is None else now
+        last = int(now // self.bucket_seconds)
+        first = last - max(1, -(-int(seconds) // self.bucket_seconds)) + 1
+        totals = MetricsBucket()
+        for bucket in reversed(self.buckets):
+            if bucket.index < first:
+                break
+            if bucket.index <= last:
+                totals.merge(bucket)
+        result = totals.as_dict()
+        result["window_seconds"] = (last - first + 1) * self.bucket_seconds
+        return result
+    
+    def series(self, buckets: Optional[int] = None) -> List[Dict[str, Any]]:
+        """
+        Get per-bucket totals, oldest first.
+        
+        Args:
+            buckets: Optional number of most recent buckets
+        
+        Returns:
+            List of bucket totals with their start time
+        """
+        selected = list(self.buckets)[-buckets:] if buckets else list(self.buckets)
+        series = []
+        for bucket in selected:
+            totals = bucket.as_dict()
+            totals["start"] = bucket.index * self.bucket_seconds
+            series.append(totals)
+        return series
+    
+    def file_trend(self, file_path: str) -> Optional[Dict[str, Any]]:
+        """
+        Get the quality trend of a file from its recent reviews.
+        
+        Args:
+            file_path: Path of the file
+        
+        Returns:
+            Dictionary with the review count, latest metrics, kept samples and the change in
+            issues per KLOC over them, or None if the file was never reviewed
+        """
+        entry = self.files.get(file_path)
+        if entry is None:
+            return None
+        
+        history = [
+            {"timestamp": timestamp, "issues_count": issues_count, "lines_of_code": lines_of_code,
+             "issues_per_kloc": density, "quality_score": quality_score}
+            for timestamp, issues_count, lines_of_code, density, quality_score in entry["history"]
+        ]
+        change = history[-1]["issues_per_kloc"] - history[0]["issues_per_kloc"]
+        return {
+            "file_path": file_path,
+            "reviews": entry["reviews"],
+            "first_reviewed": entry["first_reviewed"],
+            "last_reviewed": entry["last_reviewed"],
+            "best_quality_score": entry["best_quality_score"],
+            "worst_quality_score": entry["worst_quality_score"],
+            "latest": history[-1],
+            "history": history,
+            "issues_per_kloc_change": change,
+            "direction": "worsening" if change > 0 else "improving" if change < 0 else "stable"
+        }
+    
+    def worst_offenders(self, k: Optional[int] = None) -> List[Dict[str, Any]]:
+        """
+        Get the files with the highest current issues per KLOC.
+        
+        Args:
+            k: Number of files (at most top_k)
+        
+        Returns:
+            List of dictionaries with file_path, issues_per_kloc and quality_score, worst first
+        """
+        if self._offenders_stale:
+            latest = ((entry["history"][-1][3], file_path) for file_path, entry in self.files.items())
+            self._offenders = heapq.nlargest(self.top_k, latest)
+            heapq.heapify(self._offenders)
+            self._offender_scores = {file_path: density for density, file_path in self._offenders}
+            self._offenders_stale = False
+        
+        offenders = sorted(self._offenders, reverse=True)[:k]
+        return [
+            {"file_path": file_path, "issues_per_kloc": density,
+             "quality_score": self.files[file_path]["history"][-1][4]}
+            for density, file_path in offenders
+        ]
+    
+    def get_summary(self) -> Dict[str, Any]:
+        """
+        Get an overview of the store.
+        
+        Returns:
+            Dictionary with lifetime totals, the number of tracked files and the worst offenders
+        """
+        return {
+            "lifetime": self.window(),
+            "files_tracked": len(self.files),
+            "buckets": len(self.buckets),
+            "worst_offenders": self.worst_offenders()
+        }
@@ -0,0 +1,171 @@
+# Rule Profiling Module
+# This file defines the per-rule timing profile collected by the Debugger agent
+
+import json
+from typing import Dict, List, Any, Optional, Iterable, Tuple, Union
+
+# Columns of a profile record after the rule ID and file extension
+PROFILE_FIELDS = ("files", "seconds", "lines", "issues")
+
+
+class RuleProfile:
+    """
+    Wall time, lines scanned and issues emitted per rule and file extension,
+    aggregated over any number of reviewed files.
+    """
+    
+    def __init__(self):
+        """Initialize an empty profile."""
+        # (rule ID, extension) -> [files, seconds, lines, issues]
+        self.entries: Dict[Tuple[str, str], List[float]] = {}
+    
+    def record(self, rule_id: str, extension: str, seconds: float, lines: int, issues: int) -> None:
+        """
+        Record one rule's work on one file.
+        
+        Args:
+            rule_id: Rule ID
+            extension: File extension
+            seconds: Wall time spent in the rule
+            lines: Lines the rule examined
+            issues: Issues the rule emitted
+        """
+        entry = self.entries.get((rule_id, extension))
+        if entry is None:
+            entry = self.entries[(rule_id, extension)] = [0, 0.0, 0, 0]
+        entry[0] += 1
+        entry[1] += seconds
+        entry[2] += lines
+        entry[3] += issues
+    
+    def records(self) -> List[List[Any]]:
+        """
+        Get the profile as plain records, e.g. to send it from a worker process.
+        
+        Returns:
+            List of [rule ID, extension, files, seconds, lines, issues] lists
+        """
+        return [[rule_id, extension] + entry for (rule_id, extension), entry in self.entries.items()]
+    
+    def merge(self, other: Union["RuleProfile", Iterable[List[Any]]]) -> None:
+        """
+        Add another profile to this one.
+        
+        Args:
+            other: RuleProfile or records from RuleProfile.records
+        """
+        records = other.records() if isinstance(other, RuleProfile) else other
+        for rule_id, extension, files, seconds, lines, issues in records:
+            entry = self.entries.get((rule_id, extension))
+            if entry is None:
+                entry = self.entries[(rule_id, extension)] = [0, 0.0, 0, 0]
+            entry[0] += files
+            entry[1] += seconds
+            entry[2] += lines
+            entry[3] += issues
+    
+    def reset(self) -> None:
+        """Discard all recorded timings."""
+        self.entries = {}
+    
+    @property
+    def total_seconds(self) -> float:
+        """Wall time spent in all rules."""
+        return sum(entry[1] for entry in self.entries.values())
+    
+    def rows(self, by_extension: bool = False, sort_by: str = "seconds") -> List[Dict[str, Any]]:
+        """
+        Get the profile as rows sorted in descending order.
+        
+        Args:
+            by_extension: Keep one row per rule and file extension instead of one per rule
+            sort_by: Column to sort by (files, seconds, lines or issues)
+        
+        Returns:
+            List of row dictionaries
+        """
+        if sort_by not in PROFILE_FIELDS:
+            raise ValueError(f"Unknown profile column: {sort_by}")
+        
+        totals: Dict[Tuple[str, ...], List[float]] = {}
+        for (rule_id, extension), entry in self.entries.items():
+            key = (rule_id, extension) if by_extension else (rule_id,)
+            total = totals.setdefault(key, [0, 0.0, 0, 0])
+            for index, value in enumerate(entry):
+                total[index] += value
+        
+        total_seconds = self.total_seconds
+        rows = []
+        for key, (files, seconds, lines, issues) in totals.items():
+            row = {"rule": key[0]}
+            if by_extension:
+                row["extension"] = key[1]
+            row.update({
+                "files": files,
+                "seconds": seconds,
+                "lines": lines,
+                "issues": issues,
+                "share": seconds / total_seconds if total_seconds else 0.0,
+                "lines_per_second": lines / seconds if seconds else 0.0
+            })
+            rows.append(row)
+        
+        rows.sort(key=lambda row: (-row[sort_by], row["rule"], row.get("extension", "")))
+        return rows
+    
+    def as_dict(self, sort_by: str = "seconds") -> Dict[str, Any]:
+        """
+        Get the profile as a JSON-serializable dictionary.
+        
+        Args:
+            sort_by: Column to sort the rows by
+        
+        Returns:
+            Dictionary with the total time, per-rule rows and per-rule-and-extension rows
+        """
+        return {
+            "total_seconds": self.total_seconds,
+            "rules": self.rows(sort_by=sort_by),
+            "by_extension": self.rows(by_extension=True, sort_by=sort_by)
+        }
+    
+    def to_json(self, sort_by: str = "seconds", indent: int = 2) -> str:
+        """Get the profile as a JSON string."""
+        return json.dumps(self.as_dict(sort_by), indent=indent)
+    
+    def format_table(self, by_extension: bool = False, sort_by: str = "seconds", limit: Optional[int] = None) -> str:
+        """
+        Format the profile as a text table, slowest rules first.
+        
+        Args:
+            by_extension: One row per rule and file extension
+            sort_by: Column to sort by
+            limit: Optional maximum number of rows
+        
+        Returns:
+            Table text
+        """
+        rows = self.rows(by_extension, sort_by)[:limit]
+        header = ["rule"] + (["ext"] if by_extension else []) + ["files", "ms", "share", "lines", "issues", "lines/s"]
+        table = [header]
+        for row in rows:
+            table.append(
+                [row["rule"]] + ([row["extension"] or "-"] if by_extension else []) + [
+                    str(row["files"]),
+                    f"{row['seconds'] * 1000:.2f}",
+                    f"{row['share']:.1%}",
+                    str(row["lines"]),
+                    str(row["issues"]),
+                    f"{row['lines_per_second']:.0f}"
+                ]
+            )
+        
+        label_columns = 2 if by_extension else 1
+        widths = [max(len(cells[column]) for cells in table) for column in range(len(header))]
+        return "\n".join(
+            "  ".join(
+                cell.ljust(widths[column]) if column < label_columns else cell.rjust(widths[column])
+                for column, cell in enumerate(cells)
+            ).rstrip()
+            for cells in table
+        )
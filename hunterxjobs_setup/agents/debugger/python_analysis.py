@@ -0,0 +1,572 @@
+# Python Analysis Module
+# This file defines the AST symbol table that backs the Debugger agent's Python checks
+
+import ast
+from collections import namedtuple
+from typing import Dict, List, Optional, Set
+
+# A name bound by an import statement
+ImportedName = namedtuple("ImportedName", ["name", "module", "line", "column"])
+
+# A definition: kind is "function", "class" or "variable"
+Definition = namedtuple("Definition", ["name", "kind", "line", "column", "has_docstring"])
+
+# A call that runs SQL built with string formatting
+FormattedSqlCall = namedtuple("FormattedSqlCall", ["method", "line", "column"])
+
+# A loop-carried operation whose cost grows with the input:
+# kind is "list-membership", "string-concatenation", "repeated-scan", "repeated-slice" or "nested-scan"
+QuadraticPattern = namedtuple("QuadraticPattern", ["kind", "line", "column", "name", "loop_depth"])
+
+SQL_EXECUTE_METHODS = ("execute", "executemany")
+
+# Calls that build a value of a known kind
+_KIND_CONSTRUCTORS = {
+    "list": "list", "sorted": "list", "set": "set", "frozenset": "set", "dict": "dict",
+    "defaultdict": "dict", "Counter": "dict", "OrderedDict": "dict", "str": "str"
+}
+
+# Annotations that declare a value of a known kind
+_KIND_ANNOTATIONS = {
+    "list": "list", "List": "list", "set": "set", "Set": "set", "frozenset": "set", "FrozenSet": "set",
+    "dict": "dict", "Dict": "dict", "str": "str"
+}
+
+# Calls that pass a collection through (their first argument is what gets scanned)
+_PASS_THROUGH_CALLS = ("sorted", "list", "reversed", "enumerate", "filter", "tuple")
+
+# Methods that grow a collection in place
+_GROWING_METHODS = ("append", "extend", "insert", "add", "update", "setdefault")
+
+# Literal collections with at most this many elements, never grown, have a constant size
+FIXED_SIZE_LIMIT = 16
+
+
+def _is_formatted_string(node: ast.AST) -> bool:
+    """
+    Check whether an expression builds a string with formatting.
+    
+    Args:
+        node: Expression node
+    
+    Returns:
+        True for f-strings with placeholders, str.format calls, % formatting and concatenation with a string
+    """
+    if isinstance(node, ast.JoinedStr):
+        return any(isinstance(value, ast.FormattedValue) for value in node.values)
+    
+    if isinstance(node, ast.Call) and isinstance(node.func, ast.Attribute) and node.func.attr == "format":
+        return isinstance(node.func.value, (ast.Constant, ast.JoinedStr))
+    
+    if isinstance(node, ast.BinOp) and isinstance(node.op, (ast.Mod, ast.Add)):
+        operands = (node.left, node.right) if isinstance(node.op, ast.Add) else (node.left,)
+        return any(
+            (isinstance(operand, ast.Constant) and isinstance(operand.value, str)) or _is_formatted_string(operand)
+            for operand in operands
+        )
+    
+    return False
+
+
+class PythonSymbolTable(ast.NodeVisitor):
+    """
+    Symbol table of a Python module, built from a single walk of its AST.
+    Records imports, definitions, loaded names, exported names and SQL
+    calls that use formatted strings.
+    """
+    
+    def __init__(self, tree: ast.Module):
+        """
+        Build the symbol table.
+        
+        Args:
+            tree: Parsed module
+        """
+        self.tree = tree
+        self.module_docstring = ast.get_docstring(tree) is not None
+        self.imports: List[ImportedName] = []
+        self.definitions: List[Definition] = []
+        self.loads: Set[str] = set()
+        self.exports: Set[str] = set()
+        self.formatted_sql_calls: List[FormattedSqlCall] = []
+        self._annotation_depth = 0
+        
+        self.visit(tree)
+    
+    @classmethod
+    def from_source(cls, code_content: str, file_path: str = "<unknown>") -> "PythonSymbolTable":
+        """
+        Parse code and build its symbol table.
+        
+        Args:
+            code_content: Code content
+            file_path: Path used in syntax error messages
+        
+        Returns:
+            Symbol table (raises SyntaxError if the code does not parse)
+        """
+        return cls(ast.parse(code_content, file_path))
+    
+    # Imports
+    
+    def visit_Import(self, node: ast.Import) -> None:
+        for alias in node.names:
+            # "import a.b" binds "a"
+            name = alias.asname or alias.name.split(".")[0]
+            self.imports.append(ImportedName(name, alias.name, node.lineno, node.col_offset + 1))
+    
+    def visit_ImportFrom(self, node: ast.ImportFrom) -> None:
+        if node.module == "__future__":
+            return
+        module = "." * node.level + (node.module or "")
+        for alias in node.names:
+            if alias.name != "*":
+                self.imports.append(ImportedName(alias.asname or alias.name, module, node.lineno, node.col_offset + 1))
+    
+    # Definitions
+    
+    def _add_definition(self, node: ast.AST, kind: str) -> None:
+        self.definitions.append(Definition(node.name, kind, node.lineno, node.col_offset + 1,
+                                           ast.get_docstring(node) is not None))
+    
+    def visit_FunctionDef(self, node: ast.FunctionDef) -> None:
+        self._add_definition(node, "function")
+        for decorator in node.decorator_list:
+            self.visit(decorator)
+        self.visit(node.args)
+        self._visit_annotation(node.returns)
+        for statement in node.body:
+            self.visit(statement)
+    
+    visit_AsyncFunctionDef = visit_FunctionDef
+    
+    def visit_ClassDef(self, node: ast.ClassDef) -> None:
+        self._add_definition(node, "class")
+        self.generic_visit(node)
+    
+    def visit_Assign(self, node: ast.Assign) -> None:
+        for target in node.targets:
+            if isinstance(target, ast.Name):
+                self.definitions.append(Definition(target.id, "variable", target.lineno, target.col_offset + 1, False))
+                if target.id == "__all__" and isinstance(node.value, (ast.List, ast.Tuple)):
+                    self.exports.update(
+                        element.value for element in node.value.elts
+                        if isinstance(element, ast.Constant) and isinstance(element.value, str)
+                    )
+        self.generic_visit(node)
+    
+    # Uses
+    
+    def visit_Name(self, node: ast.Name) -> None:
+        if isinstance(node.ctx, ast.Load):
+            self.loads.add(node.id)
+    
+    def visit_Constant(self, node: ast.Constant) -> None:
+        # Names in string annotations ("Foo", Optional["Foo"]) count as uses; other strings do not
+        if self._annotation_depth and isinstance(node.value, str):
+            try:
+                self.visit(ast.parse(node.value, mode="eval"))
+            except SyntaxError:
+                pass
+    
+    def visit_arg(self, node: ast.arg) -> None:
+        self._visit_annotation(node.annotation)
+    
+    def visit_AnnAssign(self, node: ast.AnnAssign) -> None:
+        self._visit_annotation(node.annotation)
+        if node.value is not None:
+            self.visit(node.value)
+        self.visit(node.target)
+    
+    def _visit_annotation(self, annotation: Optional[ast.AST]) -> None:
+        if annotation is None:
+            return
+        self._annotation_depth += 1
+        self.visit(annotation)
+        self._annotation_depth -= 1
+    
+    def visit_Call(self, node: ast.Call) -> None:
+        func = node.func
+        method = func.attr if isinstance(func, ast.Attribute) else getattr(func, "id", None)
+        if method in SQL_EXECUTE_METHODS and node.args and _is_formatted_string(node.args[0]):
+            if isinstance(func, ast.Attribute):
+                line, column = func.end_lineno, func.end_col_offset - len(method) + 1
+            else:
+                line, column = func.lineno, func.col_offset + 1
+            self.formatted_sql_calls.append(FormattedSqlCall(method, line, column))
+        self.generic_visit(node)
+    
+    # Queries
+    
+    def unused_imports(self) -> List[ImportedName]:
+        """
+        Get the imports whose names are never used or exported.
+        
+        Returns:
+            List of imported names in source order
+        """
+        used = self.loads | self.exports
+        return [imported for imported in self.imports if imported.name not in used]
+    
+    def undocumented_definitions(self, public_only: bool = True) -> List[Definition]:
+        """
+        Get the functions and classes without a docstring.
+        
+        Args:
+            public_only: Skip names starting with an underscore
+        
+        Returns:
+            List of definitions in source order
+        """
+        return [
+            definition for definition in self.definitions
+            if definition.kind != "variable" and not definition.has_docstring
+            and not (public_only and definition.name.startswith("_"))
+        ]
+    
+    def get_summary(self) -> Dict[str, int]:
+        """Get symbol counts."""
+        return {
+            "imports": len(self.imports),
+            "definitions": len(self.definitions),
+            "names_loaded": len(self.loads)
+        }
+
+
+class QuadraticPatternFinder(ast.NodeVisitor):
+    """
+    Finds operations inside loops that scan or copy a whole collection or
+    string on every iteration, turning the loop quadratic.
+    
+    Value kinds (list, str, set, dict) are inferred from assignments,
+    annotations and constructor calls as the walk goes, per function scope
+    with self attributes shared across a class. A collection built by
+    filtering another one (e.g. a comprehension over self.tasks) counts as
+    that collection when looking for nested scans. Names bound to small
+    literal lists, tuples or dicts that are never grown have a constant
+    size, so membership tests against them are not reported.
+    """
+    
+    def __init__(self, tree: ast.AST):
+        """
+        Walk a module and collect its quadratic patterns.
+        
+        Args:
+            tree: Parsed module
+        """
+        self.patterns: List[QuadraticPattern] = []
+        # Innermost scope last: (kinds by name, source collection of derived names, whether names are fixed-size)
+        self._scopes: List[tuple] = [({}, {}, {})]
+        self._class_scopes: List[tuple] = []
+        # Enclosing loops of the current function: (collection key or None, names bound by the loop);
+        # loops over a literal tuple or list run a fixed number of times and are not tracked
+        self._loops: List[tuple] = []
+        self._reported: Set[tuple] = set()
+        self._grown = self._grown_keys(tree)
+        
+        self.visit(tree)
+    
+    # Kinds and collection keys
+    
+    @staticmethod
+    def _key(node: Optional[ast.AST]) -> Optional[str]:
+        """Get the name of a variable or attribute chain (x, self.tasks), or None for other expressions."""
+        if isinstance(node, ast.Name):
+            return node.id
+        if isinstance(node, ast.Attribute):
+            base = QuadraticPatternFinder._key(node.value)
+            return f"{base}.{node.attr}" if base else None
+        return None
+    
+    def _lookup(self, key: str, index: int) -> Optional[str]:
+        """Look a key up in the scopes, innermost first (self attributes also in the class)."""
+        for scope in reversed(self._scopes):
+            if key in scope[index]:
+                return scope[index][key]
+        if key.startswith("self.") and self._class_scopes:
+            return self._class_scopes[-1][index].get(key)
+        return None
+    
+    def _bind(self, key: str, kind: Optional[str], source: Optional[str] = None, fixed: bool = False) -> None:
+        """Record the kind (and source collection) of an assigned name, and whether its size is fixed."""
+        scope = self._class_scopes[-1] if key.startswith("self.") and self._class_scopes else self._scopes[-1]
+        scope[0][key] = kind
+        scope[1][key] = source
+        scope[2][key] = fixed and key not in self._grown
+    
+    @classmethod
+    def _grown_keys(cls, tree: ast.AST) -> Set[str]:
+        """Get the names grown anywhere in a module (by a growing method, item assignment or +=)."""
+        grown = set()
+        for node in ast.walk(tree):
+            if isinstance(node, ast.Call) and isinstance(node.func, ast.Attribute):
+                if node.func.attr not in _GROWING_METHODS:
+                    continue
+                target = node.func.value
+            elif isinstance(node, ast.Subscript) and isinstance(node.ctx, ast.Store):
+                target = node.value
+            elif isinstance(node, ast.AugAssign):
+                target = node.target
+            else:
+                continue
+            key = cls._key(target)
+            if key is not None:
+                grown.add(key)
+        return grown
+    
+    def _is_fixed(self, node: ast.AST) -> bool:
+        """Check whether an expression is a collection of constant size (a small literal or a view of one)."""
+        if isinstance(node, ast.Call) and isinstance(node.func, ast.Attribute) and not node.args:
+            return node.func.attr in ("values", "keys", "items") and self._is_fixed(node.func.value)
+        if isinstance(node, (ast.List, ast.Tuple, ast.Set)):
+            return 0 < len(node.elts) <= FIXED_SIZE_LIMIT and not any(
+                isinstance(element, ast.Starred) for element in node.elts)
+        if isinstance(node, ast.Dict):
+            return 0 < len(node.keys) <= FIXED_SIZE_LIMIT and None not in node.keys
+        key = self._key(node)
+        return bool(key and self._lookup(key, 2))
+    
+    def _kind(self, node: ast.AST) -> Optional[str]:
+        """Infer the kind of an expression."""
+        if isinstance(node, (ast.List, ast.ListComp)):
+            return "list"
+        if isinstance(node, (ast.Set, ast.SetComp)):
+            return "set"
+        if isinstance(node, (ast.Dict, ast.DictComp)):
+            return "dict"
+        if isinstance(node, ast.JoinedStr) or (isinstance(node, ast.Constant) and isinstance(node.value, str)):
+            return "str"
+        if isinstance(node, ast.BinOp) and isinstance(node.op, (ast.Add, ast.Mod)):
+            left = self._kind(node.left)
+            return left if left in ("str", "list") else self._kind(node.right) if isinstance(node.op, ast.Add) else None
+        if isinstance(node, ast.Call):
+            name = self._key(node.func)
+            if name in _KIND_CONSTRUCTORS:
+                return _KIND_CONSTRUCTORS[name]
+            if isinstance(node.func, ast.Attribute) and node.func.attr == "join":
+                return "str"
+            if isinstance(node.func, ast.Attribute) and node.func.attr in ("values", "keys", "items"):
+                # dict.values() is scanned linearly by "in"; keys() is a set-like view
+                return "list" if node.func.attr == "values" else "set"
+            return None
+        key = self._key(node)
+        return self._lookup(key, 0) if key else None
+    
+    def _annotation_kind(self, annotation: Optional[ast.AST]) -> Optional[str]:
+        """Infer the kind declared by an annotation."""
+        if isinstance(annotation, ast.Subscript):
+            annotation = annotation.value
+        if isinstance(annotation, ast.Constant) and isinstance(annotation.value, str):
+            return _KIND_ANNOTATIONS.get(annotation.value.split("[")[0])
+        return _KIND_ANNOTATIONS.get(self._key(annotation) or "")
+    
+    def _collection(self, node: Optional[ast.AST]) -> Optional[str]:
+        """Get the key of the collection an iterable scans, following derived collections."""
+        while isinstance(node, ast.Call) and self._key(node.func) in _PASS_THROUGH_CALLS and node.args:
+            node = node.args[-1] if self._key(node.func) == "filter" else node.args[0]
+        key = self._key(node)
+        seen = set()
+        while key is not None and key not in seen:
+            seen.add(key)
+            source = self._lookup(key, 1)
+            if source is None:
+                break
+            key = source
+        return key
+    
+    def _source_of(self, node: ast.AST) -> Optional[str]:
+        """Get the collection a value was derived from (a filtering comprehension or a copy)."""
+        if isinstance(node, (ast.ListComp, ast.SetComp, ast.GeneratorExp)):
+            return self._collection(node.generators[0].iter)
+        if isinstance(node, ast.Call) and self._key(node.func) in _PASS_THROUGH_CALLS and node.args:
+            return self._collection(node)
+        return None
+    
+    def _loop_names(self) -> Set[str]:
+        """Names bound by the enclosing loops."""
+        return {name for _, names in self._loops for name in names}
+    
+    @staticmethod
+    def _names(node: Optional[ast.AST]) -> Set[str]:
+        """Names read in an expression."""
+        if node is None:
+            return set()
+        return {child.id for child in ast.walk(node) if isinstance(child, ast.Name)}
+    
+    def _report(self, kind: str, node: ast.AST, name: str) -> None:
+        # A sliced prefix that is also counted (text[:i].count(...)) is one pattern
+        key = ("repeated" if kind.startswith("repeated") else kind, node.lineno)
+        if key not in self._reported:
+            self._reported.add(key)
+            self.patterns.append(QuadraticPattern(kind, node.lineno, node.col_offset + 1, name, len(self._loops)))
+    
+    # Scopes
+    
+    def _visit_function(self, node: ast.AST) -> None:
+        for decorator in getattr(node, "decorator_list", ()):
+            self.visit(decorator)
+        kinds = {}
+        for argument in node.args.posonlyargs + node.args.args + node.args.kwonlyargs:
+            kinds[argument.arg] = self._annotation_kind(argument.annotation)
+        
+        # A nested function runs when called, not once per iteration of the enclosing loop
+        loops, self._loops = self._loops, []
+        self._scopes.append((kinds, {}, dict.fromkeys(kinds, False)))
+        body = node.body if isinstance(node.body, list) else [node.body]
+        for statement in body:
+            self.visit(statement)
+        self._scopes.pop()
+        self._loops = loops
+    
+    visit_FunctionDef = visit_AsyncFunctionDef = visit_Lambda = _visit_function
+    
+    def visit_ClassDef(self, node: ast.ClassDef) -> None:
+        self._class_scopes.append(({}, {}, {}))
+        self.generic_visit(node)
+        self._class_scopes.pop()
+    
+    # Bindings
+    
+    def _bind_target(self, target: ast.AST, value: Optional[ast.AST], kind: Optional[str] = None) -> None:
+        key = self._key(target)
+        if key is not None:
+            if value is not None:
+                kind = kind or self._kind(value)
+            self._bind(key, kind, self._source_of(value) if value is not None else None,
+                       value is not None and self._is_fixed(value))
+        elif isinstance(target, (ast.Tuple, ast.List)):
+            for element in target.elts:
+                self._bind_target(element, None)
+    
+    def visit_Assign(self, node: ast.Assign) -> None:
+        self.visit(node.value)
+        for target in node.targets:
+            self._bind_target(target, node.value)
+            self.visit(target)
+    
+    def visit_AnnAssign(self, node: ast.AnnAssign) -> None:
+        if node.value is not None:
+            self.visit(node.value)
+        self._bind_target(node.target, node.value, self._annotation_kind(node.annotation))
+        self.visit(node.target)
+    
+    def visit_AugAssign(self, node: ast.AugAssign) -> None:
+        self.visit(node.value)
+        key = self._key(node.target)
+        if self._loops and key and isinstance(node.op, ast.Add) and key not in self._loop_names():
+            kind = self._kind(node.target)
+            if kind == "str" or (kind is None and self._kind(node.value) == "str"):
+                self._report("string-concatenation", node, key)
+        self.visit(node.target)
+    
+    # Loops
+    
+    def _enter_loop(self, iterable: Optional[ast.AST], target: Optional[ast.AST], node: ast.AST) -> int:
+        """Push a loop, reporting a scan of a collection an enclosing loop already scans. Returns the loops pushed."""
+        if target is not None:
+            self._bind_target(target, None)
+        if isinstance(iterable, (ast.Tuple, ast.List, ast.Set, ast.Dict)):
+            return 0
+        collection = self._collection(iterable) if iterable is not None else None
+        if collection is not None and any(outer == collection for outer, _ in self._loops):
+            self._report("nested-scan", node, collection)
+        self._loops.append((collection, self._names(target)))
+        return 1
+    
+    def visit_For(self, node: ast.For) -> None:
+        self.visit(node.iter)
+        pushed = self._enter_loop(node.iter, node.target, node.iter)
+        for statement in node.body:
+            self.visit(statement)
+        del self._loops[len(self._loops) - pushed:]
+        for statement in node.orelse:
+            self.visit(statement)
+    
+    visit_AsyncFor = visit_For
+    
+    def visit_While(self, node: ast.While) -> None:
+        self._enter_loop(None, None, node)
+        self.visit(node.test)
+        for statement in node.body:
+            self.visit(statement)
+        self._loops.pop()
+        for statement in node.orelse:
+            self.visit(statement)
+    
+    def _visit_comprehension(self, node: ast.AST) -> None:
+        pushed = 0
+        for generator in node.generators:
+            self.visit(generator.iter)
+            pushed += self._enter_loop(generator.iter, generator.target, generator.iter)
+            for condition in generator.ifs:
+                self.visit(condition)
+        if isinstance(node, ast.DictComp):
+            self.visit(node.key)
+            self.visit(node.value)
+        else:
+            self.visit(node.elt)
+        del self._loops[len(self._loops) - pushed:]
+    
+    visit_ListComp = visit_SetComp = visit_GeneratorExp = visit_DictComp = _visit_comprehension
+    
+    # Loop-carried operations
+    
+    def visit_Compare(self, node: ast.Compare) -> None:
+        self.generic_visit(node)
+        if not self._loops:
+            return
+        for operator, comparator in zip(node.ops, node.comparators):
+            if isinstance(operator, (ast.In, ast.NotIn)) and not isinstance(comparator, (ast.List, ast.Tuple)):
+                if self._kind(comparator) == "list" and not self._is_fixed(comparator):
+                    self._report("list-membership", node, self._key(comparator) or ast.unparse(comparator))
+    
+    def visit_Call(self, node: ast.Call) -> None:
+        self.generic_visit(node)
+        func = node.func
+        if not self._loops or not isinstance(func, ast.Attribute):
+            return
+        receiver = self._key(func.value)
+        loop_names = self._loop_names()
+        if func.attr in ("index", "remove", "count") and receiver is not None and receiver not in loop_names:
+            collection = self._collection(func.value)
+            if func.attr != "count" and any(outer == collection for outer, _ in self._loops):
+                self._report("nested-scan", node, receiver)
+                return
+        if func.attr == "count" and len(node.args) == 1:
+            # count(sub, start, end) scans a bounded range
+            if self._is_open_slice(func.value):
+                # text[:i].count(...) copies and scans a prefix on every iteration
+                self._report("repeated-scan", node, self._key(func.value.value) or ast.unparse(func.value.value))
+            elif receiver is not None and receiver not in loop_names and (
+                    self._kind(func.value) in ("str", "list") or self._names(node) & loop_names):
+                self._report("repeated-scan", node, receiver)
+    
+    @staticmethod
+    def _is_open_slice(node: ast.AST) -> bool:
+        """Check for a prefix or suffix slice (x[:i], x[i:]), whose copy grows with the sequence."""
+        return (isinstance(node, ast.Subscript) and isinstance(node.slice, ast.Slice)
+                and (node.slice.lower is None) != (node.slice.upper is None))
+    
+    def visit_Subscript(self, node: ast.Subscript) -> None:
+        self.generic_visit(node)
+        if not self._loops or not self._is_open_slice(node) or not isinstance(node.ctx, ast.Load):
+            return
+        receiver = self._key(node.value)
+        loop_names = self._loop_names()
+        if receiver is not None and receiver not in loop_names and self._kind(node.value) != "dict":
+            if self._names(node.slice.lower or node.slice.upper) & loop_names:
+                self._report("repeated-slice", node, receiver)
+
+
+def find_quadratic_patterns(tree: ast.AST) -> List[QuadraticPattern]:
+    """
+    Find loop-carried operations that make code quadratic.
+    
+    Args:
+        tree: Parsed module
+    
+    Returns:
+        List of patterns in source order
+    """
+    return sorted(QuadraticPatternFinder(tree).patterns, key=lambda pattern: (pattern.line, pattern.column))
+
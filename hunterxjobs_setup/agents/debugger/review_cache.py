@@ -0,0 +1,230 @@
+# Review Cache Module
+# This file defines the on-disk cache of review results used by the Debugger agent
+
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+from typing import Dict, List, Any, Optional
+
+
+def content_hash(code_content: str) -> str:
+    """
+    Hash code content for the review cache.
+    
+    Args:
+        code_content: Code content
+    
+    Returns:
+        Hex digest of the content
+    """
+    return hashlib.sha256(code_content.encode("utf-8", "surrogatepass")).hexdigest()
+
+
+class ReviewCache:
+    """
+    Review results stored in a local SQLite database.
+    
+    Results are keyed by content hash and rule-set version, so a file is only
+    analysed again when its content or the rules change. A second table maps
+    file paths to the modification time, size and hash seen at their last
+    review, which lets unchanged files skip reading and hashing entirely.
+    """
+    
+    def __init__(self, path: str = "review_cache.db"):
+        """
+        Initialize the review cache.
+        
+        Args:
+            path: Path to the SQLite database file
+        """
+        self.path = path
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._pending_writes = 0
+        self._connection = sqlite3.connect(path, check_same_thread=False)
+        # Write-ahead logging lets worker processes read while the parent writes
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.execute(
+            "CREATE TABLE IF NOT EXISTS reviews ("
+            "content_hash TEXT NOT NULL, "
+            "ruleset_version TEXT NOT NULL, "
+            "issues TEXT NOT NULL, "
+            "lines_of_code INTEGER NOT NULL, "
+            "PRIMARY KEY (content_hash, ruleset_version))"
+        )
+        self._connection.execute(
+            "CREATE TABLE IF NOT EXISTS files ("
+            "file_path TEXT PRIMARY KEY, "
+            "mtime_ns INTEGER NOT NULL, "
+            "size INTEGER NOT NULL, "
+            "content_hash TEXT NOT NULL)"
+        )
+        self._connection.execute(
+            "CREATE TABLE IF NOT EXISTS imports ("
+            "content_hash TEXT PRIMARY KEY, "
+            "imports TEXT NOT NULL)"
+        )
+        self._connection.commit()
+    
+    def _row_to_entry(self, row: Optional[tuple], digest: str) -> Optional[Dict[str, Any]]:
+        """Convert a reviews row to a cache entry and count the lookup."""
+        if row is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return {"content_hash": digest, "issues": json.loads(row[0]), "lines_of_code": row[1]}
+    
+    def get(self, digest: str, ruleset_version: str) -> Optional[Dict[str, Any]]:
+        """
+        Get the cached review of some content.
+        
+        Args:
+            digest: Content hash
+            ruleset_version: Rule-set version
+        
+        Returns:
+            Dictionary with content_hash, issues and lines_of_code, or None if not cached
+        """
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT issues, lines_of_code FROM reviews WHERE content_hash = ? AND ruleset_version = ?",
+                (digest, ruleset_version)
+            ).fetchone()
+            return self._row_to_entry(row, digest)
+    
+    def get_for_file(self, file_path: str, ruleset_version: str, mtime_ns: Optional[int] = None,
+                     size: Optional[int] = None) -> Optional[Dict[str, Any]]:
+        """
+        Get the cached review of a file from its last recorded content.
+        
+        Args:
+            file_path: Path to the file
+            ruleset_version: Rule-set version
+            mtime_ns: Current modification time; with size, the entry is only used if both still match
+            size: Current size in bytes
+        
+        Returns:
+            Cache entry, or None if the file is unknown, changed or not cached
+        """
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT mtime_ns, size, content_hash FROM files WHERE file_path = ?", (os.path.abspath(file_path),)
+            ).fetchone()
+            if row is None or (mtime_ns is not None and (row[0], row[1]) != (mtime_ns, size)):
+                self.misses += 1
+                return None
+            
+            digest = row[2]
+            review = self._connection.execute(
+                "SELECT issues, lines_of_code FROM reviews WHERE content_hash = ? AND ruleset_version = ?",
+                (digest, ruleset_version)
+            ).fetchone()
+            return self._row_to_entry(review, digest)
+    
+    def put(self, digest: str, ruleset_version: str, issues: List[Dict[str, Any]], lines_of_code: int,
+            file_path: Optional[str] = None, mtime_ns: Optional[int] = None, size: Optional[int] = None,
+            commit: bool = True) -> None:
+        """
+        Store a review.
+        
+        Args:
+            digest: Content hash
+            ruleset_version: Rule-set version
+            issues: Issues found in the content
+            lines_of_code: Number of lines in the content
+            file_path: Optional path of the reviewed file, recorded (as an absolute path) with its mtime and size
+            mtime_ns: Modification time of the file
+            size: Size of the file in bytes
+            commit: Commit immediately (pass False when storing many reviews, then call commit)
+        """
+        with self._lock:
+            self._connection.execute(
+                "INSERT OR REPLACE INTO reviews (content_hash, ruleset_version, issues, lines_of_code) "
+                "VALUES (?, ?, ?, ?)",
+                (digest, ruleset_version, json.dumps(issues), lines_of_code)
+            )
+            if file_path is not None and mtime_ns is not None:
+                self._connection.execute(
+                    "INSERT OR REPLACE INTO files (file_path, mtime_ns, size, content_hash) VALUES (?, ?, ?, ?)",
+                    (os.path.abspath(file_path), mtime_ns, size, digest)
+                )
+            self._pending_writes += 1
+            if commit:
+                self._connection.commit()
+                self._pending_writes = 0
+    
+    def get_imports(self, digest: str) -> Optional[List[str]]:
+        """
+        Get the imports extracted from some content.
+        
+        Args:
+            digest: Content hash
+        
+        Returns:
+            List of imported module names or specifiers, or None if not cached
+        """
+        with self._lock:
+            row = self._connection.execute("SELECT imports FROM imports WHERE content_hash = ?", (digest,)).fetchone()
+        return json.loads(row[0]) if row is not None else None
+    
+    def put_imports(self, digest: str, imports: List[str], commit: bool = True) -> None:
+        """
+        Store the imports extracted from some content.
+        
+        Args:
+            digest: Content hash
+            imports: Imported module names or specifiers
+            commit: Commit immediately (pass False when storing many, then call commit)
+        """
+        with self._lock:
+            self._connection.execute("INSERT OR REPLACE INTO imports (content_hash, imports) VALUES (?, ?)",
+                                     (digest, json.dumps(imports)))
+            self._pending_writes += 1
+            if commit:
+                self._connection.commit()
+                self._pending_writes = 0
+    
+    def commit(self) -> None:
+        """Commit stored reviews."""
+        with self._lock:
+            if self._pending_writes:
+                self._connection.commit()
+                self._pending_writes = 0
+    
+    def clear(self) -> None:
+        """Delete all cached reviews."""
+        with self._lock:
+            self._connection.execute("DELETE FROM reviews")
+            self._connection.execute("DELETE FROM files")
+            self._connection.execute("DELETE FROM imports")
+            self._connection.commit()
+            self._pending_writes = 0
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get cache statistics.
+        
+        Returns:
+            Dictionary containing cache statistics
+        """
+        with self._lock:
+            reviews = self._connection.execute("SELECT COUNT(*) FROM reviews").fetchone()[0]
+            files = self._connection.execute("SELECT COUNT(*) FROM files").fetchone()[0]
+        lookups = self.hits + self.misses
+        return {
+            "path": self.path,
+            "reviews": reviews,
+            "files": files,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0
+        }
+    
+    def close(self) -> None:
+        """Commit pending writes and close the database connection."""
+        self.commit()
+        with self._lock:
+            self._connection.close()
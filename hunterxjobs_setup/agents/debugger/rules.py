@@ -0,0 +1,957 @@
+# Debugger Rules Module
+# This file defines the review rules run by the Debugger agent and the single-pass pipeline that runs them
+
+import ast
+import hashlib
+import json
+import os
+import threading
+from time import perf_counter
+from typing import Dict, List, Any, Optional, Iterable, Tuple
+
+from .lexer import LineIndex, scan_js_brackets
+from .profiling import RuleProfile
+from .python_analysis import PythonSymbolTable, find_quadratic_patterns
+from .scanner import MultiPatternScanner, ScanMatch
+
+PYTHON_EXTENSIONS = ('.py', '.pyw')
+JAVASCRIPT_EXTENSIONS = ('.js', '.jsx', '.ts', '.tsx')
+
+ISSUE_TYPES = ("syntax", "style", "security", "performance")
+LANGUAGES = ("python", "javascript")
+
+# Bump when the behaviour of the built-in rules changes so cached reviews are invalidated
+RULESET_VERSION = 2
+
+
+def detect_language(file_path: str) -> Optional[str]:
+    """
+    Detect the language of a file from its extension.
+    
+    Args:
+        file_path: Path to the file
+    
+    Returns:
+        "python", "javascript" or None
+    """
+    file_extension = os.path.splitext(file_path)[1].lower()
+    if file_extension in PYTHON_EXTENSIONS:
+        return "python"
+    if file_extension in JAVASCRIPT_EXTENSIONS:
+        return "javascript"
+    return None
+
+
+def make_issue(issue_type: str, severity: str, message: str, line: int, column: int, code: str) -> Dict[str, Any]:
+    """
+    Build an issue dictionary.
+    
+    Args:
+        issue_type: Issue type (syntax, style, security, performance)
+        severity: Severity (critical, high, medium, low)
+        message: Issue message
+        line: 1-based line number
+        column: 1-based column
+        code: Source line
+    
+    Returns:
+        Issue dictionary
+    """
+    return {
+        "type": issue_type,
+        "severity": severity,
+        "message": message,
+        "line": line,
+        "column": column,
+        "code": code
+    }
+
+
+class SourceFile:
+    """
+    A file under review. The code is split into lines once and shared by all rules.
+    """
+    
+    streaming = False
+    
+    def __init__(self, file_path: str, code_content: str):
+        """
+        Initialize the source file.
+        
+        Args:
+            file_path: Path to the file
+            code_content: Code content
+        """
+        self.file_path = file_path
+        self.file_extension = os.path.splitext(file_path)[1].lower()
+        self.language = detect_language(file_path)
+        self.code_content = code_content
+        self.lines = code_content.splitlines()
+        self._line_index = None
+        self._python_tree = None
+        self._python_symbols = None
+        self._syntax_error = None
+        
+        # Optional (first, last) 1-based line numbers limiting the line pass, used to re-check edited regions
+        self.line_range = None
+        
+        # Per-file scratch space for rules that need state across lines
+        self.state = {}
+    
+    @property
+    def line_index(self) -> LineIndex:
+        """Line start offsets, built on first use."""
+        if self._line_index is None:
+            self._line_index = LineIndex(self.code_content)
+        return self._line_index
+    
+    def _parse_python(self) -> None:
+        """Parse the file as Python once, remembering the tree or the syntax error."""
+        if self._python_tree is None and self._syntax_error is None:
+            try:
+                self._python_tree = ast.parse(self.code_content, self.file_path)
+            except SyntaxError as e:
+                self._syntax_error = e
+    
+    @property
+    def python_tree(self) -> Optional[ast.Module]:
+        """Parsed Python module, or None if the code does not parse."""
+        self._parse_python()
+        return self._python_tree
+    
+    @property
+    def syntax_error(self) -> Optional[SyntaxError]:
+        """Syntax error raised while parsing the file as Python, if any."""
+        self._parse_python()
+        return self._syntax_error
+    
+    @property
+    def python_symbols(self) -> Optional[PythonSymbolTable]:
+        """Symbol table built from the parsed module, or None if the code does not parse."""
+        if self._python_symbols is None and self.python_tree is not None:
+            self._python_symbols = PythonSymbolTable(self._python_tree)
+        return self._python_symbols
+    
+    @property
+    def line_count(self) -> int:
+        """Number of lines."""
+        return len(self.lines)
+    
+    def line_text(self, line_number: int) -> str:
+        """
+        Get the text of a line.
+        
+        Args:
+            line_number: 1-based line number
+        
+        Returns:
+            Line text, or an empty string if out of range
+        """
+        if 1 <= line_number <= len(self.lines):
+            return self.lines[line_number - 1]
+        return ""
+    
+    def iter_line_chunks(self) -> Iterable[Tuple[int, List[str]]]:
+        """Iterate over (first line number, lines) chunks; an in-memory file is a single chunk."""
+        if self.line_range is not None:
+            first, last = self.line_range
+            return ((first, self.lines[first - 1:last]),)
+        return ((1, self.lines),)
+
+
+class Rule:
+    """
+    Base class for review rules.
+    
+    Line rules implement visit_line and are fed every line by the pipeline;
+    file rules implement visit_file and see the whole file once. Pattern
+    rules declare regex patterns and literals, which are compiled into the
+    registry's shared scanner, and implement visit_matches to receive the
+    lines where any of them hit.
+    """
+    
+    rule_id = "rule"
+    issue_type = "style"
+    languages = None  # None means every language
+    
+    # (key, regular expression, anchor) and (key, literal) entries matched by the shared
+    # scanner; the anchor is a literal every match contains (case-insensitive)
+    patterns = ()
+    literals = ()
+    
+    def applies_to(self, language: Optional[str]) -> bool:
+        """Check whether the rule runs for a language."""
+        return self.languages is None or language in self.languages
+    
+    def visit_file(self, source: SourceFile) -> Iterable[Dict[str, Any]]:
+        """Check the whole file. Returns a list of issues."""
+        return ()
+    
+    def visit_line(self, source: SourceFile, line_number: int, line: str, stripped: str) -> Iterable[Dict[str, Any]]:
+        """Check a single line. Returns a list of issues."""
+        return ()
+    
+    def visit_matches(self, source: SourceFile, line_number: int, line: str, stripped: str,
+                      matches: Dict[str, ScanMatch]) -> Iterable[Dict[str, Any]]:
+        """Check a line where at least one of the rule's patterns hit. Returns a list of issues."""
+        return ()
+    
+    def finish_file(self, source: SourceFile) -> Iterable[Dict[str, Any]]:
+        """Emit issues that depend on the whole file after all lines were visited."""
+        return ()
+    
+    has_line_visitor = False
+    has_file_visitor = False
+    has_match_visitor = False
+    has_finish = False
+    
+    def __init_subclass__(cls, **kwargs):
+        """Record which hooks a rule overrides so the pipeline only calls those."""
+        super().__init_subclass__(**kwargs)
+        cls.has_line_visitor = cls.visit_line is not Rule.visit_line
+        cls.has_file_visitor = cls.visit_file is not Rule.visit_file
+        cls.has_match_visitor = cls.visit_matches is not Rule.visit_matches
+        cls.has_finish = cls.finish_file is not Rule.finish_file
+
+
+# Syntax rules
+
+class PythonCompileRule(Rule):
+    """Report Python syntax errors."""
+    
+    rule_id = "python-syntax"
+    issue_type = "syntax"
+    languages = ("python",)
+    
+    def visit_file(self, source: SourceFile) -> Iterable[Dict[str, Any]]:
+        try:
+            if source.syntax_error is not None:
+                raise source.syntax_error
+            # Compiling the tree also reports errors found after parsing ('return' outside function, ...)
+            compile(source.python_tree, source.file_path, 'exec')
+        except SyntaxError as e:
+            return [make_issue("syntax", "critical", f"Syntax error: {str(e)}", e.lineno, e.offset,
+                               e.text.strip() if e.text else "")]
+        return ()
+
+
+class BracketRule(Rule):
+    """Report mismatched, unmatched and unclosed brackets in JavaScript/TypeScript."""
+    
+    rule_id = "brackets"
+    issue_type = "syntax"
+    languages = ("javascript",)
+    
+    def visit_file(self, source: SourceFile) -> Iterable[Dict[str, Any]]:
+        issues = []
+        for message, offset in scan_js_brackets(source.code_content):
+            line_number, column = source.line_index.position(offset)
+            issues.append(make_issue("syntax", "critical", message, line_number, column,
+                                     source.line_text(line_number)))
+        return issues
+
+
+# Style rules
+
+class LongLineRule(Rule):
+    """Report lines longer than the maximum line length."""
+    
+    rule_id = "long-line"
+    issue_type = "style"
+    
+    def __init__(self, max_line_length: int = 100):
+        self.max_line_length = max_line_length
+    
+    def visit_line(self, source, line_number, line, stripped):
+        if len(line) > self.max_line_length:
+            return [make_issue("style", "low", f"Line too long ({len(line)} > {self.max_line_length} characters)",
+                               line_number, 1, line)]
+        return ()
+
+
+class TrailingWhitespaceRule(Rule):
+    """Report trailing whitespace."""
+    
+    rule_id = "trailing-whitespace"
+    issue_type = "style"
+    
+    def visit_line(self, source, line_number, line, stripped):
+        if line and line[-1].isspace():
+            return [make_issue("style", "low", "Trailing whitespace", line_number, len(line.rstrip()) + 1, line)]
+        return ()
+
+
+class PythonDocstringRule(Rule):
+    """Report Python modules, public classes and public functions without a docstring."""
+    
+    rule_id = "missing-docstring"
+    issue_type = "style"
+    languages = ("python",)
+    
+    def __init__(self, require_module_docstring: bool = True, public_only: bool = True):
+        self.require_module_docstring = require_module_docstring
+        self.public_only = public_only
+    
+    def visit_file(self, source: SourceFile) -> Iterable[Dict[str, Any]]:
+        symbols = source.python_symbols
+        if symbols is None:
+            return ()
+        
+        issues = []
+        if self.require_module_docstring and not symbols.module_docstring:
+            issues.append(make_issue("style", "medium", "Missing module docstring", 1, 1, ""))
+        scope = "public " if self.public_only else ""
+        for definition in symbols.undocumented_definitions(self.public_only):
+            issues.append(make_issue("style", "low", f"Missing docstring in {scope}{definition.kind}: {definition.name}",
+                                     definition.line, definition.column, source.line_text(definition.line)))
+        return issues
+
+
+class PythonUnusedImportRule(Rule):
+    """Report Python imports whose names are never used or exported."""
+    
+    rule_id = "unused-import"
+    issue_type = "style"
+    languages = ("python",)
+    
+    def visit_file(self, source: SourceFile) -> Iterable[Dict[str, Any]]:
+        symbols = source.python_symbols
+        if symbols is None:
+            return ()
+        return [
+            make_issue("style", "low", f"Unused import: {imported.name}", imported.line, imported.column,
+                       source.line_text(imported.line))
+            for imported in symbols.unused_imports()
+        ]
+
+
+class MissingSemicolonRule(Rule):
+    """Report JavaScript/TypeScript statements without a trailing semicolon."""
+    
+    rule_id = "missing-semicolon"
+    issue_type = "style"
+    languages = ("javascript",)
+    
+    def visit_line(self, source, line_number, line, stripped):
+        if stripped and not stripped.endswith((';', '{', '}', ',')) and not stripped.startswith('//'):
+            return [make_issue("style", "low", "Missing semicolon", line_number, len(stripped) + 1, stripped)]
+        return ()
+
+
+class ConsoleLogRule(Rule):
+    """Report console.log statements."""
+    
+    rule_id = "console-log"
+    issue_type = "style"
+    languages = ("javascript",)
+    
+    literals = (("console", "console.log"),)
+    
+    def visit_matches(self, source, line_number, line, stripped, matches):
+        if stripped.startswith('//'):
+            return ()
+        return [make_issue("style", "medium", "Console statement should be removed in production code",
+                           line_number, matches["console"].start + 1, line)]
+
+
+# Security rules
+
+class HardcodedCredentialRule(Rule):
+    """Report hardcoded passwords, API keys, secrets and tokens."""
+    
+    rule_id = "hardcoded-credential"
+    issue_type = "security"
+    
+    patterns = (
+        ("Hardcoded password", r'(?i:password\s*=\s*["\']([^"\']+)["\'])', "password"),
+        ("Hardcoded API key", r'(?i:api[_\s]*key\s*=\s*["\']([^"\']+)["\'])', "api"),
+        ("Hardcoded secret", r'(?i:secret\s*=\s*["\']([^"\']+)["\'])', "secret"),
+        ("Hardcoded token", r'(?i:token\s*=\s*["\']([^"\']+)["\'])', "token")
+    )
+    
+    def visit_matches(self, source, line_number, line, stripped, matches):
+        if stripped.startswith(('#', '//', '/*')):
+            return ()
+        return [
+            make_issue("security", "critical", message, line_number, matches[message].start + 1, line)
+            for message, _, _ in self.patterns if message in matches
+        ]
+
+
+class SqlInjectionRule(Rule):
+    """Report SQL statements built with string formatting in Python."""
+    
+    rule_id = "sql-injection"
+    issue_type = "security"
+    languages = ("python",)
+    
+    def visit_file(self, source: SourceFile) -> Iterable[Dict[str, Any]]:
+        symbols = source.python_symbols
+        if symbols is None:
+            return ()
+        return [
+            make_issue("security", "critical", "Potential SQL injection vulnerability", call.line, call.column,
+                       source.line_text(call.line))
+            for call in symbols.formatted_sql_calls
+        ]
+
+
+class UnsafeDeserializationRule(Rule):
+    """Report unsafe deserialization with pickle.loads and yaml.load."""
+    
+    rule_id = "unsafe-deserialization"
+    issue_type = "security"
+    languages = ("python",)
+    
+    literals = (("pickle", "pickle.loads"), ("yaml", "yaml.load("))
+    
+    def visit_matches(self, source, line_number, line, stripped, matches):
+        if stripped.startswith('#'):
+            return ()
+        issues = []
+        if "pickle" in matches:
+            issues.append(make_issue("security", "high", "Unsafe deserialization with pickle.loads",
+                                     line_number, matches["pickle"].start + 1, line))
+        if "yaml" in matches and 'Loader=' not in line:
+            issues.append(make_issue("security", "high", "Unsafe deserialization with yaml.load (use yaml.safe_load)",
+                                     line_number, matches["yaml"].start + 1, line))
+        return issues
+
+
+class UnsafeJavaScriptRule(Rule):
+    """Report eval and raw HTML injection in JavaScript/TypeScript."""
+    
+    rule_id = "unsafe-javascript"
+    issue_type = "security"
+    languages = ("javascript",)
+    
+    unsafe_patterns = [
+        ('eval(', "critical", "Use of eval() can lead to code injection"),
+        ('innerHTML', "high", "Assigning innerHTML can lead to cross-site scripting"),
+        ('dangerouslySetInnerHTML', "high", "dangerouslySetInnerHTML can lead to cross-site scripting")
+    ]
+    literals = tuple((pattern, pattern) for pattern, _, _ in unsafe_patterns)
+    
+    def visit_matches(self, source, line_number, line, stripped, matches):
+        if stripped.startswith('//'):
+            return ()
+        return [
+            make_issue("security", severity, message, line_number, matches[pattern].start + 1, line)
+            for pattern, severity, message in self.unsafe_patterns if pattern in matches
+        ]
+
+
+# Performance rules
+
+class RangeLenRule(Rule):
+    """Report index-based iteration over range(len(...)) in Python."""
+    
+    rule_id = "range-len"
+    issue_type = "performance"
+    languages = ("python",)
+    
+    patterns = (("range-len", r'for\s+\w+\s+in\s+range\s*\(\s*len\s*\(', "range"),)
+    
+    def visit_matches(self, source, line_number, line, stripped, matches):
+        if not stripped.startswith('#'):
+            return [make_issue("performance", "low",
+                               "Iterating over range(len(...)); iterate directly or use enumerate()",
+                               line_number, line.find('for') + 1, line)]
+        return ()
+
+
+class QuadraticPatternRule(Rule):
+    """Report loops that scan or copy a whole collection or string on every iteration in Python."""
+    
+    rule_id = "quadratic-pattern"
+    issue_type = "performance"
+    languages = ("python",)
+    
+    # Message and suggested data structure per pattern kind
+    advice = {
+        "list-membership": ("Membership test on list {name} inside a loop scans the list on every iteration",
+                            "Build a set (or a dict for lookups by key) from {name} once before the loop"),
+        "string-concatenation": ("String {name} is built with += inside a loop, copying it on every iteration",
+                                 "Append the parts to a list and ''.join() it after the loop, or write to io.StringIO"),
+        "repeated-scan": ("{name} is scanned with count() on every iteration of the loop",
+                          "Count once with collections.Counter, or keep a running count as the loop advances"),
+        "repeated-slice": ("{name} is sliced up to the loop position on every iteration, copying it each time",
+                           "Track the position incrementally, or use str.find(sub, start) or a memoryview"),
+        "nested-scan": ("{name} is scanned again inside a loop over the same collection",
+                        "Index {name} in a dict keyed by the lookup field, built once before the outer loop")
+    }
+    
+    def visit_file(self, source: SourceFile) -> Iterable[Dict[str, Any]]:
+        if source.python_tree is None:
+            return ()
+        
+        issues = []
+        for pattern in find_quadratic_patterns(source.python_tree):
+            message, suggestion = self.advice[pattern.kind]
+            name = f"'{pattern.name}'"
+            issue = make_issue("performance", "high" if pattern.loop_depth > 1 else "medium",
+                               message.format(name=name), pattern.line, pattern.column,
+                               source.line_text(pattern.line))
+            issue["complexity"] = f"O(n^{pattern.loop_depth + 1})"
+            issue["suggestion"] = suggestion.format(name=name)
+            issues.append(issue)
+        return issues
+
+
+class EventListenerLeakRule(Rule):
+    """Report event listeners in files that never remove any listener."""
+    
+    rule_id = "event-listener-leak"
+    issue_type = "performance"
+    languages = ("javascript",)
+    
+    literals = (("add", "addEventListener"), ("remove", "removeEventListener"))
+    
+    def visit_matches(self, source, line_number, line, stripped, matches):
+        state = source.state.setdefault(self.rule_id, {"added": [], "removed": False})
+        if "remove" in matches:
+            state["removed"] = True
+        if "add" in matches and not stripped.startswith('//'):
+            state["added"].append((line_number, matches["add"].start, line))
+        return ()
+    
+    def finish_file(self, source: SourceFile) -> Iterable[Dict[str, Any]]:
+        state = source.state.get(self.rule_id)
+        if not state or state["removed"]:
+            return ()
+        return [
+            make_issue("performance", "medium", "Potential memory leak: event listener is never removed",
+                       line_number, column + 1, line)
+            for line_number, column, line in state["added"]
+        ]
+
+
+# Built-in rules in reporting order
+BUILTIN_RULES = (
+    PythonCompileRule,
+    BracketRule,
+    LongLineRule,
+    TrailingWhitespaceRule,
+    PythonDocstringRule,
+    PythonUnusedImportRule,
+    MissingSemicolonRule,
+    ConsoleLogRule,
+    HardcodedCredentialRule,
+    SqlInjectionRule,
+    UnsafeDeserializationRule,
+    UnsafeJavaScriptRule,
+    RangeLenRule,
+    QuadraticPatternRule,
+    EventListenerLeakRule
+)
+
+
+def _rule_settings(rule_class: type, options: Any) -> Optional[Dict[str, Any]]:
+    """
+    Read the configuration of one rule.
+    
+    Args:
+        rule_class: Rule class
+        options: True or False to enable or disable the rule, or a dictionary of
+            constructor settings with an optional "enabled" key
+    
+    Returns:
+        Constructor settings, or None if the rule is disabled
+    """
+    if options is None or options is True:
+        return {}
+    if options is False:
+        return None
+    if not isinstance(options, dict):
+        raise ValueError(f"Invalid configuration for rule {rule_class.rule_id}: {options!r}")
+    settings = dict(options)
+    if not settings.pop("enabled", True):
+        return None
+    return settings
+
+
+class RuleRegistry:
+    """
+    Registry of review rules.
+    Runs every applicable rule over a file in a single pass over its lines.
+    
+    A registry can be frozen into a compiled rule set: its plans are built
+    for every language up front and no more rules can be registered, so
+    one instance can be shared by every agent and project with the same
+    configuration.
+    """
+    
+    def __init__(self, rules: Optional[List[Rule]] = None):
+        """
+        Initialize the registry.
+        
+        Args:
+            rules: Optional initial rules (in reporting order)
+        """
+        self.rules = []
+        self.frozen = False
+        self._plans = {}
+        self._rule_scanners = {}
+        self._version = None
+        for rule in rules or []:
+            self.register(rule)
+    
+    @classmethod
+    def default(cls) -> "RuleRegistry":
+        """Create a registry with the built-in rules."""
+        return cls([rule_class() for rule_class in BUILTIN_RULES])
+    
+    @classmethod
+    def from_config(cls, linting_rules: Optional[Dict[str, Any]] = None,
+                    security_checks: Optional[Dict[str, Any]] = None) -> "RuleRegistry":
+        """
+        Create a registry with the built-in rules selected and configured by the agent configuration.
+        
+        Both mappings are keyed by rule ID. A value of False disables the rule; a
+        dictionary passes its entries to the rule's constructor (for example
+        {"long-line": {"max_line_length": 120}}) and may set "enabled". Security
+        rules are configured in security_checks, all others in linting_rules.
+        
+        Args:
+            linting_rules: Configuration of the syntax, style and performance rules
+            security_checks: Configuration of the security rules
+        
+        Returns:
+            Rule registry (raises ValueError for unknown rules or settings)
+        """
+        rule_classes = {rule_class.rule_id: rule_class for rule_class in BUILTIN_RULES}
+        sections = (("linting_rules", linting_rules or {}, False), ("security_checks", security_checks or {}, True))
+        for section, options, security in sections:
+            for rule_id in options:
+                rule_class = rule_classes.get(rule_id)
+                if rule_class is None:
+                    raise ValueError(f"Unknown rule in {section}: {rule_id}")
+                if (rule_class.issue_type == "security") != security:
+                    raise ValueError(f"Rule {rule_id} belongs in "
+                                     f"{'security_checks' if rule_class.issue_type == 'security' else 'linting_rules'}")
+        
+        rules = []
+        for rule_class in BUILTIN_RULES:
+            options = (security_checks or {}) if rule_class.issue_type == "security" else (linting_rules or {})
+            settings = _rule_settings(rule_class, options.get(rule_class.rule_id))
+            if settings is None:
+                continue
+            try:
+                rules.append(rule_class(**settings))
+            except TypeError as e:
+                raise ValueError(f"Invalid settings for rule {rule_class.rule_id}: {e}")
+        return cls(rules)
+    
+    def freeze(self) -> "RuleRegistry":
+        """
+        Compile the registry into an immutable rule set.
+        Plans and scanners for every language are built now instead of on first use.
+        
+        Returns:
+            The registry
+        """
+        if not self.frozen:
+            self.rules = tuple(self.rules)
+            for language in LANGUAGES + (None,):
+                self._plan(language, None)
+            # Fingerprint the final rules now so the version is fixed with them
+            self.version
+            self.frozen = True
+        return self
+    
+    def register(self, rule: Rule) -> None:
+        """
+        Register a rule. Issues are reported grouped by issue type, then in registration order.
+        
+        Args:
+            rule: Rule to register
+        """
+        if self.frozen:
+            raise ValueError("Rules cannot be registered in a compiled rule set")
+        if any(existing.rule_id == rule.rule_id for existing in self.rules):
+            raise ValueError(f"Rule already registered: {rule.rule_id}")
+        self.rules.append(rule)
+        self._plans = {}
+        self._rule_scanners = {}
+        self._version = None
+    
+    @property
+    def version(self) -> str:
+        """
+        Fingerprint of the registered rules and their settings.
+        Reviews produced under a different version are not reused.
+        """
+        if self._version is None:
+            digest = hashlib.sha256(str(RULESET_VERSION).encode())
+            for rule in self.rules:
+                rule_class = type(rule)
+                settings = sorted((key, repr(value)) for key, value in vars(rule).items())
+                digest.update(repr((rule_class.__module__, rule_class.__qualname__, rule.rule_id, rule.issue_type,
+                                    rule.languages, rule.patterns, rule.literals, settings)).encode())
+            self._version = digest.hexdigest()[:16]
+        return self._version
+    
+    def rules_for(self, language: Optional[str], issue_types: Optional[Iterable[str]] = None) -> List[Rule]:
+        """
+        Get the rules that run for a language, in reporting order.
+        
+        Args:
+            language: Language name
+            issue_types: Optional issue types to restrict the rules to
+        
+        Returns:
+            List of rules
+        """
+        return list(self._plan(language, frozenset(issue_types) if issue_types is not None else None)[0])
+    
+    def is_line_local(self, language: Optional[str]) -> bool:
+        """
+        Check whether every rule for a language looks at one line at a time.
+        Only then can an edited region be re-checked without the rest of the file.
+        
+        Args:
+            language: Language name
+        
+        Returns:
+            True if no rule has a file visitor or a finishing step
+        """
+        return not any(rule.has_file_visitor or rule.has_finish for rule in self.rules_for(language))
+    
+    def get_rule(self, rule_id: str) -> Optional[Rule]:
+        """Get a registered rule by ID."""
+        return next((rule for rule in self.rules if rule.rule_id == rule_id), None)
+    
+    def _plan(self, language: Optional[str], issue_types: Optional[frozenset]) -> Tuple[List[Rule], MultiPatternScanner]:
+        """
+        Get the rules that run for a language and set of issue types, in reporting order,
+        and the scanner compiled from their patterns.
+        """
+        key = (language, issue_types)
+        plan = self._plans.get(key)
+        if plan is None:
+            rules = [
+                rule for rule in self.rules
+                if rule.applies_to(language) and (issue_types is None or rule.issue_type in issue_types)
+            ]
+            type_order = {issue_type: position for position, issue_type in enumerate(ISSUE_TYPES)}
+            rules.sort(key=lambda rule: type_order.get(rule.issue_type, len(ISSUE_TYPES)))
+            
+            # Scanner hits are named (rule position, pattern key)
+            scanner = MultiPatternScanner(
+                [((position, name), pattern, anchor)
+                 for position, rule in enumerate(rules) for name, pattern, anchor in rule.patterns],
+                [((position, name), literal) for position, rule in enumerate(rules) for name, literal in rule.literals]
+            )
+            plan = self._plans[key] = (rules, scanner)
+        return plan
+    
+    def _rule_scanner(self, rule: Rule) -> MultiPatternScanner:
+        """Get a scanner compiled from a single rule's patterns (used when profiling)."""
+        scanner = self._rule_scanners.get(rule.rule_id)
+        if scanner is None:
+            scanner = self._rule_scanners[rule.rule_id] = MultiPatternScanner(rule.patterns, rule.literals)
+        return scanner
+    
+    def run(self, source: SourceFile, issue_types: Optional[Iterable[str]] = None,
+            max_issues: Optional[int] = None, profile: Optional[RuleProfile] = None) -> List[Dict[str, Any]]:
+        """
+        Run the applicable rules over a file.
+        
+        Lines are processed in the chunks the source provides. Streaming sources
+        (see MappedSourceFile) yield bounded chunks; rules that need the whole
+        file are skipped for them and listed in source.skipped_rules.
+        
+        Args:
+            source: File under review
+            issue_types: Optional issue types to restrict the run to
+            max_issues: Optional cap; the line pass stops once this many issues were found
+            profile: Optional profile to record each rule's wall time, lines and issues in
+        
+        Returns:
+            List of issues, grouped by issue type and rule and tagged with the rule ID
+        """
+        plan, scanner = self._plan(source.language, frozenset(issue_types) if issue_types is not None else None)
+        if profile is not None:
+            results = self._run_profiled(source, plan, max_issues, profile)
+        else:
+            results = self._run_shared(source, plan, scanner, max_issues)
+        
+        issues = []
+        for rule, rule_issues in zip(plan, results):
+            for issue in rule_issues:
+                issue["rule"] = rule.rule_id
+            issues.extend(rule_issues)
+        if max_issues is not None and len(issues) > max_issues:
+            del issues[max_issues:]
+        return issues
+    
+    def _run_shared(self, source: SourceFile, plan: List[Rule], scanner: MultiPatternScanner,
+                    max_issues: Optional[int]) -> List[List[Dict[str, Any]]]:
+        """
+        Run rules in a single pass, with the shared scanner feeding every pattern rule.
+        
+        Returns:
+            Issues per rule, in plan order
+        """
+        results = [[] for _ in plan]
+        found_count = 0
+        
+        for position, rule in enumerate(plan):
+            if rule.has_file_visitor:
+                if source.streaming:
+                    source.skipped_rules.append(rule.rule_id)
+                    continue
+                results[position].extend(rule.visit_file(source))
+                found_count += len(results[position])
+        
+        line_rules = [(position, rule.visit_line) for position, rule in enumerate(plan) if rule.has_line_visitor]
+        match_rules = [rule.visit_matches if rule.has_match_visitor else None for rule in plan]
+        scan = scanner.scan if scanner.regex is not None else None
+        
+        def visit_hits(line_number: int, line: str, stripped: str) -> int:
+            hits = scan(line)
+            if not hits:
+                return 0
+            by_rule = {}
+            for (position, name), match in hits.items():
+                by_rule.setdefault(position, {})[name] = match
+            count = 0
+            for position, matches in by_rule.items():
+                visit_matches = match_rules[position]
+                if visit_matches:
+                    found = visit_matches(source, line_number, line, stripped, matches)
+                    if found:
+                        results[position].extend(found)
+                        count += len(found)
+            return count
+        
+        capped = False
+        for first_line, lines in source.iter_line_chunks():
+            candidates = scanner.candidate_lines(lines)
+            if line_rules:
+                candidate_set = set(candidates)
+                for index, line in enumerate(lines):
+                    line_number = first_line + index
+                    stripped = line.strip()
+                    for position, visit_line in line_rules:
+                        found = visit_line(source, line_number, line, stripped)
+                        if found:
+                            results[position].extend(found)
+                            found_count += len(found)
+                    if index + 1 in candidate_set:
+                        found_count += visit_hits(line_number, line, stripped)
+                    if max_issues is not None and found_count >= max_issues:
+                        capped = True
+                        break
+            else:
+                for candidate in candidates:
+                    line = lines[candidate - 1]
+                    found_count += visit_hits(first_line + candidate - 1, line, line.strip())
+                    if max_issues is not None and found_count >= max_issues:
+                        capped = True
+                        break
+            if capped:
+                break
+        
+        for position, rule in enumerate(plan):
+            if rule.has_finish:
+                results[position].extend(rule.finish_file(source))
+        
+        return results
+    
+    def _run_profiled(self, source: SourceFile, plan: List[Rule], max_issues: Optional[int],
+                      profile: RuleProfile) -> List[List[Dict[str, Any]]]:
+        """
+        Run rules one at a time over each chunk of lines so each can be timed on its own.
+        Pattern rules use scanners compiled from their own patterns, so the time
+        of candidate filtering and scanning is charged to the rule that needs it.
+        
+        Returns:
+            Issues per rule, in plan order
+        """
+        results = [[] for _ in plan]
+        seconds = [0.0] * len(plan)
+        lines_scanned = [0] * len(plan)
+        found_count = 0
+        
+        for position, rule in enumerate(plan):
+            if rule.has_file_visitor:
+                if source.streaming:
+                    source.skipped_rules.append(rule.rule_id)
+                    continue
+                start = perf_counter()
+                results[position].extend(rule.visit_file(source))
+                seconds[position] += perf_counter() - start
+                lines_scanned[position] += len(source.lines)
+                found_count += len(results[position])
+        
+        for first_line, lines in source.iter_line_chunks():
+            for position, rule in enumerate(plan):
+                if not (rule.has_line_visitor or rule.has_match_visitor):
+                    continue
+                found = results[position]
+                before = len(found)
+                start = perf_counter()
+                scanner = self._rule_scanner(rule) if rule.has_match_visitor else None
+                candidates = scanner.candidate_lines(lines) if scanner is not None else []
+                if rule.has_line_visitor:
+                    candidate_set = set(candidates)
+                    for index, line in enumerate(lines):
+                        line_number = first_line + index
+                        stripped = line.strip()
+                        found.extend(rule.visit_line(source, line_number, line, stripped) or ())
+                        if index + 1 in candidate_set:
+                            matches = scanner.scan(line)
+                            if matches:
+                                found.extend(rule.visit_matches(source, line_number, line, stripped, matches) or ())
+                    lines_scanned[position] += len(lines)
+                else:
+                    for candidate in candidates:
+                        line = lines[candidate - 1]
+                        matches = scanner.scan(line)
+                        if matches:
+                            found.extend(rule.visit_matches(source, first_line + candidate - 1, line, line.strip(),
+                                                            matches) or ())
+                    lines_scanned[position] += len(candidates)
+                seconds[position] += perf_counter() - start
+                found_count += len(found) - before
+            if max_issues is not None and found_count >= max_issues:
+                break
+        
+        extension = source.file_extension
+        for position, rule in enumerate(plan):
+            if rule.has_finish:
+                start = perf_counter()
+                results[position].extend(rule.finish_file(source))
+                seconds[position] += perf_counter() - start
+            if rule.has_file_visitor and source.streaming:
+                continue
+            profile.record(rule.rule_id, extension, seconds[position], lines_scanned[position],
+                           len(results[position]))
+        
+        return results
+
+
+# Compiled rule sets by configuration, shared by every agent with the same configuration
+_compiled_rule_sets: Dict[str, RuleRegistry] = {}
+_compiled_rule_sets_lock = threading.Lock()
+
+
+def compile_rule_set(linting_rules: Optional[Dict[str, Any]] = None,
+                     security_checks: Optional[Dict[str, Any]] = None) -> RuleRegistry:
+    """
+    Get the compiled rule set for a configuration, building it on first use.
+    
+    Args:
+        linting_rules: Configuration of the syntax, style and performance rules
+        security_checks: Configuration of the security rules
+    
+    Returns:
+        Frozen rule registry (see RuleRegistry.from_config)
+    """
+    key = json.dumps([linting_rules or {}, security_checks or {}], sort_keys=True, default=repr)
+    with _compiled_rule_sets_lock:
+        rule_set = _compiled_rule_sets.get(key)
+        if rule_set is None:
+            rule_set = _compiled_rule_sets[key] = RuleRegistry.from_config(linting_rules, security_checks).freeze()
+        return rule_set
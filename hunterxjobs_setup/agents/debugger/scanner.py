@@ -0,0 +1,200 @@
+# Debugger Scanner Module
+# This file defines the precompiled multi-pattern scanner used by the Debugger rules
+
+import re
+from collections import namedtuple
+from typing import Dict, List, Optional, Tuple
+
+# A pattern hit: 0-based start/end offsets and the pattern's own capture groups
+ScanMatch = namedtuple("ScanMatch", ["start", "end", "groups"])
+
+
+def build_literal_trie_regex(literals: List[str]) -> str:
+    """
+    Compile literal strings into a trie-shaped regular expression.
+    
+    Shared prefixes are matched once, so the regex engine walks the literals
+    like an Aho-Corasick goto function instead of trying each literal in turn.
+    Longer literals are tried before their prefixes.
+    
+    Args:
+        literals: Literal strings
+    
+    Returns:
+        Regular expression source
+    """
+    trie = {}
+    for literal in literals:
+        node = trie
+        for char in literal:
+            node = node.setdefault(char, {})
+        node[""] = True
+    
+    def emit(node: Dict) -> str:
+        terminal = "" in node
+        branches = [re.escape(char) + emit(child) for char, child in sorted(node.items()) if char]
+        if not branches:
+            return ""
+        body = branches[0] if len(branches) == 1 else "(?:" + "|".join(branches) + ")"
+        if terminal:
+            return "(?:" + body + ")?"
+        return body
+    
+    return emit(trie)
+
+
+class MultiPatternScanner:
+    """
+    Scanner that tests lines against many rules at once.
+    
+    Every pattern names an anchor, a literal that all of its matches contain.
+    A file is first searched for the anchors (case-insensitively) to find the
+    candidate lines; only those lines are run through the combined pattern.
+    
+    Regex patterns are combined into one alternation with a named group per
+    pattern, and literals into a single trie-shaped group. The alternation is
+    wrapped in a lookahead so overlapping hits of different patterns are all
+    found in one pass over the line. The lookahead stops at the first
+    alternative matching at an offset, so the later alternatives are retried
+    on their own at offsets where the combined pattern hits.
+    """
+    
+    def __init__(self, patterns: List[Tuple[str, str, Optional[str]]], literals: List[Tuple[str, str]]):
+        """
+        Compile the scanner.
+        
+        Args:
+            patterns: List of (name, regular expression, anchor) tuples; a pattern
+                without an anchor makes every line a candidate
+            literals: List of (name, literal string) pairs
+        """
+        self.pattern_names = [name for name, _, _ in patterns]
+        self.literal_names = {}
+        for name, literal in literals:
+            self.literal_names.setdefault(literal, []).append(name)
+        
+        alternatives = []
+        # Group name and pattern of each alternative, in alternation order
+        self._alternatives: List[Tuple[str, re.Pattern]] = []
+        self._group_offsets = {}
+        group_index = 1
+        for position, (name, pattern, _) in enumerate(patterns):
+            group_name = f"p{position}"
+            alternatives.append(f"(?P<{group_name}>{pattern})")
+            compiled = re.compile(pattern)
+            self._alternatives.append((group_name, compiled))
+            self._group_offsets[group_name] = (name, group_index + 1, group_index + 1 + compiled.groups)
+            group_index += 1 + compiled.groups
+        
+        if self.literal_names:
+            literal_pattern = build_literal_trie_regex(list(self.literal_names))
+            alternatives.append(f"(?P<literal>{literal_pattern})")
+            self._alternatives.append(("literal", re.compile(literal_pattern)))
+        self._alternative_positions = {group_name: index for index, (group_name, _) in enumerate(self._alternatives)}
+        
+        # Literals that are prefixes of longer literals also match wherever the longer one does
+        self._literal_prefixes = {
+            literal: [prefix for prefix in self.literal_names if literal.startswith(prefix)]
+            for literal in self.literal_names
+        }
+        
+        self.regex = re.compile("(?=" + "|".join(alternatives) + ")") if alternatives else None
+        
+        if any(anchor is None for _, _, anchor in patterns):
+            self.anchors = None
+        else:
+            anchors = {anchor.lower() for _, _, anchor in patterns}
+            anchors.update(literal.lower() for literal in self.literal_names)
+            # An anchor containing a shorter one adds no candidates
+            self.anchors = sorted(
+                anchor for anchor in anchors
+                if not any(other != anchor and other in anchor for other in anchors)
+            )
+    
+    def candidate_lines(self, lines: List[str]) -> List[int]:
+        """
+        Find the lines that contain at least one anchor.
+        
+        Args:
+            lines: Lines of the file
+        
+        Returns:
+            Sorted 1-based line numbers
+        """
+        if self.regex is None:
+            return []
+        if self.anchors is None:
+            return list(range(1, len(lines) + 1))
+        
+        folded = "\n".join(lines).lower()
+        offsets = []
+        for anchor in self.anchors:
+            position = folded.find(anchor)
+            while position != -1:
+                offsets.append(position)
+                # One hit per line is enough; continue on the next line
+                line_end = folded.find("\n", position)
+                if line_end == -1:
+                    break
+                position = folded.find(anchor, line_end + 1)
+        
+        if not offsets:
+            return []
+        
+        offsets.sort()
+        line_numbers = []
+        line_number = 1
+        previous = 0
+        for offset in offsets:
+            line_number += folded.count("\n", previous, offset)
+            previous = offset
+            if not line_numbers or line_numbers[-1] != line_number:
+                line_numbers.append(line_number)
+        
+        return line_numbers
+    
+    def scan(self, text: str) -> Dict[str, ScanMatch]:
+        """
+        Scan text and report the first hit of every pattern.
+        
+        Args:
+            text: Text to scan (usually one line)
+        
+        Returns:
+            Dictionary of pattern name -> first ScanMatch
+        """
+        hits = {}
+        if self.regex is None:
+            return hits
+        
+        for match in self.regex.finditer(text):
+            group_name = match.lastgroup
+            if group_name == "literal":
+                self._add_literal_hits(hits, match.start("literal"), match.group("literal"))
+            else:
+                name, first_group, last_group = self._group_offsets[group_name]
+                if name not in hits:
+                    start, end = match.span(group_name)
+                    hits[name] = ScanMatch(start, end, match.groups()[first_group - 1:last_group - 1])
+            
+            # Later alternatives can match at the same offset too
+            position = match.start()
+            for later_group, compiled in self._alternatives[self._alternative_positions[group_name] + 1:]:
+                if later_group != "literal" and self._group_offsets[later_group][0] in hits:
+                    continue
+                later = compiled.match(text, position)
+                if later is None:
+                    continue
+                if later_group == "literal":
+                    self._add_literal_hits(hits, position, later.group())
+                else:
+                    hits[self._group_offsets[later_group][0]] = ScanMatch(later.start(), later.end(), later.groups())
+        
+        return hits
+    
+    def _add_literal_hits(self, hits: Dict[str, ScanMatch], start: int, literal: str) -> None:
+        """Record the hits of a matched literal and of the literals that are its prefixes."""
+        for prefix in self._literal_prefixes[literal]:
+            for name in self.literal_names[prefix]:
+                if name not in hits:
+                    hits[name] = ScanMatch(start, start + len(prefix), ())
@@ -0,0 +1,211 @@
+# Debugger Streaming Module
+# This file defines the memory-mapped source file used to review very large files line by line
+
+import mmap
+import os
+from array import array
+from bisect import bisect_right
+from typing import Iterator, List, Optional, Tuple
+
+from .rules import detect_language
+
+# Bytes of source decoded and checked at a time
+CHUNK_SIZE = 64 * 1024
+
+
+class ChunkIndex:
+    """
+    Sparse byte-offset index of a buffer split into chunks of whole lines.
+    
+    Each entry records the byte offset and first line number of a chunk.
+    Entries are discovered as the buffer is read, so iteration can stop
+    early without scanning the rest of the file, and random access to a
+    line only decodes the chunk that holds it.
+    """
+    
+    def __init__(self, buffer, chunk_size: int = CHUNK_SIZE):
+        """
+        Initialize the index.
+        
+        Args:
+            buffer: Bytes-like object or memory map
+            chunk_size: Target chunk size in bytes; a line longer than this gets a chunk of its own
+        """
+        self.buffer = buffer
+        self.chunk_size = chunk_size
+        self.size = len(buffer)
+        # End of the last line; a trailing newline does not start another line
+        self.content_end = self.size - 1 if self.size and buffer[self.size - 1:self.size] == b'\n' else self.size
+        self.starts = array('Q')
+        self.ends = array('Q')
+        self.first_lines = array('Q')
+        self.complete = self.size == 0
+    
+    def __len__(self) -> int:
+        """Number of chunks discovered so far."""
+        return len(self.starts)
+    
+    def _discover(self) -> bool:
+        """
+        Find the next chunk.
+        
+        Returns:
+            False if the whole buffer has been indexed
+        """
+        if self.complete:
+            return False
+        
+        if self.starts:
+            start = self.ends[-1] + 1
+            first_line = self.first_lines[-1] + self.buffer[self.starts[-1]:self.ends[-1]].count(b'\n') + 1
+        else:
+            start, first_line = 0, 1
+        
+        end = self.content_end
+        if start + self.chunk_size < end:
+            # Cut after the last full line that fits, or after the first line if none fits
+            cut = self.buffer.rfind(b'\n', start, start + self.chunk_size)
+            if cut == -1:
+                cut = self.buffer.find(b'\n', start + self.chunk_size, end)
+            if cut != -1:
+                end = cut
+        
+        self.starts.append(start)
+        self.ends.append(end)
+        self.first_lines.append(first_line)
+        self.complete = end >= self.content_end
+        return True
+    
+    def chunk(self, index: int) -> Optional[Tuple[int, int, int]]:
+        """
+        Get a chunk, discovering chunks up to it if needed.
+        
+        Args:
+            index: 0-based chunk index
+        
+        Returns:
+            Tuple of (first line number, start offset, end offset), or None past the end
+        """
+        while index >= len(self.starts):
+            if not self._discover():
+                return None
+        return self.first_lines[index], self.starts[index], self.ends[index]
+    
+    def chunk_of_line(self, line_number: int) -> Optional[int]:
+        """
+        Find the chunk holding a line.
+        
+        Args:
+            line_number: 1-based line number
+        
+        Returns:
+            0-based chunk index, or None if the line is past the end
+        """
+        while not self.complete and (not self.first_lines or self.first_lines[-1] <= line_number):
+            self._discover()
+        index = bisect_right(self.first_lines, line_number) - 1
+        return index if index >= 0 else None
+
+
+class MappedSourceFile:
+    """
+    A file under review that is memory-mapped instead of read into memory.
+    
+    The file is decoded one chunk of whole lines at a time, so memory use
+    is bounded by the chunk size or the longest line, not the file size.
+    Only line and pattern rules can run on a mapped file; rules that need
+    the whole file are skipped.
+    """
+    
+    streaming = True
+    
+    def __init__(self, file_path: str, encoding: str = 'utf-8', chunk_size: int = CHUNK_SIZE):
+        """
+        Map the file.
+        
+        Args:
+            file_path: Path to the file
+            encoding: Text encoding of the file
+            chunk_size: Target size in bytes of the chunks decoded at a time
+        """
+        self.file_path = file_path
+        self.file_extension = os.path.splitext(file_path)[1].lower()
+        self.language = detect_language(file_path)
+        self.encoding = encoding
+        self.code_content = None
+        self.state = {}
+        self.skipped_rules = []
+        
+        self._file = open(file_path, 'rb')
+        size = os.fstat(self._file.fileno()).st_size
+        # Empty files cannot be mapped
+        self.buffer = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ) if size else b""
+        self.index = ChunkIndex(self.buffer, chunk_size)
+    
+    def __enter__(self) -> "MappedSourceFile":
+        return self
+    
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.close()
+    
+    @property
+    def size(self) -> int:
+        """Size of the file in bytes."""
+        return self.index.size
+    
+    @property
+    def line_count(self) -> int:
+        """Number of lines (counted chunk by chunk without decoding)."""
+        if not self.size:
+            return 0
+        newlines = 0
+        for start in range(0, self.index.content_end, self.index.chunk_size):
+            newlines += self.buffer[start:min(start + self.index.chunk_size, self.index.content_end)].count(b'\n')
+        return newlines + 1
+    
+    def _decode_chunk(self, start: int, end: int) -> List[str]:
+        """Decode a chunk into its lines."""
+        text = self.buffer[start:end].decode(self.encoding, 'replace')
+        return [line.rstrip('\r') for line in text.split('\n')]
+    
+    def line_text(self, line_number: int) -> str:
+        """
+        Get the text of a line.
+        
+        Args:
+            line_number: 1-based line number
+        
+        Returns:
+            Line text, or an empty string if out of range
+        """
+        if line_number < 1:
+            return ""
+        index = self.index.chunk_of_line(line_number)
+        if index is None:
+            return ""
+        first_line, start, end = self.index.chunk(index)
+        lines = self._decode_chunk(start, end)
+        offset = line_number - first_line
+        return lines[offset] if offset < len(lines) else ""
+    
+    def iter_line_chunks(self) -> Iterator[Tuple[int, List[str]]]:
+        """
+        Iterate over the file in chunks of whole lines, decoding each chunk as it is reached.
+        
+        Returns:
+            Iterator of (first 1-based line number, list of line texts) tuples
+        """
+        index = 0
+        while True:
+            chunk = self.index.chunk(index)
+            if chunk is None:
+                return
+            first_line, start, end = chunk
+            yield first_line, self._decode_chunk(start, end)
+            index += 1
+    
+    def close(self) -> None:
+        """Unmap and close the file."""
+        if isinstance(self.buffer, mmap.mmap):
+            self.buffer.close()
+        self._file.close()
@@ -0,0 +1,434 @@
+# Debugger Tree Review Module
+# This file defines the file discovery, batching and worker functions used to review whole directory trees
+
+import fnmatch
+import heapq
+import os
+import subprocess
+from datetime import datetime
+from typing import Dict, List, Any, Optional, Iterable, Iterator, Tuple
+
+from .profiling import RuleProfile
+from .review_cache import ReviewCache, content_hash
+from .rules import RuleRegistry, SourceFile
+from .streaming import MappedSourceFile
+
+DEFAULT_INCLUDE = ("*.py", "*.pyw", "*.js", "*.jsx", "*.ts", "*.tsx")
+DEFAULT_EXCLUDE = (".git", "node_modules", "__pycache__", "venv", ".venv", "dist", "build", "*.min.js")
+
+SEVERITY_PENALTIES = {"critical": 20, "high": 15, "medium": 10, "low": 5}
+
+# Size from which files are memory-mapped and reviewed line by line. Streaming skips the whole-file
+# rules and caps the issues, so it is opt-in: None never streams unless a threshold is configured
+STREAMING_THRESHOLD = None
+MAX_STREAMING_ISSUES = 1000
+MAX_ISSUE_CODE_LENGTH = 200
+
+# Rule registry, review cache and options used by review_batch in worker processes (set by init_worker)
+_worker_registry = None
+_worker_cache = None
+_worker_options = {}
+
+
+def _matches(relative_path: str, patterns: Iterable[str]) -> bool:
+    """
+    Check a path against glob patterns.
+    A pattern matches either the file name or the path relative to the root.
+    
+    Args:
+        relative_path: Path relative to the review root, with forward slashes
+        patterns: Glob patterns
+    
+    Returns:
+        True if any pattern matches
+    """
+    name = relative_path.rsplit("/", 1)[-1]
+    return any(fnmatch.fnmatch(name, pattern) or fnmatch.fnmatch(relative_path, pattern) for pattern in patterns)
+
+
+def iter_source_stats(root: str, include: Optional[Iterable[str]] = None,
+                      exclude: Optional[Iterable[str]] = None) -> Iterator[Tuple[str, os.stat_result]]:
+    """
+    Walk a directory tree and yield the files to review with their stat.
+    Excluded directories are pruned without being walked, and files removed
+    during the walk are skipped.
+    
+    Args:
+        root: Root directory
+        include: Glob patterns of files to review (defaults to the supported languages)
+        exclude: Glob patterns of files and directories to skip
+    
+    Returns:
+        Iterator of (file path, stat result) tuples
+    """
+    include = tuple(include) if include is not None else DEFAULT_INCLUDE
+    exclude = tuple(exclude) if exclude is not None else DEFAULT_EXCLUDE
+    
+    for directory, subdirectories, files in os.walk(root):
+        relative_directory = os.path.relpath(directory, root).replace(os.sep, "/")
+        prefix = "" if relative_directory == "." else relative_directory + "/"
+        
+        subdirectories[:] = sorted(
+            subdirectory for subdirectory in subdirectories
+            if not _matches(prefix + subdirectory, exclude)
+        )
+        
+        for file_name in sorted(files):
+            relative_path = prefix + file_name
+            if _matches(relative_path, include) and not _matches(relative_path, exclude):
+                file_path = os.path.join(directory, file_name)
+                try:
+                    file_stat = os.stat(file_path)
+                except OSError:
+                    continue
+                yield file_path, file_stat
+
+
+def iter_source_files(root: str, include: Optional[Iterable[str]] = None,
+                      exclude: Optional[Iterable[str]] = None) -> Iterator[Tuple[str, int]]:
+    """
+    Walk a directory tree and yield the files to review.
+    Excluded directories are pruned without being walked.
+    
+    Args:
+        root: Root directory
+        include: Glob patterns of files to review (defaults to the supported languages)
+        exclude: Glob patterns of files and directories to skip
+    
+    Returns:
+        Iterator of (file path, size in bytes) tuples
+    """
+    for file_path, file_stat in iter_source_stats(root, include, exclude):
+        yield file_path, file_stat.st_size
+
+
+def git_changed_files(root: str, base_revision: str = "HEAD") -> List[str]:
+    """
+    List the files under a directory that differ from a git revision.
+    Includes uncommitted changes and untracked files.
+    
+    Args:
+        root: Directory inside a git working tree
+        base_revision: Revision to compare against
+    
+    Returns:
+        List of absolute file paths
+    """
+    commands = (
+        ["git", "diff", "--name-only", "--relative", base_revision],
+        ["git", "ls-files", "--others", "--exclude-standard"]
+    )
+    changed = []
+    for command in commands:
+        completed = subprocess.run(command, cwd=root, capture_output=True, text=True)
+        if completed.returncode != 0:
+            raise ValueError(f"git failed: {completed.stderr.strip()}")
+        changed.extend(os.path.abspath(os.path.join(root, line)) for line in completed.stdout.splitlines() if line)
+    return changed
+
+
+def balance_batches(files: List[Tuple[str, int]], batch_count: int) -> List[List[str]]:
+    """
+    Split files into batches of roughly equal total size.
+    Files are placed largest first into the currently smallest batch.
+    
+    Args:
+        files: List of (file path, size in bytes) tuples
+        batch_count: Number of batches
+    
+    Returns:
+        List of non-empty batches of file paths, largest batch first
+    """
+    batch_count = max(1, min(batch_count, len(files)))
+    heap = [(0, index, []) for index in range(batch_count)]
+    
+    for file_path, size in sorted(files, key=lambda item: item[1], reverse=True):
+        total, index, batch = heapq.heappop(heap)
+        batch.append(file_path)
+        heapq.heappush(heap, (total + size, index, batch))
+    
+    return [batch for _, _, batch in sorted(heap, reverse=True) if batch]
+
+
+def calculate_quality_metrics(issues: List[Dict[str, Any]], lines_of_code: int) -> Dict[str, Any]:
+    """
+    Calculate code quality metrics from a file's issues.
+    
+    Args:
+        issues: Issues found in the file
+        lines_of_code: Number of lines in the file
+    
+    Returns:
+        Dictionary containing code quality metrics
+    """
+    issues_by_type = {}
+    issues_by_severity = {}
+    for issue in issues:
+        issues_by_type[issue["type"]] = issues_by_type.get(issue["type"], 0) + 1
+        issues_by_severity[issue["severity"]] = issues_by_severity.get(issue["severity"], 0) + 1
+    
+    penalty = sum(SEVERITY_PENALTIES.get(severity, 0) * count for severity, count in issues_by_severity.items())
+    
+    return {
+        "lines_of_code": lines_of_code,
+        "issues_count": len(issues),
+        "issues_by_type": issues_by_type,
+        "issues_by_severity": issues_by_severity,
+        "issues_per_kloc": len(issues) * 1000 / lines_of_code if lines_of_code else 0,
+        "quality_score": max(0, 100 - penalty),
+        "calculated_at": datetime.now().isoformat()
+    }
+
+
+def cached_review_result(file_path: str, entry: Dict[str, Any], size: int = 0) -> Dict[str, Any]:
+    """
+    Build a per-file review result from a review cache entry.
+    
+    Args:
+        file_path: Path to the file
+        entry: Review cache entry
+        size: Size of the file
+    
+    Returns:
+        Dictionary containing the file's review results
+    """
+    issues = entry["issues"]
+    return {
+        "file_path": file_path,
+        "status": "completed",
+        "issues": issues,
+        "issues_count": len(issues),
+        "metrics": calculate_quality_metrics(issues, entry["lines_of_code"]),
+        "size": size,
+        "content_hash": entry["content_hash"],
+        "cached": True
+    }
+
+
+def review_file_streaming(registry: RuleRegistry, file_path: str, max_issues: Optional[int] = MAX_STREAMING_ISSUES,
+                          max_code_length: int = MAX_ISSUE_CODE_LENGTH,
+                          profile: Optional[RuleProfile] = None) -> Dict[str, Any]:
+    """
+    Review a file through a memory map, one line at a time.
+    Rules that need the whole file are skipped, the review stops at
+    max_issues, and the source line kept with each issue is shortened
+    to max_code_length characters.
+    
+    Args:
+        registry: Rule registry to run
+        file_path: Path to the file
+        max_issues: Maximum number of issues to report (None for no cap)
+        max_code_length: Maximum length of the code kept with each issue
+        profile: Optional profile to record rule timings in
+    
+    Returns:
+        Dictionary containing the file's review results
+    """
+    with MappedSourceFile(file_path) as source:
+        # Ask for one extra issue to tell a capped review from one that found exactly max_issues
+        issues = registry.run(source, max_issues=max_issues + 1 if max_issues is not None else None, profile=profile)
+        truncated = max_issues is not None and len(issues) > max_issues
+        if truncated:
+            del issues[max_issues:]
+        
+        for issue in issues:
+            if len(issue["code"]) > max_code_length:
+                issue["code"] = issue["code"][:max_code_length] + "..."
+        
+        return {
+            "file_path": file_path,
+            "status": "completed",
+            "issues": issues,
+            "issues_count": len(issues),
+            "metrics": calculate_quality_metrics(issues, source.line_count),
+            "size": source.size,
+            "streaming": True,
+            "truncated": truncated,
+            "skipped_rules": source.skipped_rules
+        }
+
+
+def review_file(registry: RuleRegistry, file_path: str, cache: Optional[ReviewCache] = None,
+                streaming_threshold: Optional[int] = STREAMING_THRESHOLD,
+                max_streaming_issues: Optional[int] = MAX_STREAMING_ISSUES,
+                profile_rules: bool = False) -> Dict[str, Any]:
+    """
+    Read and review a single file.
+    
+    Args:
+        registry: Rule registry to run
+        file_path: Path to the file
+        cache: Optional review cache consulted by content hash before running the rules
+        streaming_threshold: Size from which files are reviewed in streaming mode (None to never stream)
+        max_streaming_issues: Issue cap for files reviewed in streaming mode
+        profile_rules: Time each rule; the timings are returned as "rule_profile" records
+    
+    Returns:
+        Dictionary containing the file's review results
+    """
+    profile = RuleProfile() if profile_rules else None
+    try:
+        stat = os.stat(file_path)
+        if streaming_threshold is not None and stat.st_size >= streaming_threshold:
+            # Streamed reviews are not cached: hashing would read the whole file
+            result = review_file_streaming(registry, file_path, max_streaming_issues, profile=profile)
+            result["mtime_ns"] = stat.st_mtime_ns
+            result["file_size"] = stat.st_size
+            if profile is not None and profile.entries:
+                result["rule_profile"] = profile.records()
+            return result
+        
+        with open(file_path, 'r', encoding='utf-8', errors='replace') as f:
+            code_content = f.read()
+        
+        digest = content_hash(code_content)
+        entry = cache.get(digest, registry.version) if cache is not None else None
+        if entry is not None:
+            result = cached_review_result(file_path, entry, len(code_content))
+        else:
+            source = SourceFile(file_path, code_content)
+            issues = registry.run(source, profile=profile)
+            result = {
+                "file_path": file_path,
+                "status": "completed",
+                "issues": issues,
+                "issues_count": len(issues),
+                "metrics": calculate_quality_metrics(issues, len(source.lines)),
+                "size": len(code_content),
+                "content_hash": digest,
+                "cached": False
+            }
+        
+        result["mtime_ns"] = stat.st_mtime_ns
+        result["file_size"] = stat.st_size
+        if profile is not None and profile.entries:
+            result["rule_profile"] = profile.records()
+        return result
+    except Exception as e:
+        return {
+            "file_path": file_path,
+            "status": "failed",
+            "error": str(e),
+            "issues": [],
+            "issues_count": 0
+        }
+
+
+def init_worker(registry: RuleRegistry, cache_path: Optional[str] = None,
+                streaming_threshold: Optional[int] = STREAMING_THRESHOLD,
+                max_streaming_issues: Optional[int] = MAX_STREAMING_ISSUES, profile_rules: bool = False) -> None:
+    """
+    Initialize a worker process with the rule registry to run.
+    
+    Args:
+        registry: Rule registry
+        cache_path: Optional path of the review cache to read from (results are written by the parent)
+        streaming_threshold: Size from which files are reviewed in streaming mode
+        max_streaming_issues: Issue cap for files reviewed in streaming mode
+        profile_rules: Time each rule and return the timings with each result
+    """
+    global _worker_registry, _worker_cache, _worker_options
+    _worker_registry = registry
+    _worker_cache = ReviewCache(cache_path) if cache_path else None
+    _worker_options = {"streaming_threshold": streaming_threshold, "max_streaming_issues": max_streaming_issues,
+                       "profile_rules": profile_rules}
+
+
+def review_batch(file_paths: List[str]) -> List[Dict[str, Any]]:
+    """
+    Review a batch of files in a worker process.
+    
+    Args:
+        file_paths: Paths of the files to review
+    
+    Returns:
+        List of per-file review results
+    """
+    registry = _worker_registry if _worker_registry is not None else RuleRegistry.default()
+    return [review_file(registry, file_path, _worker_cache, **_worker_options) for file_path in file_paths]
+
+
+class TreeReviewSummary:
+    """
+    Running totals of a tree review.
+    Only counts are kept, so memory does not grow with the number of issues.
+    """
+    
+    def __init__(self, root: str):
+        """
+        Initialize the summary.
+        
+        Args:
+            root: Root directory of the review
+        """
+        self.root = root
+        self.started_at = datetime.now()
+        self.files_reviewed = 0
+        self.files_cached = 0
+        self.files_failed = 0
+        self.bytes_reviewed = 0
+        self.lines_of_code = 0
+        self.issues_count = 0
+        self.issues_by_type = {}
+        self.issues_by_severity = {}
+        self.lowest_quality = []  # heap of (negated quality score, file path), lowest scores kept
+        self.lowest_quality_size = 10
+    
+    def add(self, result: Dict[str, Any]) -> None:
+        """
+        Add a file's review result to the totals.
+        
+        Args:
+            result: Per-file review result
+        """
+        if result["status"] != "completed":
+            self.files_failed += 1
+            return
+        
+        metrics = result["metrics"]
+        self.files_reviewed += 1
+        if result.get("cached"):
+            self.files_cached += 1
+        self.bytes_reviewed += result.get("size", 0)
+        self.lines_of_code += metrics["lines_of_code"]
+        self.issues_count += metrics["issues_count"]
+        for issue_type, count in metrics["issues_by_type"].items():
+            self.issues_by_type[issue_type] = self.issues_by_type.get(issue_type, 0) + count
+        for severity, count in metrics["issues_by_severity"].items():
+            self.issues_by_severity[severity] = self.issues_by_severity.get(severity, 0) + count
+        
+        # Keep the files with the lowest quality scores (max-heap on the negated score)
+        entry = (-metrics["quality_score"], result["file_path"])
+        if len(self.lowest_quality) < self.lowest_quality_size:
+            heapq.heappush(self.lowest_quality, entry)
+        elif entry > self.lowest_quality[0]:
+            heapq.heapreplace(self.lowest_quality, entry)
+    
+    def as_dict(self) -> Dict[str, Any]:
+        """
+        Get the summary as a dictionary.
+        
+        Returns:
+            Dictionary containing the aggregate review results
+        """
+        completed_at = datetime.now()
+        return {
+            "root": self.root,
+            "status": "completed",
+            "files_reviewed": self.files_reviewed,
+            "files_cached": self.files_cached,
+            "files_failed": self.files_failed,
+            "bytes_reviewed": self.bytes_reviewed,
+            "lines_of_code": self.lines_of_code,
+            "issues_count": self.issues_count,
+            "issues_by_type": self.issues_by_type,
+            "issues_by_severity": self.issues_by_severity,
+            "issues_per_kloc": self.issues_count * 1000 / self.lines_of_code if self.lines_of_code else 0,
+            "lowest_quality_files": [
+                {"file_path": file_path, "quality_score": -score}
+                for score, file_path in sorted(self.lowest_quality, reverse=True)
+            ],
+            "started_at": self.started_at.isoformat(),
+            "completed_at": completed_at.isoformat(),
+            "duration": (completed_at - self.started_at).total_seconds()
+        }
@@ -0,0 +1,677 @@
+# Debugger Watcher Module
+# This file defines the file monitors and incremental reviewer behind DebuggerAgent.watch
+
+import ctypes
+import ctypes.util
+import os
+import select
+import struct
+import threading
+import time
+from typing import Dict, List, Any, Optional, Iterable, Callable, Tuple
+
+from .rules import RuleRegistry, SourceFile
+from .tree_review import (
+    _matches, iter_source_files, calculate_quality_metrics, review_file_streaming,
+    DEFAULT_INCLUDE, DEFAULT_EXCLUDE, STREAMING_THRESHOLD, MAX_STREAMING_ISSUES
+)
+
+# Files at least this large keep their lines between reviews so edits can be re-checked region by region
+INCREMENTAL_THRESHOLD = 256 * 1024
+
+CREATED = "created"
+MODIFIED = "modified"
+DELETED = "deleted"
+
+# inotify constants (linux/inotify.h)
+IN_MODIFY = 0x00000002
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_DELETE_SELF = 0x00000400
+IN_MOVE_SELF = 0x00000800
+IN_Q_OVERFLOW = 0x00004000
+IN_IGNORED = 0x00008000
+IN_ISDIR = 0x40000000
+IN_NONBLOCK = 0o4000
+IN_CLOEXEC = 0o2000000
+WATCH_MASK = (IN_MODIFY | IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO | IN_CREATE | IN_DELETE |
+              IN_DELETE_SELF | IN_MOVE_SELF)
+INOTIFY_EVENT = struct.Struct("iIII")
+
+
+class PollingMonitor:
+    """
+    Detects changes under a directory by polling with os.stat.
+    
+    A directory-level mtime index records the modification time of every
+    watched directory; a directory is only listed again when its mtime
+    changes, which is how files are created, deleted and renamed. Files in
+    the index are stat'ed on each poll to catch in-place edits.
+    """
+    
+    def __init__(self, root: str, include: Optional[Iterable[str]] = None,
+                 exclude: Optional[Iterable[str]] = None, poll_interval: float = 0.25):
+        """
+        Index the directory tree.
+        
+        Args:
+            root: Root directory
+            include: Glob patterns of files to watch (defaults to the supported languages)
+            exclude: Glob patterns of files and directories to skip
+            poll_interval: Seconds between polls
+        """
+        self.root = os.path.normpath(root)
+        self.include = tuple(include) if include is not None else DEFAULT_INCLUDE
+        self.exclude = tuple(exclude) if exclude is not None else DEFAULT_EXCLUDE
+        self.poll_interval = poll_interval
+        # directory -> mtime_ns, and file -> (mtime_ns, size)
+        self.directories: Dict[str, int] = {}
+        self.files: Dict[str, Tuple[int, int]] = {}
+        self._scan_directory(self.root, {})
+    
+    def _relative(self, path: str) -> str:
+        """Path relative to the root, with forward slashes."""
+        return os.path.relpath(path, self.root).replace(os.sep, "/")
+    
+    def _scan_directory(self, directory: str, changes: Dict[str, str]) -> None:
+        """
+        List a directory, update the index and record created and deleted files.
+        New subdirectories are scanned recursively.
+        """
+        try:
+            mtime_ns = os.stat(directory).st_mtime_ns
+            entries = list(os.scandir(directory))
+        except OSError:
+            self._remove_directory(directory, changes)
+            return
+        self.directories[directory] = mtime_ns
+        
+        seen = set()
+        for entry in entries:
+            relative_path = self._relative(entry.path)
+            try:
+                if entry.is_dir(follow_symlinks=False):
+                    if not _matches(relative_path, self.exclude) and entry.path not in self.directories:
+                        self._scan_directory(entry.path, changes)
+                    continue
+                if not (_matches(relative_path, self.include) and not _matches(relative_path, self.exclude)):
+                    continue
+                stat = entry.stat()
+            except OSError:
+                continue
+            seen.add(entry.path)
+            if entry.path not in self.files:
+                self.files[entry.path] = (stat.st_mtime_ns, stat.st_size)
+                changes[entry.path] = CREATED
+        
+        for file_path in [path for path in self.files if os.path.dirname(path) == directory and path not in seen]:
+            del self.files[file_path]
+            changes[file_path] = DELETED
+        for subdirectory in [path for path in self.directories
+                             if path != directory and os.path.dirname(path) == directory]:
+            if not os.path.isdir(subdirectory):
+                self._remove_directory(subdirectory, changes)
+    
+    def _remove_directory(self, directory: str, changes: Dict[str, str]) -> None:
+        """Drop a deleted directory and everything under it from the index."""
+        prefix = directory.rstrip(os.sep) + os.sep
+        for path in [path for path in self.directories if path == directory or path.startswith(prefix)]:
+            del self.directories[path]
+        for file_path in [path for path in self.files if path.startswith(prefix)]:
+            del self.files[file_path]
+            changes[file_path] = DELETED
+    
+    def poll(self) -> Dict[str, str]:
+        """
+        Check the tree once.
+        
+        Returns:
+            Dictionary of changed file path -> created, modified or deleted
+        """
+        changes: Dict[str, str] = {}
+        for directory, mtime_ns in list(self.directories.items()):
+            if directory not in self.directories:
+                continue
+            try:
+                current = os.stat(directory).st_mtime_ns
+            except OSError:
+                self._remove_directory(directory, changes)
+                continue
+            if current != mtime_ns:
+                self._scan_directory(directory, changes)
+        
+        for file_path, signature in list(self.files.items()):
+            if file_path in changes:
+                continue
+            try:
+                stat = os.stat(file_path)
+            except OSError:
+                del self.files[file_path]
+                changes[file_path] = DELETED
+                continue
+            current = (stat.st_mtime_ns, stat.st_size)
+            if current != signature:
+                self.files[file_path] = current
+                changes[file_path] = MODIFIED
+        return changes
+    
+    def wait(self, timeout: float) -> Dict[str, str]:
+        """
+        Wait for changes.
+        
+        Args:
+            timeout: Maximum seconds to wait
+        
+        Returns:
+            Changed files (empty if nothing changed before the timeout)
+        """
+        deadline = time.monotonic() + timeout
+        while True:
+            remaining = deadline - time.monotonic()
+            if remaining > 0:
+                time.sleep(min(self.poll_interval, remaining))
+            changes = self.poll()
+            if changes or time.monotonic() >= deadline:
+                return changes
+    
+    def close(self) -> None:
+        """Release the monitor."""
+        self.directories = {}
+        self.files = {}
+
+
+class InotifyMonitor:
+    """
+    Detects changes under a directory with Linux inotify, called through ctypes.
+    One watch is added per directory, including directories created later.
+    The watched files are indexed so that a directory moved out of the tree
+    (or the tree itself being moved) reports the files under it as deleted;
+    the watches of a moved directory are removed, since they follow it.
+    """
+    
+    def __init__(self, root: str, include: Optional[Iterable[str]] = None,
+                 exclude: Optional[Iterable[str]] = None):
+        """
+        Add watches for the directory tree.
+        
+        Args:
+            root: Root directory
+            include: Glob patterns of files to watch (defaults to the supported languages)
+            exclude: Glob patterns of files and directories to skip
+        """
+        self.root = os.path.normpath(root)
+        self.include = tuple(include) if include is not None else DEFAULT_INCLUDE
+        self.exclude = tuple(exclude) if exclude is not None else DEFAULT_EXCLUDE
+        self._libc = _load_libc()
+        if self._libc is None:
+            raise OSError("inotify is not available")
+        self.fd = self._libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        self.watches: Dict[int, str] = {}
+        self.files = set()
+        self._add_tree(self.root, None)
+    
+    @staticmethod
+    def available() -> bool:
+        """Check whether inotify can be used on this system."""
+        return _load_libc() is not None
+    
+    def _relative(self, path: str) -> str:
+        """Path relative to the root, with forward slashes."""
+        return os.path.relpath(path, self.root).replace(os.sep, "/")
+    
+    def _wanted(self, path: str) -> bool:
+        """Check a file path against the include and exclude patterns."""
+        relative_path = self._relative(path)
+        return _matches(relative_path, self.include) and not _matches(relative_path, self.exclude)
+    
+    def _add_tree(self, directory: str, changes: Optional[Dict[str, str]]) -> None:
+        """Watch a directory and its subdirectories; files found are recorded as created when changes is given."""
+        for current, subdirectories, files in os.walk(directory):
+            relative_directory = self._relative(current)
+            if current != self.root and _matches(relative_directory, self.exclude):
+                subdirectories[:] = []
+                continue
+            watch = self._libc.inotify_add_watch(self.fd, os.fsencode(current), WATCH_MASK)
+            if watch >= 0:
+                self.watches[watch] = current
+            subdirectories[:] = [
+                subdirectory for subdirectory in subdirectories
+                if not _matches(self._relative(os.path.join(current, subdirectory)), self.exclude)
+            ]
+            for file_name in files:
+                file_path = os.path.join(current, file_name)
+                if self._wanted(file_path):
+                    self.files.add(file_path)
+                    if changes is not None:
+                        changes[file_path] = CREATED
+    
+    def _remove_tree(self, directory: str, changes: Dict[str, str]) -> None:
+        """Stop watching a directory that left the tree and record the files under it as deleted."""
+        prefix = directory + os.sep
+        for watch, watched in list(self.watches.items()):
+            if watched == directory or watched.startswith(prefix):
+                self._libc.inotify_rm_watch(self.fd, watch)
+                del self.watches[watch]
+        for file_path in [file_path for file_path in self.files if file_path.startswith(prefix)]:
+            self.files.discard(file_path)
+            changes[file_path] = DELETED
+    
+    def _read_events(self, changes: Dict[str, str]) -> None:
+        """Read pending events into changes."""
+        while True:
+            try:
+                data = os.read(self.fd, 64 * 1024)
+            except BlockingIOError:
+                return
+            if not data:
+                return
+            
+            offset = 0
+            while offset < len(data):
+                watch, mask, _, length = INOTIFY_EVENT.unpack_from(data, offset)
+                offset += INOTIFY_EVENT.size
+                name = os.fsdecode(data[offset:offset + length].rstrip(b"\0"))
+                offset += length
+                
+                if mask & IN_Q_OVERFLOW:
+                    # Events were lost: report every file as modified, and files no longer found as deleted
+                    found = {file_path for file_path, _ in iter_source_files(self.root, self.include, self.exclude)}
+                    for file_path in self.files - found:
+                        changes[file_path] = DELETED
+                    for file_path in found:
+                        changes.setdefault(file_path, MODIFIED)
+                    self.files = found
+                    continue
+                if mask & IN_IGNORED:
+                    self.watches.pop(watch, None)
+                    continue
+                
+                directory = self.watches.get(watch)
+                if directory is None:
+                    continue
+                if mask & IN_MOVE_SELF:
+                    # A watched directory moved without its parent reporting it (e.g. the root itself)
+                    self._remove_tree(directory, changes)
+                    continue
+                if not name:
+                    continue
+                path = os.path.join(directory, name)
+                if mask & IN_ISDIR:
+                    # Deleted directories report their files first; their watches end with IN_IGNORED
+                    if mask & IN_MOVED_FROM:
+                        self._remove_tree(path, changes)
+                    elif mask & (IN_CREATE | IN_MOVED_TO) and not _matches(self._relative(path), self.exclude):
+                        self._add_tree(path, changes)
+                    continue
+                if not self._wanted(path):
+                    continue
+                if mask & (IN_DELETE | IN_MOVED_FROM):
+                    self.files.discard(path)
+                    changes[path] = DELETED
+                elif mask & (IN_CREATE | IN_MOVED_TO):
+                    self.files.add(path)
+                    changes[path] = CREATED
+                elif changes.get(path) != CREATED:
+                    changes[path] = MODIFIED
+    
+    def wait(self, timeout: float) -> Dict[str, str]:
+        """
+        Wait for changes.
+        
+        Args:
+            timeout: Maximum seconds to wait
+        
+        Returns:
+            Changed files (empty if nothing changed before the timeout)
+        """
+        changes: Dict[str, str] = {}
+        readable, _, _ = select.select([self.fd], [], [], max(timeout, 0))
+        if readable:
+            self._read_events(changes)
+        return changes
+    
+    def close(self) -> None:
+        """Close the inotify descriptor."""
+        if self.fd >= 0:
+            os.close(self.fd)
+            self.fd = -1
+
+
+_libc_handle = None
+
+
+def _load_libc():
+    """Load libc with the inotify functions, or return None where inotify is unavailable."""
+    global _libc_handle
+    if _libc_handle is None:
+        _libc_handle = False
+        if hasattr(select, "select") and os.name == "posix":
+            try:
+                libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+                libc.inotify_init1.argtypes = [ctypes.c_int]
+                libc.inotify_init1.restype = ctypes.c_int
+                libc.inotify_add_watch.argtypes = [ctypes.c_int, ctypes.c_char_p, ctypes.c_uint32]
+                libc.inotify_add_watch.restype = ctypes.c_int
+                libc.inotify_rm_watch.argtypes = [ctypes.c_int, ctypes.c_int]
+                libc.inotify_rm_watch.restype = ctypes.c_int
+                _libc_handle = libc
+            except (OSError, AttributeError):
+                pass
+    return _libc_handle or None
+
+
+def create_monitor(root: str, include: Optional[Iterable[str]] = None, exclude: Optional[Iterable[str]] = None,
+                   use_inotify: Optional[bool] = None, poll_interval: float = 0.25):
+    """
+    Create a file monitor.
+    
+    Args:
+        root: Root directory
+        include: Glob patterns of files to watch
+        exclude: Glob patterns of files and directories to skip
+        use_inotify: True to require inotify, False to poll, None to use inotify where available
+        poll_interval: Seconds between polls when polling
+    
+    Returns:
+        InotifyMonitor or PollingMonitor
+    """
+    if use_inotify is not False and InotifyMonitor.available():
+        try:
+            return InotifyMonitor(root, include, exclude)
+        except OSError:
+            if use_inotify:
+                raise
+    elif use_inotify:
+        raise OSError("inotify is not available")
+    return PollingMonitor(root, include, exclude, poll_interval)
+
+
+def _common_prefix(old: List[str], new: List[str]) -> int:
+    """Count the leading lines two line lists share (galloping search with C-level slice comparisons)."""
+    limit = min(len(old), len(new))
+    matched, step = 0, 64
+    while matched < limit:
+        end = min(matched + step, limit)
+        if old[matched:end] == new[matched:end]:
+            matched = end
+            step *= 2
+        elif step > 1:
+            step //= 2
+        else:
+            break
+    return matched
+
+
+def _common_suffix(old: List[str], new: List[str], limit: int) -> int:
+    """Count the trailing lines two line lists share, up to limit."""
+    matched, step = 0, 64
+    old_end, new_end = len(old), len(new)
+    while matched < limit:
+        end = min(matched + step, limit)
+        if old[old_end - end:old_end - matched] == new[new_end - end:new_end - matched]:
+            matched = end
+            step *= 2
+        elif step > 1:
+            step //= 2
+        else:
+            break
+    return matched
+
+
+class IncrementalReviewer:
+    """
+    Reviews changed files, re-checking only the edited region of large files.
+    
+    When every rule for a file's language is line-local (see
+    RuleRegistry.is_line_local), the lines and issues of files above the
+    incremental threshold are kept. After an edit, the unchanged leading
+    and trailing lines are found, their issues are kept (shifted to their
+    new line numbers), and the rules run only over the lines in between.
+    """
+    
+    def __init__(self, registry: RuleRegistry, incremental_threshold: int = INCREMENTAL_THRESHOLD,
+                 streaming_threshold: Optional[int] = STREAMING_THRESHOLD,
+                 max_streaming_issues: Optional[int] = MAX_STREAMING_ISSUES):
+        """
+        Initialize the reviewer.
+        
+        Args:
+            registry: Rule registry to run
+            incremental_threshold: Size from which files are re-checked region by region
+            streaming_threshold: Size from which files are reviewed in streaming mode
+            max_streaming_issues: Issue cap for files reviewed in streaming mode
+        """
+        self.registry = registry
+        self.incremental_threshold = incremental_threshold
+        self.streaming_threshold = streaming_threshold
+        self.max_streaming_issues = max_streaming_issues
+        # file path -> (lines, issues) from the last review
+        self._files: Dict[str, Tuple[List[str], List[Dict[str, Any]]]] = {}
+    
+    def forget(self, file_path: str) -> None:
+        """Drop the state kept for a file."""
+        self._files.pop(file_path, None)
+    
+    def review(self, file_path: str) -> Dict[str, Any]:
+        """
+        Review a file, incrementally if possible.
+        
+        Args:
+            file_path: Path to the file
+        
+        Returns:
+            Dictionary containing the file's review results; "changed_lines" gives the
+            (first, last) lines that were re-checked when the review was incremental
+        """
+        try:
+            size = os.path.getsize(file_path)
+            if self.streaming_threshold is not None and size >= self.streaming_threshold:
+                self.forget(file_path)
+                return review_file_streaming(self.registry, file_path, self.max_streaming_issues)
+            
+            with open(file_path, 'r', encoding='utf-8', errors='replace') as f:
+                code_content = f.read()
+            source = SourceFile(file_path, code_content)
+            previous = self._files.get(file_path)
+            incremental = (len(code_content) >= self.incremental_threshold
+                           and self.registry.is_line_local(source.language))
+            
+            changed_lines = None
+            if incremental and previous is not None:
+                issues, changed_lines = self._review_changes(source, *previous)
+            else:
+                issues = self.registry.run(source)
+            
+            if incremental:
+                self._files[file_path] = (source.lines, issues)
+            else:
+                self.forget(file_path)
+            
+            return {
+                "file_path": file_path,
+                "status": "completed",
+                "issues": issues,
+                "issues_count": len(issues),
+                "metrics": calculate_quality_metrics(issues, len(source.lines)),
+                "size": len(code_content),
+                "incremental": changed_lines is not None,
+                "changed_lines": changed_lines
+            }
+        except Exception as e:
+            self.forget(file_path)
+            return {
+                "file_path": file_path,
+                "status": "failed",
+                "error": str(e),
+                "issues": [],
+                "issues_count": 0
+            }
+    
+    def _review_changes(self, source: SourceFile, old_lines: List[str],
+                        old_issues: List[Dict[str, Any]]) -> Tuple[List[Dict[str, Any]], Tuple[int, int]]:
+        """
+        Re-check the lines that differ from the previous version of a file.
+        
+        Returns:
+            Tuple of (issues, (first, last) re-checked lines)
+        """
+        new_lines = source.lines
+        prefix = _common_prefix(old_lines, new_lines)
+        suffix = _common_suffix(old_lines, new_lines, min(len(old_lines), len(new_lines)) - prefix)
+        old_last = len(old_lines) - suffix
+        new_last = len(new_lines) - suffix
+        delta = new_last - old_last
+        
+        kept = []
+        for issue in old_issues:
+            if issue["line"] <= prefix:
+                kept.append(issue)
+            elif issue["line"] > old_last:
+                shifted = dict(issue)
+                shifted["line"] += delta
+                kept.append(shifted)
+        
+        fresh = []
+        if prefix < new_last:
+            source.line_range = (prefix + 1, new_last)
+            fresh = self.registry.run(source)
+        
+        # Restore the order of a full review: by rule, then by line
+        order = {rule.rule_id: position for position, rule in enumerate(self.registry.rules_for(source.language))}
+        issues = sorted(kept + fresh, key=lambda issue: (order.get(issue.get("rule"), len(order)), issue["line"]))
+        return issues, (prefix + 1, new_last)
+
+
+class SourceWatch:
+    """
+    A running watch of a source tree.
+    
+    Changes are collected until no new change arrives for the debounce
+    interval (or max_delay passes), then the changed files are reviewed and
+    the results handed to the callback in one batch.
+    """
+    
+    def __init__(self, monitor: Any, reviewer: IncrementalReviewer,
+                 callback: Callable[[List[Dict[str, Any]], float], None],
+                 debounce: float = 0.05, max_delay: float = 1.0):
+        """
+        Initialize the watch.
+        
+        Args:
+            monitor: PollingMonitor or InotifyMonitor
+            reviewer: Reviewer of changed files
+            callback: Called with the results of each batch and its duration in milliseconds
+            debounce: Seconds without changes that end a burst
+            max_delay: Maximum seconds to keep collecting a burst
+        """
+        self.monitor = monitor
+        self.reviewer = reviewer
+        self.callback = callback
+        self.debounce = debounce
+        self.max_delay = max_delay
+        self.batches = 0
+        self._stop = threading.Event()
+        self._thread = None
+    
+    @property
+    def running(self) -> bool:
+        """Whether the background thread is running."""
+        return self._thread is not None and self._thread.is_alive()
+    
+    def collect(self, timeout: float) -> Dict[str, str]:
+        """
+        Wait for a burst of changes and return it once it settles.
+        
+        Args:
+            timeout: Maximum seconds to wait for the first change
+        
+        Returns:
+            Changed files (empty if nothing changed)
+        """
+        changes = self.monitor.wait(timeout)
+        if not changes:
+            return changes
+        deadline = time.monotonic() + self.max_delay
+        while not self._stop.is_set():
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            more = self.monitor.wait(min(self.debounce, remaining))
+            if not more:
+                break
+            for file_path, change in more.items():
+                # A file created during the burst stays created unless it was deleted again
+                if changes.get(file_path) == CREATED and change == MODIFIED:
+                    continue
+                changes[file_path] = change
+        return changes
+    
+    def process(self, changes: Dict[str, str]) -> List[Dict[str, Any]]:
+        """
+        Review a batch of changed files and hand the results to the callback.
+        
+        Args:
+            changes: Changed file path -> created, modified or deleted
+        
+        Returns:
+            Per-file results ("change" gives the kind of change)
+        """
+        started = time.perf_counter()
+        results = []
+        for file_path in sorted(changes):
+            change = changes[file_path]
+            if change == DELETED:
+                self.reviewer.forget(file_path)
+                result = {"file_path": file_path, "status": "deleted", "issues": [], "issues_count": 0}
+            else:
+                result = self.reviewer.review(file_path)
+            result["change"] = change
+            results.append(result)
+        
+        self.batches += 1
+        self.callback(results, (time.perf_counter() - started) * 1000)
+        return results
+    
+    def run_once(self, timeout: float = 0) -> List[Dict[str, Any]]:
+        """
+        Collect one burst of changes and review it.
+        
+        Args:
+            timeout: Maximum seconds to wait for the first change
+        
+        Returns:
+            Per-file results (empty if nothing changed)
+        """
+        changes = self.collect(timeout)
+        return self.process(changes) if changes else []
+    
+    def start(self) -> "SourceWatch":
+        """Start watching in a background thread."""
+        if not self.running:
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name="debugger-watch", daemon=True)
+            self._thread.start()
+        return self
+    
+    def _run(self) -> None:
+        """Background loop."""
+        while not self._stop.is_set():
+            self.run_once(timeout=0.5)
+    
+    def stop(self, timeout: Optional[float] = None) -> None:
+        """
+        Stop watching and release the monitor.
+        
+        Args:
+            timeout: Maximum seconds to wait for the background thread
+        """
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+        self.monitor.close()
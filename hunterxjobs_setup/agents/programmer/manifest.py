@@ -0,0 +1,168 @@
+# Generation Manifest Module
+# This file defines the manifest of generated files the Programmer agent uses to regenerate features incrementally
+
+import json
+import logging
+import os
+import threading
+from typing import Dict, List, Any, Iterable
+
+from .staging import StagedFileSystem
+
+MANIFEST_VERSION = 1
+
+logger = logging.getLogger("generation_manifest")
+
+
+class GenerationManifest:
+    """
+    Record of the files generated for each feature, stored as a JSON file.
+    
+    Every output file is recorded with the fingerprint of the template and
+    specification slice it was rendered from, the features generating it,
+    and its size and modification time once written. An output whose
+    fingerprint is unchanged and whose size and modification time still
+    match is up to date, so it is neither rendered nor read again. Recorded
+    outputs a feature no longer generates are its orphans.
+    """
+    
+    def __init__(self, path: str):
+        """
+        Initialize the manifest, loading it if the file exists.
+        
+        Args:
+            path: Path to the JSON manifest file
+        """
+        self.path = path
+        # Recorded outputs by normalized path
+        self.entries: Dict[str, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+        self.load()
+    
+    def __getstate__(self) -> Dict[str, Any]:
+        """Get a serializable state (used by snapshots); the entries are reloaded from the manifest file."""
+        return {"path": self.path}
+    
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        """Restore the state produced by __getstate__."""
+        self.__init__(state["path"])
+    
+    def load(self) -> None:
+        """Load the manifest file; a missing, unreadable or outdated manifest starts empty."""
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except FileNotFoundError:
+            data = {}
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable generation manifest {self.path}: {e}")
+            data = {}
+        
+        with self._lock:
+            self.entries = data.get("outputs", {}) if data.get("version") == MANIFEST_VERSION else {}
+    
+    def save(self) -> None:
+        """Write the manifest file atomically; nothing is written if it did not change."""
+        with self._lock:
+            content = json.dumps({"version": MANIFEST_VERSION, "outputs": self.entries}, indent=2, sort_keys=True)
+        vfs = StagedFileSystem()
+        vfs.write(self.path, content + "\n")
+        vfs.commit()
+    
+    def _matches_disk(self, path: str, entry: Dict[str, Any]) -> bool:
+        """Check that a file still has the size and modification time recorded for it."""
+        try:
+            file_stat = os.stat(path)
+        except OSError:
+            return False
+        return file_stat.st_size == entry["size"] and file_stat.st_mtime_ns == entry["mtime_ns"]
+    
+    def is_current(self, path: str, fingerprint: str) -> bool:
+        """
+        Check whether an output is up to date.
+        
+        Args:
+            path: Normalized path of the output
+            fingerprint: Fingerprint of the template and specification the output would be rendered from
+        
+        Returns:
+            True if the output was generated from the same fingerprint and has not changed on disk since
+        """
+        entry = self.entries.get(path)
+        return entry is not None and entry["fingerprint"] == fingerprint and self._matches_disk(path, entry)
+    
+    def orphans(self, feature_name: str, outputs: Iterable[str]) -> Dict[str, bool]:
+        """
+        Find the outputs only a feature generated that it no longer generates.
+        Outputs another feature still generates are not orphans, and missing files are left out.
+        
+        Args:
+            feature_name: Name of the feature
+            outputs: Normalized paths the feature generates now
+        
+        Returns:
+            Whether each orphan is unchanged on disk since it was generated (and so can be deleted),
+            by normalized path
+        """
+        outputs = set(outputs)
+        orphans = {}
+        with self._lock:
+            for path, entry in self.entries.items():
+                if entry["features"] == [feature_name] and path not in outputs and os.path.exists(path):
+                    orphans[path] = self._matches_disk(path, entry)
+        return orphans
+    
+    def update(self, feature_name: str, outputs: Dict[str, str]) -> None:
+        """
+        Record the outputs of a feature after they were written, replacing its previous outputs.
+        
+        Args:
+            feature_name: Name of the feature
+            outputs: Fingerprints of the outputs by normalized path
+        """
+        with self._lock:
+            for path in [path for path, entry in self.entries.items()
+                         if feature_name in entry["features"] and path not in outputs]:
+                features = self.entries[path]["features"]
+                features.remove(feature_name)
+                if not features:
+                    del self.entries[path]
+            
+            for path, fingerprint in outputs.items():
+                try:
+                    file_stat = os.stat(path)
+                except OSError:
+                    self.entries.pop(path, None)
+                    continue
+                previous = self.entries.get(path, {})
+                features = sorted(set(previous.get("features", [])) | {feature_name})
+                self.entries[path] = {
+                    "fingerprint": fingerprint,
+                    "features": features,
+                    "size": file_stat.st_size,
+                    "mtime_ns": file_stat.st_mtime_ns
+                }
+    
+    def outputs(self, feature_name: str) -> List[str]:
+        """
+        Get the recorded outputs of a feature.
+        
+        Args:
+            feature_name: Name of the feature
+        
+        Returns:
+            Sorted normalized paths
+        """
+        with self._lock:
+            return sorted(path for path, entry in self.entries.items() if feature_name in entry["features"])
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get manifest statistics.
+        
+        Returns:
+            Dictionary with the manifest path and the output and feature counts
+        """
+        with self._lock:
+            features = {feature for entry in self.entries.values() for feature in entry["features"]}
+            return {"path": self.path, "outputs": len(self.entries), "features": len(features)}
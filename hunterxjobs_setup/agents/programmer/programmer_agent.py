@@ -4,11 +4,16 @@
 import logging
 from typing import Dict, List, Any, Optional
 from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
+from time import perf_counter
 import os
 import json
 
 # Import base agent class
 from ..base.base_agent import BaseAgent
+from .manifest import GenerationManifest
+from .staging import StagedFileSystem, resolve_overlaps
+from .templates import compile_template_set
 
 class ProgrammerAgent(BaseAgent):
     """
@@ -37,6 +42,8 @@ class ProgrammerAgent(BaseAgent):
         self.current_feature = None
         self.implemented_features = []
         self.code_templates = {}
+        self.template_engine = compile_template_set()
+        self.generation_manifest = None
         
         # Load configuration if provided
         if config:
@@ -56,6 +63,36 @@ class ProgrammerAgent(BaseAgent):
         
         if "code_templates" in config:
             self.code_templates = config["code_templates"]
+            self.template_engine = compile_template_set(self.code_templates)
+        
+        if config.get("generation_manifest"):
+            self.enable_generation_manifest(config["generation_manifest"])
+    
+    def after_restore(self) -> None:
+        """
+        Compile the restored code templates, after the agent was restored from a snapshot
+        (the template engine itself is not part of the snapshot).
+        """
+        self.template_engine = compile_template_set(self.code_templates)
+    
+    def enable_generation_manifest(self, path: str) -> GenerationManifest:
+        """
+        Enable incremental regeneration backed by a generation manifest.
+        
+        With a manifest, implementing a feature again only renders and writes
+        the files whose template or specification slice changed (or that
+        changed on disk), and deletes the files the feature no longer
+        generates, unless they were edited since they were generated.
+        
+        Args:
+            path: Path to the JSON manifest file
+        
+        Returns:
+            The generation manifest
+        """
+        self.generation_manifest = GenerationManifest(path)
+        self.logger.info(f"Generation manifest enabled at {path}")
+        return self.generation_manifest
     
     def create_project_structure(self, base_dir: str) -> Dict[str, Any]:
         """
@@ -82,19 +119,19 @@ class ProgrammerAgent(BaseAgent):
             }
         }
         
-        # Create directories and placeholder files
+        # Stage directories and placeholder files, then write them in one batch
+        vfs = StagedFileSystem(base_dir)
         for section, contents in structure.items():
-            section_dir = os.path.join(base_dir, section)
-            os.makedirs(section_dir, exist_ok=True)
+            vfs.mkdir(section)
             
             for item in contents:
                 if isinstance(item, str):
                     # Create empty file
-                    with open(os.path.join(section_dir, item), 'w') as f:
-                        f.write(f"# {item} - Created by Programmer Agent\n")
+                    vfs.write(os.path.join(section, item), f"# {item} - Created by Programmer Agent\n")
                 else:
                     # Create subdirectory
-                    os.makedirs(os.path.join(section_dir, item), exist_ok=True)
+                    vfs.mkdir(os.path.join(section, item))
+        vfs.commit()
         
         self.logger.info(f"Created project structure in {base_dir}")
         return structure
@@ -103,6 +140,12 @@ class ProgrammerAgent(BaseAgent):
         """
         Implement a specific feature based on its specification.
         
+        Generated files are staged in memory and written in one batch once the
+        whole feature is generated, so a failure leaves no partial feature on
+        disk. Files whose content is already up to date are not rewritten.
+        With a generation manifest, files generated from an unchanged template
+        and specification slice are skipped, and orphaned files are deleted.
+        
         Args:
             feature_name: Name of the feature
             feature_spec: Specification of the feature
@@ -113,58 +156,271 @@ class ProgrammerAgent(BaseAgent):
         self.logger.info(f"Implementing feature: {feature_name}")
         self.current_feature = feature_name
         
-        # Track files created or modified
-        files_created = []
-        files_modified = []
-        
-        # Determine feature type and implement accordingly
+        # Stage the generated files and write them together once the feature is complete
+        vfs = StagedFileSystem()
         feature_type = feature_spec.get("type", "unknown")
+        for step in self._feature_steps(feature_type):
+            step(feature_name, feature_spec, vfs)
+        orphaned = self._stage_orphans(feature_name, vfs)
+        fingerprints = dict(vfs.fingerprints)
+        
+        try:
+            written = vfs.commit()
+        except OSError as e:
+            self.logger.error(f"Failed to write feature {feature_name}: {e}")
+            self.current_feature = None
+            return {"error": f"Failed to write feature {feature_name}: {e}"}
+        
+        implementation_details = self._record_feature(feature_name, feature_type, written, fingerprints, orphaned)
+        self._save_generation_manifest()
+        self.current_feature = None
         
-        if feature_type == "frontend":
-            # Implement frontend feature
-            component_files = self._implement_frontend_feature(feature_name, feature_spec)
-            files_created.extend(component_files)
+        return implementation_details
+    
+    def implement_features(self, specs: Dict[str, Dict[str, Any]],
+                           max_workers: Optional[int] = None) -> Dict[str, Any]:
+        """
+        Implement several features concurrently.
+        
+        Every generation step of every feature (frontend, backend and
+        integration code) runs as its own task on a bounded thread pool and
+        is staged in memory. Before anything is written, the staged and kept
+        paths of all features are compared: a path generated by several
+        features with different content (for a kept file, the content on
+        disk) is a conflict, and none of the features involved are written.
+        A path staged with the same content is written once.
+        The remaining features are then written concurrently, each in its
+        own all-or-nothing batch.
+        
+        Args:
+            specs: Feature specifications by feature name
+            max_workers: Maximum number of concurrent tasks (defaults to the thread pool default)
+        
+        Returns:
+            Dictionary with the result of each feature (implementation details or error, with its
+            generation and write times in ms), the conflicts and the counts
+        """
+        started = perf_counter()
+        names = list(specs)
+        self.logger.info(f"Implementing {len(names)} features")
+        
+        feature_types = {name: specs[name].get("type", "unknown") for name in names}
+        timings = {name: {"generate_ms": 0.0, "write_ms": 0.0} for name in names}
+        results: Dict[str, Dict[str, Any]] = {}
+        
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            # Generate: one task per feature step, staged separately and merged in step order
+            futures = {
+                name: [executor.submit(self._run_feature_step, step, name, specs[name])
+                       for step in self._feature_steps(feature_types[name])]
+                for name in names
+            }
+            stages = {}
+            for name in names:
+                stages[name] = vfs = StagedFileSystem()
+                try:
+                    for future in futures[name]:
+                        step_vfs, elapsed = future.result()
+                        vfs.merge(step_vfs)
+                        timings[name]["generate_ms"] += elapsed
+                except Exception as e:
+                    self.logger.error(f"Failed to generate feature {name}: {e}")
+                    results[name] = {"error": f"Failed to generate feature {name}: {e}"}
+                    del stages[name]
             
-        elif feature_type == "backend":
-            # Implement backend feature
-            api_files = self._implement_backend_feature(feature_name, feature_spec)
-            files_created.extend(api_files)
+            claimed = {path for vfs in stages.values() for path in list(vfs.files) + list(vfs.kept)}
+            orphaned = {name: self._stage_orphans(name, vfs, claimed) for name, vfs in stages.items()}
+            conflicts, shared = resolve_overlaps(stages)
+            for conflict in conflicts:
+                self.logger.warning(f"Output path conflict on {conflict['path']}: {', '.join(conflict['features'])}")
+                for name in conflict["features"]:
+                    results.setdefault(name, {"error": "Output path conflicts with other features", "conflicts": []})
+                    results[name]["conflicts"].append(conflict["path"])
             
+            # Write: one batch per feature without conflicts
+            fingerprints = {name: dict(vfs.fingerprints) for name, vfs in stages.items()}
+            writes = {
+                name: executor.submit(self._commit_feature, vfs)
+                for name, vfs in stages.items() if name not in results
+            }
+            for name, future in writes.items():
+                try:
+                    written, elapsed = future.result()
+                except OSError as e:
+                    self.logger.error(f"Failed to write feature {name}: {e}")
+                    results[name] = {"error": f"Failed to write feature {name}: {e}"}
+                    continue
+                timings[name]["write_ms"] = elapsed
+                results[name] = self._record_feature(name, feature_types[name], written, fingerprints[name],
+                                                     orphaned[name])
+                results[name]["files_shared"] = shared[name]
+        
+        if writes:
+            self._save_generation_manifest()
+        
+        for name in names:
+            results[name]["timings"] = {key: round(value, 3) for key, value in timings[name].items()}
+        
+        implemented = sum(1 for result in results.values() if "error" not in result)
+        return {
+            "features": {name: results[name] for name in names},
+            "conflicts": conflicts,
+            "implemented": implemented,
+            "failed": len(names) - implemented,
+            "elapsed_ms": round((perf_counter() - started) * 1000, 3)
+        }
+    
+    def _feature_steps(self, feature_type: str) -> List[Any]:
+        """
+        Get the generation steps of a feature type.
+        
+        Args:
+            feature_type: Type of the feature
+        
+        Returns:
+            List of methods taking the feature name, specification and staging area
+        """
+        if feature_type == "frontend":
+            return [self._implement_frontend_feature]
+        elif feature_type == "backend":
+            return [self._implement_backend_feature]
         elif feature_type == "integration":
-            # Implement integration feature (both frontend and backend)
-            frontend_files = self._implement_frontend_feature(feature_name, feature_spec)
-            backend_files = self._implement_backend_feature(feature_name, feature_spec)
-            files_created.extend(frontend_files)
-            files_created.extend(backend_files)
-            
-            # Create integration code
-            integration_files = self._implement_integration(feature_name, feature_spec)
-            files_created.extend(integration_files)
+            # Integration features have both frontend and backend, plus the code connecting them
+            return [self._implement_frontend_feature, self._implement_backend_feature, self._implement_integration]
+        return []
+    
+    def _run_feature_step(self, step: Any, feature_name: str, feature_spec: Dict[str, Any]):
+        """
+        Run one generation step into its own staging area.
+        
+        Returns:
+            Tuple of the staging area and the elapsed time in ms
+        """
+        started = perf_counter()
+        vfs = StagedFileSystem()
+        step(feature_name, feature_spec, vfs)
+        return vfs, (perf_counter() - started) * 1000
+    
+    def _commit_feature(self, vfs: StagedFileSystem):
+        """
+        Write a staged feature to disk.
+        
+        Returns:
+            Tuple of the commit result and the elapsed time in ms
+        """
+        started = perf_counter()
+        written = vfs.commit()
+        return written, (perf_counter() - started) * 1000
+    
+    def _record_feature(self, feature_name: str, feature_type: str, written: Dict[str, Any],
+                        fingerprints: Optional[Dict[str, str]] = None,
+                        orphaned: Optional[List[str]] = None) -> Dict[str, Any]:
+        """
+        Record a written feature in the implemented features and the generation manifest.
+        
+        Args:
+            feature_name: Name of the feature
+            feature_type: Type of the feature
+            written: Result of the staging area commit
+            fingerprints: Fingerprints of the feature's outputs by normalized path
+            orphaned: Orphaned files left in place because they were edited
+        
+        Returns:
+            Dictionary containing implementation details
+        """
+        if self.generation_manifest is not None:
+            self.generation_manifest.update(feature_name, fingerprints or {})
         
-        # Add to implemented features
         implementation_details = {
             "feature_name": feature_name,
             "feature_type": feature_type,
-            "files_created": files_created,
-            "files_modified": files_modified,
+            "files_created": written["created"],
+            "files_modified": written["modified"],
+            "files_unchanged": written["unchanged"],
+            "files_skipped": written["kept"],
+            "files_removed": written["removed"],
+            "files_orphaned": orphaned or [],
             "implemented_at": datetime.now().isoformat()
         }
         
+        self.logger.info(
+            f"Feature {feature_name}: {len(written['created'])} created, {len(written['modified'])} modified, "
+            f"{len(written['unchanged'])} unchanged, {len(written['kept'])} skipped, "
+            f"{len(written['removed'])} removed"
+        )
         self.implemented_features.append(implementation_details)
-        self.current_feature = None
-        
         return implementation_details
     
-    def _implement_frontend_feature(self, feature_name: str, feature_spec: Dict[str, Any]) -> List[str]:
+    def _stage_output(self, vfs: StagedFileSystem, file_path: str, template_name: str,
+                      spec: Dict[str, Any]) -> None:
+        """
+        Stage a generated file, skipping it if the generation manifest shows it is up to date.
+        
+        Args:
+            vfs: Staging area
+            file_path: Path of the file
+            template_name: Name of the template the file is rendered from
+            spec: Normalized specification slice the file is rendered from
+        """
+        if self.generation_manifest is None:
+            vfs.write(file_path, self.template_engine.render(template_name, spec))
+            return
+        
+        fingerprint = self.template_engine.fingerprint(template_name, spec)
+        if self.generation_manifest.is_current(vfs.resolve(file_path), fingerprint):
+            vfs.keep(file_path, fingerprint)
+        else:
+            vfs.write(file_path, self.template_engine.render(template_name, spec), fingerprint)
+    
+    def _stage_orphans(self, feature_name: str, vfs: StagedFileSystem,
+                       claimed: Optional[set] = None) -> List[str]:
+        """
+        Stage the deletion of the files a feature no longer generates.
+        
+        Args:
+            feature_name: Name of the feature
+            vfs: Staging area holding the feature's outputs
+            claimed: Optional paths generated by other features in the same run, never deleted
+        
+        Returns:
+            Orphaned files left in place because they were edited since they were generated
+        """
+        if self.generation_manifest is None:
+            return []
+        
+        outputs = set(vfs.files) | set(vfs.kept)
+        kept = []
+        for path, unchanged in sorted(self.generation_manifest.orphans(feature_name, outputs).items()):
+            if claimed and path in claimed:
+                continue
+            if unchanged:
+                vfs.remove(path)
+            else:
+                self.logger.warning(f"Leaving edited orphan of feature {feature_name}: {path}")
+                kept.append(path)
+        return kept
+    
+    def _save_generation_manifest(self) -> None:
+        """Save the generation manifest, if enabled."""
+        if self.generation_manifest is None:
+            return
+        try:
+            self.generation_manifest.save()
+        except OSError as e:
+            self.logger.error(f"Failed to save generation manifest: {e}")
+    
+    def _implement_frontend_feature(self, feature_name: str, feature_spec: Dict[str, Any],
+                                   vfs: StagedFileSystem) -> List[str]:
         """
         Implement a frontend feature.
         
         Args:
             feature_name: Name of the feature
             feature_spec: Specification of the feature
-            
+            vfs: Staging area the generated files are written to
+        
         Returns:
-            List of created files
+            List of staged files
         """
         files_created = []
         
@@ -173,13 +429,11 @@ class ProgrammerAgent(BaseAgent):
         for component in components:
             component_name = component.get("name")
             component_path = component.get("path", f"components/{feature_name.lower()}")
-            component_code = self._generate_react_component(component_name, component.get("props", []))
             
-            # Create the file
-            os.makedirs(component_path, exist_ok=True)
+            # Stage the file
             file_path = f"{component_path}/{component_name}.jsx"
-            with open(file_path, 'w') as f:
-                f.write(component_code)
+            self._stage_output(vfs, file_path, "react_component",
+                               self._react_component_spec(component_name, component.get("props", [])))
             
             files_created.append(file_path)
         
@@ -188,28 +442,27 @@ class ProgrammerAgent(BaseAgent):
         for page in pages:
             page_name = page.get("name")
             page_path = page.get("path", "pages")
-            page_code = self._generate_next_page(page_name, page.get("components", []))
             
-            # Create the file
-            os.makedirs(page_path, exist_ok=True)
+            # Stage the file
             file_path = f"{page_path}/{page_name}.jsx"
-            with open(file_path, 'w') as f:
-                f.write(page_code)
+            self._stage_output(vfs, file_path, "next_page", self._next_page_spec(page_name, page.get("components", [])))
             
             files_created.append(file_path)
         
         return files_created
     
-    def _implement_backend_feature(self, feature_name: str, feature_spec: Dict[str, Any]) -> List[str]:
+    def _implement_backend_feature(self, feature_name: str, feature_spec: Dict[str, Any],
+                                  vfs: StagedFileSystem) -> List[str]:
         """
         Implement a backend feature.
         
         Args:
             feature_name: Name of the feature
             feature_spec: Specification of the feature
-            
+            vfs: Staging area the generated files are written to
+        
         Returns:
-            List of created files
+            List of staged files
         """
         files_created = []
         
@@ -218,13 +471,10 @@ class ProgrammerAgent(BaseAgent):
         for endpoint in endpoints:
             endpoint_name = endpoint.get("name")
             endpoint_path = endpoint.get("path", f"api/{feature_name.lower()}")
-            endpoint_code = self._generate_api_endpoint(endpoint_name, endpoint)
             
-            # Create the file
-            os.makedirs(endpoint_path, exist_ok=True)
+            # Stage the file
             file_path = f"{endpoint_path}/{endpoint_name}.py"
-            with open(file_path, 'w') as f:
-                f.write(endpoint_code)
+            self._stage_output(vfs, file_path, "api_endpoint", self._api_endpoint_spec(endpoint_name, endpoint))
             
             files_created.append(file_path)
         
@@ -233,13 +483,10 @@ class ProgrammerAgent(BaseAgent):
         for model in models:
             model_name = model.get("name")
             model_path = model.get("path", "models")
-            model_code = self._generate_model(model_name, model.get("fields", []))
             
-            # Create the file
-            os.makedirs(model_path, exist_ok=True)
+            # Stage the file
             file_path = f"{model_path}/{model_name}.py"
-            with open(file_path, 'w') as f:
-                f.write(model_code)
+            self._stage_output(vfs, file_path, "model", self._model_spec(model_name, model.get("fields", [])))
             
             files_created.append(file_path)
         
@@ -248,39 +495,34 @@ class ProgrammerAgent(BaseAgent):
         for service in services:
             service_name = service.get("name")
             service_path = service.get("path", "services")
-            service_code = self._generate_service(service_name, service)
             
-            # Create the file
-            os.makedirs(service_path, exist_ok=True)
+            # Stage the file
             file_path = f"{service_path}/{service_name}.py"
-            with open(file_path, 'w') as f:
-                f.write(service_code)
+            self._stage_output(vfs, file_path, "service", self._service_spec(service_name, service))
             
             files_created.append(file_path)
         
         return files_created
     
-    def _implement_integration(self, feature_name: str, feature_spec: Dict[str, Any]) -> List[str]:
+    def _implement_integration(self, feature_name: str, feature_spec: Dict[str, Any],
+                               vfs: StagedFileSystem) -> List[str]:
         """
         Implement integration between frontend and backend.
         
         Args:
             feature_name: Name of the feature
             feature_spec: Specification of the feature
-            
+            vfs: Staging area the generated files are written to
+        
         Returns:
-            List of created files
+            List of staged files
         """
         files_created = []
         
         # Create API client for frontend
         api_client_path = "frontend/utils/api"
-        os.makedirs(api_client_path, exist_ok=True)
-        
-        api_client_code = self._generate_api_client(feature_name, feature_spec)
         file_path = f"{api_client_path}/{feature_name.lower()}_api.js"
-        with open(file_path, 'w') as f:
-            f.write(api_client_code)
+        self._stage_output(vfs, file_path, "api_client", self._api_client_spec(feature_name, feature_spec))
         
         files_created.append(file_path)
         
@@ -297,35 +539,14 @@ class ProgrammerAgent(BaseAgent):
         Returns:
             Generated component code
         """
-        props_list = ", ".join([prop.get("name") for prop in props])
-        props_destructure = "{ " + props_list + " }" if props else "props"
-        
-        props_types = []
-        for prop in props:
-            prop_name = prop.get("name")
-            prop_type = prop.get("type", "any")
-            props_types.append(f"  {prop_name}: {prop_type};")
-        
-        props_interface = "\n".join(props_types)
-        
-        return f"""import React from 'react';
-import styles from './{component_name}.module.css';
-
-interface {component_name}Props {{
-{props_interface}
-}}
-
-const {component_name}: React.FC<{component_name}Props> = ({props_destructure}) => {{
-  return (
-    <div className={{styles.container}}>
-      <h2>{component_name} Component</h2>
-      {/* Component content goes here */}
-    </div>
-  );
-}};
-
-export default {component_name};
-"""
+        return self.template_engine.render("react_component", self._react_component_spec(component_name, props))
+    
+    def _react_component_spec(self, component_name: str, props: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """Build the normalized specification of a React component."""
+        return {
+            "component_name": component_name,
+            "props": [{"name": prop.get("name"), "type": prop.get("type", "any")} for prop in props]
+        }
     
     def _generate_next_page(self, page_name: str, components: List[str]) -> str:
         """
@@ -338,40 +559,11 @@ export default {component_name};
         Returns:
             Generated page code
         """
-        imports = []
-        component_instances = []
-        
-        for component in components:
-            imports.append(f"import {component} from '../components/{component}';")
-            component_instances.append(f"      <{component} />")
-        
-        imports_code = "\n".join(imports)
-        components_code = "\n".join(component_instances)
-        
-        return f"""import React from 'react';
-import Head from 'next/head';
-{imports_code}
-import styles from '../styles/{page_name}.module.css';
-
-const {page_name}Page: React.FC = () => {{
-  return (
-    <div className={{styles.container}}>
-      <Head>
-        <title>{page_name} | HunterXJobs</title>
-        <meta name="description" content="HunterXJobs - AI-Powered Career Catalyst" />
-        <link rel="icon" href="/favicon.ico" />
-      </Head>
-
-      <main className={{styles.main}}>
-        <h1 className={{styles.title}}>{page_name}</h1>
-{components_code}
-      </main>
-    </div>
-  );
-}};
-
-export default {page_name}Page;
-"""
+        return self.template_engine.render("next_page", self._next_page_spec(page_name, components))
+    
+    def _next_page_spec(self, page_name: str, components: List[str]) -> Dict[str, Any]:
+        """Build the normalized specification of a Next.js page."""
+        return {"page_name": page_name, "components": list(components)}
     
     def _generate_api_endpoint(self, endpoint_name: str, endpoint_spec: Dict[str, Any]) -> str:
         """
@@ -384,45 +576,16 @@ export default {page_name}Page;
         Returns:
             Generated endpoint code
         """
-        method = endpoint_spec.get("method", "GET")
-        path = endpoint_spec.get("path", f"/{endpoint_name.lower()}")
-        
-        return f"""from fastapi import APIRouter, Depends, HTTPException, status
-from typing import List, Optional
-from pydantic import BaseModel
-
-router = APIRouter()
-
-class {endpoint_name}Request(BaseModel):
-    # Request model fields
-    pass
-
-class {endpoint_name}Response(BaseModel):
-    # Response model fields
-    success: bool
-    message: str
-    data: Optional[dict] = None
-
-@router.{method.lower()}("{path}")
-async def {endpoint_name.lower()}(request: {endpoint_name}Request):
-    \"\"\"
-    {endpoint_spec.get("description", f"{endpoint_name} endpoint")}
-    \"\"\"
-    try:
-        # Endpoint implementation
-        result = {{"key": "value"}}
-        
-        return {endpoint_name}Response(
-            success=True,
-            message="Operation successful",
-            data=result
-        )
-    except Exception as e:
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=str(e)
-        )
-"""
+        return self.template_engine.render("api_endpoint", self._api_endpoint_spec(endpoint_name, endpoint_spec))
+    
+    def _api_endpoint_spec(self, endpoint_name: str, endpoint_spec: Dict[str, Any]) -> Dict[str, Any]:
+        """Build the normalized specification of an API endpoint."""
+        return {
+            "endpoint_name": endpoint_name,
+            "method": endpoint_spec.get("method", "GET"),
+            "path": endpoint_spec.get("path", f"/{endpoint_name.lower()}"),
+            "description": endpoint_spec.get("description", f"{endpoint_name} endpoint")
+        }
     
     def _generate_model(self, model_name: str, fields: List[Dict[str, Any]]) -> str:
         """
@@ -435,31 +598,135 @@ async def {endpoint_name.lower()}(request: {endpoint_name}Request):
         Returns:
             Generated model code
         """
-        field_definitions = []
+        return self.template_engine.render("model", self._model_spec(model_name, fields))
+    
+    def _model_spec(self, model_name: str, fields: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """Build the normalized specification of a database model."""
+        return {
+            "model_name": model_name,
+            "fields": [
+                {"name": field.get("name"), "type": field.get("type", "String"), "options": field.get("options", {})}
+                for field in fields
+            ]
+        }
+    
+    def _generate_service(self, service_name: str, service_spec: Dict[str, Any]) -> str:
+        """
+        Generate code for a backend service.
         
-        for field in fields:
-            field_name = field.get("name")
-            field_type = field.get("type", "String")
-            field_options = field.get("options", {})
-            
-            options_str = ", ".join([f"{k}={v}" for k, v in field_options.items()])
-            field_definitions.append(f"    {field_name} = Column({field_type}, {options_str})")
+        Args:
+            service_name: Name of the service
+            service_spec: Specification of the service
         
-        fields_code = "\n".join(field_definitions)
+        Returns:
+            Generated service code
+        """
+        return self.template_engine.render("service", self._service_spec(service_name, service_spec))
+    
+    def _service_spec(self, service_name: str, service_spec: Dict[str, Any]) -> Dict[str, Any]:
+        """Build the normalized specification of a backend service."""
+        methods = []
+        for method in service_spec.get("methods", []):
+            if isinstance(method, str):
+                method = {"name": method}
+            methods.append({
+                "method_name": method.get("name"),
+                "description": method.get("description", f"{method.get('name')} operation")
+            })
+        
+        return {
+            "service_name": service_name,
+            "description": service_spec.get("description", f"{service_name} service"),
+            "methods": methods
+        }
+    
+    def _generate_api_client(self, feature_name: str, feature_spec: Dict[str, Any]) -> str:
+        """
+        Generate a frontend API client for a feature's endpoints.
         
-        return f"""from sqlalchemy import Column, Integer, String, Boolean, DateTime, ForeignKey, Text, JSON
-from sqlalchemy.orm import relationship
-from datetime import datetime
-
-from database import Base
-
-class {model_name}(Base):
-    \"\"\"
-    {model_name} model
-    \"\"\"
-    __tablename__ = "{model_name.lower()}s"
+        Args:
+            feature_name: Name of the feature
+            feature_spec: Specification of the feature
+        
+        Returns:
+            Generated API client code
+        """
+        return self.template_engine.render("api_client", self._api_client_spec(feature_name, feature_spec))
     
-    id = Column(Integer, primary_key=True, index=True)
-{fields_code}
-    created_at = Column(DateTime, default=datetime.utcnow)
-    updated_at = Column(DateTime<response clipped><NOTE>To save on context only part of this file has been shown to you. You should retry this tool after you have searched inside the file with `grep -n` in order to find the line numbers of what you are looking for.</NOTE>
\ No newline at end of file
+    def _api_client_spec(self, feature_name: str, feature_spec: Dict[str, Any]) -> Dict[str, Any]:
+        """Build the normalized specification of a feature's API client."""
+        endpoints = []
+        for endpoint in feature_spec.get("endpoints", []):
+            endpoint_name = endpoint.get("name")
+            endpoints.append({
+                "function_name": endpoint_name[:1].lower() + endpoint_name[1:],
+                "method": endpoint.get("method", "GET"),
+                "path": endpoint.get("path", f"/{endpoint_name.lower()}")
+            })
+        
+        return {"feature_name": feature_name, "endpoints": endpoints}
+    
+    def get_development_status(self) -> Dict[str, Any]:
+        """
+        Get the current development status.
+        
+        Returns:
+            Dictionary containing the current feature, implemented features, template cache and manifest statistics
+        """
+        return {
+            "project": self.current_project,
+            "current_feature": self.current_feature,
+            "implemented_features": len(self.implemented_features),
+            "recent_features": [feature["feature_name"] for feature in self.implemented_features[-5:]],
+            "tech_stack": self.tech_stack,
+            "template_cache": self.template_engine.get_stats(),
+            "generation_manifest": self.generation_manifest.get_stats() if self.generation_manifest else None
+        }
+    
+    def receive_message(self, message: Dict) -> Dict:
+        """
+        Process a received message and take appropriate action.
+        Override the base class method to provide specialized behavior.
+        
+        Args:
+            message: The message to process
+        
+        Returns:
+            Dictionary containing the response
+        """
+        super().receive_message(message)
+        
+        sender = message.get("sender")
+        message_type = message.get("message_type")
+        content = message.get("content", {})
+        action = content.get("action", "")
+        data = content.get("data", {})
+        
+        response_data = {}
+        
+        if message_type == "request":
+            if action == "get_development_status":
+                response_data = self.get_development_status()
+            
+            elif action == "implement_feature":
+                feature_name = data.get("feature_name")
+                if feature_name:
+                    response_data = self.implement_feature(feature_name, data.get("feature_spec", {}))
+                else:
+                    response_data = {"error": "Missing feature_name"}
+        
+        # Prepare and send response
+        response = {
+            "id": f"resp_{message.get('id')}",
+            "sender": self.name,
+            "receiver": sender,
+            "message_type": "response",
+            "content": {
+                "action": f"{action}_response",
+                "data": response_data,
+                "priority": content.get("priority", "medium"),
+                "timestamp": datetime.now().isoformat()
+            }
+        }
+        
+        return response
@@ -0,0 +1,348 @@
+# Programmer Staging Module
+# This file defines the staged virtual filesystem the Programmer agent writes generated code through
+
+import os
+import stat
+import uuid
+from typing import Dict, List, Any, Optional, Tuple
+
+
+class StagedFileSystem:
+    """
+    In-memory staging area for generated files, committed to disk in one batch.
+    
+    Writes and directories are only recorded until commit. A commit creates
+    each missing directory once, skips files whose content on disk is
+    already identical, writes every other file to a temporary file next to
+    it, renames the temporary files into place and then deletes the files
+    staged for removal. If any step fails, the files already replaced or
+    deleted are restored, new files and directories are removed, and the
+    error is raised, so the commit is all or nothing.
+    
+    Files can also be kept: claimed as up to date on disk, so they count as
+    outputs without being read or written. Staged and kept files can carry
+    the fingerprint of what produced them.
+    """
+    
+    def __init__(self, root: Optional[str] = None):
+        """
+        Initialize an empty staging area.
+        
+        Args:
+            root: Optional directory relative paths are resolved against (defaults to the working directory)
+        """
+        self.root = root
+        # Staged files by normalized path: (path as given, encoded content)
+        self.files: Dict[str, Tuple[str, bytes]] = {}
+        self.directories = set()
+        # Kept and removed files by normalized path: path as given
+        self.kept: Dict[str, str] = {}
+        self.removals: Dict[str, str] = {}
+        # Fingerprints of staged and kept files by normalized path
+        self.fingerprints: Dict[str, str] = {}
+    
+    def resolve(self, path: str) -> str:
+        """Normalize a path, resolving it against the root."""
+        return os.path.normpath(os.path.join(self.root, path) if self.root else path)
+    
+    def write(self, path: str, content: str, fingerprint: Optional[str] = None) -> None:
+        """
+        Stage a file; staging the same path again replaces the content.
+        
+        Args:
+            path: Path of the file
+            content: File content
+            fingerprint: Optional fingerprint of what produced the content
+        """
+        resolved = self.resolve(path)
+        self.files[resolved] = (path, content.encode("utf-8"))
+        self.kept.pop(resolved, None)
+        self._set_fingerprint(resolved, fingerprint)
+    
+    def keep(self, path: str, fingerprint: Optional[str] = None) -> None:
+        """
+        Claim a file as up to date on disk, leaving it untouched.
+        
+        Args:
+            path: Path of the file
+            fingerprint: Optional fingerprint of what produced the content
+        """
+        resolved = self.resolve(path)
+        self.files.pop(resolved, None)
+        self.kept[resolved] = path
+        self._set_fingerprint(resolved, fingerprint)
+    
+    def remove(self, path: str) -> None:
+        """
+        Stage the deletion of a file; a file also staged for writing is not deleted.
+        
+        Args:
+            path: Path of the file
+        """
+        self.removals[self.resolve(path)] = path
+    
+    def _set_fingerprint(self, resolved: str, fingerprint: Optional[str]) -> None:
+        """Record or clear the fingerprint of a staged or kept file."""
+        if fingerprint is None:
+            self.fingerprints.pop(resolved, None)
+        else:
+            self.fingerprints[resolved] = fingerprint
+    
+    def mkdir(self, path: str) -> None:
+        """
+        Stage a directory (parents included).
+        
+        Args:
+            path: Path of the directory
+        """
+        self.directories.add(self.resolve(path))
+    
+    def read(self, path: str) -> Optional[str]:
+        """
+        Read a file as it will be after the commit.
+        
+        Args:
+            path: Path of the file
+        
+        Returns:
+            Staged content, else the content on disk, or None if the file does not exist
+        """
+        staged = self.files.get(self.resolve(path))
+        if staged is not None:
+            return staged[1].decode("utf-8")
+        try:
+            with open(self.resolve(path), "r", encoding="utf-8") as f:
+                return f.read()
+        except FileNotFoundError:
+            return None
+    
+    def __contains__(self, path: str) -> bool:
+        return self.resolve(path) in self.files
+    
+    def __len__(self) -> int:
+        return len(self.files)
+    
+    def merge(self, other: "StagedFileSystem") -> None:
+        """
+        Stage everything staged in another staging area; its files replace staged files at the same paths.
+        
+        Args:
+            other: Staging area to merge
+        """
+        for path in other.files:
+            self.kept.pop(path, None)
+            self.fingerprints.pop(path, None)
+        for path in other.kept:
+            self.files.pop(path, None)
+            self.fingerprints.pop(path, None)
+        self.files.update(other.files)
+        self.kept.update(other.kept)
+        self.fingerprints.update(other.fingerprints)
+        self.directories.update(other.directories)
+        self.removals.update(other.removals)
+    
+    def discard(self) -> None:
+        """Drop everything staged."""
+        self.files.clear()
+        self.directories.clear()
+        self.kept.clear()
+        self.removals.clear()
+        self.fingerprints.clear()
+    
+    def _create_directories(self, created: List[str]) -> None:
+        """
+        Create the staged directories and the parents of the staged files.
+        Only the deepest directories are created, each with one makedirs call.
+        
+        Args:
+            created: List the created directories are appended to, parents first
+        """
+        directories = set(self.directories)
+        directories.update(os.path.dirname(path) for path in self.files)
+        directories.discard("")
+        
+        ancestors = set()
+        for directory in directories:
+            parent = os.path.dirname(directory)
+            while parent and parent not in ancestors and parent != directory:
+                ancestors.add(parent)
+                directory, parent = parent, os.path.dirname(parent)
+        
+        for leaf in sorted(directories - ancestors):
+            missing = []
+            directory = leaf
+            while directory and not os.path.isdir(directory):
+                missing.append(directory)
+                directory = os.path.dirname(directory)
+            if missing:
+                os.makedirs(leaf, exist_ok=True)
+                created.extend(reversed(missing))
+    
+    def commit(self) -> Dict[str, Any]:
+        """
+        Write everything staged to disk, all or nothing.
+        The staging area is emptied when the commit succeeds.
+        
+        Returns:
+            Dictionary with the created, modified, unchanged, kept and removed file paths (as staged)
+            and the number of directories created
+        """
+        created_directories = []
+        # Files to write: (path, content, previous content or None for a new file, previous permissions)
+        pending = []
+        unchanged = []
+        # Files to delete: (path, path as staged, previous content, previous permissions)
+        removals = []
+        temp_paths = {}
+        replaced = []
+        
+        try:
+            for path, (display_path, content) in self.files.items():
+                try:
+                    with open(path, "rb") as f:
+                        previous = f.read()
+                        mode = stat.S_IMODE(os.fstat(f.fileno()).st_mode)
+                except FileNotFoundError:
+                    previous = mode = None
+                if previous == content:
+                    unchanged.append(display_path)
+                else:
+                    pending.append((path, content, previous, mode))
+            
+            for path, display_path in self.removals.items():
+                if path in self.files or path in self.kept:
+                    continue
+                try:
+                    with open(path, "rb") as f:
+                        removals.append((path, display_path, f.read(), stat.S_IMODE(os.fstat(f.fileno()).st_mode)))
+                except FileNotFoundError:
+                    pass
+            
+            self._create_directories(created_directories)
+            
+            for path, content, _, mode in pending:
+                temp_paths[path] = _write_temp(path, content, mode)
+            
+            for path, _, previous, mode in pending:
+                os.replace(temp_paths[path], path)
+                del temp_paths[path]
+                replaced.append((path, previous, mode))
+            
+            for path, _, previous, mode in removals:
+                os.unlink(path)
+                replaced.append((path, previous, mode))
+        except BaseException:
+            for temp_path in temp_paths.values():
+                _remove(temp_path)
+            for path, previous, mode in reversed(replaced):
+                if previous is None:
+                    _remove(path)
+                else:
+                    os.replace(_write_temp(path, previous, mode), path)
+            for directory in reversed(created_directories):
+                try:
+                    os.rmdir(directory)
+                except OSError:
+                    pass
+            raise
+        
+        result = {
+            "created": [self.files[path][0] for path, _, previous, _ in pending if previous is None],
+            "modified": [self.files[path][0] for path, _, previous, _ in pending if previous is not None],
+            "unchanged": unchanged,
+            "kept": list(self.kept.values()),
+            "removed": [display_path for _, display_path, _, _ in removals],
+            "directories_created": len(created_directories)
+        }
+        self.discard()
+        return result
+
+
+def resolve_overlaps(stages: Dict[str, StagedFileSystem]) -> Tuple[List[Dict[str, Any]], Dict[str, List[str]]]:
+    """
+    Find the paths staged or kept by more than one staging area, before anything is written.
+    
+    A path staged with different contents is a conflict; the staging areas
+    involved are left untouched and should not be committed. A kept file
+    counts with its content on disk, which is only read when another
+    staging area stages the same path. Among the other staging areas, a
+    path staged with the same content is dropped from every staging area
+    after the first one claiming it, so it is written once.
+    
+    Args:
+        stages: Staging areas by name, in priority order
+    
+    Returns:
+        Tuple of the conflicts (path and names of the staging areas) and the shared paths dropped, by name
+    """
+    # Claims by normalized path: (name, path as given, staged content or None for a kept file)
+    claims: Dict[str, List[Tuple[str, str, Optional[bytes]]]] = {}
+    for name, vfs in stages.items():
+        for path, (display_path, content) in vfs.files.items():
+            claims.setdefault(path, []).append((name, display_path, content))
+        for path, display_path in vfs.kept.items():
+            claims.setdefault(path, []).append((name, display_path, None))
+    
+    conflicts = []
+    for path, path_claims in claims.items():
+        contents = {content for _, _, content in path_claims}
+        if None in contents and len(contents) > 1:
+            contents.discard(None)
+            contents.add(_read_bytes(path))
+        if len(contents) > 1:
+            conflicts.append({"path": path_claims[0][1], "features": [name for name, _, _ in path_claims]})
+    conflicted = {name for conflict in conflicts for name in conflict["features"]}
+    
+    shared: Dict[str, List[str]] = {name: [] for name in stages}
+    for path, path_claims in claims.items():
+        claimants = [claim for claim in path_claims if claim[0] not in conflicted]
+        for name, display_path, content in claimants[1:]:
+            if content is not None:
+                del stages[name].files[path]
+                shared[name].append(display_path)
+    
+    return conflicts, shared
+
+
+def _read_bytes(path: str) -> Optional[bytes]:
+    """Read a file, or return None if it cannot be read."""
+    try:
+        with open(path, "rb") as f:
+            return f.read()
+    except OSError:
+        return None
+
+
+def _write_temp(path: str, content: bytes, mode: Optional[int] = None) -> str:
+    """
+    Write content to a new temporary file next to a path, flushed to disk.
+    
+    Args:
+        path: Path the temporary file will replace
+        content: File content
+        mode: Optional permissions (defaults to those of a new file under the current umask)
+    
+    Returns:
+        Path of the temporary file
+    """
+    temp_path = os.path.join(os.path.dirname(path), f".{os.path.basename(path)}.{uuid.uuid4().hex[:12]}.tmp")
+    descriptor = os.open(temp_path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o666)
+    try:
+        if mode is not None:
+            os.fchmod(descriptor, mode)
+        with os.fdopen(descriptor, "wb") as f:
+            f.write(content)
+            f.flush()
+            os.fsync(f.fileno())
+    except BaseException:
+        _remove(temp_path)
+        raise
+    return temp_path
+
+
+def _remove(path: str) -> None:
+    """Remove a file if it exists."""
+    try:
+        os.unlink(path)
+    except FileNotFoundError:
+        pass
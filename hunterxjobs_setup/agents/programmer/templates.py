@@ -0,0 +1,441 @@
+# Programmer Templates Module
+# This file defines the compiled code templates and the memoizing template engine used by the Programmer agent
+
+import hashlib
+import json
+import threading
+from collections import OrderedDict
+from string import Formatter
+from typing import Dict, List, Any, Optional, Callable
+
+# Rendered outputs kept per template engine
+MAX_RENDERED = 4096
+
+REACT_COMPONENT_TEMPLATE = """import React from 'react';
+import styles from './{component_name}.module.css';
+
+interface {component_name}Props {{
+{props_interface}
+}}
+
+const {component_name}: React.FC<{component_name}Props> = ({props_destructure}) => {{
+  return (
+    <div className={{styles.container}}>
+      <h2>{component_name} Component</h2>
+      {{/* Component content goes here */}}
+    </div>
+  );
+}};
+
+export default {component_name};
+"""
+
+NEXT_PAGE_TEMPLATE = """import React from 'react';
+import Head from 'next/head';
+{imports_code}
+import styles from '../styles/{page_name}.module.css';
+
+const {page_name}Page: React.FC = () => {{
+  return (
+    <div className={{styles.container}}>
+      <Head>
+        <title>{page_name} | HunterXJobs</title>
+        <meta name="description" content="HunterXJobs - AI-Powered Career Catalyst" />
+        <link rel="icon" href="/favicon.ico" />
+      </Head>
+
+      <main className={{styles.main}}>
+        <h1 className={{styles.title}}>{page_name}</h1>
+{components_code}
+      </main>
+    </div>
+  );
+}};
+
+export default {page_name}Page;
+"""
+
+API_ENDPOINT_TEMPLATE = """from fastapi import APIRouter, Depends, HTTPException, status
+from typing import List, Optional
+from pydantic import BaseModel
+
+router = APIRouter()
+
+class {endpoint_name}Request(BaseModel):
+    # Request model fields
+    pass
+
+class {endpoint_name}Response(BaseModel):
+    # Response model fields
+    success: bool
+    message: str
+    data: Optional[dict] = None
+
+@router.{method}("{path}")
+async def {function_name}(request: {endpoint_name}Request):
+    \"\"\"
+    {description}
+    \"\"\"
+    try:
+        # Endpoint implementation
+        result = {{"key": "value"}}
+        
+        return {endpoint_name}Response(
+            success=True,
+            message="Operation successful",
+            data=result
+        )
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=str(e)
+        )
+"""
+
+MODEL_TEMPLATE = """from sqlalchemy import Column, Integer, String, Boolean, DateTime, ForeignKey, Text, JSON
+from sqlalchemy.orm import relationship
+from datetime import datetime
+
+from database import Base
+
+class {model_name}(Base):
+    \"\"\"
+    {model_name} model
+    \"\"\"
+    __tablename__ = "{table_name}"
+    
+    id = Column(Integer, primary_key=True, index=True)
+{fields_code}
+    created_at = Column(DateTime, default=datetime.utcnow)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+"""
+
+SERVICE_TEMPLATE = """import logging
+from typing import Dict, List, Any, Optional
+
+class {class_name}:
+    \"\"\"
+    {description}
+    \"\"\"
+    
+    def __init__(self):
+        self.logger = logging.getLogger("{service_name}")
+{methods_code}"""
+
+SERVICE_METHOD_TEMPLATE = """
+    async def {method_name}(self, data: Dict[str, Any]) -> Dict[str, Any]:
+        \"\"\"
+        {description}
+        \"\"\"
+        self.logger.info("{method_name} called")
+        return {{"success": True, "data": data}}
+"""
+
+API_CLIENT_TEMPLATE = """import axios from 'axios';
+
+const API_BASE_URL = process.env.NEXT_PUBLIC_API_URL || 'http://localhost:8000';
+
+// API client for the {feature_name} feature
+{functions_code}"""
+
+API_CLIENT_FUNCTION_TEMPLATE = """
+export const {function_name} = async (data) => {{
+  const response = await axios.{method}(`${{API_BASE_URL}}{path}`, {request_arguments});
+  return response.data;
+}};
+"""
+
+BUILTIN_TEMPLATES = {
+    "react_component": REACT_COMPONENT_TEMPLATE,
+    "next_page": NEXT_PAGE_TEMPLATE,
+    "api_endpoint": API_ENDPOINT_TEMPLATE,
+    "model": MODEL_TEMPLATE,
+    "service": SERVICE_TEMPLATE,
+    "service_method": SERVICE_METHOD_TEMPLATE,
+    "api_client": API_CLIENT_TEMPLATE,
+    "api_client_function": API_CLIENT_FUNCTION_TEMPLATE
+}
+
+
+def spec_hash(spec: Any) -> str:
+    """
+    Hash a specification independently of its key order.
+    
+    Args:
+        spec: JSON-like specification
+    
+    Returns:
+        Hex digest of the specification's canonical JSON form
+    """
+    canonical = json.dumps(spec, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.blake2b(canonical.encode("utf-8"), digest_size=16).hexdigest()
+
+
+class CodeTemplate:
+    """
+    A code template compiled once into its literal text and field slots.
+    
+    Templates use str.format syntax restricted to plain field names: {name}
+    is replaced by the value of a context field and {{ and }} stand for
+    literal braces.
+    """
+    
+    def __init__(self, name: str, source: str):
+        """
+        Compile the template.
+        
+        Args:
+            name: Name of the template
+            source: Template source
+        """
+        self.name = name
+        self.source = source
+        literals = []
+        self.fields: List[str] = []
+        literal_text = ""
+        try:
+            for literal, field, format_spec, conversion in Formatter().parse(source):
+                # Escaped braces split the literal text; join it back up to the next field
+                literal_text += literal
+                if field is None:
+                    continue
+                if not field.isidentifier() or format_spec or conversion:
+                    raise ValueError(f"unsupported field {{{field}}}; only plain names are allowed")
+                literals.append(literal_text)
+                literal_text = ""
+                self.fields.append(field)
+        except ValueError as e:
+            raise ValueError(f"Invalid template {name}: {e}")
+        literals.append(literal_text)
+        
+        # Output pieces with the field slots left empty: literal, field, literal, ..., literal
+        self._pieces = [None] * (2 * len(self.fields) + 1)
+        self._pieces[::2] = literals
+    
+    def render(self, context: Dict[str, Any]) -> str:
+        """
+        Render the template.
+        
+        Args:
+            context: Values of the template fields
+        
+        Returns:
+            Rendered code
+        """
+        pieces = self._pieces.copy()
+        try:
+            pieces[1::2] = [str(context[field]) for field in self.fields]
+        except KeyError as e:
+            raise ValueError(f"Template {self.name} needs field {e.args[0]}")
+        return "".join(pieces)
+
+
+# Context builders by template name: map a normalized specification (and the compiled templates, for
+# nested templates) to the template's field values. Templates without a builder are rendered with the
+# specification itself as context.
+
+def _react_component_context(spec: Dict[str, Any], templates: Dict[str, CodeTemplate]) -> Dict[str, Any]:
+    props = spec["props"]
+    props_list = ", ".join(prop["name"] for prop in props)
+    return {
+        "component_name": spec["component_name"],
+        "props_destructure": "{ " + props_list + " }" if props else "props",
+        "props_interface": "\n".join(f"  {prop['name']}: {prop['type']};" for prop in props)
+    }
+
+
+def _next_page_context(spec: Dict[str, Any], templates: Dict[str, CodeTemplate]) -> Dict[str, Any]:
+    components = spec["components"]
+    return {
+        "page_name": spec["page_name"],
+        "imports_code": "\n".join(f"import {component} from '../components/{component}';" for component in components),
+        "components_code": "\n".join(f"      <{component} />" for component in components)
+    }
+
+
+def _api_endpoint_context(spec: Dict[str, Any], templates: Dict[str, CodeTemplate]) -> Dict[str, Any]:
+    return {
+        "endpoint_name": spec["endpoint_name"],
+        "method": spec["method"].lower(),
+        "path": spec["path"],
+        "function_name": spec["endpoint_name"].lower(),
+        "description": spec["description"]
+    }
+
+
+def _model_context(spec: Dict[str, Any], templates: Dict[str, CodeTemplate]) -> Dict[str, Any]:
+    field_definitions = []
+    for field in spec["fields"]:
+        options_str = ", ".join(f"{key}={value}" for key, value in field["options"].items())
+        field_definitions.append(f"    {field['name']} = Column({field['type']}, {options_str})")
+    return {
+        "model_name": spec["model_name"],
+        "table_name": f"{spec['model_name'].lower()}s",
+        "fields_code": "\n".join(field_definitions)
+    }
+
+
+def _service_context(spec: Dict[str, Any], templates: Dict[str, CodeTemplate]) -> Dict[str, Any]:
+    method_template = templates["service_method"]
+    return {
+        "service_name": spec["service_name"],
+        "class_name": "".join(part.capitalize() for part in spec["service_name"].split("_")),
+        "description": spec["description"],
+        "methods_code": "".join(method_template.render(method) for method in spec["methods"])
+    }
+
+
+def _api_client_context(spec: Dict[str, Any], templates: Dict[str, CodeTemplate]) -> Dict[str, Any]:
+    function_template = templates["api_client_function"]
+    functions = []
+    for endpoint in spec["endpoints"]:
+        method = endpoint["method"].lower()
+        functions.append(function_template.render({
+            "function_name": endpoint["function_name"],
+            "method": method,
+            "path": endpoint["path"],
+            "request_arguments": "{ params: data }" if method in ("get", "delete") else "data"
+        }))
+    return {"feature_name": spec["feature_name"], "functions_code": "".join(functions)}
+
+
+CONTEXT_BUILDERS: Dict[str, Callable[[Dict[str, Any], Dict[str, CodeTemplate]], Dict[str, Any]]] = {
+    "react_component": _react_component_context,
+    "next_page": _next_page_context,
+    "api_endpoint": _api_endpoint_context,
+    "model": _model_context,
+    "service": _service_context,
+    "api_client": _api_client_context
+}
+
+# Templates a context builder renders besides the template itself
+TEMPLATE_DEPENDENCIES = {
+    "service": ("service_method",),
+    "api_client": ("api_client_function",)
+}
+
+
+class TemplateEngine:
+    """
+    Compiled code templates with memoized output.
+    
+    Templates are compiled once, from the built-ins overridden by any
+    configured templates. Rendered code is kept in a bounded LRU map keyed
+    by the template name and the hash of the normalized specification, so
+    generating the same component or model again is a dictionary lookup.
+    """
+    
+    def __init__(self, templates: Optional[Dict[str, str]] = None, max_rendered: int = MAX_RENDERED):
+        """
+        Initialize the engine.
+        
+        Args:
+            templates: Optional templates by name, replacing or adding to the built-ins
+            max_rendered: Number of rendered outputs kept
+        """
+        sources = dict(BUILTIN_TEMPLATES)
+        sources.update(templates or {})
+        self.templates = {name: CodeTemplate(name, source) for name, source in sources.items()}
+        self.template_hashes = {
+            name: spec_hash([sources[dependency] for dependency in (name,) + TEMPLATE_DEPENDENCIES.get(name, ())
+                             if dependency in sources])
+            for name in sources
+        }
+        self.max_rendered = max_rendered
+        self.hits = 0
+        self.misses = 0
+        self._rendered = OrderedDict()
+        self._lock = threading.Lock()
+    
+    def render(self, name: str, spec: Dict[str, Any]) -> str:
+        """
+        Render a template for a specification, reusing earlier output for the same specification.
+        
+        Args:
+            name: Name of the template
+            spec: Normalized specification (defaults filled in, so equal inputs compare equal)
+        
+        Returns:
+            Rendered code
+        """
+        template = self.templates.get(name)
+        if template is None:
+            raise ValueError(f"Unknown template: {name}")
+        
+        key = (name, spec_hash(spec))
+        with self._lock:
+            code = self._rendered.get(key)
+            if code is not None:
+                self._rendered.move_to_end(key)
+                self.hits += 1
+                return code
+        
+        build_context = CONTEXT_BUILDERS.get(name)
+        code = template.render(build_context(spec, self.templates) if build_context is not None else spec)
+        
+        with self._lock:
+            self.misses += 1
+            self._rendered[key] = code
+            if len(self._rendered) > self.max_rendered:
+                self._rendered.popitem(last=False)
+        return code
+    
+    def fingerprint(self, name: str, spec: Dict[str, Any]) -> str:
+        """
+        Fingerprint the output of a template for a specification without rendering it.
+        The fingerprint changes when the specification or any template the output is rendered from changes.
+        
+        Args:
+            name: Name of the template
+            spec: Normalized specification
+        
+        Returns:
+            Hex digest identifying the output
+        """
+        template_hash = self.template_hashes.get(name)
+        if template_hash is None:
+            raise ValueError(f"Unknown template: {name}")
+        return spec_hash([name, template_hash, spec])
+    
+    def clear(self) -> None:
+        """Drop every memoized output."""
+        with self._lock:
+            self._rendered.clear()
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get cache statistics.
+        
+        Returns:
+            Dictionary with the template count, memoized output count, hits and misses
+        """
+        with self._lock:
+            return {
+                "templates": len(self.templates),
+                "rendered": len(self._rendered),
+                "hits": self.hits,
+                "misses": self.misses
+            }
+
+
+# Template engines by configured templates, shared by every agent with the same templates
+_template_engines: Dict[str, TemplateEngine] = {}
+_template_engines_lock = threading.Lock()
+
+
+def compile_template_set(code_templates: Optional[Dict[str, str]] = None) -> TemplateEngine:
+    """
+    Get the template engine for a set of configured templates, compiling it on first use.
+    
+    Args:
+        code_templates: Optional templates by name, replacing or adding to the built-ins
+    
+    Returns:
+        Template engine
+    """
+    key = json.dumps(code_templates or {}, sort_keys=True)
+    with _template_engines_lock:
+        engine = _template_engines.get(key)
+        if engine is None:
+            engine = _template_engines[key] = TemplateEngine(code_templates)
+        return engine
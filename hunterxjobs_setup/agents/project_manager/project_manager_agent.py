@@ -33,6 +33,17 @@ class ProjectManagerAgent(BaseAgent):
         # Track managed agents
         self.managed_agents = {}
         
+        # Position of each task in self.tasks by task ID (positions, unlike task references, survive snapshots)
+        self.task_positions = {}
+        
+        # Task duration estimates used for automatic task placement
+        # (EWMA of observed durations in seconds, per agent and per task type)
+        self.ewma_alpha = 0.3
+        self.default_task_duration = 60.0
+        self.duration_estimates = {}
+        self.agent_duration_estimates = {}
+        self.task_type_duration_estimates = {}
+        
         # Project requirements and features
         self.requirements = {}
         self.features = {}
@@ -65,6 +76,12 @@ class ProjectManagerAgent(BaseAgent):
         
         if "features" in config:
             self.features = config["features"]
+        
+        if "ewma_alpha" in config:
+            self.ewma_alpha = config["ewma_alpha"]
+        
+        if "default_task_duration" in config:
+            self.default_task_duration = config["default_task_duration"]
     
     def register_agent(self, agent_name: str, agent_type: str) -> bool:
         """
@@ -85,6 +102,7 @@ class ProjectManagerAgent(BaseAgent):
             "type": agent_type,
             "status": "idle",
             "current_task": None,
+            "queued_tasks": [],
             "completed_tasks": [],
             "registered_at": datetime.now().isoformat()
         }
@@ -92,21 +110,31 @@ class ProjectManagerAgent(BaseAgent):
         self.logger.info(f"Registered agent: {agent_name} of type {agent_type}")
         return True
     
-    def assign_task(self, agent_name: str, task_description: str, priority: str = "medium", 
-                   deadline: Optional[datetime] = None, dependencies: List[str] = None) -> Dict:
+    def assign_task(self, agent_name: Optional[str], task_description: str, priority: str = "medium", 
+                   deadline: Optional[datetime] = None, dependencies: List[str] = None,
+                   task_type: str = "general", agent_type: Optional[str] = None) -> Dict:
         """
         Assign a task to a managed agent.
         
         Args:
-            agent_name: Name of the agent to assign the task to
+            agent_name: Name of the agent to assign the task to, or None / "auto"
+                to place the task on the agent with the lowest expected completion time
             task_description: Description of the task
             priority: Priority level (high, medium, low)
             deadline: Optional deadline for the task
             dependencies: List of task IDs that must be completed before this task
+            task_type: Type of the task, used for duration estimates
+            agent_type: Optional agent type restriction for automatic placement
             
         Returns:
             Dictionary containing the task details or error message
         """
+        if agent_name in (None, "auto"):
+            agent_name = self.select_agent(task_type, agent_type)
+            if agent_name is None:
+                self.logger.error(f"Cannot assign task: No available agent for task type {task_type}")
+                return {"error": f"No available agent for task type {task_type}"}
+        
         if agent_name not in self.managed_agents:
             self.logger.error(f"Cannot assign task: Agent {agent_name} not registered")
             return {"error": f"Agent {agent_name} not registered"}
@@ -115,6 +143,8 @@ class ProjectManagerAgent(BaseAgent):
             "id": f"task_{len(self.tasks) + 1}_{datetime.now().timestamp()}",
             "agent": agent_name,
             "description": task_description,
+            "task_type": task_type,
+            "agent_type": agent_type,
             "priority": priority,
             "status": "assigned",
             "created_at": datetime.now().isoformat(),
@@ -123,11 +153,33 @@ class ProjectManagerAgent(BaseAgent):
         }
         
         # Add to our task list
+        self.task_positions[task["id"]] = len(self.tasks)
         self.tasks.append(task)
         
+        self._place_task(task, agent_name)
+        
+        self.logger.info(f"Task {task['id']} assigned to {agent_name}: {task_description}")
+        return task
+    
+    def _place_task(self, task: Dict[str, Any], agent_name: str) -> None:
+        """
+        Queue a task on a managed agent and notify the agent.
+        
+        Args:
+            task: Task dictionary
+            agent_name: Name of the agent receiving the task
+        """
+        agent_info = self.managed_agents[agent_name]
+        task["agent"] = agent_name
+        task["assigned_at"] = datetime.now().isoformat()
+        task.pop("started_at", None)
+        agent_info["queued_tasks"].append(task["id"])
+        
         # Update agent status
-        self.managed_agents[agent_name]["status"] = "assigned"
-        self.managed_agents[agent_name]["current_task"] = task["id"]
+        if agent_info["current_task"] is None:
+            self._start_task(agent_info, task["id"])
+        if agent_info["status"] == "idle":
+            agent_info["status"] = "assigned"
         
         # Send message to the agent
         self.send_message(
@@ -137,11 +189,185 @@ class ProjectManagerAgent(BaseAgent):
                 "action": "assign_task",
                 "data": task
             },
-            priority=priority
+            priority=task["priority"]
         )
+    
+    def get_task(self, task_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Look up a task by ID.
         
-        self.logger.info(f"Task {task['id']} assigned to {agent_name}: {task_description}")
-        return task
+        Args:
+            task_id: ID of the task
+        
+        Returns:
+            Task dictionary, or None if there is no such task
+        """
+        position = self.task_positions.get(task_id)
+        if position is not None and position < len(self.tasks) and self.tasks[position]["id"] == task_id:
+            return self.tasks[position]
+        if position is None and len(self.task_positions) == len(self.tasks):
+            return None
+        
+        # Tasks were added or reordered outside assign_task; index them again
+        self.task_positions = {task["id"]: i for i, task in enumerate(self.tasks)}
+        position = self.task_positions.get(task_id)
+        return None if position is None else self.tasks[position]
+    
+    def _start_task(self, agent_info: Dict[str, Any], task_id: Optional[str]) -> None:
+        """
+        Make a queued task the agent's current task, recording when it could start.
+        Queue wait before that point is counted as backlog, not as task duration.
+        
+        Args:
+            agent_info: Managed agent record
+            task_id: ID of the task, or None to clear the current task
+        """
+        agent_info["current_task"] = task_id
+        task = self.get_task(task_id) if task_id else None
+        if task is not None and not task.get("started_at"):
+            task["started_at"] = datetime.now().isoformat()
+    
+    def estimate_task_duration(self, agent_name: str, task_type: str) -> float:
+        """
+        Estimate how long an agent will take to complete a task of a given type.
+        
+        Falls back from the agent/task-type estimate to the task-type estimate,
+        then the agent estimate, then the default task duration.
+        
+        Args:
+            agent_name: Name of the agent
+            task_type: Type of the task
+            
+        Returns:
+            Estimated duration in seconds
+        """
+        for estimate in (
+            self.duration_estimates.get((agent_name, task_type)),
+            self.task_type_duration_estimates.get(task_type),
+            self.agent_duration_estimates.get(agent_name)
+        ):
+            if estimate is not None:
+                return estimate
+        
+        return self.default_task_duration
+    
+    def expected_completion_time(self, agent_name: str, task_type: str) -> float:
+        """
+        Estimate when an agent would finish a new task of a given type,
+        taking the work already queued on the agent into account.
+        
+        Args:
+            agent_name: Name of the agent
+            task_type: Type of the new task
+            
+        Returns:
+            Expected completion time in seconds from now
+        """
+        backlog = 0.0
+        
+        for task_id in self.managed_agents[agent_name]["queued_tasks"]:
+            task = self.get_task(task_id)
+            if not task:
+                continue
+            
+            estimate = self.estimate_task_duration(agent_name, task.get("task_type", "general"))
+            if task["status"] == "in_progress" and task.get("started_at"):
+                elapsed = (datetime.now() - datetime.fromisoformat(task["started_at"])).total_seconds()
+                estimate = max(estimate - elapsed, 0.0)
+            backlog += estimate
+        
+        return backlog + self.estimate_task_duration(agent_name, task_type)
+    
+    def select_agent(self, task_type: str = "general", agent_type: Optional[str] = None,
+                     exclude: Optional[List[str]] = None) -> Optional[str]:
+        """
+        Select the managed agent with the lowest expected completion time for a task.
+        
+        Args:
+            task_type: Type of the task
+            agent_type: Optional agent type restriction
+            exclude: Optional list of agent names to skip
+            
+        Returns:
+            Name of the selected agent, or None if no agent is available
+        """
+        best_agent = None
+        best_time = None
+        
+        for agent_name, info in self.managed_agents.items():
+            if info["status"] == "blocked" or (exclude and agent_name in exclude):
+                continue
+            if agent_type and info["type"] != agent_type:
+                continue
+            
+            completion_time = self.expected_completion_time(agent_name, task_type)
+            if best_time is None or completion_time < best_time:
+                best_agent = agent_name
+                best_time = completion_time
+        
+        return best_agent
+    
+    def _record_task_duration(self, agent_name: str, task: Dict[str, Any]) -> None:
+        """
+        Update the duration estimates with a completed task.
+        
+        Args:
+            agent_name: Name of the agent that completed the task
+            task: The completed task
+        """
+        started_at = task.get("started_at") or task.get("assigned_at")
+        if not started_at:
+            return
+        
+        duration = (datetime.now() - datetime.fromisoformat(started_at)).total_seconds()
+        task_type = task.get("task_type", "general")
+        
+        for estimates, key in (
+            (self.duration_estimates, (agent_name, task_type)),
+            (self.task_type_duration_estimates, task_type),
+            (self.agent_duration_estimates, agent_name)
+        ):
+            previous = estimates.get(key)
+            if previous is None:
+                estimates[key] = duration
+            else:
+                estimates[key] = self.ewma_alpha * duration + (1 - self.ewma_alpha) * previous
+    
+    def rebalance_tasks(self, agent_name: str) -> List[Dict]:
+        """
+        Move tasks that have not been started off a blocked agent (work stealing).
+        
+        Args:
+            agent_name: Name of the blocked agent
+            
+        Returns:
+            List of tasks that were moved to other agents
+        """
+        agent_info = self.managed_agents[agent_name]
+        moved_tasks = []
+        kept_tasks = []
+        
+        for task_id in agent_info["queued_tasks"]:
+            task = self.get_task(task_id)
+            if not task or task["status"] != "assigned":
+                kept_tasks.append(task_id)
+                continue
+            
+            target = self.select_agent(task.get("task_type", "general"), task.get("agent_type"),
+                                       exclude=[agent_name])
+            if target is None:
+                kept_tasks.append(task_id)
+                continue
+            
+            self._place_task(task, target)
+            moved_tasks.append(task)
+            self.logger.info(f"Task {task_id} moved from blocked agent {agent_name} to {target}")
+        
+        agent_info["queued_tasks"] = kept_tasks
+        if agent_info["current_task"] not in kept_tasks:
+            self._start_task(agent_info, kept_tasks[0] if kept_tasks else None)
+        
+        return moved_tasks
     
     def update_agent_status(self, agent_name: str, status: str, task_id: Optional[str] = None) -> bool:
         """
@@ -159,8 +385,9 @@ class ProjectManagerAgent(BaseAgent):
             self.logger.error(f"Cannot update status: Agent {agent_name} not registered")
             return False
         
-        old_status = self.managed_agents[agent_name]["status"]
-        self.managed_agents[agent_name]["status"] = status
+        agent_info = self.managed_agents[agent_name]
+        old_status = agent_info["status"]
+        agent_info["status"] = status
         
         if task_id:
             # Update task status if provided
@@ -168,15 +395,32 @@ class ProjectManagerAgent(BaseAgent):
                 if task["id"] == task_id:
                     if status == "idle" and task["status"] != "completed":
                         self.tasks[i]["status"] = "completed"
+                        self._record_task_duration(agent_name, task)
                         
                         # Move from current to completed tasks for the agent
-                        if self.managed_agents[agent_name]["current_task"] == task_id:
-                            self.managed_agents[agent_name]["current_task"] = None
-                            self.managed_agents[agent_name]["completed_tasks"].append(task_id)
+                        if task_id in agent_info["queued_tasks"]:
+                            agent_info["queued_tasks"].remove(task_id)
+                            agent_info["completed_tasks"].append(task_id)
+                        if agent_info["current_task"] == task_id:
+                            agent_info["current_task"] = None
+                        
+                        # Keep working through the agent's queue
+                        if agent_info["queued_tasks"]:
+                            self._start_task(agent_info, agent_info["queued_tasks"][0])
+                            agent_info["status"] = "assigned"
+                    
+                    elif status == "working":
+                        self.tasks[i]["status"] = "in_progress"
+                        self.tasks[i]["started_at"] = datetime.now().isoformat()
+                        agent_info["current_task"] = task_id
                     
                     elif status == "blocked":
                         self.tasks[i]["status"] = "blocked"
         
+        # Hand queued work from a blocked agent to the others
+        if status == "blocked" and old_status != "blocked":
+            self.rebalance_tasks(agent_name)
+        
         self.logger.info(f"Agent {agent_name} status updated: {old_status} -> {status}")
         return True
     
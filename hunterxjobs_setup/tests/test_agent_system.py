@@ -6,7 +6,8 @@ import sys
 import logging
 import unittest
 import json
-from datetime import datetime
+import tempfile
+from datetime import datetime, timedelta
 
 # Add parent directory to path to import agents
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -16,6 +17,17 @@ from agents.programmer import ProgrammerAgent
 from agents.debugger import DebuggerAgent
 from agents.linkedin_optimizer import LinkedInProfileOptimizerAgent
 from agents.security import SecurityAgent
+from agents.base import BaseAgent, DecisionScorer, KnowledgeBase, SQLiteKnowledgeBackend, RedisKnowledgeBackend
+from agents.base.snapshot import SnapshotWriter, SnapshotReader
+from agents.debugger.clones import CloneIndex
+from agents.debugger.issue_store import IssueTable
+from agents.debugger.benchmark import (
+    generate_source, generate_corpus, run_benchmark, save_baseline, load_baseline, compare_to_baseline
+)
+from agents.debugger.metrics import MetricsStore
+from agents.debugger.rules import Rule, RuleRegistry, SourceFile, make_issue
+from agents.debugger.scanner import MultiPatternScanner
+from agents.debugger.watcher import IncrementalReviewer, InotifyMonitor
 
 class TestAgentSystem(unittest.TestCase):
     """Test cases for the HunterXJobs agent system"""
@@ -89,6 +101,79 @@ class TestAgentSystem(unittest.TestCase):
         self.assertIn("debugger", agent_statuses)
         self.assertIn("linkedin_optimizer", agent_statuses)
         self.assertIn("security", agent_statuses)
+    
+    def test_snapshot_and_restore(self):
+        """Test that a restored system keeps agent tasks, knowledge and messages"""
+        project_manager = self.agent_system.get_agent("project_manager")
+        project_manager.register_agent("programmer", "programmer")
+        task = project_manager.assign_task("programmer", "Build dashboard")
+        project_manager.update_knowledge("industry", "technology")
+        
+        with tempfile.TemporaryDirectory() as temp_dir:
+            path = os.path.join(temp_dir, "system.snapshot")
+            self.agent_system.snapshot(path)
+            restored = AgentSystem.restore(path)
+            
+            agents = restored.get_all_agents()
+            self.assertEqual(set(agents), set(self.agent_system.get_all_agents()))
+            
+            restored_manager = agents["project_manager"]
+            self.assertEqual(restored_manager.id, project_manager.id)
+            self.assertEqual(restored_manager.tasks[0]["id"], task["id"])
+            self.assertEqual(restored_manager.get_knowledge("industry"), "technology")
+            self.assertEqual(len(restored_manager.messages), len(project_manager.messages))
+            restored.stop()
+            
+            # Stopping releases the snapshot file; lazily loaded lists are decoded first
+            self.assertIsNone(restored._snapshot_reader)
+            self.assertEqual(len(restored_manager.messages), len(project_manager.messages))
+    
+    def test_snapshot_restores_debugger_reviews(self):
+        """Test that a restored debugger keeps its reviews, their issues and its rolling metrics"""
+        debugger = self.agent_system.get_agent("debugger")
+        debugger.review_code("a.js", "console.log('a')\nconst password = 'secret123'\n")
+        debugger.review_code("b.py", "import os\nprint('b')\n")
+        
+        with tempfile.TemporaryDirectory() as temp_dir:
+            path = os.path.join(temp_dir, "system.snapshot")
+            skipped = self.agent_system.snapshot(path)["skipped_attributes"].get("debugger", [])
+            self.assertNotIn("completed_reviews", skipped)
+            self.assertNotIn("issue_store", skipped)
+            self.assertNotIn("metrics_store", skipped)
+            restored = AgentSystem.restore(path)
+            
+            restored_debugger = restored.get_agent("debugger")
+            self.assertEqual([review["issues"] for review in restored_debugger.completed_reviews],
+                             [list(review["issues"]) for review in debugger.completed_reviews])
+            self.assertIs(restored_debugger.completed_reviews[0]["issues"].table, restored_debugger.issue_store)
+            self.assertEqual(list(restored_debugger.issue_store.iter_issues()),
+                             list(debugger.issue_store.iter_issues()))
+            self.assertEqual(restored_debugger.get_quality_trends(file_path="a.js"),
+                             debugger.get_quality_trends(file_path="a.js"))
+            
+            restored_debugger.review_code("c.js", "console.log('c')\n")
+            self.assertEqual(len(restored_debugger.completed_reviews), 3)
+            self.assertEqual(restored_debugger.metrics_store.window()["reviews"], 3)
+            self.assertEqual(restored_debugger.completed_reviews[0]["issues"], debugger.completed_reviews[0]["issues"])
+            restored.stop()
+    
+    def test_snapshot_restores_programmer_templates(self):
+        """Test that a restored programmer renders its configured templates and keeps its generation manifest"""
+        programmer = self.agent_system.get_agent("programmer")
+        
+        with tempfile.TemporaryDirectory() as temp_dir:
+            manifest_path = os.path.join(temp_dir, "generation_manifest.json")
+            programmer._load_config({"code_templates": {"model": "class {model_name}: # {table_name}\n"},
+                                     "generation_manifest": manifest_path})
+            path = os.path.join(temp_dir, "system.snapshot")
+            skipped = self.agent_system.snapshot(path)["skipped_attributes"].get("programmer", [])
+            self.assertNotIn("generation_manifest", skipped)
+            restored = AgentSystem.restore(path)
+            
+            restored_programmer = restored.get_agent("programmer")
+            self.assertEqual(restored_programmer._generate_model("Job", []), "class Job: # jobs\n")
+            self.assertEqual(restored_programmer.generation_manifest.path, manifest_path)
+            restored.stop()
 
 
 class TestProjectManagerAgent(unittest.TestCase):
@@ -125,6 +210,221 @@ class TestProjectManagerAgent(unittest.TestCase):
         self.assertIsNotNone(response)
         self.assertEqual(response["receiver"], "system")
         self.assertEqual(response["message_type"], "response")
+    
+    def test_auto_task_placement(self):
+        """Test that automatic placement spreads tasks over the least loaded agents"""
+        self.agent.register_agent("programmer_1", "programmer")
+        self.agent.register_agent("programmer_2", "programmer")
+        
+        first = self.agent.assign_task(None, "Build login page", task_type="frontend")
+        second = self.agent.assign_task("auto", "Build signup page", task_type="frontend")
+        
+        self.assertNotEqual(first["agent"], second["agent"])
+    
+    def test_blocked_agent_rebalancing(self):
+        """Test that queued tasks are moved off an agent that reports blocked"""
+        self.agent.register_agent("programmer_1", "programmer")
+        self.agent.register_agent("programmer_2", "programmer")
+        
+        current = self.agent.assign_task("programmer_1", "Build login page")
+        queued = self.agent.assign_task("programmer_1", "Build signup page")
+        self.agent.update_agent_status("programmer_1", "blocked", current["id"])
+        
+        self.assertEqual(queued["agent"], "programmer_2")
+        self.assertIn(queued["id"], self.agent.managed_agents["programmer_2"]["queued_tasks"])
+        self.assertNotIn(queued["id"], self.agent.managed_agents["programmer_1"]["queued_tasks"])
+    
+    def test_queue_wait_not_counted_as_duration(self):
+        """Test that a queued task's duration is measured from when it becomes the current task"""
+        self.agent.register_agent("programmer_1", "programmer")
+        first = self.agent.assign_task("programmer_1", "Build login page", task_type="frontend")
+        second = self.agent.assign_task("programmer_1", "Build signup page", task_type="frontend")
+        self.assertNotIn("started_at", second)
+        
+        # Both tasks waited an hour; only the first one was running all that time
+        an_hour_ago = (datetime.now() - timedelta(hours=1)).isoformat()
+        first["started_at"] = second["assigned_at"] = an_hour_ago
+        self.agent.update_agent_status("programmer_1", "idle", first["id"])
+        self.assertEqual(self.agent.managed_agents["programmer_1"]["current_task"], second["id"])
+        self.agent.update_agent_status("programmer_1", "idle", second["id"])
+        
+        # EWMA of 3600 s and about 0 s, where counting the wait would give 3600 s
+        self.assertLess(self.agent.estimate_task_duration("programmer_1", "frontend"), 3000)
+        self.assertIs(self.agent.get_task(second["id"]), second)
+        self.assertIs(self.agent.get_task(self.agent.add_task("Review copy")["id"]), self.agent.tasks[-1])
+
+
+class TestKnowledgeBase(unittest.TestCase):
+    """Test cases for the bounded knowledge base"""
+    
+    def test_lru_eviction(self):
+        """Test that least recently used items are evicted when over budget"""
+        knowledge_base = KnowledgeBase(max_items=2)
+        knowledge_base.set("a", 1)
+        knowledge_base.set("b", 2)
+        knowledge_base.get("a")
+        knowledge_base.set("c", 3)
+        
+        self.assertEqual(knowledge_base.get("a"), 1)
+        self.assertIsNone(knowledge_base.get("b"))
+        self.assertEqual(knowledge_base.get_stats()["evictions"], 1)
+    
+    def test_ttl_expiry_and_counters(self):
+        """Test that expired items are treated as misses"""
+        knowledge_base = KnowledgeBase()
+        knowledge_base.set("fresh", "value")
+        knowledge_base.set("stale", "value", ttl=-1)
+        
+        self.assertEqual(knowledge_base.get("fresh"), "value")
+        self.assertIsNone(knowledge_base.get("stale"))
+        
+        stats = knowledge_base.get_stats()
+        self.assertEqual(stats["hits"], 1)
+        self.assertEqual(stats["misses"], 1)
+    
+    def test_namespaces(self):
+        """Test that namespaces keep keys apart"""
+        knowledge_base = KnowledgeBase()
+        knowledge_base.set("key", "one", namespace="first")
+        knowledge_base.set("key", "two", namespace="second")
+        
+        self.assertEqual(knowledge_base.get("key", namespace="first"), "one")
+        self.assertEqual(knowledge_base.get("key", namespace="second"), "two")
+    
+    def test_shared_sqlite_backend(self):
+        """Test that agents sharing a backend can read each other's facts"""
+        backend = SQLiteKnowledgeBackend(":memory:")
+        writer = BaseAgent("Writer", "test")
+        reader = BaseAgent("Reader", "test")
+        writer.set_knowledge_backend(backend)
+        reader.set_knowledge_backend(backend)
+        
+        writer.update_knowledge("industry", {"name": "tech"}, namespace="shared")
+        
+        self.assertEqual(reader.get_knowledge("industry", namespace="shared"), {"name": "tech"})
+    
+    def test_shared_backend_updates_are_seen(self):
+        """Test that local copies of shared items are refreshed after another knowledge base updates them"""
+        backend = SQLiteKnowledgeBackend(":memory:")
+        first = KnowledgeBase(backend=backend, backend_ttl=0)
+        second = KnowledgeBase(backend=backend, backend_ttl=0)
+        
+        first.set("status", "draft")
+        self.assertEqual(second.get("status"), "draft")
+        first.set("status", "published")
+        self.assertEqual(second.get("status"), "published")
+        second.set("status", "archived")
+        self.assertEqual(first.get("status"), "archived")
+    
+    def test_shared_values_keep_their_types(self):
+        """Test that values read back from a shared backend have the types they were stored with"""
+        backend = SQLiteKnowledgeBackend(":memory:")
+        knowledge_base = KnowledgeBase(backend=backend, backend_ttl=0)
+        value = {"when": datetime(2025, 1, 1), "pair": (1, 2), "tags": {"a"}, "scores": {1: [0.5]}, "__type__": "x"}
+        knowledge_base.set("event", value)
+        self.assertEqual(knowledge_base.get("event"), value)
+        self.assertEqual(KnowledgeBase(backend=backend).get("event"), value)
+        
+        # Values the backend cannot hold are rejected up front, and corrupt backend data is a miss
+        with self.assertRaises(ValueError):
+            knowledge_base.set("lock", object())
+        backend.set("default", "broken", "{not json")
+        self.assertEqual(knowledge_base.get("broken", default="missing"), "missing")
+    
+    def test_redis_backend_with_stand_in(self):
+        """Test the Redis backend against a local stand-in client"""
+        class StandInRedis:
+            def __init__(self):
+                self.store = {}
+            
+            def get(self, key):
+                return self.store.get(key)
+            
+            def set(self, key, value, px=None):
+                self.store[key] = value
+            
+            def delete(self, key):
+                self.store.pop(key, None)
+            
+            def scan_iter(self, match):
+                prefix = match.rstrip("*")
+                return [key for key in list(self.store) if key.startswith(prefix)]
+        
+        backend = RedisKnowledgeBackend(client=StandInRedis())
+        KnowledgeBase(backend=backend).set("skills", ["python"])
+        
+        self.assertEqual(KnowledgeBase(backend=backend).get("skills"), ["python"])
+
+
+class TestDecisionScorer(unittest.TestCase):
+    """Test cases for multi-criteria decision scoring"""
+    
+    def setUp(self):
+        """Set up test environment"""
+        self.agent = BaseAgent("TestAgent", "test")
+        self.options = [{"impact": i % 13, "effort": i % 7} for i in range(1000)]
+        self.criteria = {"impact": 2, "effort": -1}
+    
+    def test_vectorized_matches_python_scoring(self):
+        """Test that the vectorized and plain Python scorers agree"""
+        for normalization in (None, "minmax", "zscore"):
+            vectorized = DecisionScorer(self.criteria, normalization, vectorize_threshold=0)
+            python = DecisionScorer(self.criteria, normalization, vectorize_threshold=10 ** 9)
+            
+            self.assertIs(vectorized.best(self.options), python.best(self.options))
+            self.assertEqual(vectorized.top_k(self.options, 10), python.top_k(self.options, 10))
+    
+    def test_make_decision_semantics(self):
+        """Test that make_decision keeps returning the first best option"""
+        options = [{"score": 1}, {"score": 3}, {"score": 3}, {"other": 5}]
+        
+        self.assertIs(self.agent.make_decision(options, {"score": 1}), options[1])
+        self.assertEqual(self.agent.make_decision([], {"score": 1}), {})
+        self.assertIs(self.agent.make_decision(options, {}), options[0])
+    
+    def test_rank_options_and_batch(self):
+        """Test top-k ranking and batch decisions"""
+        top = self.agent.rank_options(self.options, self.criteria, k=3)
+        self.assertEqual([option["impact"] for option in top], [12, 12, 12])
+        self.assertTrue(all(option["effort"] == 0 for option in top))
+        
+        decisions = self.agent.make_decisions([self.options[:10], [], self.options[10:]], self.criteria)
+        self.assertEqual(len(decisions), 3)
+        self.assertEqual(decisions[1], {})
+
+
+class TestSnapshot(unittest.TestCase):
+    """Test cases for the binary snapshot format"""
+    
+    def test_round_trip(self):
+        """Test that records decode to the values that were written"""
+        record = {
+            "name": "Agent",
+            "created_at": datetime(2025, 1, 1, 12, 30),
+            "scores": [1, 2.5, None, True, False, 2 ** 70],
+            "estimates": {("agent", "frontend"): 12.5},
+            "tags": {"a", "b"},
+            "knowledge_base": KnowledgeBase(namespace="Agent")
+        }
+        record["knowledge_base"].set("key", ["value"])
+        
+        with tempfile.TemporaryDirectory() as temp_dir:
+            path = os.path.join(temp_dir, "test.snapshot")
+            writer = SnapshotWriter(path)
+            writer.write_record("record", record)
+            writer.write_record("strings", ["Agent"] * 100)
+            writer.close(metadata={"version": 1})
+            
+            reader = SnapshotReader(path)
+            restored = reader.read_record("record")
+            self.assertEqual(reader.metadata, {"version": 1})
+            self.assertEqual(reader.read_record("strings"), ["Agent"] * 100)
+            
+            knowledge_base = restored.pop("knowledge_base")
+            record.pop("knowledge_base")
+            self.assertEqual(restored, record)
+            self.assertEqual(knowledge_base.get("key"), ["value"])
+            reader.close()
 
 
 class TestProgrammerAgent(unittest.TestCase):
@@ -161,6 +461,145 @@ class TestProgrammerAgent(unittest.TestCase):
         self.assertIsNotNone(response)
         self.assertEqual(response["receiver"], "project_manager")
         self.assertEqual(response["message_type"], "response")
+    
+    def test_template_cache(self):
+        """Test that templates are compiled once and output is memoized by normalized specification"""
+        engine = self.agent.template_engine
+        before = engine.get_stats()
+        
+        component = self.agent._generate_react_component("JobCard", [{"name": "title", "type": "string"}])
+        self.assertIn("interface JobCardProps {\n  title: string;\n}", component)
+        self.assertIn("{/* Component content goes here */}", component)
+        self.assertIs(self.agent._generate_react_component("JobCard", [{"type": "string", "name": "title"}]), component)
+        self.assertEqual(self.agent._generate_model("Listing", [{"name": "title"}]),
+                         self.agent._generate_model("Listing", [{"name": "title", "type": "String", "options": {}}]))
+        stats = engine.get_stats()
+        self.assertEqual((stats["misses"] - before["misses"], stats["hits"] - before["hits"]), (2, 2))
+        
+        custom = ProgrammerAgent(name="Custom", config={"code_templates": {"model": "class {model_name}: # {table_name}\n"}})
+        self.assertEqual(custom._generate_model("Job", []), "class Job: # jobs\n")
+        self.assertIn("class Job(Base):", self.agent._generate_model("Job", []))
+        with self.assertRaises(ValueError):
+            ProgrammerAgent(name="Invalid", config={"code_templates": {"model": "{model_name.upper()}"}})
+    
+    def test_staged_feature_writes(self):
+        """Test that a feature is written in one batch that skips unchanged files and writes nothing on failure"""
+        with tempfile.TemporaryDirectory() as root:
+            model_path = os.path.join(root, "models", "Job.py")
+            spec = {
+                "type": "backend",
+                "models": [{"name": "Job", "path": os.path.join(root, "models"), "fields": [{"name": "title"}]}],
+                "services": [{"name": "job_service", "path": os.path.join(root, "services"), "methods": ["match"]}]
+            }
+            first = self.agent.implement_feature("Jobs", spec)
+            self.assertEqual(first["files_created"], [model_path, os.path.join(root, "services", "job_service.py")])
+            mtime = os.stat(model_path).st_mtime_ns
+            
+            second = self.agent.implement_feature("Jobs", spec)
+            self.assertEqual((second["files_created"], second["files_modified"]), ([], []))
+            self.assertEqual(len(second["files_unchanged"]), 2)
+            self.assertEqual(os.stat(model_path).st_mtime_ns, mtime)
+            
+            # The service cannot be written under a file, so the changed model is not written either
+            spec["models"][0]["fields"].append({"name": "company"})
+            spec["services"][0]["path"] = model_path
+            self.assertIn("error", self.agent.implement_feature("Jobs", spec))
+            with open(model_path) as f:
+                self.assertNotIn("company", f.read())
+            self.assertEqual(os.listdir(os.path.join(root, "models")), ["Job.py"])
+            self.assertEqual(len(self.agent.implemented_features), 2)
+    
+    def test_implement_features_concurrently(self):
+        """Test that features are implemented together, sharing identical files and skipping conflicting ones"""
+        with tempfile.TemporaryDirectory() as root:
+            model_path = os.path.join(root, "models", "Job.py")
+            component_path = os.path.join(root, "components", "SearchBar.jsx")
+            component = {"name": "SearchBar", "path": os.path.join(root, "components"), "props": [{"name": "query"}]}
+            specs = {
+                "Board": {"type": "frontend", "components": [component]},
+                "Jobs": {"type": "backend", "models": [{"name": "Job", "path": os.path.join(root, "models"),
+                                                       "fields": [{"name": "title"}]}]},
+                "Search": {"type": "frontend", "components": [dict(component)]},
+                "Alerts": {"type": "backend", "models": [{"name": "Job", "path": os.path.join(root, "models"),
+                                                         "fields": [{"name": "company"}]}]}
+            }
+            result = self.agent.implement_features(specs, max_workers=4)
+            features = result["features"]
+            
+            self.assertEqual((result["implemented"], result["failed"]), (2, 2))
+            self.assertEqual(result["conflicts"], [{"path": model_path, "features": ["Jobs", "Alerts"]}])
+            self.assertEqual(features["Alerts"]["conflicts"], [model_path])
+            self.assertFalse(os.path.exists(model_path))
+            self.assertEqual(features["Board"]["files_created"], [component_path])
+            self.assertEqual((features["Search"]["files_created"], features["Search"]["files_shared"]),
+                             ([], [component_path]))
+            for feature in features.values():
+                self.assertEqual(set(feature["timings"]), {"generate_ms", "write_ms"})
+            self.assertEqual(len(self.agent.implemented_features), 2)
+    
+    def test_incremental_regeneration(self):
+        """Test that the generation manifest skips unchanged outputs and removes orphaned ones"""
+        with tempfile.TemporaryDirectory() as root:
+            config = {"generation_manifest": os.path.join(root, "generation_manifest.json")}
+            agent = ProgrammerAgent(name="IncrementalProgrammer", config=config)
+            paths = {name: os.path.join(root, "models", f"{name}.py") for name in ("Job", "Company")}
+            service_path = os.path.join(root, "services", "job_service.py")
+            spec = {
+                "type": "backend",
+                "models": [{"name": name, "path": os.path.join(root, "models"), "fields": [{"name": "title"}]}
+                           for name in ("Job", "Company")],
+                "services": [{"name": "job_service", "path": os.path.join(root, "services"), "methods": ["match"]}]
+            }
+            self.assertEqual(len(agent.implement_feature("Jobs", spec)["files_created"]), 3)
+            
+            # Only the changed model is generated again and the dropped one is deleted
+            spec["models"] = [{"name": "Job", "path": os.path.join(root, "models"), "fields": [{"name": "salary"}]}]
+            second = agent.implement_feature("Jobs", spec)
+            self.assertEqual(second["files_modified"], [paths["Job"]])
+            self.assertEqual(second["files_skipped"], [service_path])
+            self.assertEqual(second["files_removed"], [paths["Company"]])
+            self.assertFalse(os.path.exists(paths["Company"]))
+            
+            # The manifest is reloaded, and an orphan edited since it was generated is left in place
+            with open(service_path, "a") as f:
+                f.write("# custom\n")
+            spec["services"] = []
+            third = ProgrammerAgent(name="IncrementalProgrammer", config=config).implement_feature("Jobs", spec)
+            self.assertEqual((third["files_skipped"], third["files_removed"]), ([paths["Job"]], []))
+            self.assertEqual(third["files_orphaned"], [service_path])
+            self.assertTrue(os.path.exists(service_path))
+    
+    def test_regeneration_conflicts_with_kept_files(self):
+        """Test that a file kept by one feature conflicts with a different file generated by another"""
+        with tempfile.TemporaryDirectory() as root:
+            manifest_path = os.path.join(root, "generation_manifest.json")
+            agent = ProgrammerAgent(name="IncrementalProgrammer", config={"generation_manifest": manifest_path})
+            user_path = os.path.join(root, "models", "User.py")
+            specs = {
+                name: {"type": "backend", "models": [{"name": "User", "path": os.path.join(root, "models"),
+                                                      "fields": [{"name": field}]}]}
+                for name, field in (("A", "email"), ("B", "phone"), ("C", "email"))
+            }
+            self.assertEqual(agent.implement_features({"A": specs["A"]})["implemented"], 1)
+            with open(user_path) as f:
+                content = f.read()
+            with open(manifest_path) as f:
+                manifest = f.read()
+            
+            # A keeps its file, so B generating different content is a conflict and nothing is written
+            result = agent.implement_features({"A": specs["A"], "B": specs["B"]})
+            self.assertEqual(result["conflicts"], [{"path": user_path, "features": ["A", "B"]}])
+            self.assertEqual(result["implemented"], 0)
+            with open(user_path) as f:
+                self.assertEqual(f.read(), content)
+            with open(manifest_path) as f:
+                self.assertEqual(f.read(), manifest)
+            
+            # The same content is not a conflict and is not written again
+            result = agent.implement_features({"A": specs["A"], "C": specs["C"]})
+            self.assertEqual((result["conflicts"], result["implemented"]), ([], 2))
+            self.assertEqual([result["features"][name]["files_skipped"] for name in "AC"], [[user_path]] * 2)
+            self.assertEqual(agent.generation_manifest.outputs("C"), [user_path])
 
 
 class TestDebuggerAgent(unittest.TestCase):
@@ -174,6 +613,624 @@ class TestDebuggerAgent(unittest.TestCase):
         """Test agent initialization"""
         self.assertEqual(self.agent.name, "TestDebugger")
         self.assertEqual(self.agent.agent_type, "debugger")
+    
+    def test_bracket_matching(self):
+        """Test bracket errors are reported with their line and column"""
+        code = "function f() {\n  return g(a];\n"
+        review = self.agent.review_code("example.js", code)
+        syntax_issues = [issue for issue in review["issues"] if issue["type"] == "syntax"]
+        
+        self.assertEqual(
+            [(issue["message"], issue["line"], issue["column"]) for issue in syntax_issues],
+            [("Mismatched brackets: ( and ]", 2, 13), ("Unclosed bracket: {", 1, 14)]
+        )
+        self.assertEqual(syntax_issues[0]["code"], "  return g(a];")
+    
+    def test_brackets_in_strings_and_comments_ignored(self):
+        """Test brackets inside strings, templates, comments and regex literals are ignored"""
+        code = (
+            "const a = '((';\n"
+            "const b = `[[ ${fn({ x: 1 })} ]]`;\n"
+            "// }}}\n"
+            "const c = /[)]+/g;\n"
+        )
+        review = self.agent.review_code("example.ts", code)
+        
+        self.assertFalse([issue for issue in review["issues"] if issue["type"] == "syntax"])
+    
+    def test_rule_pipeline(self):
+        """Test that registered rules run in the review pass and issues stay grouped by type"""
+        class TodoRule(Rule):
+            rule_id = "todo"
+            issue_type = "style"
+            
+            def visit_line(self, source, line_number, line, stripped):
+                if "TODO" in line:
+                    return [make_issue("style", "low", "TODO comment", line_number, line.find("TODO") + 1, line)]
+                return ()
+        
+        self.agent.rule_registry.register(TodoRule())
+        code = '"""Module."""\nimport os\npassword = "hunter2"  # TODO rotate\n'
+        review = self.agent.review_code("example.py", code)
+        
+        messages = [issue["message"] for issue in review["issues"]]
+        self.assertIn("TODO comment", messages)
+        self.assertEqual(messages.index("Unused import: os"), 0)
+        self.assertEqual([issue["type"] for issue in review["issues"]], ["style", "style", "security"])
+    
+    def test_configured_rule_sets(self):
+        """Test that linting_rules and security_checks select and configure a shared compiled rule set"""
+        config = {
+            "linting_rules": {"long-line": {"max_line_length": 20}, "trailing-whitespace": False},
+            "security_checks": {"hardcoded-credential": {"enabled": False}}
+        }
+        agent = DebuggerAgent(name="ConfiguredDebugger", config=config)
+        other = DebuggerAgent(name="OtherDebugger", config=json.loads(json.dumps(config)))
+        self.assertIs(agent.rule_registry, other.rule_registry)
+        self.assertIsNot(agent.rule_registry, self.agent.rule_registry)
+        self.assertNotEqual(agent.rule_registry.version, self.agent.rule_registry.version)
+        self.assertIsNone(agent.rule_registry.get_rule("trailing-whitespace"))
+        with self.assertRaises(ValueError):
+            agent.rule_registry.register(Rule())
+        
+        code = '"""Module."""\npassword = "hunter2-and-more"  \n'
+        rules = {issue["rule"] for issue in agent.review_code("example.py", code)["issues"]}
+        self.assertEqual(rules, {"long-line"})
+        default_rules = {issue["rule"] for issue in self.agent.review_code("example.py", code)["issues"]}
+        self.assertIn("hardcoded-credential", default_rules)
+        
+        with self.assertRaises(ValueError):
+            DebuggerAgent(name="BadDebugger", config={"linting_rules": {"no-such-rule": False}})
+        with self.assertRaises(ValueError):
+            DebuggerAgent(name="BadDebugger", config={"linting_rules": {"long-line": {"max_length": 80}}})
+    
+    def test_watch(self):
+        """Test that watch debounces changes, re-reviews changed files and notifies subscribers"""
+        messages = []
+        self.agent.subscribe(messages.append)
+        with tempfile.TemporaryDirectory() as root:
+            file_path = os.path.join(root, "app.js")
+            with open(file_path, "w") as f:
+                f.write("const a = 1;\n")
+            watch = self.agent.watch(root, use_inotify=False, poll_interval=0.01, start=False)
+            
+            with open(file_path, "w") as f:
+                f.write("const a = 1;\nconsole.log(a);\n")
+            with open(os.path.join(root, "new.py"), "w") as f:
+                f.write('"""Module."""\nimport os\n')
+            results = watch.run_once(timeout=1)
+            self.assertEqual([(os.path.basename(result["file_path"]), result["change"]) for result in results],
+                             [("app.js", "modified"), ("new.py", "created")])
+            self.assertEqual(messages[-1]["content"]["action"], "review_updated")
+            self.assertEqual(messages[-1]["content"]["data"]["issues_count"], 2)
+            
+            os.remove(file_path)
+            self.assertEqual(watch.run_once(timeout=1)[0]["change"], "deleted")
+            self.assertNotIn(file_path, self.agent.code_quality_metrics)
+            self.assertEqual(watch.run_once(timeout=0), [])
+            watch.stop()
+    
+    def test_watch_directory_moved_out(self):
+        """Test that a directory moved out of a watched tree reports its files as deleted and is no longer watched"""
+        if not InotifyMonitor.available():
+            self.skipTest("inotify is not available")
+        with tempfile.TemporaryDirectory() as root, tempfile.TemporaryDirectory() as elsewhere:
+            os.mkdir(os.path.join(root, "sub"))
+            file_path = os.path.join(root, "sub", "a.js")
+            with open(file_path, "w") as f:
+                f.write("const a = 1;\n")
+            monitor = InotifyMonitor(root)
+            
+            os.rename(os.path.join(root, "sub"), os.path.join(elsewhere, "sub"))
+            self.assertEqual(monitor.wait(1), {file_path: "deleted"})
+            with open(os.path.join(elsewhere, "sub", "a.js"), "a") as f:
+                f.write("console.log(a);\n")
+            self.assertEqual(monitor.wait(0.1), {})
+            monitor.close()
+    
+    def test_incremental_rereview(self):
+        """Test that edits to large files are re-checked only in the edited region"""
+        registry = RuleRegistry.from_config({"brackets": False, "event-listener-leak": False})
+        reviewer = IncrementalReviewer(registry, incremental_threshold=0)
+        lines = [f"const value{index} = {index};" for index in range(200)]
+        with tempfile.TemporaryDirectory() as root:
+            file_path = os.path.join(root, "app.js")
+            with open(file_path, "w") as f:
+                f.write("\n".join(lines))
+            self.assertFalse(reviewer.review(file_path)["incremental"])
+            
+            lines[50:51] = ["console.log(value49)", "const password = 'hunter2'  "]
+            del lines[120:125]
+            code = "\n".join(lines)
+            with open(file_path, "w") as f:
+                f.write(code)
+            result = reviewer.review(file_path)
+            self.assertTrue(result["incremental"])
+            self.assertEqual(result["changed_lines"], (51, 120))
+            self.assertEqual(result["issues"], registry.run(SourceFile(file_path, code)))
+    
+    def test_multi_pattern_scanner(self):
+        """Test that one scan reports every pattern and literal hit on a line by name"""
+        scanner = MultiPatternScanner(
+            [("password", r'(?i:password\s*=\s*"([^"]+)")', "password"), ("call", r'run\((\w+)\)', "run")],
+            [("inner", "innerHTML"), ("dangerous", "dangerouslySetInnerHTML"), ("eval", "eval")]
+        )
+        
+        hits = scanner.scan('PASSWORD = "x"; run(job); a.dangerouslySetInnerHTML = b.innerHTML = evaluate(y)')
+        self.assertEqual(set(hits), {"password", "call", "inner", "dangerous", "eval"})
+        self.assertEqual(hits["password"].groups, ("x",))
+        self.assertEqual(hits["call"].groups, ("job",))
+        self.assertEqual(hits["eval"].start, hits["eval"].end - len("eval"))
+        self.assertEqual(scanner.scan("nothing to see"), {})
+        
+        lines = ["a = 1", "Password = \"p\"", "b = 2", "el.innerHTML = c"]
+        self.assertEqual(scanner.candidate_lines(lines), [2, 4])
+        
+        # Patterns matching at the same offset are all reported
+        overlapping = MultiPatternScanner([("a", r"foo\d", "foo"), ("b", r"foo", "foo")], [("lit", "foo")])
+        self.assertEqual(set(overlapping.scan("x foo1")), {"a", "b", "lit"})
+    
+    def test_python_symbol_analysis(self):
+        """Test that Python style and SQL checks come from the parsed module"""
+        code = (
+            '"""Module."""\n'
+            'import os\n'
+            'import json as js\n'
+            'from typing import Optional\n'
+            '\n'
+            'def run(cursor, table) -> "Optional[str]":\n'
+            '    print("os is only mentioned in this string")\n'
+            '    cursor.execute(f"SELECT * FROM {table}")\n'
+            '    cursor.execute("SELECT 1")\n'
+            '    return js.dumps({})\n'
+        )
+        review = self.agent.review_code("example.py", code)
+        
+        messages = [(issue["message"], issue["line"]) for issue in review["issues"]]
+        self.assertIn(("Unused import: os", 2), messages)
+        self.assertNotIn(("Unused import: js", 3), messages)
+        self.assertNotIn(("Unused import: Optional", 4), messages)
+        self.assertIn(("Missing docstring in public function: run", 6), messages)
+        self.assertEqual([line for message, line in messages if "SQL injection" in message], [8])
+    
+    def test_review_tree(self):
+        """Test that a tree review streams per-file results and ends with an aggregate"""
+        with tempfile.TemporaryDirectory() as root:
+            os.makedirs(os.path.join(root, "src"))
+            os.makedirs(os.path.join(root, "node_modules", "lib"))
+            for index in range(6):
+                with open(os.path.join(root, "src", f"module_{index}.py"), "w") as f:
+                    f.write('"""Module."""\nimport os\n' * (index + 1))
+            with open(os.path.join(root, "src", "app.js"), "w") as f:
+                f.write("console.log('hi');\n")
+            with open(os.path.join(root, "node_modules", "lib", "index.js"), "w") as f:
+                f.write("console.log('skipped');\n")
+            with open(os.path.join(root, "notes.txt"), "w") as f:
+                f.write("not code\n")
+            
+            for max_workers in (1, 2):
+                results = list(self.agent.review_tree(root, exclude=["node_modules"], max_workers=max_workers))
+                
+                file_results = [result for result in results if result["result_type"] == "file"]
+                summary = results[-1]
+                self.assertEqual(summary["result_type"], "summary")
+                self.assertEqual(len(file_results), 7)
+                self.assertFalse(any("node_modules" in result["file_path"] for result in file_results))
+                self.assertEqual(summary["files_reviewed"], 7)
+                self.assertEqual(summary["issues_count"], sum(result["issues_count"] for result in file_results))
+        
+        self.assertEqual(self.agent.completed_reviews, [])
+    
+    def test_review_cache(self):
+        """Test that unchanged files are answered from the review cache"""
+        with tempfile.TemporaryDirectory() as root:
+            self.agent.enable_review_cache(os.path.join(root, "review_cache.db"))
+            source_dir = os.path.join(root, "src")
+            os.makedirs(source_dir)
+            for name in ("a.py", "b.py"):
+                with open(os.path.join(source_dir, name), "w") as f:
+                    f.write('"""Module."""\nimport os\n')
+            file_path = os.path.join(source_dir, "a.py")
+            
+            first = self.agent.review_code(file_path)
+            second = self.agent.review_code(file_path)
+            self.assertNotIn("cached", first)
+            self.assertTrue(second["cached"])
+            self.assertEqual(first["issues"], second["issues"])
+            
+            # Same content under a different name is found by content hash
+            self.assertTrue(self.agent.review_code("copy.py", '"""Module."""\nimport os\n')["cached"])
+            
+            summary = list(self.agent.review_tree(source_dir, max_workers=1))[-1]
+            self.assertEqual((summary["files_reviewed"], summary["files_cached"]), (2, 2))
+            
+            with open(file_path, "w") as f:
+                f.write('"""Module."""\nimport os\nimport sys\n')
+            results = list(self.agent.review_changes(source_dir, changed_files=["a.py"], max_workers=1))
+            by_name = {os.path.basename(result["file_path"]): result for result in results[:-1]}
+            self.assertFalse(by_name["a.py"]["cached"])
+            self.assertIn("Unused import: sys", [issue["message"] for issue in by_name["a.py"]["issues"]])
+            self.assertTrue(by_name["b.py"]["cached"])
+            
+            self.agent.review_cache.close()
+    
+    def test_impacted_review(self):
+        """Test that a change is expanded to the files importing it, directly or transitively"""
+        files = {
+            "pkg/__init__.py": "",
+            "pkg/base.py": "def helper():\n    return 1\n",
+            "pkg/service.py": "from .base import helper\n",
+            "pkg/api.py": "from pkg.service import helper\n",
+            "pkg/other.py": "import os\n",
+            "web/util.js": "export const x = 1;\n",
+            "web/page.jsx": "import { x } from './util';\nconst React = require('react');\n"
+        }
+        with tempfile.TemporaryDirectory() as root:
+            for name, code in files.items():
+                os.makedirs(os.path.dirname(os.path.join(root, name)), exist_ok=True)
+                with open(os.path.join(root, name), "w") as f:
+                    f.write(code)
+            path = lambda name: os.path.join(os.path.abspath(root), name)
+            
+            first = list(self.agent.review_impacted(root, max_workers=1))
+            self.assertEqual(first[-1]["impacted_files"], len(files))
+            graph = self.agent.get_dependency_graph(root)
+            self.assertEqual(graph.get_dependents(path("pkg/base.py")), [path("pkg/service.py")])
+            self.assertEqual(graph.get_dependencies(path("web/page.jsx")), [path("web/util.js")])
+            
+            results = list(self.agent.review_impacted(root, changed_files=["pkg/base.py"], max_workers=1))
+            self.assertEqual([result["file_path"] for result in results[:-1]],
+                             [path("pkg/api.py"), path("pkg/base.py"), path("pkg/service.py")])
+            self.assertEqual((results[-1]["changed_files"], results[-1]["impacted_files"]), (1, 3))
+            
+            with open(path("web/util.js"), "w") as f:
+                f.write("export const x = 2;\n")
+            results = list(self.agent.review_impacted(root, max_workers=1))
+            self.assertEqual([result["file_path"] for result in results[:-1]], [path("web/page.jsx"), path("web/util.js")])
+            self.assertEqual(graph.last_update["updated"], 1)
+    
+    def test_apply_fixes(self):
+        """Test that mechanical issues are fixed in one atomic write per file, or previewed as a diff"""
+        python_code = 'import os, sys\nimport json  \n\ndef main():\n    text = """a  \nb"""\n    return sys.argv, text\n'
+        js_code = "function f(x) {\n  let y = x\n  console.log(y);\n  if (y)\n    console.log(x);\n  return y\n}\n"
+        with tempfile.TemporaryDirectory() as root:
+            for name, code in (("main.py", python_code), ("app.js", js_code)):
+                with open(os.path.join(root, name), "w") as f:
+                    f.write(code)
+            
+            preview = self.agent.apply_fixes(root, dry_run=True, max_workers=1)
+            self.assertEqual(preview["files_changed"], 2)
+            self.assertIn("--- a/main.py\n+++ b/main.py\n", preview["diff"])
+            self.assertIn("+import sys\n", preview["diff"])
+            with open(os.path.join(root, "main.py")) as f:
+                self.assertEqual(f.read(), python_code)
+            
+            summary = self.agent.apply_fixes(root, max_workers=1)
+            self.assertEqual(summary["applied"], {"unused-import": 2, "trailing-whitespace": 1,
+                                                  "missing-semicolon": 2, "console-log": 1})
+            with open(os.path.join(root, "main.py")) as f:
+                self.assertEqual(f.read(), 'import sys\n\ndef main():\n    text = """a  \nb"""\n    return sys.argv, text\n')
+            with open(os.path.join(root, "app.js")) as f:
+                self.assertEqual(f.read(), "function f(x) {\n  let y = x;\n  if (y)\n    console.log(x);\n  return y;\n}\n")
+            self.assertEqual(sorted(os.listdir(root)), ["app.js", "main.py"])
+            self.assertEqual(self.agent.apply_fixes(root, max_workers=1)["fixes_applied"], 0)
+    
+    def test_streaming_review(self):
+        """Test that large files are memory-mapped, reviewed line by line and capped"""
+        with tempfile.TemporaryDirectory() as root:
+            file_path = os.path.join(root, "bundle.js")
+            with open(file_path, "w") as f:
+                for index in range(500):
+                    f.write(f"const value{index} = {index};\nconsole.log(value{index});\n")
+            
+            # Streaming is opt-in: by default every file gets the whole-file rules
+            full = self.agent.review_code(file_path)
+            self.assertNotIn("streaming", full)
+            self.agent.streaming_threshold = 1
+            streamed = self.agent.review_code(file_path)
+            
+            self.assertTrue(streamed["streaming"])
+            self.assertFalse(streamed["truncated"])
+            self.assertIn("brackets", streamed["skipped_rules"])
+            self.assertEqual([(issue["line"], issue["message"]) for issue in streamed["issues"]],
+                             [(issue["line"], issue["message"]) for issue in full["issues"]])
+            self.assertEqual(self.agent.code_quality_metrics[file_path]["lines_of_code"], 1000)
+            
+            capped = self.agent.review_code_streaming(file_path, max_issues=10)
+            self.assertTrue(capped["truncated"])
+            self.assertEqual(capped["issues_count"], 10)
+    
+    def test_issue_store_and_export(self):
+        """Test that completed reviews keep their issues in the columnar store and export as SARIF and JSONL"""
+        code = "import os\nconsole.log('a')\nconst password = 'secret123'\n"
+        with tempfile.TemporaryDirectory() as root:
+            file_path = os.path.join(root, "app.js")
+            with open(file_path, "w") as f:
+                f.write(code)
+            review = self.agent.review_code(file_path)
+            
+            stored = self.agent.completed_reviews[-1]
+            self.assertEqual(stored["issues"], review["issues"])
+            self.assertTrue(all(issue["rule"] for issue in review["issues"]))
+            stats = self.agent.issue_store.get_stats()
+            self.assertEqual(stats["issues"], len(review["issues"]))
+            self.assertEqual(stats["line_table_entries"], len({issue["line"] for issue in review["issues"]}))
+            
+            sarif_path = os.path.join(root, "issues.sarif")
+            self.agent.export_issues(sarif_path)
+            with open(sarif_path) as f:
+                sarif = json.load(f)
+            results = sarif["runs"][0]["results"]
+            self.assertEqual(sarif["version"], "2.1.0")
+            self.assertEqual([result["ruleId"] for result in results], [issue["rule"] for issue in review["issues"]])
+            self.assertEqual(results[0]["locations"][0]["physicalLocation"]["region"]["startLine"],
+                             review["issues"][0]["line"])
+            
+            jsonl_path = os.path.join(root, "issues.jsonl")
+            self.assertEqual(self.agent.export_issues(jsonl_path, format="jsonl")["issues"], len(review["issues"]))
+            with open(jsonl_path) as f:
+                records = [json.loads(line) for line in f]
+            self.assertEqual([record["message"] for record in records], [issue["message"] for issue in review["issues"]])
+            self.assertTrue(all(record["file_path"] == file_path for record in records))
+    
+    def test_issue_store_keeps_issue_fields(self):
+        """Test that stored issues come back with exactly the fields they were stored with"""
+        issues = [
+            {"type": "style", "severity": "low", "message": "a", "line": 1, "column": 1, "rule": "r", "fix_hint": "x"},
+            {"type": "style", "severity": "low", "message": "b", "line": 2, "column": 1, "code": "b()", "rule": "r"},
+            {"type": "performance", "severity": "high", "message": "c", "line": 3, "column": 1, "code": "c",
+             "complexity": "O(n^2)"}
+        ]
+        table = IssueTable()
+        view = table.add("a.py", issues, ["a()", "b()", "c"])
+        self.assertEqual(list(view), issues)
+        table.compact([view])
+        self.assertEqual(list(view), issues)
+    
+    def test_quality_metrics(self):
+        """Test rolling windows, file trends, worst offenders and the bound on completed reviews"""
+        self.agent.max_completed_reviews = 3
+        clean = "const total = 1;\n"
+        noisy = "import os\nconsole.log('a')\nconst password = 'secret123'\n"
+        self.agent.review_code("a.js", noisy)
+        for index in range(5):
+            self.agent.review_code(f"clean_{index}.js", clean)
+        self.assertEqual(len(self.agent.completed_reviews), 3)
+        self.assertEqual(self.agent.completed_reviews[-1]["file_path"], "clean_4.js")
+        
+        trends = self.agent.get_quality_trends(file_path="a.js")
+        self.assertEqual(trends["window"]["reviews"], 6)
+        self.assertEqual(trends["worst_offenders"][0]["file_path"], "a.js")
+        self.assertGreater(trends["window"]["by_severity"]["critical"]["per_kloc"], 0)
+        
+        self.agent.review_code("a.js", clean)
+        trend = self.agent.get_quality_trends(file_path="a.js")["file_trend"]
+        self.assertEqual((trend["reviews"], trend["direction"]), (2, "improving"))
+        self.assertEqual(self.agent.get_quality_trends()["worst_offenders"][0]["issues_per_kloc"], 0)
+        
+        store = MetricsStore(bucket_seconds=60, retention_buckets=3, top_k=2)
+        for minute, (file_path, issues_count) in enumerate([("x", 1), ("y", 2), ("z", 3), ("x", 5)]):
+            metrics = {"lines_of_code": 1000, "issues_count": issues_count, "issues_per_kloc": issues_count,
+                       "issues_by_type": {"style": issues_count}, "issues_by_severity": {"low": issues_count},
+                       "quality_score": 100 - issues_count}
+            store.record(file_path, metrics, timestamp=minute * 60)
+        self.assertEqual(store.window(60, now=180)["issues_count"], 5)
+        self.assertEqual(store.window(3600, now=180)["issues_count"], 10)
+        self.assertEqual(store.window()["issues_count"], 11)
+        self.assertEqual([offender["file_path"] for offender in store.worst_offenders()], ["x", "z"])
+        self.assertEqual(store.file_trend("x")["direction"], "worsening")
+        
+        store = MetricsStore(top_k=2, max_files=2)
+        for minute, (file_path, issues_count) in enumerate([("x", 5), ("y", 1), ("x", 4), ("z", 2)]):
+            metrics = {"lines_of_code": 1000, "issues_count": issues_count, "issues_per_kloc": issues_count,
+                       "issues_by_type": {}, "issues_by_severity": {}, "quality_score": 100 - issues_count}
+            store.record(file_path, metrics, timestamp=minute * 60)
+        self.assertEqual(list(store.files), ["x", "z"])
+        self.assertIsNone(store.file_trend("y"))
+        self.assertEqual([offender["file_path"] for offender in store.worst_offenders()], ["x", "z"])
+        self.assertEqual(store.window()["reviews"], 4)
+        
+        self.agent.metrics_store.max_files = 1
+        self.agent.review_code("b.js", clean)
+        self.assertEqual(list(self.agent.code_quality_metrics), ["b.js"])
+    
+    def test_quadratic_patterns(self):
+        """Test that loop-carried scans are reported with a complexity and a suggested data structure"""
+        code = (
+            '"""Module."""\n'
+            '\n'
+            '\n'
+            'def _scan(code_content, tasks, words):\n'
+            '    closing = {"(": ")"}\n'
+            '    seen = []\n'
+            '    report = ""\n'
+            '    for i, char in enumerate(code_content):\n'
+            '        if char in closing.values():\n'
+            '            line_number = code_content[:i].count("\\n") + 1\n'
+            '            report += f"{line_number}\\n"\n'
+            '        if char not in seen:\n'
+            '            seen.append(char)\n'
+            '    pending = [task for task in tasks if task["status"] == "pending"]\n'
+            '    for task in pending:\n'
+            '        for dep_id in task["dependencies"]:\n'
+            '            dep = next((t for t in tasks if t["id"] == dep_id), None)\n'
+            '    for word in ("a", "b"):\n'
+            '        report += word\n'
+            '    return [words.count(word) for word in set(words)], report[:10], dep\n'
+        )
+        issues = [issue for issue in self.agent.review_code("scan.py", code)["issues"]
+                  if issue["rule"] == "quadratic-pattern"]
+        found = {(issue["line"], issue["complexity"]) for issue in issues}
+        # closing is a one-entry literal dict, so scanning its values is constant time
+        self.assertEqual(found, {(10, "O(n^2)"), (11, "O(n^2)"), (12, "O(n^2)"), (17, "O(n^3)"), (20, "O(n^2)")})
+        by_line = {issue["line"]: issue for issue in issues}
+        self.assertIn("set", by_line[12]["suggestion"])
+        self.assertIn("join", by_line[11]["suggestion"])
+        self.assertIn("dict", by_line[17]["suggestion"])
+        self.assertEqual(by_line[17]["severity"], "high")
+        self.assertEqual(self.agent.completed_reviews[-1]["issues"][-1]["complexity"], issues[-1]["complexity"])
+    
+    def test_quadratic_patterns_skip_fixed_collections(self):
+        """Test that membership tests against small literal collections are not reported unless they grow"""
+        code = (
+            'def match(items, pairs):\n'
+            '    names = ["a", "b"]\n'
+            '    brackets = {"(": ")", "[": "]", "{": "}"}\n'
+            '    seen = ["start"]\n'
+            '    closers = {}\n'
+            '    for item in items:\n'
+            '        if item in names or item in brackets.values():\n'
+            '            continue\n'
+            '        if item in seen or item in closers.values():\n'
+            '            seen.append(item)\n'
+            '    for opening, closing in pairs:\n'
+            '        closers[opening] = closing\n'
+            '    return seen\n'
+        )
+        issues = [issue for issue in self.agent.review_code("match.py", code)["issues"]
+                  if issue["rule"] == "quadratic-pattern"]
+        self.assertEqual({issue["line"] for issue in issues}, {9})
+    
+    def test_duplicate_code(self):
+        """Test that renamed copies are reported as clones and the index updates incrementally"""
+        component = (
+            "export function ItemList(props) {\n"
+            "  const items = props.items.filter((item) => item.visible && item.count > 0);\n"
+            "  const total = items.reduce((sum, item) => sum + item.count, 0);\n"
+            "  if (!items.length) {\n"
+            "    return renderEmpty(props.emptyText || 'Nothing here');\n"
+            "  }\n"
+            "  const rows = items.map((item, index) => ({ key: item.id, index, label: item.name.trim() }));\n"
+            "  rows.sort((a, b) => a.label.localeCompare(b.label));\n"
+            "  return { rows, total, selected: props.selected ? rows.find((row) => row.key === props.selected) : null };\n"
+            "}\n"
+        )
+        renamed = component.replace("items", "rows").replace("item", "row").replace("render", "draw")
+        other = "".join(f"let value{index} = compute({index}, 'x{index}');\nif (value{index}) {{ log(value{index}); }}\n"
+                        for index in range(20))
+        with tempfile.TemporaryDirectory() as root:
+            paths = {}
+            for name, code in (("a.js", component), ("b.js", renamed), ("c.js", component), ("d.js", other)):
+                paths[name] = os.path.join(root, name)
+                with open(paths[name], "w") as f:
+                    f.write(code)
+            
+            clones = self.agent.find_duplicate_code(root)
+            self.assertEqual(clones["index"]["added"], 4)
+            self.assertEqual(clones["clusters"], [[paths["a.js"], paths["b.js"], paths["c.js"]]])
+            pair = next(pair for pair in clones["pairs"] if pair["file_a"] == paths["a.js"] and pair["file_b"] == paths["b.js"])
+            self.assertGreater(pair["similarity"], 0.9)
+            self.assertEqual(pair["regions"][0]["a_lines"][0], 1)
+            
+            with open(paths["c.js"], "w") as f:
+                f.write(other.replace("value", "total"))
+            os.remove(paths["b.js"])
+            clones = self.agent.find_duplicate_code(root)
+            self.assertEqual((clones["index"]["updated"], clones["index"]["removed"], clones["index"]["unchanged"]), (1, 1, 2))
+            self.assertEqual(clones["clusters"], [[paths["c.js"], paths["d.js"]]])
+    
+    def test_widely_duplicated_code(self):
+        """Test that code copied into more files than max_postings still forms one cluster"""
+        component = (
+            "export function Card{index}(props) {{\n"
+            "  const title = props.title ? props.title.trim() : 'Untitled';\n"
+            "  const tags = (props.tags || []).filter((tag) => tag.length > 0).slice(0, 5);\n"
+            "  const onClick = () => props.onSelect && props.onSelect(props.id, title);\n"
+            "  return (\n"
+            "    <div className=\"card\" onClick={{onClick}}>\n"
+            "      <h2>{{title}}</h2>\n"
+            "      <ul>{{tags.map((tag) => <li key={{tag}}>{{tag}}</li>)}}</ul>\n"
+            "    </div>\n"
+            "  );\n"
+            "}}\n"
+        )
+        index = CloneIndex()
+        paths = [f"components/Card{number}.jsx" for number in range(8)]
+        for number, path in enumerate(paths):
+            index.add_file(path, component.format(index=number))
+        index.add_file("other.js", "".join(f"let v{n} = compute({n});\n" for n in range(20)))
+        
+        clones = index.find_clones(max_postings=4)
+        self.assertEqual(clones["pairs"], [])
+        self.assertEqual([group["files"] for group in clones["widespread"]], [sorted(paths)])
+        self.assertGreaterEqual(clones["widespread"][0]["duplicated_lines"], 5)
+        self.assertEqual(clones["clusters"], [sorted(paths)])
+        self.assertEqual(len([pair for pair in index.find_clones()["pairs"] if pair["file_a"] in paths]), 28)
+        index.close()
+    
+    def test_duplicate_code_within_file(self):
+        """Test that code copied within one file is reported as a pair of the file with itself"""
+        function = (
+            "def summarize(orders):\n"
+            "    totals = {}\n"
+            "    for order in orders:\n"
+            "        if order.status != 'cancelled' and order.amount > 0:\n"
+            "            totals[order.customer] = totals.get(order.customer, 0) + order.amount\n"
+            "    ranked = sorted(totals.items(), key=lambda item: item[1], reverse=True)\n"
+            "    return [{'customer': customer, 'total': total} for customer, total in ranked[:10]]\n"
+        )
+        with tempfile.TemporaryDirectory() as root:
+            file_path = os.path.join(root, "report.py")
+            with open(file_path, "w") as f:
+                f.write(function + "\n\n" + function.replace("summarize", "summarize_refunds").replace("order", "item"))
+            
+            clones = self.agent.find_duplicate_code(root)
+            self.assertEqual(len(clones["pairs"]), 1)
+            pair = clones["pairs"][0]
+            self.assertEqual((pair["file_a"], pair["file_b"]), (file_path, file_path))
+            self.assertEqual(pair["regions"][0]["a_lines"][0], 1)
+            self.assertGreaterEqual(pair["regions"][0]["b_lines"][0], 10)
+            self.assertEqual(clones["clusters"], [])
+    
+    def test_rule_profiling(self):
+        """Test that rule timings aggregate per rule and extension without changing the issues"""
+        code = "import os\nconsole.log('a')\nconst password = 'secret123'\n"
+        with tempfile.TemporaryDirectory() as root:
+            for name in ("a.js", "b.js", "c.py"):
+                with open(os.path.join(root, name), "w") as f:
+                    f.write(code)
+            plain = self.agent.review_code(os.path.join(root, "a.js"))["issues"]
+            
+            self.agent.enable_rule_profiling()
+            self.assertEqual(self.agent.review_code(os.path.join(root, "a.js"))["issues"], plain)
+            list(self.agent.review_tree(root, max_workers=1))
+            
+            rows = self.agent.get_rule_profile(format="dict")["by_extension"]
+            self.assertEqual([row["seconds"] for row in rows], sorted((row["seconds"] for row in rows), reverse=True))
+            console_log = next(row for row in rows if row["rule"] == "console-log")
+            self.assertEqual((console_log["extension"], console_log["files"], console_log["issues"]), (".js", 3, 3))
+            self.assertIn("python-syntax", self.agent.get_rule_profile())
+            self.assertEqual(json.loads(self.agent.get_rule_profile(format="json"))["rules"][0]["rule"], rows[0]["rule"])
+    
+    def test_benchmark_corpus(self):
+        """Test that the synthetic corpus is deterministic and its injected issues are all found"""
+        densities = {"long_lines": 0.05, "credentials": 0.02, "unused_imports": 0.02}
+        code, injected = generate_source("python", 8 * 1024, seed=7, densities=densities)
+        self.assertEqual(generate_source("python", 8 * 1024, seed=7, densities=densities), (code, injected))
+        self.assertNotEqual(generate_source("python", 8 * 1024, seed=8, densities=densities)[0], code)
+        
+        with tempfile.TemporaryDirectory() as root:
+            corpus = generate_corpus(root, sizes=(4 * 1024,), languages=("python", "javascript"),
+                                     densities=dict(densities, bracket_errors=0.01))
+            results = run_benchmark(corpus, self.agent, repeat=1)
+            self.assertEqual(set(results["languages"]), {"python", "javascript"})
+            self.assertGreater(results["checks"]["javascript"]["brackets"]["mb_per_s"], 0)
+            
+            javascript = next(corpus_file for corpus_file in corpus if corpus_file.language == "javascript")
+            issues = self.agent.review_code(javascript.path)["issues"]
+            for rule_id, kind in (("long-line", "long_lines"), ("hardcoded-credential", "credentials"),
+                                  ("brackets", "bracket_errors")):
+                self.assertEqual(sum(issue["rule"] == rule_id for issue in issues), javascript.injected[kind])
+            
+            baseline_file = os.path.join(root, "baselines.json")
+            save_baseline(results, baseline_file, "main")
+            comparison = compare_to_baseline(results, load_baseline(baseline_file, "main"))
+            self.assertEqual(comparison["total"]["change"], 0.0)
+        
+        issues = self.agent.review_code("synthetic.py", code)["issues"]
+        for rule_id, kind in (("long-line", "long_lines"), ("hardcoded-credential", "credentials"),
+                              ("unused-import", "unused_imports")):
+            self.assertEqual(sum(issue["rule"] == rule_id for issue in issues), injected[kind])
 
 
 class TestLinkedInProfileOptimizerAgent(unittest.TestCase):